@@ -0,0 +1,20 @@
+"""
+FIB Tool - Benchmarks
+
+Standalone timing harnesses for the fib_tool runtime modules. They live
+outside python/fib_tool so the installed package only carries runtime code.
+
+Run from the repository root, with KLayout's Python module (pya) importable:
+    python -m benchmarks.perf_overhead
+    python -m benchmarks.bulk_transform markers=20000 repeat=5
+
+Keyword arguments of the benchmark function can be passed as key=value;
+the result dict is printed as JSON.
+"""
+
+import os
+import sys
+
+_PYTHON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'python')
+if _PYTHON_DIR not in sys.path:
+    sys.path.insert(0, _PYTHON_DIR)
@@ -0,0 +1,87 @@
+"""Batch marker type conversion, data only and with GDS shape replacement"""
+
+import math
+import time
+
+import pya
+
+from fib_tool.business.bulk_transform import FibBulkTransformer
+from fib_tool.business.marker_transformer import FibMarkerTransformer
+from fib_tool.config import DEFAULT_MARKER_NOTES, LAYERS
+from fib_tool.markers import CutMarker, ConnectMarker, ProbeMarker, coordinate_texts
+
+from .common import main
+
+
+def benchmark_batch_conversion(markers=10000):
+    """Time convert_batch on synthetic markers, data only and with GDS replacement
+
+    Builds `markers` cuts, connects and probes (with notes and design
+    layers), draws them into a standalone layout and converts all of them
+    to CONNECT - the connects fail as "already connect" - first without
+    and then with a cell. Checks that ids, notes and layers survive and
+    that the layout ends up with exactly the shapes of the new markers.
+
+    Returns:
+        dict: {'data_ms', 'gds_ms', 'gds_us_per_marker', 'converted',
+               'failed', 'markers'}
+    """
+    def build():
+        marker_list = []
+        side = math.sqrt(markers * 400.0)
+        for n in range(markers):
+            x, y = (n * 7.3) % side, (n * 3.1) % side
+            if n % 3 == 0:
+                marker = CutMarker(f"CUT_{n}", x, y, x + 2.0, y + 1.0, LAYERS['cut'], 'M1:31/0', 'M2:32/0')
+            elif n % 3 == 1:
+                marker = ConnectMarker(f"CONNECT_{n}", x, y, x + 2.0, y, LAYERS['connect'], 'M1:31/0', 'M1:31/0')
+            else:
+                marker = ProbeMarker(f"PROBE_{n}", x, y, LAYERS['probe'], 'M3:33/0')
+            marker.notes = DEFAULT_MARKER_NOTES[marker.TAG]
+            marker_list.append(marker)
+        return marker_list
+
+    marker_list = build()
+    t0 = time.perf_counter()
+    converted, failures = FibMarkerTransformer.convert_batch(marker_list, 'connect')
+    data_seconds = time.perf_counter() - t0
+    for old, new in converted:
+        if new.id != old.id or new.notes != DEFAULT_MARKER_NOTES['connect'] or new.layer != LAYERS['connect']:
+            raise AssertionError(f"{old.id}: id, notes or FIB layer not carried over")
+        if new.layer1 != getattr(old, 'layer1', getattr(old, 'target_layer', None)):
+            raise AssertionError(f"{old.id}: design layer not carried over")
+
+    marker_list = build()
+    layout = pya.Layout()
+    cell = layout.create_cell("BENCH")
+    FibBulkTransformer().draw_gds(marker_list, cell)
+    t0 = time.perf_counter()
+    converted, failures = FibMarkerTransformer.convert_batch(marker_list, 'connect', cell)
+    gds_seconds = time.perf_counter() - t0
+
+    # The layout must hold exactly the shapes of the converted and unconverted markers
+    replaced = {id(old): new for old, new in converted}
+    expected_layout = pya.Layout()
+    expected_cell = expected_layout.create_cell("EXPECTED")
+    FibBulkTransformer().draw_gds([replaced.get(id(marker), marker) for marker in marker_list], expected_cell)
+    for layer_index in expected_layout.layer_indexes():
+        info = expected_layout.get_info(layer_index)
+        actual = cell.shapes(layout.find_layer(info.layer, info.datatype)).size()
+        expected = expected_cell.shapes(layer_index).size()
+        if actual != expected:
+            raise AssertionError(f"Layer {info}: {actual} shapes after conversion, expected {expected}")
+    if len(coordinate_texts(converted[0][1], layout.dbu)) != 2:
+        raise AssertionError("Converted connect should have two coordinate texts")
+
+    return {
+        'data_ms': round(data_seconds * 1000.0, 1),
+        'gds_ms': round(gds_seconds * 1000.0, 1),
+        'gds_us_per_marker': round(gds_seconds * 1e6 / max(1, len(converted)), 1),
+        'converted': len(converted),
+        'failed': len(failures),
+        'markers': markers,
+    }
+
+
+if __name__ == "__main__":
+    main(benchmark_batch_conversion)
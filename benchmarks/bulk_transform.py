@@ -0,0 +1,75 @@
+"""Bulk marker transform: scalar and NumPy paths, and the layout redraw"""
+
+import time
+
+import pya
+
+from fib_tool.business.bulk_transform import FibBulkTransformer
+from fib_tool.core.geometry_utils import get_marker_db_points, get_numpy
+from fib_tool.core.marker_table import FibMarkerTable
+
+from .common import main, mixed_markers
+
+
+def benchmark_bulk_transform(markers=10000, repeat=3):
+    """Time the coordinate transform per marker and through the marker table
+
+    Builds `markers` cuts, connects, probes and 5-point multi-point cuts,
+    rotates them by 90 degrees with a shift and back (scalar path, then the
+    NumPy path with a prebuilt marker table when NumPy is available) and
+    checks both paths agree and the round trip restores every point. Then
+    draws 1000 of them into a standalone layout and times apply() (erase,
+    transform, redraw).
+
+    Returns:
+        dict: {'scalar_ms', 'vectorized_ms' (None without NumPy), 'apply_1000_ms',
+               'erased_1000', 'markers'}
+    """
+    marker_list = mixed_markers(markers, seed=11)
+    original = [get_marker_db_points(marker) for marker in marker_list]
+    forward = pya.DCplxTrans(1.0, 90.0, False, pya.DVector(250.0, -12.5))
+
+    def best(transformer, with_table):
+        times, moved = [], None
+        for _ in range(repeat):
+            # The panel passes the model's cached table, so its build is not timed
+            table = FibMarkerTable(marker_list) if with_table else None
+            t0 = time.perf_counter()
+            transformer.transform(marker_list, forward, table)
+            times.append(time.perf_counter() - t0)
+            moved = [get_marker_db_points(marker) for marker in marker_list]
+            transformer.transform(marker_list, forward.inverted())
+        if [get_marker_db_points(marker) for marker in marker_list] != original:
+            raise AssertionError("Transform round trip changed marker coordinates")
+        return min(times) * 1000.0, moved
+
+    scalar_ms, expected = best(FibBulkTransformer(vectorize_from=markers + 1), False)
+    vectorized_ms = None
+    if get_numpy() is not None:
+        vectorized_ms, moved = best(FibBulkTransformer(vectorize_from=0), True)
+        if moved != expected:
+            raise AssertionError("Vectorized transform differs from the scalar transform")
+        vectorized_ms = round(vectorized_ms, 1)
+
+    layout = pya.Layout()
+    cell = layout.create_cell("BENCH")
+    subset = marker_list[:1000]
+    FibBulkTransformer().draw_gds(subset, cell)
+    shape_count = sum(cell.shapes(index).size() for index in layout.layer_indexes())
+    t0 = time.perf_counter()
+    erased = FibBulkTransformer().apply(subset, forward, cell)
+    apply_ms = (time.perf_counter() - t0) * 1000.0
+    if erased != shape_count:
+        raise AssertionError(f"Erased {erased} of {shape_count} marker shapes")
+
+    return {
+        'scalar_ms': round(scalar_ms, 1),
+        'vectorized_ms': vectorized_ms,
+        'apply_1000_ms': round(apply_ms, 1),
+        'erased_1000': erased,
+        'markers': markers,
+    }
+
+
+if __name__ == "__main__":
+    main(benchmark_bulk_transform)
@@ -0,0 +1,55 @@
+"""Shared helpers for the benchmark modules"""
+
+import ast
+import json
+import math
+import random
+import sys
+
+from fib_tool.markers import CutMarker, ConnectMarker, ProbeMarker
+from fib_tool.multipoint_markers import MultiPointCutMarker
+
+
+def parse_kwargs(argv):
+    """Parse key=value arguments; values are Python literals or plain strings"""
+    kwargs = {}
+    for arg in argv:
+        key, sep, value = arg.partition('=')
+        if not sep:
+            raise SystemExit(f"Expected key=value, got '{arg}'")
+        try:
+            kwargs[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            kwargs[key] = value
+    return kwargs
+
+
+def main(benchmark, argv=None):
+    """Run benchmark(**key=value args) and print the result as JSON"""
+    kwargs = parse_kwargs(sys.argv[1:] if argv is None else argv)
+    result = benchmark(**kwargs)
+    print(json.dumps(result, indent=2, default=str))
+    return result
+
+
+def mixed_markers(count, seed):
+    """Cuts, connects, probes and 5-point multi-point cuts in equal parts
+
+    Placed at random over a square chip sized for about one marker per
+    400 um^2.
+    """
+    rng = random.Random(seed)
+    side = math.sqrt(count * 400.0)
+    markers = []
+    for n in range(count):
+        x, y = rng.uniform(0, side), rng.uniform(0, side)
+        kind = n % 4
+        if kind == 0:
+            markers.append(CutMarker(f"CUT_{n}", x, y, x + 3.0, y + 1.0, 0))
+        elif kind == 1:
+            markers.append(ConnectMarker(f"CONNECT_{n}", x, y, x - 2.0, y + 4.0, 0))
+        elif kind == 2:
+            markers.append(ProbeMarker(f"PROBE_{n}", x, y, 0))
+        else:
+            markers.append(MultiPointCutMarker(f"CUT_{n}", [(x + i, y + (i % 2)) for i in range(5)], 0))
+    return markers
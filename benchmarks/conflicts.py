@@ -0,0 +1,76 @@
+"""Marker spacing conflicts: full sweep and incremental checks"""
+
+import math
+import random
+import time
+
+from fib_tool.business.conflict_analyzer import FibConflictAnalyzer
+from fib_tool.core.geometry_utils import marker_marker_distance
+from fib_tool.core.spatial_index import FibMarkerSpatialIndex
+from fib_tool.markers import CutMarker, ConnectMarker, ProbeMarker
+
+from .common import main
+
+
+def benchmark_conflicts(markers=50000, checks=1000, min_spacing=None):
+    """Time the full sweep and the incremental check on synthetic markers
+
+    Places `markers` cuts, connects and probes at random over a square chip
+    sized for about one marker per 400 um^2 (some pairs end up too close),
+    runs the sweep, compares with the brute-force pair count on the first
+    2000 markers, and times `checks` incremental checks through a spatial
+    index.
+
+    Returns:
+        dict: {'sweep_ms', 'conflicts', 'check_marker_ms' (per marker),
+               'brute_force_ms' (2000 markers), 'sweep_2000_ms', 'markers'}
+    """
+    rng = random.Random(7)
+    side = math.sqrt(markers * 400.0)
+    marker_list = []
+    for n in range(markers):
+        x, y = rng.uniform(0, side), rng.uniform(0, side)
+        dx, dy = rng.uniform(-5, 5), rng.uniform(-5, 5)
+        if n % 3 == 0:
+            marker_list.append(CutMarker(f"CUT_{n}", x, y, x + dx, y + dy, 0))
+        elif n % 3 == 1:
+            marker_list.append(ConnectMarker(f"CONNECT_{n}", x, y, x + dx, y + dy, 0))
+        else:
+            marker_list.append(ProbeMarker(f"PROBE_{n}", x, y, 0))
+
+    analyzer = FibConflictAnalyzer(min_spacing)
+    t0 = time.perf_counter()
+    conflicts = analyzer.analyze(marker_list)
+    sweep = time.perf_counter() - t0
+
+    # Cross-check against all pairs of a subset
+    subset = marker_list[:2000]
+    t0 = time.perf_counter()
+    brute = sum(1 for i, a in enumerate(subset) for b in subset[i + 1:]
+                if marker_marker_distance(a, b) < analyzer.min_spacing)
+    brute_seconds = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    swept = len(analyzer.analyze(subset))
+    sweep_subset = time.perf_counter() - t0
+    if swept != brute:
+        raise AssertionError(f"Sweep found {swept} conflicts, brute force {brute}")
+
+    index = FibMarkerSpatialIndex()
+    index.rebuild(marker_list)
+    t0 = time.perf_counter()
+    for marker in marker_list[:checks]:
+        analyzer.check_marker(marker, index)
+    check_seconds = time.perf_counter() - t0
+
+    return {
+        'sweep_ms': round(sweep * 1000.0, 1),
+        'conflicts': len(conflicts),
+        'check_marker_ms': round(check_seconds * 1000.0 / checks, 3),
+        'brute_force_ms': round(brute_seconds * 1000.0, 1),
+        'sweep_2000_ms': round(sweep_subset * 1000.0, 1),
+        'markers': markers,
+    }
+
+
+if __name__ == "__main__":
+    main(benchmark_conflicts)
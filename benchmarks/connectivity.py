@@ -0,0 +1,74 @@
+"""Net tracing of CONNECT markers on a synthetic two-metal design"""
+
+import random
+import time
+
+import pya
+
+from fib_tool.business.connectivity import FibConnectivityService
+from fib_tool.markers import ConnectMarker
+
+from .common import main
+
+
+def benchmark_connectivity(markers=2000, blocks=100, window=None):
+    """Time net tracing of CONNECT markers on a synthetic two-metal design
+
+    Each block has horizontal M1 wires strapped in pairs by an M2 bar
+    through vias, instantiated `blocks` x `blocks` times. CONNECT markers
+    join random wires of random blocks in a cluster of 10 x 10 blocks, so
+    later markers reuse the windows extracted for earlier ones. Compares
+    with the cache disabled (one extraction per marker).
+
+    Returns:
+        dict: {'cached_ms', 'uncached_ms' (per marker), 'extractions',
+               'connected' (markers whose ends are already connected), 'markers'}
+    """
+    layout = pya.Layout()
+    layout.dbu = 0.001
+    m1, v1, m2 = layout.layer(31, 0), layout.layer(51, 0), layout.layer(32, 0)
+    block = layout.create_cell("BLOCK")
+    for i in range(10):
+        block.shapes(m1).insert(pya.Box(0, i * 2000, 19000, i * 2000 + 600))
+        if i % 2 == 0:
+            # Strap wire i and i + 1 together
+            block.shapes(v1).insert(pya.Box(18000, i * 2000 + 100, 18400, i * 2000 + 500))
+            block.shapes(v1).insert(pya.Box(18000, i * 2000 + 2100, 18400, i * 2000 + 2500))
+            block.shapes(m2).insert(pya.Box(17900, i * 2000, 18500, i * 2000 + 2600))
+    top = layout.create_cell("TOP")
+    top.insert(pya.CellInstArray(block.cell_index(), pya.Trans(), pya.Vector(20000, 0), pya.Vector(0, 20000),
+                                 blocks, blocks))
+
+    rng = random.Random(5)
+    marker_list = []
+    for n in range(markers):
+        bx, by = rng.randrange(10) * 20.0, rng.randrange(10) * 20.0
+        w1, w2 = rng.randrange(10), rng.randrange(10)
+        marker_list.append(ConnectMarker(f"CONNECT_{n}", bx + 2.0, by + w1 * 2.0 + 0.3,
+                                         bx + 10.0, by + w2 * 2.0 + 0.3, 0, "M1:31/0", "M1:31/0"))
+
+    def run(keep_cache):
+        service = FibConnectivityService(window=window, conductors=['31/0', '32/0'],
+                                         vias=[('31/0', '51/0', '32/0')], labels={})
+        t0 = time.perf_counter()
+        if keep_cache:
+            service.trace_markers(marker_list, layout, top)
+        else:
+            for marker in marker_list:
+                service.invalidate()
+                service.trace_marker(marker, layout, top)
+        return (time.perf_counter() - t0) * 1000.0 / markers, service.extractions
+
+    cached_ms, extractions = run(True)
+    uncached_ms, _ = run(False)
+    return {
+        'cached_ms': round(cached_ms, 3),
+        'uncached_ms': round(uncached_ms, 3),
+        'extractions': extractions,
+        'connected': sum(1 for marker in marker_list if marker.connected),
+        'markers': markers,
+    }
+
+
+if __name__ == "__main__":
+    main(benchmark_connectivity)
@@ -0,0 +1,69 @@
+"""Edit latency with one FibEditSession per edit versus one per batch"""
+
+import time
+
+import pya
+
+from fib_tool.core.edit_session import FibEditSession
+
+from .common import main
+
+
+def benchmark_edit_session(shape_count=100000, edits=1000, with_view=True):
+    """Measure edit latency with and without a surrounding FibEditSession
+
+    Builds a scratch layout with `shape_count` boxes and applies `edits`
+    insert + erase pairs twice: each pair in its own session (one undo step
+    and layout update per edit, like the unbatched code) and all pairs in
+    one session. Runs in KLayout or with the standalone klayout module
+    (a headless LayoutView is used when available).
+
+    Returns:
+        dict: {'per_edit_ms', 'batched_ms', 'speedup', 'shapes', 'edits'}
+    """
+    view = None
+    if with_view and hasattr(pya, 'LayoutView'):
+        try:
+            manager = pya.Manager()  # Undo manager (a headless view has none by default)
+            view = pya.LayoutView(True, manager)  # Editable, not shown
+            layout = view.cellview(view.create_layout(True)).layout()
+        except Exception:
+            view = None
+    if view is None:
+        layout = pya.Layout(True)
+
+    top = layout.create_cell("BENCH")
+    layer = layout.layer(317, 0)
+    shapes = top.shapes(layer)
+    side = max(1, int(shape_count ** 0.5))
+    for i in range(shape_count):
+        x, y = (i % side) * 200, (i // side) * 200
+        shapes.insert(pya.Box(x, y, x + 100, y + 100))
+
+    def run(batched):
+        t0 = time.perf_counter()
+        if batched:
+            with FibEditSession(view, "benchmark", layout):
+                for i in range(edits):
+                    shapes.erase(shapes.insert(pya.Box(-i - 100, 0, -i, 100)))
+        else:
+            for i in range(edits):
+                with FibEditSession(view, "benchmark", layout):
+                    shapes.erase(shapes.insert(pya.Box(-i - 100, 0, -i, 100)))
+        return time.perf_counter() - t0
+
+    per_edit = run(False)
+    batched = run(True)
+    if view is not None:
+        view.clear_transactions()
+    return {
+        'per_edit_ms': round(per_edit * 1000.0, 2),
+        'batched_ms': round(batched * 1000.0, 2),
+        'speedup': round(per_edit / batched, 1) if batched > 0 else None,
+        'shapes': shape_count,
+        'edits': edits,
+    }
+
+
+if __name__ == "__main__":
+    main(benchmark_edit_session)
@@ -0,0 +1,53 @@
+"""Memory held by markers as the UI creates them"""
+
+import gc
+import tracemalloc
+
+from fib_tool.config import DEFAULT_MARKER_NOTES, LAYERS
+from fib_tool.markers import CutMarker, ConnectMarker, ProbeMarker
+from fib_tool.multipoint_markers import MultiPointCutMarker
+
+from .common import main
+
+
+def benchmark_marker_memory(count=100000):
+    """Memory held by `count` markers as the UI creates them
+
+    Builds a mix of cuts, connects, probes and 5-point multi-point cuts with
+    layer info and default notes and measures the allocations with
+    tracemalloc (ids, layer strings and the list included).
+
+    Returns:
+        dict: {'mb', 'bytes_per_marker', 'markers'}
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        markers = []
+        for n in range(count):
+            x = n * 0.5
+            kind = n % 4
+            if kind == 0:
+                marker = CutMarker(f"CUT_{n}", x, 1.0, x + 2.0, 3.0, LAYERS['cut'], 'M1:31/0', 'M1:31/0')
+            elif kind == 1:
+                marker = ConnectMarker(f"CONNECT_{n}", x, 1.0, x + 2.0, 3.0, LAYERS['connect'], 'M1:31/0', 'M2:32/0')
+            elif kind == 2:
+                marker = ProbeMarker(f"PROBE_{n}", x, 1.0, LAYERS['probe'], 'M3:33/0')
+            else:
+                marker = MultiPointCutMarker(f"CUT_{n}", [(x, 1.0), (x + 1.0, 2.0), (x + 2.0, 1.5),
+                                                          (x + 3.0, 4.0), (x + 4.0, 0.5)],
+                                             LAYERS['cut'], ['M1'] * 5)
+            marker.notes = DEFAULT_MARKER_NOTES['probe' if kind == 2 else 'connect' if kind == 1 else 'cut']
+            markers.append(marker)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'mb': round(current / 1e6, 1),
+        'bytes_per_marker': round(current / count),
+        'markers': count,
+    }
+
+
+if __name__ == "__main__":
+    main(benchmark_marker_memory)
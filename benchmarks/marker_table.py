@@ -0,0 +1,87 @@
+"""Columnar marker table queries against per-object loops, with and without NumPy"""
+
+import math
+import time
+
+from fib_tool.core.geometry_utils import (
+    calculate_distance, get_bounding_box, get_marker_points, get_numpy, transform_points
+)
+from fib_tool.core.marker_table import FibMarkerTable
+
+from .common import main, mixed_markers
+
+
+def benchmark_marker_table(markers=100000, repeat=5):
+    """Time table queries against per-object loops, with and without NumPy
+
+    Builds `markers` cuts, connects, probes and 5-point multi-point cuts,
+    then times bounding box, region filter (1% of the area), lengths and a
+    90 degree rotation of all points. Each query is checked against the
+    object loop.
+
+    Returns:
+        dict: {'build_ms', 'objects_ms', 'python_ms', 'numpy_ms' (None without
+               NumPy)}, the query times summed over the four queries
+    """
+    marker_list = mixed_markers(markers, seed=3)
+    side = math.sqrt(markers * 400.0)
+    region = (side * 0.45, side * 0.45, side * 0.55, side * 0.55)
+    rotate = (0.0, -1.0, 1.0, 0.0, 10.0, 0.0)
+
+    def best(function):
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            result = function()
+            times.append(time.perf_counter() - t0)
+        return min(times) * 1000.0, result
+
+    def objects():
+        boxes = [get_bounding_box(get_marker_points(marker)) for marker in marker_list]
+        box = (min(b[0] for b in boxes), min(b[1] for b in boxes),
+               max(b[2] for b in boxes), max(b[3] for b in boxes))
+        inside = [marker for marker, b in zip(marker_list, boxes)
+                  if b[2] >= region[0] and b[3] >= region[1] and b[0] <= region[2] and b[1] <= region[3]]
+        lengths = []
+        for marker in marker_list:
+            points = get_marker_points(marker)
+            lengths.append(sum(calculate_distance(*points[i], *points[i + 1]) for i in range(len(points) - 1)))
+        rotated = [transform_points(x, y, rotate) for marker in marker_list for x, y in get_marker_points(marker)]
+        return box, len(inside), sum(lengths), len(rotated)
+
+    def queries(table):
+        box = table.bounding_box()
+        inside = table.markers_in_region(region)
+        lengths = table.lengths()
+        xs, _ = table.transformed_points(rotate)
+        return box, len(inside), float(sum(lengths)), len(xs)
+
+    def check(name, result, expected):
+        if result[:2] != expected[:2] or result[3] != expected[3] or \
+                not math.isclose(result[2], expected[2], rel_tol=1e-9):
+            raise AssertionError(f"{name} table gave {result}, objects {expected}")
+
+    objects_ms, expected = best(objects)
+    t0 = time.perf_counter()
+    python_table = FibMarkerTable(marker_list, use_numpy=False)
+    build_ms = (time.perf_counter() - t0) * 1000.0
+    python_ms, result = best(lambda: queries(python_table))
+    check("Pure Python", result, expected)
+    numpy_ms = None
+    if get_numpy() is not None:
+        numpy_table = FibMarkerTable(marker_list)
+        numpy_ms, result = best(lambda: queries(numpy_table))
+        check("NumPy", result, expected)
+        numpy_ms = round(numpy_ms, 1)
+
+    return {
+        'build_ms': round(build_ms, 1),
+        'objects_ms': round(objects_ms, 1),
+        'python_ms': round(python_ms, 1),
+        'numpy_ms': numpy_ms,
+        'markers': markers,
+    }
+
+
+if __name__ == "__main__":
+    main(benchmark_marker_table)
@@ -0,0 +1,99 @@
+"""Marker migration to a new layout revision on synthetic instance trees"""
+
+import random
+import time
+
+import pya
+
+from fib_tool.business.marker_migrator import FibMarkerMigrator
+from fib_tool.markers import ProbeMarker
+
+from .common import main
+
+
+def benchmark_migration(markers=5000, blocks=20):
+    """Time index builds and a migration on synthetic layout revisions
+
+    Builds an old layout with blocks x blocks named instances of a block
+    cell, each holding four unnamed sub-blocks, and a new revision where
+    every block is shifted (every seventh also rotated by 90 degrees),
+    sub-block 0 moved inside the block cell and one block removed. Places
+    `markers` probes inside sub-blocks, migrates them and checks each
+    against its expected position (markers in the removed block must be
+    reported).
+
+    Returns:
+        dict: {'index_ms' (both layouts), 'migrate_ms', 'moved', 'unmapped',
+               'instances', 'markers'}
+    """
+    def build(revision):
+        layout = pya.Layout()
+        top = layout.create_cell("TOP")
+        block = layout.create_cell("BLOCK")
+        sub = layout.create_cell("SUB")
+        sub.shapes(layout.layer(1, 0)).insert(pya.Box(0, 0, 20000, 20000))
+        for k in range(4):
+            offset = pya.Vector(k % 2 * 40000, k // 2 * 40000)
+            if revision and k == 0:
+                offset += pya.Vector(5000, 5000)  # ECO inside the block
+            block.insert(pya.CellInstArray(sub.cell_index(), pya.Trans(offset)))
+        for n in range(blocks * blocks):
+            if revision and n == 1:
+                continue  # Block removed in the new revision
+            shift = pya.Vector(n % blocks * 100000, n // blocks * 100000)
+            rotation = 0
+            if revision:
+                shift += pya.Vector(3000 + 500 * (n % 5), -2000)
+                rotation = 1 if n % 7 == 0 else 0
+            inst = top.insert(pya.CellInstArray(block.cell_index(), pya.Trans(rotation, False, shift)))
+            inst.set_property('name', f"B{n}")  # Unnamed, 400 vs 399 siblings would be ambiguous
+        return layout, top
+
+    old_layout, old_top = build(False)
+    new_layout, new_top = build(True)
+    rng = random.Random(5)
+    marker_list, expected = [], []
+    for n in range(markers):
+        block_n, k = rng.randrange(blocks * blocks), rng.randrange(4)
+        local = pya.DPoint(k % 2 * 40 + rng.uniform(1, 19), k // 2 * 40 + rng.uniform(1, 19))
+        old_point = pya.DCplxTrans(pya.DVector(block_n % blocks * 100, block_n // blocks * 100)) * local
+        marker_list.append(ProbeMarker(f"PROBE_{n}", old_point.x, old_point.y, 0))
+        if block_n == 1:
+            expected.append(None)  # Reported, stays
+            continue
+        if k == 0:
+            local = local + pya.DVector(5, 5)
+        new_trans = pya.DCplxTrans(1.0, 90.0 if block_n % 7 == 0 else 0.0, False,
+                                   pya.DVector(block_n % blocks * 100 + 3 + 0.5 * (block_n % 5),
+                                               block_n // blocks * 100 - 2))
+        expected.append(new_trans * local)
+
+    migrator = FibMarkerMigrator(max_depth=2, name_property='name')
+    t0 = time.perf_counter()
+    migrator.index(old_layout, old_top)
+    migrator.index(new_layout, new_top)
+    index_seconds = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    result = migrator.migrate(marker_list, old_layout, old_top, new_layout, new_top)
+    migrate_seconds = time.perf_counter() - t0
+
+    unmapped_ids = {item.marker_id for item in result.unmapped}
+    for marker, point in zip(marker_list, expected):
+        if point is None:
+            if marker.id not in unmapped_ids:
+                raise AssertionError(f"{marker.id} in a removed block was mapped")
+        elif abs(marker.x - point.x) > 0.001 or abs(marker.y - point.y) > 0.001:
+            raise AssertionError(f"{marker.id} at ({marker.x}, {marker.y}), expected ({point.x}, {point.y})")
+
+    return {
+        'index_ms': round(index_seconds * 1000.0, 1),
+        'migrate_ms': round(migrate_seconds * 1000.0, 1),
+        'moved': result.moved,
+        'unmapped': len(result.unmapped),
+        'instances': len(migrator.index(old_layout, old_top)),
+        'markers': markers,
+    }
+
+
+if __name__ == "__main__":
+    main(benchmark_migration)
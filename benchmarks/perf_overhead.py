@@ -0,0 +1,37 @@
+"""Per-call cost of perf_timer() with the monitor enabled and disabled"""
+
+import time
+
+from fib_tool.core.perf_monitor import FibPerfMonitor
+
+from .common import main
+
+
+def benchmark_overhead(iterations=100000):
+    """Measure the per-call cost of perf_timer() (enabled and disabled)
+
+    Returns:
+        dict: Nanoseconds per call for 'baseline', 'enabled' and 'disabled'
+    """
+    monitor = FibPerfMonitor(enabled=True)
+
+    def run():
+        t0 = time.perf_counter()
+        for _ in range(iterations):
+            with monitor.timer('benchmark'):
+                pass
+        return (time.perf_counter() - t0) * 1e9 / iterations
+
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        pass
+    baseline = (time.perf_counter() - t0) * 1e9 / iterations
+
+    enabled = run()
+    monitor.set_enabled(False)
+    disabled = run()
+    return {'baseline': round(baseline, 1), 'enabled': round(enabled, 1), 'disabled': round(disabled, 1)}
+
+
+if __name__ == "__main__":
+    main(benchmark_overhead)
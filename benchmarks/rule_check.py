@@ -0,0 +1,65 @@
+"""Full marker rule check on a synthetic chip"""
+
+import random
+
+import pya
+
+from fib_tool.business.rule_checker import FibRuleChecker
+from fib_tool.markers import CutMarker, ConnectMarker, ProbeMarker
+
+from .common import main
+
+
+def benchmark_rule_check(markers=5000, blocks=400, threads=None):
+    """Measure a full rule check on a synthetic chip
+
+    Builds a metal layer from `blocks` x `blocks` instances of a block with
+    10 separate wires (1.6M wires at the default) and places `markers`
+    markers (cuts, connects and probes in equal parts) spread over the chip,
+    some on purpose crossing two wires or landing between wires.
+
+    Returns:
+        dict: {'seconds', 'violations', 'markers', 'shapes', 'tiles', 'threads'}
+    """
+    layout = pya.Layout()
+    layout.dbu = 0.001
+    layer = layout.layer(31, 0)
+    block = layout.create_cell("BLOCK")
+    for i in range(10):
+        block.shapes(layer).insert(pya.Box(0, i * 2000, 19000, i * 2000 + 600))
+    top = layout.create_cell("TOP")
+    top.insert(pya.CellInstArray(block.cell_index(), pya.Trans(), pya.Vector(20000, 0), pya.Vector(0, 20000),
+                                 blocks, blocks))
+
+    rng = random.Random(1)
+    marker_list = []
+    for n in range(markers):
+        bx = rng.randrange(blocks) * 20.0
+        by = rng.randrange(blocks) * 20.0
+        wire = rng.randrange(9) * 2.0
+        if n % 3 == 0:
+            # Vertical cut across one wire or (every 4th) two
+            length = 1.6 if n % 4 else 3.0
+            marker_list.append(CutMarker(f"CUT_{n}", bx + 1.3, by + wire - 0.5, bx + 1.3,
+                                         by + wire - 0.5 + length, 0, "M3:31/0", "M3:31/0"))
+        elif n % 3 == 1:
+            off = 1.0 if n % 5 == 0 else 0.3   # Every 5th lands between wires
+            marker_list.append(ConnectMarker(f"CONNECT_{n}", bx + 5.0, by + wire + off, bx + 11.0,
+                                             by + wire + 0.3, 0, "M3:31/0", "M3:31/0"))
+        else:
+            marker_list.append(ProbeMarker(f"PROBE_{n}", bx + 7.0, by + wire + 0.3, 0, "M3:31/0"))
+
+    checker = FibRuleChecker(threads=threads)
+    result = checker.check(marker_list, layout, top)
+    return {
+        'seconds': round(result.elapsed, 2),
+        'violations': len(result.violations),
+        'markers': markers,
+        'shapes': blocks * blocks * 10,
+        'tiles': result.tiles,
+        'threads': checker.threads,
+    }
+
+
+if __name__ == "__main__":
+    main(benchmark_rule_check)
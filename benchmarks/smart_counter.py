@@ -0,0 +1,76 @@
+"""Incremental SmartCounter numbering against the legacy id scan"""
+
+import time
+
+from fib_tool.core.marker_numbers import FibMarkerNumberIndex
+from fib_tool.smart_counter import SmartCounter
+
+from .common import main
+
+
+class _BenchmarkMarker:
+    __slots__ = ('id',)
+
+    def __init__(self, marker_id):
+        self.id = marker_id
+
+
+class _BenchmarkPanel:
+    """Panel stand-in: markers_list plus an optional number index"""
+
+    def __init__(self, indexed):
+        self.markers_list = []
+        self.marker_model = self if indexed else None
+        self.number_index = FibMarkerNumberIndex() if indexed else None
+
+    def add_marker(self, marker):
+        self.markers_list.append(marker)
+        if self.number_index is not None:
+            self.number_index.add(marker)
+
+
+def benchmark_smart_counter(count=100000, legacy_count=2000):
+    """Time creating markers one by one (next number + add), as the plugin does
+
+    The legacy scan is quadratic, so it runs with legacy_count markers and is
+    extrapolated to count.
+
+    Returns:
+        dict: Seconds for 'indexed' (count markers), 'legacy' (legacy_count
+              markers) and 'legacy_extrapolated' (count markers)
+    """
+    def create(indexed, n):
+        panel = _BenchmarkPanel(indexed)
+        counter = SmartCounter(panel)
+        types = ('cut', 'connect', 'probe')
+        t0 = time.perf_counter()
+        for i in range(n):
+            marker_type = types[i % 3]
+            number = counter.get_next_number(marker_type)
+            panel.add_marker(_BenchmarkMarker(f"{marker_type.upper()}_{number}"))
+        return time.perf_counter() - t0, panel
+
+    indexed_seconds, panel = create(True, count)
+
+    # Delete every 10th CUT and refill: exercises the free-number heap
+    cuts = [m for m in panel.markers_list if m.id.startswith('CUT_')][::10]
+    t0 = time.perf_counter()
+    for marker in cuts:
+        panel.number_index.remove(marker)
+    counter = SmartCounter(panel)
+    for _ in cuts:
+        number = counter.get_next_number('cut')
+        panel.add_marker(_BenchmarkMarker(f"CUT_{number}"))
+    refill_seconds = time.perf_counter() - t0
+
+    legacy_seconds, _ = create(False, legacy_count)
+    return {
+        'indexed': round(indexed_seconds, 3),
+        'refill_deleted': round(refill_seconds, 3),
+        'legacy': round(legacy_seconds, 3),
+        'legacy_extrapolated': round(legacy_seconds * (count / float(legacy_count)) ** 2, 1),
+    }
+
+
+if __name__ == "__main__":
+    main(benchmark_smart_counter)
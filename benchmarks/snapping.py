@@ -0,0 +1,61 @@
+"""Snap latency on a synthetic metal layer, with and without the window cache"""
+
+import math
+import time
+
+import pya
+
+from fib_tool.snapping import FibSnapCache
+
+from .common import main
+
+
+def benchmark_snapping(wires=20000, clicks=200, radius=0.5):
+    """Measure snap latency on a synthetic metal layer
+
+    Builds a layout with a top cell that instantiates a block of horizontal
+    wires (paths) and vertical straps (boxes) `wires` times over, then
+    snaps `clicks` nearby clicks with the cache kept (as consecutive clicks
+    do) and with the cache dropped before every click.
+
+    Returns:
+        dict: {'cached_ms', 'uncached_ms' (per click), 'builds', 'shapes'}
+    """
+    layout = pya.Layout()
+    layout.dbu = 0.001
+    layer = layout.layer(30, 0)
+    block = layout.create_cell("BLOCK")
+    for i in range(10):
+        block.shapes(layer).insert(pya.Path([pya.Point(0, i * 2000), pya.Point(50000, i * 2000)], 400))
+        block.shapes(layer).insert(pya.Box(i * 5000, 0, i * 5000 + 500, 20000))
+    top = layout.create_cell("TOP")
+    columns = max(1, int(math.sqrt(wires / 20)))
+    rows = max(1, wires // (20 * columns))
+    top.insert(pya.CellInstArray(block.cell_index(), pya.Trans(), pya.Vector(50000, 0), pya.Vector(0, 20000), columns, rows))
+
+    # Clicks in a few areas (5 x 5 um each), like placing the points of some markers
+    center = top.dbbox().center()
+    points = [(center.x + (i // 50) * 100.0 + (i % 10) * 0.5, center.y + (i % 50 // 10) * 1.0 + 0.3)
+              for i in range(clicks)]
+
+    def run(keep_cache):
+        cache = FibSnapCache()
+        t0 = time.perf_counter()
+        for x, y in points:
+            if not keep_cache:
+                cache.invalidate()
+            cache.snap(top, layer, x, y, radius)
+        return (time.perf_counter() - t0) * 1000.0 / len(points), cache.builds
+
+    cached_ms, builds = run(True)
+    uncached_ms, _ = run(False)
+    return {
+        'cached_ms': round(cached_ms, 3),
+        'uncached_ms': round(uncached_ms, 3),
+        'builds': builds,
+        'shapes': columns * rows * 20,
+    }
+
+
+if __name__ == "__main__":
+    main(benchmark_snapping)
@@ -0,0 +1,116 @@
+"""
+FIB Tool - Startup Import-Cost Benchmark
+
+Measures how long the fib_tool modules take to import on the KLayout
+startup path, compared with the modules that used to be imported eagerly
+(package __init__ with core/ui/business, layer manager and the docked panel).
+
+From the repository root (modules needing KLayout's Qt classes are
+reported as errors outside KLayout):
+    python -m benchmarks.startup_imports
+
+Each measurement imports the modules into a fresh fib_tool namespace and
+restores the original modules afterwards. fib_plugin itself is not
+imported (it registers plugin factories); its own imports are listed below.
+Standard-library modules already loaded in the process are not counted.
+"""
+
+import importlib
+import statistics
+import sys
+import time
+
+from .common import parse_kwargs
+
+
+PACKAGE = 'fib_tool'
+
+# Imported by klayout_package.init_fib_tool -> fib_plugin at startup
+STARTUP_MODULES = (
+    'fib_tool',
+    'fib_tool.config',
+    'fib_tool.markers',
+    'fib_tool.multipoint_markers',
+    'fib_tool.layer_tap',
+    'fib_tool.snapping',
+)
+
+# Previously also imported at startup: eager package __init__ (core, ui,
+# business), layer manager (layer check) and the panel (docked at startup)
+EAGER_MODULES = STARTUP_MODULES + (
+    'fib_tool.core',
+    'fib_tool.ui',
+    'fib_tool.business.marker_transformer',
+    'fib_tool.business.file_manager',
+    'fib_tool.business.export_manager',
+    'fib_tool.business.report_writer',
+    'fib_tool.business.image_processor',
+    'fib_tool.business.report_manifest',
+    'fib_tool.layer_manager',
+    'fib_tool.fib_panel',
+)
+
+
+def _package_modules():
+    return [name for name in sys.modules if name == PACKAGE or name.startswith(PACKAGE + '.')]
+
+
+def measure_import_cost(modules):
+    """Import modules into a fresh fib_tool namespace
+
+    Returns:
+        tuple: (seconds, number of fib_tool modules loaded, errors {module: message})
+    """
+    saved = {name: sys.modules.pop(name) for name in _package_modules()}
+    errors = {}
+    try:
+        t0 = time.perf_counter()
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                errors[name] = f"{type(e).__name__}: {e}"
+        seconds = time.perf_counter() - t0
+        loaded = len(_package_modules())
+    finally:
+        for name in _package_modules():
+            del sys.modules[name]
+        sys.modules.update(saved)
+    return seconds, loaded, errors
+
+
+def benchmark_startup_imports(repeat=5):
+    """Compare the current startup imports with the former eager imports
+
+    Returns:
+        dict: {'startup': {...}, 'eager': {...}} with median_ms, min_ms,
+              modules (fib_tool modules loaded) and errors
+    """
+    results = {}
+    for label, modules in (('startup', STARTUP_MODULES), ('eager', EAGER_MODULES)):
+        runs = [measure_import_cost(modules) for _ in range(repeat)]
+        times = [seconds for seconds, _, _ in runs]
+        results[label] = {
+            'median_ms': round(statistics.median(times) * 1000.0, 2),
+            'min_ms': round(min(times) * 1000.0, 2),
+            'modules': runs[-1][1],
+            'errors': runs[-1][2],
+        }
+    return results
+
+
+def print_startup_benchmark(repeat=5):
+    """Print benchmark_startup_imports() as a small table"""
+    results = benchmark_startup_imports(repeat)
+    print(f"{'Import set':<12}{'Modules':>9}{'Median ms':>12}{'Min ms':>10}")
+    for label in ('startup', 'eager'):
+        r = results[label]
+        print(f"{label:<12}{r['modules']:>9}{r['median_ms']:>12.2f}{r['min_ms']:>10.2f}")
+    for label in ('startup', 'eager'):
+        for module, message in results[label]['errors'].items():
+            print(f"[Startup Benchmark] {label}: {module} failed to import ({message})")
+    return results
+
+
+if __name__ == "__main__":
+    print_startup_benchmark(**parse_kwargs(sys.argv[1:]))
@@ -38,32 +38,14 @@ __version__ = "1.0.0"
 __author__ = "Dean"
 __license__ = "MIT"
 
-# Import new modular components (version 4.0+)
-from .core.global_state import FibGlobalState
-from .core.geometry_utils import (
-    calculate_distance,
-    calculate_direction,
-    get_bounding_box,
-    get_marker_center
-)
-from .core.validation_utils import (
-    validate_marker_id,
-    validate_coordinates,
-    validate_file_path,
-    validate_conversion
-)
-from .ui.dialog_manager import FibDialogManager
-from .business.marker_transformer import FibMarkerTransformer
-from .business.file_manager import FibFileManager
-from .business.export_manager import FibExportManager
+import importlib
 
-# Backward compatibility: FIBPanel will be imported from ui/ after refactoring
-# For now, it's still in the old location
-# from .ui.fib_panel import FIBPanel
+# Nothing is imported eagerly: KLayout imports this package at startup, and
+# the panel, export and business modules are only needed once FIB is used.
+# Attributes below are resolved on first access (PEP 562 module __getattr__).
 
-# Package metadata
-__all__ = [
-    # Legacy module names (for backward compatibility)
+# Legacy module names (for backward compatibility): fib_tool.<module>
+_LAZY_MODULES = (
     'markers',
     'multipoint_markers',
     'config',
@@ -71,19 +53,46 @@ __all__ = [
     'layer_tap',
     'fib_panel',
     'fib_plugin',
-    # New modular components (version 4.0+)
-    'FibGlobalState',
-    'calculate_distance',
-    'calculate_direction',
-    'get_bounding_box',
-    'get_marker_center',
-    'validate_marker_id',
-    'validate_coordinates',
-    'validate_file_path',
-    'validate_conversion',
-    'FibDialogManager',
-    'FibMarkerTransformer',
-    'FibFileManager',
-    'FibExportManager',
-    # 'FIBPanel',  # Uncomment after refactoring fib_panel.py
-]
+)
+
+# New modular components (version 4.0+): name -> defining module
+_LAZY_ATTRIBUTES = {
+    'FibGlobalState': '.core.global_state',
+    'FibExportLogger': '.core.export_logger',
+    'calculate_distance': '.core.geometry_utils',
+    'calculate_direction': '.core.geometry_utils',
+    'get_bounding_box': '.core.geometry_utils',
+    'get_marker_center': '.core.geometry_utils',
+    'validate_marker_id': '.core.validation_utils',
+    'validate_coordinates': '.core.validation_utils',
+    'validate_file_path': '.core.validation_utils',
+    'validate_conversion': '.core.validation_utils',
+    'FibDialogManager': '.ui.dialog_manager',
+    'FibMarkerTransformer': '.business.marker_transformer',
+    'FibFileManager': '.business.file_manager',
+    'FibExportManager': '.business.export_manager',
+}
+
+# Backward compatibility: FIBPanel will be imported from ui/ after refactoring
+# For now, it's still in the old location
+# from .ui.fib_panel import FIBPanel
+
+# Package metadata
+__all__ = list(_LAZY_MODULES) + list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    """Import legacy modules and components on first access"""
+    if name in _LAZY_MODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    elif name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # Cache: later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
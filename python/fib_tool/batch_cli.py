@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+FIB Tool - Headless Batch Report CLI
+
+Regenerates FIB HTML reports (screenshots + report) from a layout file and a
+FIB project JSON without opening the GUI.
+
+KLayout batch mode (variables passed with -rd):
+    klayout -b -r python/fib_tool/batch_cli.py -rd layout=chip.gds -rd project=chip_fib.json -rd output=out/chip
+    klayout -b -r python/fib_tool/batch_cli.py -rd jobs=jobs.json -rd workers=4
+
+Standalone klayout Python module (pip install klayout):
+    python -m fib_tool.batch_cli --layout chip.gds --project chip_fib.json --output out/chip
+    python -m fib_tool.batch_cli --jobs jobs.json --workers 4 --summary batch_summary.json
+
+jobs.json is a list of {"layout": ..., "project": ..., "output": ...} objects.
+Relative paths in jobs.json are resolved against the directory of jobs.json.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Running as a script (klayout -b -r): make the fib_tool package importable
+_PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PACKAGE_PARENT not in sys.path:
+    sys.path.insert(0, _PACKAGE_PARENT)
+
+import pya  # KLayout application or standalone klayout module
+
+
+REPORT_FILENAME = "fib_markers_report.html"
+
+
+# =============================================================================
+# Single job
+# =============================================================================
+
+def _draw_markers(markers, layout, cell):
+    """Draw marker geometry and coordinate texts into the layout (same as the panel does)"""
+    from fib_tool.config import LAYERS
+    from fib_tool.business.report_writer import marker_report_type
+    from fib_tool.core.geometry_utils import get_marker_points
+
+    dbu = layout.dbu
+    coord_layer = layout.layer(LAYERS['coordinates'], 0)
+
+    for marker in markers:
+        base_type = marker_report_type(marker).lower()
+        marker.to_gds(cell, layout.layer(LAYERS[base_type], 0))
+
+        for x, y in get_marker_points(marker):
+            text = pya.Text(f"{marker.id}:({x:.3f},{y:.3f})",
+                            pya.Trans(pya.Point(int(round(x / dbu)), int(round(y / dbu)))))
+            cell.shapes(coord_layer).insert(text)
+
+
+def _create_view(layout_path):
+    """Create a headless LayoutView with the layout loaded"""
+    if not hasattr(pya, 'LayoutView'):
+        raise RuntimeError("pya.LayoutView not available - KLayout 0.28+ is required for headless screenshots")
+
+    view = pya.LayoutView()
+    view.load_layout(layout_path, True)
+    view.max_hier()
+    view.zoom_fit()
+    return view
+
+
+def run_job(layout_path, project_path, output_dir, quiet=False, update=False):
+    """Generate screenshots and the HTML report for one layout/project pair
+
+    Args:
+        layout_path (str): GDS/OASIS file
+        project_path (str): FIB project JSON (as saved by the panel)
+        output_dir (str): Export directory (created if missing)
+        quiet (bool): Log to export_log.txt only
+        update (bool): Incrementally update a previous export in output_dir
+
+    Returns:
+        dict: Job result - status, markers, seconds, timings, report, error
+    """
+    from fib_tool.business.file_manager import FibFileManager
+    from fib_tool.core.export_logger import FibExportLogger
+    from fib_tool.config import EXPORT_LOG_CONFIG
+    from fib_tool.screenshot_export import export_report
+
+    t0 = time.perf_counter()
+    result = {
+        'layout': layout_path,
+        'project': project_path,
+        'output': output_dir,
+        'status': 'failed',
+        'markers': 0,
+        'seconds': 0.0,
+        'timings': {},
+    }
+
+    os.makedirs(output_dir, exist_ok=True)
+    log = FibExportLogger(os.path.join(output_dir, EXPORT_LOG_CONFIG['filename']), mode='w', quiet=quiet)
+
+    try:
+        with log.step('load_layout'):
+            view = _create_view(os.path.abspath(layout_path))
+            cellview = view.active_cellview()
+            if not cellview.is_valid() or cellview.cell is None:
+                raise RuntimeError(f"No top cell in {layout_path}")
+
+        with log.step('load_project'):
+            markers_data, notes_dict, _ = FibFileManager.load_markers_from_json(
+                os.path.abspath(project_path), layout_dbu=cellview.layout().dbu)
+            if markers_data is None:
+                raise RuntimeError(f"Cannot load project {project_path}")
+            markers = []
+            for marker_data in markers_data:
+                try:
+                    marker = FibFileManager.marker_from_dict(marker_data, notes_dict)
+                except Exception as e:
+                    log.warning(f"[Batch] Skipping marker {marker_data.get('id', 'unknown')}: {e}")
+                    continue
+                if marker is not None:
+                    markers.append(marker)
+
+        with log.step('draw_markers'):
+            _draw_markers(markers, cellview.layout(), cellview.cell)
+            view.add_missing_layers()
+
+        log.info(f"[Batch] {os.path.basename(layout_path)}: {len(markers)} markers")
+
+        report_path = export_report(markers, view, output_dir, logger=log, update=update,
+                                    report_filename=REPORT_FILENAME)
+        if not report_path:
+            raise RuntimeError("HTML report generation failed")
+
+        result.update(status='ok', markers=len(markers), report=report_path)
+
+    except Exception as e:
+        log.exception(f"[Batch] Job failed: {e}")
+        result['error'] = str(e)
+
+    finally:
+        result['timings'] = {name: round(seconds, 3) for name, seconds in log.timings.items()}
+        result['seconds'] = round(time.perf_counter() - t0, 3)
+        log.close()
+
+    return result
+
+
+# =============================================================================
+# Job lists (parallel worker processes)
+# =============================================================================
+
+def load_jobs(jobs_path):
+    """Read a jobs JSON file; relative paths are resolved against its directory"""
+    base_dir = os.path.dirname(os.path.abspath(jobs_path))
+    with open(jobs_path, 'r', encoding='utf-8') as f:
+        jobs = json.load(f)
+
+    resolved = []
+    for job in jobs:
+        resolved.append({key: os.path.join(base_dir, job[key]) for key in ('layout', 'project', 'output')})
+    return resolved
+
+
+def _in_klayout():
+    """True when running inside the KLayout application (klayout -b -r)"""
+    try:
+        return hasattr(pya, 'Application') and pya.Application.instance() is not None
+    except Exception:
+        return False
+
+
+def _worker_command(job, summary_path, quiet, update):
+    """Command line that runs one job in a separate process"""
+    if _in_klayout():
+        cmd = [sys.executable, '-b', '-r', os.path.abspath(__file__),
+               '-rd', f"layout={job['layout']}",
+               '-rd', f"project={job['project']}",
+               '-rd', f"output={job['output']}",
+               '-rd', f"summary={summary_path}"]
+        if quiet:
+            cmd += ['-rd', 'quiet=1']
+        if update:
+            cmd += ['-rd', 'update=1']
+        return cmd
+
+    cmd = [sys.executable, '-m', 'fib_tool.batch_cli',
+           '--layout', job['layout'], '--project', job['project'],
+           '--output', job['output'], '--summary', summary_path]
+    if quiet:
+        cmd.append('--quiet')
+    if update:
+        cmd.append('--update')
+    return cmd
+
+
+def _run_job_process(job, quiet, update):
+    """Run one job in a child process and collect its JSON result"""
+    fd, summary_path = tempfile.mkstemp(prefix='fib_job_', suffix='.json')
+    os.close(fd)
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = _PACKAGE_PARENT + os.pathsep + env.get('PYTHONPATH', '')
+
+    t0 = time.perf_counter()
+    try:
+        proc = subprocess.run(_worker_command(job, summary_path, quiet, update), env=env,
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        try:
+            with open(summary_path, 'r', encoding='utf-8') as f:
+                results = json.load(f)
+            return results[0]
+        except (OSError, ValueError, IndexError):
+            tail = proc.stdout.decode('utf-8', errors='replace')[-2000:]
+            return dict(job, status='failed', markers=0, timings={},
+                        seconds=round(time.perf_counter() - t0, 3),
+                        error=f"worker exited with code {proc.returncode}: {tail}")
+    finally:
+        try:
+            os.remove(summary_path)
+        except OSError:
+            pass
+
+
+def run_jobs(jobs, workers=1, quiet=False, update=False):
+    """Run a list of jobs, in parallel worker processes when workers > 1
+
+    Returns:
+        list: Job results in input order
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        return [run_job(job['layout'], job['project'], job['output'], quiet=quiet, update=update)
+                for job in jobs]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda job: _run_job_process(job, quiet, update), jobs))
+
+
+def print_summary(results, total_seconds):
+    """Print a per-job timing table"""
+    print("")
+    print("=" * 78)
+    print(f"{'Status':<8}{'Markers':>8}{'Seconds':>10}  Layout / timings")
+    print("-" * 78)
+    for result in results:
+        print(f"{result['status']:<8}{result['markers']:>8}{result['seconds']:>10.2f}  "
+              f"{os.path.basename(result['layout'])}")
+        if result.get('timings'):
+            steps = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in result['timings'].items())
+            print(f"{'':26}  {steps}")
+        if result.get('error'):
+            print(f"{'':26}  error: {result['error'].splitlines()[0] if result['error'] else ''}")
+    print("-" * 78)
+    failed = sum(1 for r in results if r['status'] != 'ok')
+    print(f"{len(results)} job(s), {failed} failed, {total_seconds:.2f}s total")
+    print("=" * 78)
+
+
+# =============================================================================
+# Entry point
+# =============================================================================
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Generate FIB HTML reports without the GUI")
+    parser.add_argument('--layout', help="Layout file (GDS/OASIS)")
+    parser.add_argument('--project', help="FIB project JSON")
+    parser.add_argument('--output', help="Output directory")
+    parser.add_argument('--jobs', help="JSON list of {layout, project, output} jobs")
+    parser.add_argument('--workers', type=int, default=1, help="Parallel worker processes for --jobs")
+    parser.add_argument('--summary', help="Write job results as JSON to this file")
+    parser.add_argument('--quiet', action='store_true', help="Only write export_log.txt, no console log")
+    parser.add_argument('--update', action='store_true',
+                        help="Update previous exports in place (only new/changed markers are re-rendered)")
+    args = parser.parse_args(argv)
+
+    if not args.jobs and not (args.layout and args.project and args.output):
+        parser.error("either --jobs or all of --layout, --project and --output are required")
+    return args
+
+
+def _argv_from_rd(namespace):
+    """Translate klayout -rd name=value variables into command-line arguments"""
+    argv = []
+    for name in ('layout', 'project', 'output', 'jobs', 'workers', 'summary'):
+        value = namespace.get(name)
+        if isinstance(value, str) and value:
+            argv += [f"--{name}", value]
+    for flag in ('quiet', 'update'):
+        if namespace.get(flag) not in (None, '', '0', 'false'):
+            argv.append(f"--{flag}")
+    return argv
+
+
+def main(argv=None):
+    """Run the CLI. Returns the process exit code (0 = all jobs succeeded)"""
+    args = parse_args(argv)
+    t0 = time.perf_counter()
+
+    if args.jobs:
+        jobs = load_jobs(args.jobs)
+    else:
+        jobs = [{'layout': args.layout, 'project': args.project, 'output': args.output}]
+
+    results = run_jobs(jobs, workers=args.workers, quiet=args.quiet, update=args.update)
+    print_summary(results, time.perf_counter() - t0)
+
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    return 0 if all(r['status'] == 'ok' for r in results) else 1
+
+
+if __name__ == "__main__":
+    if _in_klayout():
+        # klayout -b -r: arguments arrive as -rd variables in this module's globals
+        _exit_code = main(_argv_from_rd(globals()))
+        if _exit_code:
+            pya.Application.instance().exit(_exit_code)
+    else:
+        sys.exit(main(sys.argv[1:]))
@@ -1,15 +1,42 @@
 """Business logic for FIB Tool
 
 This module provides business logic components for marker transformations,
-file I/O operations, and export management.
+file I/O operations, export management, report writing, marker rule
+checks, marker conflict detection, CONNECT endpoint net lookup, bulk
+marker transforms and marker migration to new layout revisions.
+
+Components are imported on first access (PEP 562 module __getattr__), so
+importing one of them does not load the export/report modules as well.
 """
 
-from .marker_transformer import FibMarkerTransformer
-from .file_manager import FibFileManager
-from .export_manager import FibExportManager
+import importlib
+
+# Component name -> defining module
+_LAZY_ATTRIBUTES = {
+    'FibMarkerTransformer': '.marker_transformer',
+    'FibFileManager': '.file_manager',
+    'FibExportManager': '.export_manager',
+    'FibReportWriter': '.report_writer',
+    'FibImageProcessor': '.image_processor',
+    'FibReportManifest': '.report_manifest',
+    'FibRuleChecker': '.rule_checker',
+    'FibConflictAnalyzer': '.conflict_analyzer',
+    'FibConnectivityService': '.connectivity',
+    'FibBulkTransformer': '.bulk_transform',
+    'FibMarkerMigrator': '.marker_migrator',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    """Import a component on first access"""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = [
-    'FibMarkerTransformer',
-    'FibFileManager',
-    'FibExportManager',
-]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
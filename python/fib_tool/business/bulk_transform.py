@@ -0,0 +1,213 @@
+"""Bulk marker transformation for FIB Tool
+
+When a design revision moves, rotates or mirrors a block, its markers have
+to follow. FibBulkTransformer applies one pya.DCplxTrans (shift, rotation,
+mirror at the x axis, magnification) to a selection or all markers:
+
+    transformer = FibBulkTransformer()
+    trans = pya.DCplxTrans(1.0, 90.0, False, pya.DVector(120.0, 0.0))
+    transformer.apply(markers, trans, cell, view)
+
+apply() updates the marker objects, their GDS geometry and their
+coordinate texts inside one FibEditSession, so the whole move is one undo
+step and one layout update. The old shapes are found exactly: the markers
+are drawn into a scratch layout and only equal shapes at the same place
+are erased, so neighbouring markers and design shapes are never touched.
+
+New coordinates are computed in canonical units and rounded once. Large
+selections go through the NumPy marker table (core.marker_table) instead
+of one marker at a time; both paths give identical results. Rule check,
+conflict and net results of moved markers are reset to "not checked".
+"""
+
+import math
+import time
+
+from ..config import LAYERS, TRANSFORM_CONFIG
+from ..core.edit_session import FibEditSession
+from ..core.geometry_utils import CANONICAL_SCALE, get_marker_db_points, get_numpy, set_marker_db_points
+from ..core.log_utils import get_logger
+from ..core.marker_table import FibMarkerTable
+from ..core.perf_monitor import get_perf_monitor
+
+logger = get_logger('bulk_transform')
+
+
+def trans_matrix(trans):
+    """Affine matrix of a transformation
+
+    Args:
+        trans: pya.DCplxTrans (displacement in microns), or a matrix tuple
+
+    Returns:
+        tuple: (m11, m12, m21, m22, dx, dy) with x' = m11 * x + m12 * y + dx
+            and y' = m21 * x + m22 * y + dy (see geometry_utils.transform_points)
+
+    Example:
+        >>> trans_matrix(pya.DCplxTrans(1.0, 90.0, False, 10.0, 0.0))
+        (0.0, -1.0, 1.0, 0.0, 10.0, 0.0)
+    """
+    if isinstance(trans, (tuple, list)):
+        return tuple(trans)
+    angle = math.radians(trans.angle)
+    mag = trans.mag
+    # Exact values for the 90 degree multiples of layout revisions
+    c = round(math.cos(angle), 15) * mag
+    s = round(math.sin(angle), 15) * mag
+    c, s = c + 0.0, s + 0.0  # No -0.0
+    if trans.is_mirror():
+        # Mirror at the x axis first, then rotate
+        return (c, s, s, -c, trans.disp.x, trans.disp.y)
+    return (c, -s, s, c, trans.disp.x, trans.disp.y)
+
+
+def _marker_layer(layout, marker):
+    """Layer index of the marker's FIB layer (created if missing)"""
+    return layout.layer(LAYERS[marker.TAG], 0)
+
+
+def _same_shape(shape, other):
+    if shape.is_text():
+        return other.is_text() and shape.text == other.text
+    return not other.is_text() and shape.polygon == other.polygon
+
+
+class FibBulkTransformer:
+    """Moves markers by one transformation (data, geometry and texts)
+
+    Args:
+        vectorize_from (int): Selections with at least this many markers use
+            the NumPy marker table (default TRANSFORM_CONFIG['vectorize_from'])
+
+    Example:
+        >>> transformer = FibBulkTransformer()
+        >>> transformer.transform(markers, (1, 0, 0, 1, 5.0, 0.0))  # 5 um right, data only
+        120
+    """
+
+    def __init__(self, vectorize_from=None):
+        self.vectorize_from = TRANSFORM_CONFIG['vectorize_from'] if vectorize_from is None else vectorize_from
+
+    def transform(self, markers, trans, table=None, rows=None):
+        """Transform the marker coordinates (no layout changes)
+
+        Args:
+            markers: Markers to move
+            trans: pya.DCplxTrans or matrix tuple (see trans_matrix)
+            table: Up-to-date FibMarkerTable to use instead of building one
+                (e.g. FibMarkerListModel.marker_table())
+            rows: Table rows of `markers`, in the same order (with `table`)
+
+        Returns:
+            int: Number of markers moved
+        """
+        t0 = time.perf_counter()
+        m11, m12, m21, m22, dx, dy = trans_matrix(trans)
+        matrix = (m11, m12, m21, m22, dx * CANONICAL_SCALE, dy * CANONICAL_SCALE)
+        if len(markers) >= self.vectorize_from and get_numpy() is not None:
+            if table is None or not table.numpy:
+                table, rows = FibMarkerTable(markers), None
+            xs, ys, offsets = table.transformed_db_points(matrix, rows)
+            kinds = (table.kinds if rows is None else table.kinds[get_numpy().asarray(rows)]).tolist()
+            for row, (marker, kind) in enumerate(zip(markers, kinds)):
+                start = offsets[row]
+                if kind == 0 or kind == 1:  # Cut / connect (KIND_CODES)
+                    marker.ix1, marker.iy1, marker.ix2, marker.iy2 = xs[start], ys[start], xs[start + 1], ys[start + 1]
+                elif kind == 2:
+                    marker.ix, marker.iy = xs[start], ys[start]
+                else:
+                    end = offsets[row + 1]
+                    set_marker_db_points(marker, list(zip(xs[start:end], ys[start:end])))
+                self._reset_results(marker)
+        else:
+            for marker in markers:
+                set_marker_db_points(marker, [(int(round(m11 * x + m12 * y + matrix[4])),
+                                               int(round(m21 * x + m22 * y + matrix[5])))
+                                              for x, y in get_marker_db_points(marker)])
+                self._reset_results(marker)
+        get_perf_monitor().record('transform.markers', time.perf_counter() - t0)
+        return len(markers)
+
+    @staticmethod
+    def _reset_results(marker):
+        # Checked at the old position - no longer valid
+        marker.violations = None
+        marker.conflicts = None
+        marker.nets = None
+        marker.connected = None
+
+    def apply(self, markers, trans, cell, view=None, table=None, rows=None):
+        """Transform markers, their geometry and coordinate texts as one undo step
+
+        Args:
+            markers: Markers to move (drawn in `cell`)
+            trans: pya.DCplxTrans or matrix tuple
+            cell: pya.Cell holding the marker shapes
+            view: pya.LayoutView for the undo step (None = current view)
+            table, rows: See transform()
+
+        Returns:
+            int: Number of old shapes erased (geometry, labels and texts)
+        """
+        t0 = time.perf_counter()
+        layout = cell.layout()
+        with FibEditSession(view, f"FIB: transform {len(markers)} marker(s)", layout):
+            erased = self.erase_gds(markers, cell)
+            self.transform(markers, trans, table, rows)
+            self.draw_gds(markers, cell)
+        elapsed = time.perf_counter() - t0
+        get_perf_monitor().record('transform.apply', elapsed)
+        logger.info("[Transform] Moved %s marker(s), replaced %s shape(s) (%.1f ms)",
+                    len(markers), erased, elapsed * 1000.0)
+        return erased
+
+    def erase_gds(self, markers, cell):
+        """Erase the shapes and coordinate texts the markers drew
+
+        Draws the markers into a scratch layout with the same dbu and erases
+        each equal shape found at the same place in `cell` once.
+
+        Returns:
+            int: Number of shapes erased
+        """
+        import pya
+        from ..markers import coordinate_texts
+
+        layout = cell.layout()
+        scratch = pya.Layout()
+        scratch.dbu = layout.dbu
+        scratch_cell = scratch.create_cell("FIB_TRANSFORM")
+        coordinate_layer = scratch.layer(LAYERS['coordinates'], 0)
+        for marker in markers:
+            marker.to_gds(scratch_cell, scratch.layer(LAYERS[marker.TAG], 0))
+            for text in coordinate_texts(marker, layout.dbu):
+                scratch_cell.shapes(coordinate_layer).insert(text)
+
+        erased = 0
+        for layer_index in scratch.layer_indexes():
+            info = scratch.get_info(layer_index)
+            target_index = layout.find_layer(info.layer, info.datatype)
+            if target_index is None:
+                continue
+            shapes = cell.shapes(target_index)
+            doomed = set()
+            for shape in scratch_cell.shapes(layer_index).each():
+                for candidate in shapes.each_touching(shape.bbox()):
+                    if candidate not in doomed and _same_shape(shape, candidate):
+                        doomed.add(candidate)
+                        break
+            for shape in doomed:
+                shapes.erase(shape)
+            erased += len(doomed)
+        return erased
+
+    def draw_gds(self, markers, cell):
+        """Draw the markers and their coordinate texts into `cell`"""
+        from ..markers import coordinate_texts
+
+        layout = cell.layout()
+        coordinate_shapes = cell.shapes(layout.layer(LAYERS['coordinates'], 0))
+        for marker in markers:
+            marker.to_gds(cell, _marker_layer(layout, marker))
+            for text in coordinate_texts(marker, layout.dbu):
+                coordinate_shapes.insert(text)
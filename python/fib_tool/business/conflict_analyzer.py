@@ -0,0 +1,202 @@
+"""Marker-to-marker conflict detection for FIB Tool
+
+Two markers conflict when their geometry (probe points, cut/connect lines,
+multi-point polylines, as drawn without width) is closer than
+CONFLICT_CONFIG['min_spacing'] - overlapping or crossing markers have
+distance 0. The FIB beam cannot resolve such pairs separately.
+
+Full analysis (Checks tab "Find Conflicts") is a sort-and-sweep over the
+marker bounding boxes: boxes are sorted by left edge and swept left to
+right while a heap drops boxes that ended more than min_spacing before the
+current one. Only pairs whose boxes come within min_spacing in x and y get
+the exact segment distance test. That is O(n log n + candidate pairs)
+instead of O(n^2).
+
+A single new marker (incremental check when it is created) only looks at
+the markers the spatial index returns for its enlarged bounding box.
+
+    analyzer = FibConflictAnalyzer()
+    conflicts = analyzer.analyze(markers)
+    new_conflicts = analyzer.check_marker(marker, model.spatial_index)
+
+Each analyzed marker gets a ``conflicts`` list (empty = no conflict), seen
+from that marker.
+"""
+
+import heapq
+import math
+import time
+
+from ..config import CONFLICT_CONFIG
+from ..core.geometry_utils import (
+    closest_point_on_segment, get_bounding_box, get_marker_points, get_marker_segments,
+    segment_segment_distance, segments_intersect
+)
+from ..core.log_utils import get_logger
+from ..core.perf_monitor import get_perf_monitor
+
+logger = get_logger('conflict_analyzer')
+
+
+class MarkerConflict:
+    """A marker closer than the minimum spacing to another marker"""
+
+    __slots__ = ('marker_id', 'other_id', 'distance', 'x', 'y')
+
+    def __init__(self, marker_id, other_id, distance, x, y):
+        self.marker_id = marker_id
+        self.other_id = other_id
+        self.distance = distance  # In microns (0 = overlapping)
+        self.x = x                # Closest approach in microns
+        self.y = y
+
+    @property
+    def message(self):
+        if self.distance == 0.0:
+            return f"Overlaps {self.other_id}"
+        return f"Too close to {self.other_id} ({self.distance:.3f} um)"
+
+    def reversed(self):
+        """The same conflict seen from the other marker"""
+        return MarkerConflict(self.other_id, self.marker_id, self.distance, self.x, self.y)
+
+    def __repr__(self):
+        return f"MarkerConflict({self.marker_id}, {self.other_id}, {self.distance:.3f})"
+
+
+def _closest_approach(segments_a, segments_b, min_spacing):
+    """Distance and location of the closest approach of two segment lists
+
+    Returns:
+        tuple: (distance, x, y), distance is inf if not below min_spacing
+    """
+    best, best_pair = math.inf, None
+    for a in segments_a:
+        for b in segments_b:
+            d = segment_segment_distance(*a, *b)
+            if d < best:
+                best, best_pair = d, (a, b)
+                if d == 0.0:
+                    break
+        if best == 0.0:
+            break
+    if best >= min_spacing:
+        return math.inf, None, None
+
+    (ax1, ay1, ax2, ay2), (bx1, by1, bx2, by2) = best_pair
+    if best == 0.0 and segments_intersect(ax1, ay1, ax2, ay2, bx1, by1, bx2, by2):
+        # Crossing point (or the shared end point of collinear segments)
+        dax, day, dbx, dby = ax2 - ax1, ay2 - ay1, bx2 - bx1, by2 - by1
+        denominator = dax * dby - day * dbx
+        if denominator != 0.0:
+            t = ((bx1 - ax1) * dby - (by1 - ay1) * dbx) / denominator
+            return 0.0, ax1 + t * dax, ay1 + t * day
+    # Midpoint between the closest end point and its projection on the other segment
+    candidates = []
+    for px, py, sx1, sy1, sx2, sy2 in ((ax1, ay1, bx1, by1, bx2, by2), (ax2, ay2, bx1, by1, bx2, by2),
+                                       (bx1, by1, ax1, ay1, ax2, ay2), (bx2, by2, ax1, ay1, ax2, ay2)):
+        qx, qy = closest_point_on_segment(px, py, sx1, sy1, sx2, sy2)
+        candidates.append((math.hypot(px - qx, py - qy), (px + qx) / 2.0, (py + qy) / 2.0))
+    _, x, y = min(candidates)
+    return best, x, y
+
+
+class FibConflictAnalyzer:
+    """Finds marker pairs closer than the minimum spacing
+
+    Args:
+        min_spacing (float): Minimum distance in microns between markers
+            (default CONFLICT_CONFIG['min_spacing'])
+
+    Example:
+        >>> analyzer = FibConflictAnalyzer(min_spacing=0.5)
+        >>> for conflict in analyzer.analyze(markers):
+        ...     print(conflict.marker_id, conflict.message)
+    """
+
+    def __init__(self, min_spacing=None):
+        self.min_spacing = CONFLICT_CONFIG['min_spacing'] if min_spacing is None else min_spacing
+
+    def analyze(self, markers):
+        """Sort-and-sweep over all markers
+
+        Sets ``conflicts`` on every marker.
+
+        Returns:
+            list: MarkerConflict per conflicting pair (marker_id is the
+                  marker that comes first in `markers`), in marker order
+        """
+        t0 = time.perf_counter()
+        spacing = self.min_spacing
+        entries = []
+        for order, marker in enumerate(markers):
+            marker.conflicts = []
+            box = get_bounding_box(get_marker_points(marker))
+            if box is not None:
+                entries.append((box[0], box[1], box[2], box[3], order, marker, get_marker_segments(marker)))
+        entries.sort(key=lambda entry: entry[0])
+
+        pairs = []
+        candidates = 0
+        active = {}     # order -> entry
+        ends = []       # heap of (right edge, order) of the active entries
+        for entry in entries:
+            left, bottom, right, top = entry[:4]
+            # Drop boxes that ended more than `spacing` before this one starts
+            while ends and ends[0][0] < left - spacing:
+                active.pop(heapq.heappop(ends)[1], None)
+            for other in active.values():
+                if other[1] - spacing > top or other[3] + spacing < bottom:
+                    continue
+                candidates += 1
+                d, x, y = _closest_approach(entry[6], other[6], spacing)
+                if d < spacing:
+                    first, second = (other, entry) if other[4] < entry[4] else (entry, other)
+                    conflict = MarkerConflict(first[5].id, second[5].id, d, x, y)
+                    pairs.append((first[4], second[4], conflict))
+                    first[5].conflicts.append(conflict)
+                    second[5].conflicts.append(conflict.reversed())
+            active[entry[4]] = entry
+            heapq.heappush(ends, (right, entry[4]))
+
+        pairs.sort(key=lambda pair: (pair[0], pair[1]))
+        elapsed = time.perf_counter() - t0
+        get_perf_monitor().record('conflicts.analyze', elapsed)
+        logger.info("[Conflicts] %s conflict(s) among %s marker(s), %s exact test(s) (%.1f ms)",
+                    len(pairs), len(markers), candidates, elapsed * 1000.0)
+        return [conflict for _, _, conflict in pairs]
+
+    def check_marker(self, marker, spatial_index):
+        """Conflicts of one (new) marker with the indexed markers
+
+        Updates ``conflicts`` of the marker and of the markers it conflicts
+        with (if they were analyzed before).
+
+        Args:
+            marker: The marker to check (may be in the index itself)
+            spatial_index: core.spatial_index.FibMarkerSpatialIndex
+
+        Returns:
+            list: MarkerConflict seen from `marker`, nearest first
+        """
+        t0 = time.perf_counter()
+        spacing = self.min_spacing
+        conflicts = []
+        box = get_bounding_box(get_marker_points(marker))
+        if box is not None:
+            segments = get_marker_segments(marker)
+            for other in spatial_index.window(box[0] - spacing, box[1] - spacing,
+                                              box[2] + spacing, box[3] + spacing):
+                if other is marker:
+                    continue
+                d, x, y = _closest_approach(segments, get_marker_segments(other), spacing)
+                if d < spacing:
+                    conflict = MarkerConflict(marker.id, other.id, d, x, y)
+                    conflicts.append(conflict)
+                    others = getattr(other, 'conflicts', None)
+                    if others is not None:
+                        others.append(conflict.reversed())
+        conflicts.sort(key=lambda conflict: conflict.distance)
+        marker.conflicts = conflicts
+        get_perf_monitor().record('conflicts.check_marker', time.perf_counter() - t0)
+        return conflicts
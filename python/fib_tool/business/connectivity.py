@@ -0,0 +1,301 @@
+"""Net lookup for CONNECT marker endpoints
+
+FibConnectivityService tells which nets the two endpoints of a CONNECT
+marker sit on and whether these nets are already connected. Nets are
+extracted with pya.LayoutToNetlist from the conductor stack in
+CONNECTIVITY_CONFIG:
+
+    'conductors': ['M1:31/0', '32/0']            conducting layers
+    'vias':       [('31/0', '51/0', '32/0')]     lower, via, upper
+    'labels':     {'31/0': '31/10'}              text layer naming a conductor's nets
+
+The endpoint layers (layer1 / layer2 / point_layers) are always added as
+conductors; texts on a conductor layer itself name its nets, others get
+"$<n>" names. With an empty stack each endpoint layer is its own
+conductor, which still tells whether both ends sit on one shape.
+
+Extraction is limited to a window around the marker: the shapes touching
+it are read hierarchically into flat Regions and extracted there (the
+extractor does not accept clipped hierarchical input). Extracted windows
+are cached (least recently used, CONNECTIVITY_CONFIG['cache_size']) and
+reused by every later marker whose endpoints lie inside one with a
+margin, so tracing many CONNECT markers in one area extracts once. Nets
+joined only outside the window are reported as separate nets.
+
+    service = FibConnectivityService()
+    trace = service.trace_marker(marker, layout, cell)
+    print(marker.nets, marker.connected)
+
+A traced marker gets ``nets`` (net name per endpoint, None if the end is
+not on a conductor) and ``connected`` (True / False, None if unknown).
+"""
+
+import time
+from collections import OrderedDict
+
+from ..config import CONNECTIVITY_CONFIG
+from ..core.geometry_utils import get_bounding_box, get_marker_points
+from ..core.log_utils import get_logger
+from ..core.perf_monitor import timed
+from .rule_checker import parse_layer_spec
+
+logger = get_logger('connectivity')
+
+
+class NetTrace:
+    """Nets at the two endpoints of a CONNECT marker"""
+
+    __slots__ = ('marker_id', 'nets', 'connected', 'layers', 'x', 'y')
+
+    def __init__(self, marker_id, nets, connected, layers, x, y):
+        self.marker_id = marker_id
+        self.nets = nets            # (start net, end net), None where not on a conductor
+        self.connected = connected  # True / False, None if an end has no net
+        self.layers = layers        # (start layer, end layer) strings
+        self.x = x                  # Start point in microns
+        self.y = y
+
+    @property
+    def message(self):
+        start, end = (net if net is not None else 'no net' for net in self.nets)
+        if self.connected:
+            return f"Already connected ({start})"
+        return f"{start} -> {end}"
+
+    @property
+    def layer(self):
+        return " / ".join(layer or 'N/A' for layer in self.layers)
+
+    def __repr__(self):
+        return f"NetTrace({self.marker_id}, {self.nets}, connected={self.connected})"
+
+
+def _is_connect(marker):
+    return 'Connect' in marker.__class__.__name__
+
+
+def _endpoints(marker):
+    """((x, y, layer string), (x, y, layer string)) of a CONNECT marker"""
+    points = get_marker_points(marker)
+    if hasattr(marker, 'points'):
+        layers = list(getattr(marker, 'point_layers', None) or [])
+        first, last = (layers[0], layers[-1]) if layers else (None, None)
+    else:
+        first, last = getattr(marker, 'layer1', None), getattr(marker, 'layer2', None)
+    return (points[0][0], points[0][1], first), (points[-1][0], points[-1][1], last)
+
+
+class _NetWindow:
+    """Nets extracted from one window of the layout"""
+
+    def __init__(self, box, l2n, regions):
+        self.box = box          # pya.Box in DBU
+        self.l2n = l2n
+        self.regions = regions  # (layer, datatype) -> registered Region
+
+    def net_at(self, spec, x, y):
+        """Net on a conductor at (x, y) microns, or None"""
+        import pya
+        region = self.regions.get(spec)
+        if region is None:
+            return None
+        return self.l2n.probe_net(region, pya.DPoint(x, y))
+
+
+class FibConnectivityService:
+    """Cached windowed net extraction for CONNECT endpoints
+
+    Args:
+        window (float): Side of an extracted window in microns
+        margin (float): Minimum distance of the endpoints from a window edge
+        cache_size (int): Extracted windows kept
+        conductors, vias, labels: Conductor stack (default CONNECTIVITY_CONFIG)
+
+    Example:
+        >>> service = FibConnectivityService()
+        >>> traces = service.trace_markers(markers, layout, cell)
+        >>> print(service.extractions, "windows extracted")
+    """
+
+    def __init__(self, window=None, margin=None, cache_size=None, conductors=None, vias=None, labels=None):
+        config = CONNECTIVITY_CONFIG
+        self.window = window or config['window']
+        self.margin = config['margin'] if margin is None else margin
+        self.cache_size = cache_size or config['cache_size']
+        self.conductors = config['conductors'] if conductors is None else conductors
+        self.vias = config['vias'] if vias is None else vias
+        self.labels = config['labels'] if labels is None else labels
+        self.extractions = 0
+        self.hits = 0
+        self._cache = OrderedDict()  # key -> _NetWindow (least recently used first)
+
+    def invalidate(self):
+        """Drop all extracted windows (layout may have changed)"""
+        self._cache.clear()
+
+    # ------------------------------------------------------------------
+    # Tracing
+    # ------------------------------------------------------------------
+
+    def trace_markers(self, markers, layout, cell):
+        """Trace all CONNECT markers (others are skipped)
+
+        Returns:
+            list: NetTrace per CONNECT marker, in marker order
+        """
+        t0 = time.perf_counter()
+        connects = [marker for marker in markers if _is_connect(marker)]
+        extra = set()
+        for marker in connects:
+            for _, _, layer in _endpoints(marker):
+                spec = parse_layer_spec(layer)
+                if spec is not None:
+                    extra.add(spec)
+        # One stack for the whole batch so all markers share the cached windows
+        stack = self._stack(extra)
+        traces = [self.trace_marker(marker, layout, cell, stack) for marker in connects]
+        logger.info("[Connectivity] Traced %s CONNECT marker(s), %s window(s) extracted, %s reused (%.1f s)",
+                    len(traces), self.extractions, self.hits, time.perf_counter() - t0)
+        return traces
+
+    @timed('connectivity.trace')
+    def trace_marker(self, marker, layout, cell, stack=None):
+        """Nets at the endpoints of one CONNECT marker (stored on the marker)
+
+        Returns:
+            NetTrace, or None for other marker types
+        """
+        if not _is_connect(marker):
+            return None
+        start, end = _endpoints(marker)
+        specs = (parse_layer_spec(start[2]), parse_layer_spec(end[2]))
+        if stack is None:
+            stack = self._stack(spec for spec in specs if spec is not None)
+
+        nets = [None, None]
+        connected = None
+        if any(spec is not None for spec in specs):
+            box = get_bounding_box(get_marker_points(marker))
+            window = self._window(layout, cell, stack, box)
+            found = [window.net_at(spec, x, y) if spec is not None else None
+                     for spec, (x, y, _) in zip(specs, (start, end))]
+            nets = [self._net_name(net) for net in found]
+            if found[0] is not None and found[1] is not None:
+                connected = found[0].circuit().name == found[1].circuit().name and \
+                    found[0].cluster_id == found[1].cluster_id
+
+        marker.nets = tuple(nets)
+        marker.connected = connected
+        return NetTrace(marker.id, marker.nets, connected, (start[2], end[2]), start[0], start[1])
+
+    @staticmethod
+    def _net_name(net):
+        if net is None:
+            return None
+        return net.expanded_name()
+
+    # ------------------------------------------------------------------
+    # Windows
+    # ------------------------------------------------------------------
+
+    def _stack(self, extra_specs=()):
+        """(conductors, vias, labels) as sorted (layer, datatype) tuples"""
+        conductors = set(spec for spec in (parse_layer_spec(text) for text in self.conductors) if spec)
+        conductors.update(extra_specs)
+        vias = []
+        for lower, via, upper in self.vias:
+            specs = (parse_layer_spec(lower), parse_layer_spec(via), parse_layer_spec(upper))
+            if all(specs):
+                vias.append(specs)
+        labels = []
+        for conductor, text_layer in self.labels.items():
+            specs = (parse_layer_spec(conductor), parse_layer_spec(text_layer))
+            if all(specs):
+                labels.append(specs)
+        return tuple(sorted(conductors)), tuple(sorted(vias)), tuple(sorted(labels))
+
+    def _window(self, layout, cell, stack, bbox):
+        """Cached window holding a marker's bounding box (micron tuple), or a new one"""
+        dbu = layout.dbu
+        margin = int(round(self.margin / dbu))
+        x1, y1, x2, y2 = (int(round(value / dbu)) for value in bbox)
+        key_prefix = (id(layout), cell.cell_index(), dbu, stack)
+        for key, window in self._cache.items():
+            if key[:4] != key_prefix:
+                continue
+            box = window.box
+            if box.left <= x1 - margin and box.bottom <= y1 - margin and \
+                    box.right >= x2 + margin and box.top >= y2 + margin:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return window
+
+        import pya
+        # Centered on the marker so neighbours up to half a window away reuse it
+        half = int(round(self.window / dbu / 2.0))
+        cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
+        half_w = max(half, (x2 - x1) // 2 + margin)
+        half_h = max(half, (y2 - y1) // 2 + margin)
+        box = pya.Box(cx - half_w, cy - half_h, cx + half_w, cy + half_h)
+        window = self._extract(layout, cell, stack, box)
+        self._cache[key_prefix + ((box.left, box.bottom, box.right, box.top),)] = window
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return window
+
+    @timed('connectivity.extract')
+    def _extract(self, layout, cell, stack, box):
+        """Extract the nets of the stack's shapes touching `box`"""
+        import pya
+        conductors, vias, labels = stack
+        l2n = pya.LayoutToNetlist(cell.name, layout.dbu)
+        regions = {}
+
+        def region_of(spec):
+            if spec not in regions:
+                layer_index = layout.find_layer(spec[0], spec[1])
+                if layer_index is None:
+                    regions[spec] = None
+                else:
+                    region = pya.Region(cell.begin_shapes_rec_touching(layer_index, box))
+                    l2n.register(region, f"L{spec[0]}_{spec[1]}")
+                    regions[spec] = region
+            return regions[spec]
+
+        def texts_of(spec, name):
+            layer_index = layout.find_layer(spec[0], spec[1])
+            if layer_index is None:
+                return None
+            texts = pya.Texts(cell.begin_shapes_rec_touching(layer_index, box))
+            if texts.is_empty():
+                return None
+            l2n.register(texts, name)
+            return texts
+
+        for spec in conductors:
+            region = region_of(spec)
+            if region is None:
+                continue
+            l2n.connect(region)
+            # Texts on the conductor layer itself name its nets
+            texts = texts_of(spec, f"T{spec[0]}_{spec[1]}")
+            if texts is not None:
+                l2n.connect(region, texts)
+        for lower, via, upper in vias:
+            regions_ = [region_of(spec) for spec in (lower, via, upper)]
+            if any(region is None for region in regions_):
+                continue
+            l2n.connect(regions_[1])
+            l2n.connect(regions_[0], regions_[1])
+            l2n.connect(regions_[1], regions_[2])
+        for conductor, text_layer in labels:
+            region = region_of(conductor)
+            texts = texts_of(text_layer, f"T{text_layer[0]}_{text_layer[1]}_for_{conductor[0]}_{conductor[1]}")
+            if region is not None and texts is not None:
+                l2n.connect(region, texts)
+
+        l2n.extract_netlist()
+        self.extractions += 1
+        logger.debug("[Connectivity] Extracted window %s (%s conductor(s), %s via layer(s))",
+                     box, len(conductors), len(vias))
+        return _NetWindow(box, l2n, {spec: region for spec, region in regions.items() if region is not None})
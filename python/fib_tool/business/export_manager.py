@@ -17,13 +17,14 @@ class FibExportManager:
     """
 
     @staticmethod
-    def export_to_html(markers, screenshots_dict, output_path):
+    def export_to_html(markers, screenshots_dict, output_path, logger=None):
         """Export markers to HTML report with screenshots
 
         Args:
             markers (list): List of marker objects
             screenshots_dict (dict): Dictionary of screenshots indexed by marker ID
             output_path (str): Output HTML file path
+            logger (FibExportLogger): Optional shared export logger
 
         Returns:
             bool: True if exported successfully, False otherwise
@@ -34,7 +35,8 @@ class FibExportManager:
             result = generate_html_report_with_screenshots(
                 markers,
                 screenshots_dict,
-                output_path
+                output_path,
+                logger=logger
             )
             return result
 
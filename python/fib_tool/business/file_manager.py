@@ -2,11 +2,59 @@
 
 This module handles all file operations including JSON export/import
 and CSV export for markers.
+
+JSON version 1.2 stores each marker coordinate twice: in microns under the
+keys older releases read (x1, y1, ..., x, y, points) and as integers in the
+unit given by the top-level 'dbu' (CANONICAL_DBU) under ix1, iy1, ..., ix,
+iy, ipoints. The top-level 'layout_dbu' records the database unit of the
+layout the project was saved from. Version 1.1 files hold the integers under
+the plain keys; version 1.0 files hold float microns only. Both are migrated
+to canonical units when they are loaded and written as 1.2 on the next save.
 """
 
 import json
 import os
 
+from ..config import CANONICAL_DBU
+from ..core.geometry_utils import check_coordinate_grid, from_canonical, get_marker_db_points, to_canonical
+from ..core.perf_monitor import timed
+
+JSON_VERSION = '1.2'
+
+# Coordinate keys of two-point / probe marker entries
+_COORDINATE_KEYS = ('x1', 'y1', 'x2', 'y2', 'x', 'y')
+
+
+def _to_canonical(value, dbu):
+    """Canonical units of a file coordinate (dbu None = microns)"""
+    if dbu == CANONICAL_DBU:
+        return int(value)
+    return to_canonical(value * (1.0 if dbu is None else dbu))
+
+
+def _migrate_marker_data(marker_data, dbu):
+    """Convert one marker entry to canonical integer coordinates in place
+
+    The integer keys (ix1, ..., ipoints) win over the micron keys and are
+    removed; afterwards the plain keys hold canonical integers.
+
+    Args:
+        marker_data (dict): Marker entry of a project file
+        dbu (float): Unit of the file's integer coordinates, None for float microns (1.0)
+    """
+    for key in _COORDINATE_KEYS:
+        integer = marker_data.pop('i' + key, None)
+        if integer is not None:
+            marker_data[key] = _to_canonical(integer, dbu)
+        elif marker_data.get(key) is not None:
+            # Version 1.1 integers or version 1.0 microns
+            marker_data[key] = _to_canonical(marker_data[key], dbu)
+    points = marker_data.pop('ipoints', None)
+    if points is None:
+        points = marker_data.get('points')
+    if points is not None:
+        marker_data['points'] = [(_to_canonical(x, dbu), _to_canonical(y, dbu)) for x, y in points]
+
 
 class FibFileManager:
     """Manages file I/O operations for markers
@@ -18,7 +66,8 @@ class FibFileManager:
     """
 
     @staticmethod
-    def save_markers_to_json(markers, filename, marker_notes_dict=None, marker_counters=None):
+    @timed('project.save')
+    def save_markers_to_json(markers, filename, marker_notes_dict=None, marker_counters=None, layout_dbu=None):
         """Save markers to JSON file
 
         Args:
@@ -26,6 +75,7 @@ class FibFileManager:
             filename (str): Output JSON filepath
             marker_notes_dict (dict): Optional notes dictionary
             marker_counters (dict): Optional marker counters
+            layout_dbu (float): Database unit of the markers' layout (recorded if given)
 
         Returns:
             bool: True if saved successfully, False otherwise
@@ -42,6 +92,7 @@ class FibFileManager:
             markers_data = []
             for marker in markers:
                 marker_class_name = marker.__class__.__name__
+                db_points = get_marker_db_points(marker)  # Canonical integer units
 
                 # Handle multi-point markers
                 if 'MultiPoint' in marker_class_name:
@@ -55,10 +106,11 @@ class FibFileManager:
                     marker_dict = {
                         'id': marker.id,
                         'type': marker_type,
-                        'points': marker.points if hasattr(marker, 'points') else [],
+                        'points': [[from_canonical(x), from_canonical(y)] for x, y in db_points],
+                        'ipoints': [list(point) for point in db_points],
                         'notes': getattr(marker, 'notes', ''),
-                        'screenshots': getattr(marker, 'screenshots', []),
-                        'target_layers': getattr(marker, 'target_layers', []),
+                        'screenshots': list(getattr(marker, 'screenshots', ())),
+                        'target_layers': list(getattr(marker, 'target_layers', ())),
                         'point_layers': getattr(marker, 'point_layers', [])
                     }
                 else:
@@ -67,33 +119,37 @@ class FibFileManager:
                         'id': marker.id,
                         'type': marker_class_name.replace('Marker', '').lower(),
                         'notes': getattr(marker, 'notes', ''),
-                        'screenshots': getattr(marker, 'screenshots', []),
-                        'target_layers': getattr(marker, 'target_layers', [])
+                        'screenshots': list(getattr(marker, 'screenshots', ())),
+                        'target_layers': list(getattr(marker, 'target_layers', ()))
                     }
 
                     # Add coordinates based on marker type
                     if hasattr(marker, 'x1'):  # CUT or CONNECT
-                        marker_dict['x1'] = marker.x1
-                        marker_dict['y1'] = marker.y1
-                        marker_dict['x2'] = marker.x2
-                        marker_dict['y2'] = marker.y2
+                        (marker_dict['ix1'], marker_dict['iy1']), (marker_dict['ix2'], marker_dict['iy2']) = db_points
                         marker_dict['layer1'] = getattr(marker, 'layer1', None)
                         marker_dict['layer2'] = getattr(marker, 'layer2', None)
                     else:  # PROBE
-                        marker_dict['x'] = marker.x
-                        marker_dict['y'] = marker.y
+                        marker_dict['ix'], marker_dict['iy'] = db_points[0]
                         marker_dict['target_layer'] = getattr(marker, 'target_layer', None)
+                    # Microns for older releases, which read only these keys
+                    for key in _COORDINATE_KEYS:
+                        if 'i' + key in marker_dict:
+                            marker_dict[key] = from_canonical(marker_dict['i' + key])
 
                 markers_data.append(marker_dict)
 
             # Save to file
+            project = {
+                'version': JSON_VERSION,
+                'dbu': CANONICAL_DBU,
+                'markers': markers_data,
+                'marker_notes_dict': marker_notes_dict or {},
+                'marker_counters': marker_counters or {'cut': 0, 'connect': 0, 'probe': 0}
+            }
+            if layout_dbu is not None:
+                project['layout_dbu'] = layout_dbu
             with open(filename, 'w') as f:
-                json.dump({
-                    'version': '1.0',
-                    'markers': markers_data,
-                    'marker_notes_dict': marker_notes_dict or {},
-                    'marker_counters': marker_counters or {'cut': 0, 'connect': 0, 'probe': 0}
-                }, f, indent=2)
+                json.dump(project, f, indent=2)
 
             print(f"[File Manager] Saved {len(markers_data)} markers to {filename}")
             return True
@@ -105,11 +161,17 @@ class FibFileManager:
             return False
 
     @staticmethod
-    def load_markers_from_json(filename):
+    @timed('project.read')
+    def load_markers_from_json(filename, layout_dbu=None):
         """Load markers from JSON file
 
         Args:
             filename (str): JSON filepath to load
+            layout_dbu (float): Database unit of the target layout; files whose
+                integer grid is coarser are refused (see check_coordinate_grid)
+
+        Older files are migrated: coordinates in the returned dictionaries are
+        always canonical integer units (see marker_from_dict).
 
         Returns:
             tuple: (markers_list, marker_notes_dict, marker_counters) or (None, None, None) if failed
@@ -143,6 +205,17 @@ class FibFileManager:
             marker_notes_dict = data.get('marker_notes_dict', {})
             marker_counters = data.get('marker_counters', {'cut': 0, 'connect': 0, 'probe': 0})
 
+            version = data.get('version', '1.0')
+            dbu = None if version == '1.0' else data.get('dbu', 0.001)
+            grid_error = check_coordinate_grid(dbu, layout_dbu)
+            if grid_error:
+                print(f"[File Manager] Cannot load {filename}: {grid_error}")
+                return (None, None, None)
+            for marker_data in markers_data:
+                _migrate_marker_data(marker_data, dbu)
+            if dbu != CANONICAL_DBU:
+                print(f"[File Manager] Migrated version {version} coordinates to {CANONICAL_DBU} um units")
+
             print(f"[File Manager] Loaded {len(markers_data)} markers from {filename}")
             return (markers_data, marker_notes_dict, marker_counters)
 
@@ -152,6 +225,67 @@ class FibFileManager:
             traceback.print_exc()
             return (None, None, None)
 
+    @staticmethod
+    def marker_from_dict(marker_data, marker_notes_dict=None):
+        """Build a marker object from one entry of a JSON project file
+
+        Args:
+            marker_data (dict): Marker dictionary as returned by load_markers_from_json
+                (coordinates in canonical integer units)
+            marker_notes_dict (dict): Optional centralized notes (take precedence)
+
+        Returns:
+            Marker object, or None if the marker type is unknown/unavailable
+        """
+        from ..config import LAYERS, DEFAULT_MARKER_NOTES
+        from ..markers import CutMarker, ConnectMarker, ProbeMarker
+
+        marker_type = marker_data['type']
+        marker_id = marker_data['id']
+
+        if marker_type in ('multipoint_cut', 'multipoint_connect'):
+            try:
+                from ..multipoint_markers import MultiPointCutMarker, MultiPointConnectMarker
+            except ImportError:
+                print(f"[File Manager] Multi-point markers not available, skipping {marker_id}")
+                return None
+            points = marker_data.get('points', [])
+            if marker_type == 'multipoint_cut':
+                marker = MultiPointCutMarker.from_canonical(marker_id, points, LAYERS['cut'])
+            else:
+                marker = MultiPointConnectMarker.from_canonical(marker_id, points, LAYERS['connect'])
+            marker.point_layers = marker_data.get('point_layers', [])
+        elif marker_type == 'cut':
+            marker = CutMarker.from_canonical(marker_id, marker_data['x1'], marker_data['y1'],
+                                              marker_data['x2'], marker_data['y2'], 6)
+        elif marker_type == 'connect':
+            marker = ConnectMarker.from_canonical(marker_id, marker_data['x1'], marker_data['y1'],
+                                                  marker_data['x2'], marker_data['y2'], 6)
+        elif marker_type == 'probe':
+            marker = ProbeMarker.from_canonical(marker_id, marker_data['x'], marker_data['y'], 6)
+        else:
+            print(f"[File Manager] Unknown marker type: {marker_type}")
+            return None
+
+        # Notes: centralized dict first, then marker data, then type default
+        if marker_notes_dict and marker_id in marker_notes_dict:
+            marker.notes = marker_notes_dict[marker_id]
+        else:
+            base_type = marker_type.replace('multipoint_', '')
+            marker.notes = marker_data.get('notes', '') or DEFAULT_MARKER_NOTES.get(base_type, '')
+
+        marker.screenshots = marker_data.get('screenshots') or ()
+        marker.target_layers = marker_data.get('target_layers') or ()
+
+        # Restore layer information
+        if marker_type in ('cut', 'connect'):
+            marker.layer1 = marker_data.get('layer1', None)
+            marker.layer2 = marker_data.get('layer2', None)
+        elif marker_type == 'probe':
+            marker.target_layer = marker_data.get('target_layer', None)
+
+        return marker
+
     @staticmethod
     def export_markers_to_csv(markers, filename):
         """Export markers to CSV file
@@ -206,11 +340,13 @@ class FibFileManager:
             return False
 
     @staticmethod
-    def validate_json_file(filename):
+    def validate_json_file(filename, layout_dbu=None):
         """Validate JSON file format
 
         Args:
             filename (str): JSON filepath to validate
+            layout_dbu (float): Database unit of the target layout (also
+                checks the file's coordinate grid, see check_coordinate_grid)
 
         Returns:
             tuple: (is_valid, error_message)
@@ -228,6 +364,11 @@ class FibFileManager:
             if not isinstance(data['markers'], list):
                 return (False, "'markers' field must be a list")
 
+            if data.get('version', '1.0') != '1.0':
+                grid_error = check_coordinate_grid(data.get('dbu', 0.001), layout_dbu)
+                if grid_error:
+                    return (False, grid_error)
+
             return (True, None)
 
         except json.JSONDecodeError as e:
@@ -0,0 +1,388 @@
+"""Screenshot post-processing for FIB Tool
+
+This module generates report thumbnails for exported screenshots and can
+re-encode the full images (optimized PNG, WebP or JPEG). Work runs in a
+thread pool while the next markers are still being captured.
+
+Pillow is optional. Without it a small pure-Python PNG codec is used:
+thumbnails are nearest-neighbour downscaled PNGs and re-encoding is limited
+to lossless PNG recompression.
+"""
+
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config import IMAGE_PROCESSING
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = None
+    PIL_AVAILABLE = False
+
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+PIL_FORMATS = {
+    'png': ('PNG', '.png'),
+    'jpeg': ('JPEG', '.jpg'),
+    'webp': ('WEBP', '.webp'),
+}
+
+
+# =============================================================================
+# Pure-Python PNG codec (8-bit RGB/RGBA, non-interlaced - what save_image writes)
+# =============================================================================
+
+def _swar_add(a, b, mask7, mask8):
+    """Byte-wise (a + b) mod 256 on packed big integers, without carries between bytes"""
+    return ((a & mask7) + (b & mask7)) ^ ((a ^ b) & mask8)
+
+
+def _unfilter_rows(data, width, height, bpp):
+    """Undo PNG scanline filters and return a list of raw rows"""
+    stride = width * bpp
+    rows = []
+    prev = bytes(stride)
+
+    nbits = stride * 8
+    row_mask = (1 << nbits) - 1
+    mask7 = int.from_bytes(b'\x7f' * stride, 'little')
+    mask8 = int.from_bytes(b'\x80' * stride, 'little')
+
+    pos = 0
+    for _ in range(height):
+        ftype = data[pos]
+        raw = data[pos + 1:pos + 1 + stride]
+        pos += 1 + stride
+
+        if ftype == 0:
+            cur = bytes(raw)
+        elif ftype == 1:
+            # Sub: prefix sum with stride bpp (log-step scan on packed integers)
+            acc = int.from_bytes(raw, 'little')
+            shift = bpp * 8
+            while shift < nbits:
+                acc = _swar_add(acc, (acc << shift) & row_mask, mask7, mask8)
+                shift <<= 1
+            cur = acc.to_bytes(stride, 'little')
+        elif ftype == 2:
+            # Up
+            acc = _swar_add(int.from_bytes(raw, 'little'), int.from_bytes(prev, 'little'), mask7, mask8)
+            cur = acc.to_bytes(stride, 'little')
+        elif ftype == 3:
+            # Average
+            out = bytearray(raw)
+            for i in range(stride):
+                left = out[i - bpp] if i >= bpp else 0
+                out[i] = (out[i] + ((left + prev[i]) >> 1)) & 0xFF
+            cur = bytes(out)
+        elif ftype == 4:
+            # Paeth
+            out = bytearray(raw)
+            for i in range(stride):
+                if i >= bpp:
+                    a = out[i - bpp]
+                    c = prev[i - bpp]
+                else:
+                    a = c = 0
+                b = prev[i]
+                p = a + b - c
+                pa = abs(p - a)
+                pb = abs(p - b)
+                pc = abs(p - c)
+                if pa <= pb and pa <= pc:
+                    pred = a
+                elif pb <= pc:
+                    pred = b
+                else:
+                    pred = c
+                out[i] = (out[i] + pred) & 0xFF
+            cur = bytes(out)
+        else:
+            raise ValueError(f"Unknown PNG filter type {ftype}")
+
+        rows.append(cur)
+        prev = cur
+
+    return rows
+
+
+def read_png(path):
+    """Decode an 8-bit RGB/RGBA PNG
+
+    Returns:
+        tuple: (width, height, bytes_per_pixel, rows)
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError(f"Not a PNG file: {path}")
+
+    pos = len(PNG_SIGNATURE)
+    idat = []
+    width = height = bpp = None
+
+    while pos < len(data):
+        length, ctype = struct.unpack('>I4s', data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+
+        if ctype == b'IHDR':
+            width, height, depth, color, _, _, interlace = struct.unpack('>IIBBBBB', chunk)
+            if depth != 8 or color not in (2, 6) or interlace != 0:
+                raise ValueError(f"Unsupported PNG format (depth={depth}, color={color}, interlace={interlace})")
+            bpp = 3 if color == 2 else 4
+        elif ctype == b'IDAT':
+            idat.append(chunk)
+        elif ctype == b'IEND':
+            break
+
+    if width is None:
+        raise ValueError(f"PNG without IHDR: {path}")
+
+    rows = _unfilter_rows(zlib.decompress(b''.join(idat)), width, height, bpp)
+    return width, height, bpp, rows
+
+
+def write_png(path, width, height, bpp, rows, level=9):
+    """Encode rows as an 8-bit RGB/RGBA PNG (filter type 0, max zlib compression)"""
+    def chunk(ctype, payload):
+        return (struct.pack('>I', len(payload)) + ctype + payload +
+                struct.pack('>I', zlib.crc32(ctype + payload) & 0xFFFFFFFF))
+
+    color = 2 if bpp == 3 else 6
+    header = struct.pack('>IIBBBBB', width, height, 8, color, 0, 0, 0)
+    raw = b''.join(b'\x00' + row for row in rows)
+
+    with open(path, 'wb') as f:
+        f.write(PNG_SIGNATURE)
+        f.write(chunk(b'IHDR', header))
+        f.write(chunk(b'IDAT', zlib.compress(raw, level)))
+        f.write(chunk(b'IEND', b''))
+
+
+def downscale_rows(width, height, bpp, rows, max_size):
+    """Nearest-neighbour downscale by an integer factor so the image fits max_size
+
+    Returns:
+        tuple: (width, height, rows)
+    """
+    max_w, max_h = max_size
+    factor = max(1, -(-width // max_w), -(-height // max_h))
+    if factor == 1:
+        return width, height, rows
+
+    new_w = width // factor
+    new_h = height // factor
+    step = factor * bpp
+    used = new_w * step
+
+    new_rows = []
+    for y in range(new_h):
+        row = rows[y * factor][:used]
+        out = bytearray(new_w * bpp)
+        for channel in range(bpp):
+            out[channel::bpp] = row[channel::step]
+        new_rows.append(bytes(out))
+
+    return new_w, new_h, new_rows
+
+
+# =============================================================================
+# Per-image processing
+# =============================================================================
+
+def _make_thumbnail(src_path, thumb_base, cfg):
+    """Create a thumbnail next to thumb_base (extension added). Returns (path, (w, h))"""
+    max_size = tuple(cfg['thumbnail_size'])
+
+    if PIL_AVAILABLE:
+        fmt, ext = PIL_FORMATS.get(cfg['thumbnail_format'], PIL_FORMATS['png'])
+        thumb_path = thumb_base + ext
+        with Image.open(src_path) as img:
+            img = img.convert('RGB')
+            resample = getattr(Image, 'Resampling', Image).LANCZOS
+            img.thumbnail(max_size, resample)
+            size = img.size
+            if fmt == 'PNG':
+                # Layout screenshots have few colors - an adaptive palette is lossless in practice
+                img.quantize(colors=256).save(thumb_path, fmt, optimize=True)
+            else:
+                img.save(thumb_path, fmt, quality=cfg['quality'], optimize=True)
+        return thumb_path, size
+
+    # Pure-Python fallback: PNG only
+    thumb_path = thumb_base + '.png'
+    width, height, bpp, rows = read_png(src_path)
+    width, height, rows = downscale_rows(width, height, bpp, rows, max_size)
+    write_png(thumb_path, width, height, bpp, rows)
+    return thumb_path, (width, height)
+
+
+def _reencode(src_path, cfg):
+    """Re-encode the full image. Returns the new path (may equal src_path)"""
+    target = cfg['reencode_format']
+    base = os.path.splitext(src_path)[0]
+
+    if PIL_AVAILABLE:
+        fmt, ext = PIL_FORMATS.get(target, PIL_FORMATS['png'])
+        out_path = base + ext
+        tmp_path = out_path + '.tmp'
+        with Image.open(src_path) as img:
+            if fmt == 'PNG':
+                img.save(tmp_path, fmt, optimize=True)
+            else:
+                img.convert('RGB').save(tmp_path, fmt, quality=cfg['quality'], optimize=True)
+    else:
+        if target != 'png':
+            # WebP/JPEG need Pillow - keep the PNG as-is
+            return src_path
+        out_path = src_path
+        tmp_path = out_path + '.tmp'
+        width, height, bpp, rows = read_png(src_path)
+        write_png(tmp_path, width, height, bpp, rows)
+
+    # Only keep the re-encoded file if it is actually smaller
+    if os.path.getsize(tmp_path) >= os.path.getsize(src_path):
+        os.remove(tmp_path)
+        return src_path
+
+    os.replace(tmp_path, out_path)
+    if out_path != src_path and not cfg['keep_original']:
+        os.remove(src_path)
+    return out_path
+
+
+def process_image(filepath, thumbs_dir, cfg=None):
+    """Generate thumbnail and optionally re-encode one screenshot
+
+    Args:
+        filepath (str): Full-size screenshot path
+        thumbs_dir (str): Directory for thumbnails
+        cfg (dict): Processing config (default IMAGE_PROCESSING)
+
+    Returns:
+        tuple: (new_filepath, meta) - meta holds sizes and the thumbnail filename
+    """
+    cfg = cfg or IMAGE_PROCESSING
+    meta = {'original_bytes': os.path.getsize(filepath)}
+
+    if cfg.get('reencode_format'):
+        try:
+            filepath = _reencode(filepath, cfg)
+        except Exception as e:
+            meta['error'] = f"re-encode failed: {e}"
+
+    meta['format'] = os.path.splitext(filepath)[1].lstrip('.').lower()
+    meta['bytes'] = os.path.getsize(filepath)
+
+    try:
+        thumb_base = os.path.join(thumbs_dir, os.path.splitext(os.path.basename(filepath))[0] + '_thumb')
+        thumb_path, thumb_size = _make_thumbnail(filepath, thumb_base, cfg)
+        meta['thumbnail'] = f"{os.path.basename(thumbs_dir)}/{os.path.basename(thumb_path)}"
+        meta['thumb_bytes'] = os.path.getsize(thumb_path)
+        meta['thumb_size'] = thumb_size
+    except Exception as e:
+        meta['error'] = f"thumbnail failed: {e}"
+
+    return filepath, meta
+
+
+# =============================================================================
+# Export stage
+# =============================================================================
+
+class FibImageProcessor:
+    """Thread-pooled post-processing stage for exported screenshots
+
+    Screenshot tuples (description, filename, filepath) are replaced in place
+    by (description, filename, filepath, meta) once processed. meta contains:
+    'bytes', 'original_bytes', 'format' and, if created, 'thumbnail',
+    'thumb_bytes', 'thumb_size'.
+
+    Example:
+        >>> processor = FibImageProcessor(images_dir, logger=log)
+        >>> processor.submit(screenshots)       # per marker, while exporting
+        >>> stats = processor.finish()          # wait and update tuples
+    """
+
+    def __init__(self, images_dir, config=None, logger=None):
+        self.cfg = dict(IMAGE_PROCESSING)
+        if config:
+            self.cfg.update(config)
+        self.logger = logger
+        self.thumbs_dir = os.path.join(images_dir, 'thumbs')
+        self._pending = []  # (screenshot list, index, future)
+        self._pool = None
+
+        if self.cfg['enabled']:
+            os.makedirs(self.thumbs_dir, exist_ok=True)
+            self._pool = ThreadPoolExecutor(max_workers=max(1, self.cfg['workers']))
+            self._log('debug', f"[Image Processor] Started ({'Pillow' if PIL_AVAILABLE else 'pure Python'}, "
+                               f"{self.cfg['workers']} workers)")
+
+    def submit(self, screenshots):
+        """Queue all screenshots of one marker for processing"""
+        if self._pool is None:
+            return
+        for index, shot in enumerate(screenshots):
+            future = self._pool.submit(process_image, shot[2], self.thumbs_dir, self.cfg)
+            self._pending.append((screenshots, index, future))
+
+    def process_all(self, screenshots_dict):
+        """Process a complete screenshots dict (marker id -> list) and wait"""
+        for screenshots in screenshots_dict.values():
+            self.submit(screenshots)
+        return self.finish()
+
+    def finish(self):
+        """Wait for all queued work and update the screenshot tuples
+
+        Returns:
+            dict: Totals - files, original_bytes, bytes, thumb_bytes, errors
+        """
+        stats = {'files': 0, 'original_bytes': 0, 'bytes': 0, 'thumb_bytes': 0, 'errors': 0}
+        if self._pool is None:
+            return stats
+
+        for screenshots, index, future in self._pending:
+            desc, filename, filepath = screenshots[index][:3]
+            try:
+                new_path, meta = future.result()
+            except Exception as e:
+                self._log('warning', f"[Image Processor] Failed to process {filename}: {e}")
+                stats['errors'] += 1
+                continue
+
+            if 'error' in meta:
+                self._log('warning', f"[Image Processor] {filename}: {meta['error']}")
+                stats['errors'] += 1
+
+            screenshots[index] = (desc, os.path.basename(new_path), new_path, meta)
+            stats['files'] += 1
+            stats['original_bytes'] += meta['original_bytes']
+            stats['bytes'] += meta['bytes']
+            stats['thumb_bytes'] += meta.get('thumb_bytes', 0)
+
+        self._pending = []
+        self._pool.shutdown(wait=True)
+        self._pool = None
+
+        self._log('info', f"[Image Processor] {stats['files']} images: "
+                          f"{stats['original_bytes'] / 1e6:.1f} MB -> {stats['bytes'] / 1e6:.1f} MB full, "
+                          f"{stats['thumb_bytes'] / 1e6:.1f} MB thumbnails")
+        return stats
+
+    def _log(self, level, message):
+        if self.logger is not None:
+            getattr(self.logger, level)(message)
+        else:
+            try:
+                print(message)
+            except Exception:
+                pass
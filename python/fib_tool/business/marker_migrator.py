@@ -0,0 +1,290 @@
+"""Marker migration between layout revisions
+
+In an ECO revision blocks move independently, so one transformation for
+all markers (business/bulk_transform.py) is not enough. FibMarkerMigrator
+moves each marker with the cell instance that contains it:
+
+    migrator = FibMarkerMigrator()
+    result = migrator.migrate(markers, old_layout, old_top, new_layout, new_top)
+    for item in result.unmapped:
+        print(item.marker_id, item.message)
+
+For each marker the deepest instance (up to MIGRATION_CONFIG['max_depth']
+levels below the top cell) whose box contains the whole marker is looked
+up in the old layout. The same instance path is looked up in the new
+layout and the marker is mapped through T_new * T_old^-1, where T is the
+instance's accumulated transformation into the top cell. Markers outside
+every instance stay where they are.
+
+An instance path is the list of (cell name, label) from the top cell down.
+The label is the instance's MIGRATION_CONFIG['name_property'] property if
+it has one, otherwise its position among the siblings of the same cell in
+the parent (array members add their a / b index). Unnamed siblings are
+only trusted when both layouts have the same number of them; markers in
+instances that are missing or ambiguous in the new layout are reported
+and not moved.
+
+Each layout's instance paths are indexed once (FibInstancePathIndex, a
+grid over the instance boxes plus a path dictionary) and cached until
+invalidate(), so migrating thousands of markers is one grid query and one
+dictionary lookup per marker.
+"""
+
+import time
+from collections import Counter
+
+from ..config import MIGRATION_CONFIG
+from ..core.geometry_utils import get_bounding_box, get_marker_points
+from ..core.log_utils import get_logger
+from ..core.perf_monitor import get_perf_monitor
+from ..core.spatial_index import UniformGridIndex
+from .bulk_transform import FibBulkTransformer
+
+logger = get_logger('marker_migrator')
+
+# Containment tolerance in microns (instance boxes are in layout dbu)
+_TOLERANCE = 1e-6
+
+
+def format_path(path):
+    """Readable instance path, e.g. 'CPU#0/ALU[2,0]#0'"""
+    parts = []
+    for segment in path:
+        name, label = segment[0], segment[1]
+        array = f"[{segment[2]},{segment[3]}]" if len(segment) > 2 else ""
+        parts.append(f"{name}{array}#{label}" if isinstance(label, int) else f"{name}{array}:{label}")
+    return "/".join(parts) or "(top)"
+
+
+class UnmappedMarker:
+    """A marker the migration could not map"""
+
+    __slots__ = ('marker_id', 'message', 'layer', 'x', 'y')
+
+    def __init__(self, marker_id, message, x, y):
+        self.marker_id = marker_id
+        self.message = message
+        self.layer = None  # Checks tab column
+        self.x = x         # Marker center in microns (old layout)
+        self.y = y
+
+    def __repr__(self):
+        return f"UnmappedMarker({self.marker_id}, {self.message!r})"
+
+
+class MigrationResult:
+    """Outcome of FibMarkerMigrator.migrate"""
+
+    __slots__ = ('moved', 'unchanged', 'top_level', 'unmapped', 'elapsed')
+
+    def __init__(self):
+        self.moved = 0        # Markers whose instance moved
+        self.unchanged = 0    # Markers whose instance kept its place
+        self.top_level = 0    # Markers outside every indexed instance (not moved)
+        self.unmapped = []    # UnmappedMarker per marker left in place
+        self.elapsed = 0.0    # Seconds (index build included)
+
+    def summary(self):
+        return (f"{self.moved} marker(s) moved, {self.unchanged} unchanged, {self.top_level} at top level, "
+                f"{len(self.unmapped)} not mapped ({self.elapsed * 1000.0:.0f} ms)")
+
+    def __repr__(self):
+        return f"MigrationResult({self.summary()})"
+
+
+class FibInstancePathIndex:
+    """Instance paths of a layout below a top cell, with their boxes and transformations
+
+    Args:
+        layout: pya.Layout
+        cell: Top pya.Cell
+        max_depth, name_property, max_array_members, cell_size:
+            Defaults from MIGRATION_CONFIG
+
+    Attributes:
+        paths: Instance path per entry (tuples of segments)
+        transs: pya.DCplxTrans per entry (instance cell -> top cell, microns)
+        counts: Unnamed sibling count per path segment (1 for named instances)
+        by_path: Path -> entry
+    """
+
+    def __init__(self, layout, cell, max_depth=None, name_property=None, max_array_members=None,
+                 cell_size=None):
+        import pya
+
+        self.max_depth = MIGRATION_CONFIG['max_depth'] if max_depth is None else max_depth
+        self.name_property = MIGRATION_CONFIG['name_property'] if name_property is None else name_property
+        self.max_array_members = max_array_members or MIGRATION_CONFIG['max_array_members']
+        self.paths, self.transs, self.counts = [], [], []
+        self.by_path = {}
+        self.grid = UniformGridIndex(cell_size or MIGRATION_CONFIG['cell_size'])
+        self._layout = layout
+        self._children = {}  # cell index -> [(segment, count, child cell index, DCplxTrans)]
+
+        t0 = time.perf_counter()
+        stack = [((), (), pya.DCplxTrans(), cell.cell_index(), 0)]
+        while stack:
+            path, counts, trans, cell_index, depth = stack.pop()
+            if depth >= self.max_depth:
+                continue
+            for segment, count, child_index, child_trans in self._child_instances(cell_index):
+                child_box = layout.cell(child_index).dbbox()
+                if child_box.empty():
+                    continue
+                total = trans * child_trans
+                box = child_box.transformed(total)
+                entry = len(self.paths)
+                entry_path = path + (segment,)
+                entry_counts = counts + (count,)
+                self.paths.append(entry_path)
+                self.transs.append(total)
+                self.counts.append(entry_counts)
+                self.by_path[entry_path] = entry
+                self.grid.insert(entry, (box.left, box.bottom, box.right, box.top))
+                stack.append((entry_path, entry_counts, total, child_index, depth + 1))
+        self._children = {}
+        get_perf_monitor().record('migration.index', time.perf_counter() - t0)
+        logger.debug("[Migration] Indexed %s instance(s) below %s (%.1f ms)",
+                     len(self.paths), cell.name, (time.perf_counter() - t0) * 1000.0)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def _child_instances(self, cell_index):
+        """Path segments of a cell's instances (array members expanded), cached per cell"""
+        children = self._children.get(cell_index)
+        if children is not None:
+            return children
+        import pya
+
+        layout = self._layout
+        instances = list(layout.cell(cell_index).each_inst())
+        siblings = Counter(inst.cell_index for inst in instances)
+        ordinals = Counter()
+        children = []
+        for inst in instances:
+            child_index = inst.cell_index
+            name = layout.cell(child_index).name
+            label = inst.property(self.name_property) if self.name_property is not None else None
+            if label is None:
+                label, count = ordinals[child_index], siblings[child_index]
+                ordinals[child_index] += 1
+            else:
+                count = 1
+            trans = inst.dcplx_trans
+            members = inst.na * inst.nb if inst.is_regular_array() else 1
+            if 1 < members <= self.max_array_members:
+                da, db = inst.da, inst.db
+                for a in range(inst.na):
+                    for b in range(inst.nb):
+                        children.append(((name, label, a, b), count, child_index,
+                                         pya.DCplxTrans(da * a + db * b) * trans))
+            else:
+                # Single instance, or an array indexed as a whole (its first member moves it)
+                children.append(((name, label), count, child_index, trans))
+        self._children[cell_index] = children
+        return children
+
+    def locate(self, box):
+        """Deepest entry whose instance box contains `box`, or None
+
+        Args:
+            box: (x1, y1, x2, y2) in microns
+        """
+        grid = self.grid
+        best, best_key = None, None
+        for entry in grid.query_window(*box):
+            ex1, ey1, ex2, ey2 = grid.box(entry)
+            if (ex1 - _TOLERANCE <= box[0] and ey1 - _TOLERANCE <= box[1] and
+                    box[2] <= ex2 + _TOLERANCE and box[3] <= ey2 + _TOLERANCE):
+                key = (len(self.paths[entry]), -(ex2 - ex1) * (ey2 - ey1), -entry)
+                if best_key is None or key > best_key:
+                    best, best_key = entry, key
+        return best
+
+
+class FibMarkerMigrator:
+    """Maps markers onto a new layout revision through their containing instances
+
+    Args:
+        max_depth (int): Indexed instance levels (default MIGRATION_CONFIG['max_depth'])
+        name_property: Instance property with the instance name (default
+            MIGRATION_CONFIG['name_property'])
+
+    Example:
+        >>> migrator = FibMarkerMigrator(max_depth=3)
+        >>> result = migrator.migrate(markers, old_layout, old_top, new_layout, new_top)
+        >>> result.summary()
+        '118 marker(s) moved, 40 unchanged, 2 at top level, 1 not mapped (35 ms)'
+    """
+
+    def __init__(self, max_depth=None, name_property=None):
+        self.max_depth = max_depth
+        self.name_property = name_property
+        self.transformer = FibBulkTransformer()
+        self._indexes = {}
+
+    def index(self, layout, cell):
+        """Cached FibInstancePathIndex of a layout below `cell`"""
+        key = (id(layout), cell.cell_index())
+        index = self._indexes.get(key)
+        if index is None:
+            index = FibInstancePathIndex(layout, cell, self.max_depth, self.name_property)
+            self._indexes[key] = index
+        return index
+
+    def invalidate(self):
+        """Drop the cached indexes (after the hierarchy of a layout changed)"""
+        self._indexes = {}
+
+    def migrate(self, markers, old_layout, old_cell, new_layout, new_cell):
+        """Move markers from the old layout revision onto the new one
+
+        Markers that cannot be mapped keep their coordinates and are listed
+        in the result. Mapped markers lose their check results (see
+        FibBulkTransformer.transform). The layouts are not changed.
+
+        Returns:
+            MigrationResult
+        """
+        t0 = time.perf_counter()
+        result = MigrationResult()
+        old = self.index(old_layout, old_cell)
+        new = self.index(new_layout, new_cell)
+
+        groups = {}  # (old entry, new entry) -> markers
+        for marker in markers:
+            box = get_bounding_box(get_marker_points(marker))
+            entry = old.locate(box) if box is not None else None
+            if entry is None:
+                result.top_level += 1
+                continue
+            path = old.paths[entry]
+            new_entry = new.by_path.get(path)
+            message = None
+            if new_entry is None:
+                message = f"Instance {format_path(path)} not in the new layout"
+            else:
+                for segment, old_count, new_count in zip(path, old.counts[entry], new.counts[new_entry]):
+                    if old_count != new_count:
+                        message = (f"Ambiguous instance {format_path(path)}: {old_count} -> "
+                                   f"{new_count} unnamed {segment[0]} instance(s)")
+                        break
+            if message is not None:
+                result.unmapped.append(UnmappedMarker(marker.id, message, (box[0] + box[2]) / 2.0,
+                                                      (box[1] + box[3]) / 2.0))
+                continue
+            groups.setdefault((entry, new_entry), []).append(marker)
+
+        for (entry, new_entry), group in groups.items():
+            trans = new.transs[new_entry] * old.transs[entry].inverted()
+            if trans.is_unity():
+                result.unchanged += len(group)
+            else:
+                self.transformer.transform(group, trans)
+                result.moved += len(group)
+
+        result.elapsed = time.perf_counter() - t0
+        get_perf_monitor().record('migration.migrate', result.elapsed)
+        logger.info("[Migration] %s", result.summary())
+        return result
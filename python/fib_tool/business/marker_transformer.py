@@ -5,10 +5,19 @@ This module provides functions to convert markers between different types:
 - Single-point ↔ Multi-point
 
 This eliminates ~20% code duplication by centralizing conversion logic.
+
+convert_batch() converts a whole selection: validation, conversion, GDS
+replacement (one undo step) and the list model update in one call.
 """
 
+import time
+
+from ..config import DEFAULT_MARKER_NOTES, LAYERS
 from ..markers import CutMarker, ConnectMarker, ProbeMarker
-from ..core.validation_utils import validate_conversion
+from ..core.edit_session import FibEditSession
+from ..core.log_utils import get_logger
+from ..core.perf_monitor import get_perf_monitor
+from ..core.validation_utils import marker_type_name, validate_conversion
 
 # Check if multipoint markers module exists
 try:
@@ -17,6 +26,8 @@ try:
 except ImportError:
     MULTIPOINT_AVAILABLE = False
 
+logger = get_logger('marker_transformer')
+
 
 class FibMarkerTransformer:
     """Handles all marker type conversions
@@ -234,6 +245,118 @@ class FibMarkerTransformer:
 
         return new_marker
 
+    @staticmethod
+    def convert_batch(markers, target_type, cell=None, view=None, model=None):
+        """Convert a selection of markers to one type
+
+        Ids, notes, target layers and the design layer of each point are
+        kept; the FIB layer follows the new type. With a cell the old
+        geometry and coordinate texts are replaced in one FibEditSession
+        (one undo step); with a model the new markers take the rows of
+        the old ones.
+
+        Args:
+            markers: Markers to convert
+            target_type (str): 'cut', 'connect', 'probe', 'multipoint_cut'
+                or 'multipoint_connect'
+            cell: pya.Cell with the marker shapes (None = data only)
+            view: pya.LayoutView for the undo step (None = current view)
+            model: FibMarkerListModel holding the markers (optional)
+
+        Returns:
+            tuple: (converted, failures) - converted is a list of
+                (old marker, new marker), failures a list of (marker id, reason)
+
+        Example:
+            >>> converted, failures = FibMarkerTransformer.convert_batch(
+            ...     panel.selected_markers(), 'connect', cell, model=panel.marker_model)
+        """
+        t0 = time.perf_counter()
+        converted, failures = [], []
+        for marker in markers:
+            new_marker, error = FibMarkerTransformer._convert_one(marker, target_type)
+            if new_marker is None:
+                failures.append((getattr(marker, 'id', None), error))
+                continue
+            FibMarkerTransformer._copy_fields(marker, new_marker)
+            converted.append((marker, new_marker))
+
+        if converted and cell is not None:
+            from .bulk_transform import FibBulkTransformer
+            bulk = FibBulkTransformer()
+            with FibEditSession(view, f"FIB: convert {len(converted)} marker(s) to {target_type}", cell.layout()):
+                bulk.erase_gds([old for old, _ in converted], cell)
+                bulk.draw_gds([new for _, new in converted], cell)
+        if converted and model is not None:
+            model.replace_markers(converted)
+
+        get_perf_monitor().record('convert.batch', time.perf_counter() - t0)
+        logger.info("[Transformer] Converted %s marker(s) to %s, %s failed",
+                    len(converted), target_type, len(failures))
+        return converted, failures
+
+    @staticmethod
+    def _convert_one(marker, target_type):
+        """New marker of `target_type` (batch type names), or (None, reason)"""
+        source_type = marker_type_name(marker)
+        base_type = target_type.replace('multipoint_', '')
+        if target_type.startswith('multipoint_'):
+            if source_type == 'multipoint':
+                # Multi-point cut <-> connect keeps all points
+                if marker.TAG == base_type:
+                    return None, f"Marker is already type '{target_type}'"
+                cls = MultiPointCutMarker if base_type == 'cut' else MultiPointConnectMarker
+                return cls.from_canonical(marker.id, marker.ipoints, 0), None
+            check_type = 'multipoint'
+        elif target_type in ('cut', 'connect', 'probe'):
+            check_type = target_type
+        else:
+            return None, f"Unknown target type: {target_type}"
+
+        can_convert, error = validate_conversion(marker, check_type)
+        if not can_convert:
+            return None, error
+        if check_type == 'cut':
+            new_marker = FibMarkerTransformer.convert_to_cut(marker)
+        elif check_type == 'connect':
+            new_marker = FibMarkerTransformer.convert_to_connect(marker)
+        elif check_type == 'probe':
+            new_marker = FibMarkerTransformer.convert_to_probe(marker)
+        else:
+            new_marker = FibMarkerTransformer.convert_to_multipoint(marker, base_type)
+        if new_marker is None:
+            return None, "Conversion failed"
+        return new_marker, None
+
+    @staticmethod
+    def _copy_fields(source, target):
+        """Carry notes, screenshots and layer information over to a converted marker
+
+        A type's default note (DEFAULT_MARKER_NOTES) becomes the new type's.
+        """
+        if hasattr(source, 'point_layers'):
+            layers = list(source.point_layers)
+        elif hasattr(source, 'layer1'):
+            layers = [source.layer1, source.layer2]
+        else:
+            layers = [getattr(source, 'target_layer', None)]
+        layers = layers or [None]
+
+        if hasattr(target, 'point_layers'):
+            count = len(target.ipoints)
+            target.point_layers = (layers + [layers[-1]] * count)[:count]
+        elif hasattr(target, 'layer1'):
+            target.layer1, target.layer2 = layers[0], layers[-1]
+        else:
+            target.target_layer = layers[0]
+        target.layer = LAYERS[target.TAG]  # FIB layer of the new type
+        notes = getattr(source, 'notes', '')
+        if notes and notes == DEFAULT_MARKER_NOTES.get(source.TAG):
+            notes = DEFAULT_MARKER_NOTES.get(target.TAG, notes)  # Default note of the new type
+        target.notes = notes
+        target.target_layers = getattr(source, 'target_layers', ())
+        target.screenshots = getattr(source, 'screenshots', ())
+
     @staticmethod
     def get_marker_type(marker):
         """Get the type string for a marker
@@ -247,15 +370,4 @@ class FibMarkerTransformer:
         if not marker:
             return 'unknown'
 
-        marker_class = marker.__class__.__name__.lower()
-
-        if 'cut' in marker_class:
-            return 'cut'
-        elif 'connect' in marker_class:
-            return 'connect'
-        elif 'probe' in marker_class:
-            return 'probe'
-        elif 'multipoint' in marker_class:
-            return 'multipoint'
-        else:
-            return 'unknown'
+        return marker_type_name(marker)
@@ -0,0 +1,156 @@
+"""Report manifest for incremental HTML report updates
+
+Each export directory gets a fib_report_manifest.json describing what was
+exported: the report timestamp (used as localStorage key prefix by
+report_script.js), and per marker its geometry hash, content hash, notes,
+screenshot files and rendered section HTML.
+
+Updating an existing export diffs the current markers against the manifest:
+only new or moved markers get new screenshots, only changed markers get their
+section re-rendered, and files of removed markers are deleted. The timestamp
+is kept, so custom images and notes stored in the browser stay attached.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+
+MANIFEST_FILENAME = 'fib_report_manifest.json'
+MANIFEST_VERSION = 1
+
+# Marker attributes shown in the report section (besides geometry)
+CONTENT_ATTRS = ('notes', 'layer1', 'layer2', 'target_layer', 'point_layers', 'target_layers', 'violations', 'nets', 'connected')
+
+
+def marker_geometry_hash(marker):
+    """Hash of marker type and coordinates - screenshots depend only on this
+
+    Uses the exact canonical geometry (marker.geometry_key()), so a marker
+    moved by a single database unit gets new screenshots.
+    """
+    key = (marker.__class__.__name__,) + tuple(marker.geometry_key())
+    return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+
+def marker_content_hash(marker):
+    """Hash of everything rendered in the marker's report section"""
+    parts = [marker_geometry_hash(marker)]
+    for attr in CONTENT_ATTRS:
+        parts.append(repr(getattr(marker, attr, None)))
+    return hashlib.sha1("|".join(parts).encode('utf-8')).hexdigest()
+
+
+class FibReportManifest:
+    """Manifest of one export directory
+
+    Example:
+        >>> manifest = FibReportManifest.load(export_dir)
+        >>> diff = manifest.diff(markers)
+        >>> diff['new_screenshots']   # ids needing new screenshots
+    """
+
+    def __init__(self, timestamp=None, markers=None, pages=None):
+        self.timestamp = timestamp or datetime.now().strftime("%Y%m%d%H%M%S%f")
+        self.markers = markers or {}  # marker id -> entry dict
+        self.pages = pages or []      # report page file names
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def path(export_dir):
+        return os.path.join(export_dir, MANIFEST_FILENAME)
+
+    @classmethod
+    def load(cls, export_dir):
+        """Load the manifest of an export directory, or None if missing/invalid"""
+        path = cls.path(export_dir)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != MANIFEST_VERSION:
+                print(f"[Report Manifest] Unsupported manifest version in {path}")
+                return None
+            return cls(data['timestamp'], data.get('markers', {}), data.get('pages', []))
+        except Exception as e:
+            print(f"[Report Manifest] Error loading {path}: {e}")
+            return None
+
+    def save(self, export_dir):
+        data = {
+            'version': MANIFEST_VERSION,
+            'timestamp': self.timestamp,
+            'updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'pages': self.pages,
+            'markers': self.markers,
+        }
+        tmp_path = self.path(export_dir) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path(export_dir))
+
+    # ------------------------------------------------------------------
+    # Diff / update
+    # ------------------------------------------------------------------
+
+    def diff(self, markers):
+        """Compare current markers with the manifest
+
+        Returns:
+            dict: Lists of marker ids
+                new_screenshots - new or moved markers (screenshots + section)
+                rerender        - same geometry, changed notes/layers (section only)
+                unchanged       - section and screenshots can be reused
+                removed         - in the manifest but no longer present
+        """
+        result = {'new_screenshots': [], 'rerender': [], 'unchanged': [], 'removed': []}
+        current_ids = set()
+
+        for marker in markers:
+            current_ids.add(marker.id)
+            entry = self.markers.get(marker.id)
+            if entry is None or entry.get('geometry') != marker_geometry_hash(marker):
+                result['new_screenshots'].append(marker.id)
+            elif entry.get('content') != marker_content_hash(marker) or 'section' not in entry:
+                result['rerender'].append(marker.id)
+            else:
+                result['unchanged'].append(marker.id)
+
+        result['removed'] = [marker_id for marker_id in self.markers if marker_id not in current_ids]
+        return result
+
+    def screenshots_for(self, marker_id, images_dir):
+        """Stored screenshots of a marker as (desc, filename, filepath, meta) tuples"""
+        entry = self.markers.get(marker_id, {})
+        return [(desc, filename, os.path.join(images_dir, filename), meta)
+                for desc, filename, meta in entry.get('screenshots', [])]
+
+    def section_for(self, marker_id):
+        return self.markers.get(marker_id, {}).get('section')
+
+    def files_for(self, marker_id, images_dir):
+        """All image files (full + thumbnails) recorded for a marker"""
+        files = []
+        for _, filename, meta in self.markers.get(marker_id, {}).get('screenshots', []):
+            files.append(os.path.join(images_dir, filename))
+            if meta and meta.get('thumbnail'):
+                files.append(os.path.join(images_dir, meta['thumbnail']))
+        return files
+
+    def remove(self, marker_id):
+        self.markers.pop(marker_id, None)
+
+    def update_marker(self, marker, screenshots, section_html):
+        """Record the current state of a marker"""
+        self.markers[marker.id] = {
+            'geometry': marker_geometry_hash(marker),
+            'content': marker_content_hash(marker),
+            'notes': getattr(marker, 'notes', ''),
+            'screenshots': [[shot[0], shot[1], shot[3] if len(shot) > 3 else {}] for shot in screenshots],
+            'section': section_html,
+        }
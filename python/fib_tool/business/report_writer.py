@@ -0,0 +1,205 @@
+"""Streaming HTML report writer for FIB Tool
+
+This module writes the HTML report section by section straight to disk
+instead of building one big string. Large reports are split into pages
+(or an index plus per-type pages) so the browser never has to load
+thousands of screenshots at once.
+"""
+
+import os
+
+from ..config import REPORT_CONFIG
+
+
+SECTIONS_PLACEHOLDER = "{marker_sections}"
+SCRIPT_TAG = '<script src="report_script.js"></script>'
+
+REPORT_TYPES = ('CUT', 'CONNECT', 'PROBE')
+
+
+def marker_report_type(marker):
+    """Return the report group of a marker: 'CUT', 'CONNECT', 'PROBE' or 'OTHER'"""
+    marker_class = marker.__class__.__name__
+    if 'Cut' in marker_class:
+        return 'CUT'
+    if 'Connect' in marker_class:
+        return 'CONNECT'
+    if 'Probe' in marker_class:
+        return 'PROBE'
+    return 'OTHER'
+
+
+def fill_placeholders(text, context):
+    """Replace {key} placeholders with context values
+
+    The templates contain CSS braces, so str.format() cannot be used.
+    Only the known keys are substituted.
+    """
+    for key, value in context.items():
+        text = text.replace("{" + key + "}", str(value))
+    return text
+
+
+class FibReportWriter:
+    """Writes a (possibly multi-page) HTML report from a template
+
+    The template is split at {marker_sections}; the part before is written,
+    then each marker section is rendered and written one at a time, then the
+    part after. All other placeholders keep working as before.
+
+    Page layout:
+    - markers <= page_size: a single file at output_path (same as before)
+    - otherwise: output_path is page 1, further pages are <stem>_p2.html, ...
+    - split_by_type: output_path becomes an index page linking to
+      <stem>_cut.html, <stem>_connect.html, <stem>_probe.html (each paginated)
+
+    Example:
+        >>> writer = FibReportWriter('out/report.html', template, js, context)
+        >>> pages = writer.write(markers, lambda m: render(m))
+    """
+
+    def __init__(self, output_path, template_html, js_content='', context=None,
+                 page_size=None, split_by_type=None, logger=None):
+        """
+        Args:
+            output_path (str): Main report path (page 1 or index page)
+            template_html (str): Report template containing {marker_sections}
+            js_content (str): JavaScript inlined in place of report_script.js
+            context (dict): Placeholder values (marker_sections is ignored)
+            page_size (int): Maximum marker sections per page (default from config)
+            split_by_type (bool): Write an index plus per-type pages
+            logger: Optional FibExportLogger
+        """
+        self.output_path = str(output_path)
+        self.page_size = max(1, page_size or REPORT_CONFIG['page_size'])
+        self.split_by_type = REPORT_CONFIG['split_by_type'] if split_by_type is None else split_by_type
+        self.logger = logger
+
+        context = dict(context or {})
+        context.pop('marker_sections', None)
+
+        if SECTIONS_PLACEHOLDER in template_html:
+            head, tail = template_html.split(SECTIONS_PLACEHOLDER, 1)
+        else:
+            head, tail = template_html, ""
+
+        head = fill_placeholders(head, context)
+        tail = fill_placeholders(tail, context)
+
+        # Embed JavaScript inline so every page stays self-contained
+        if js_content:
+            head = head.replace(SCRIPT_TAG, f'<script>\n{js_content}\n</script>')
+            tail = tail.replace(SCRIPT_TAG, f'<script>\n{js_content}\n</script>')
+
+        self._head = head
+        self._tail = tail
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def write(self, markers, render_section):
+        """Write all pages
+
+        Args:
+            markers (list): Markers in report order
+            render_section (callable): marker -> section HTML string
+
+        Returns:
+            list: Paths of the written pages (first entry is output_path)
+        """
+        pages = self.plan_pages(markers)
+        written = []
+
+        for page in pages:
+            self._write_page(page, pages, render_section)
+            written.append(page['path'])
+
+        self._log(f"[Report Writer] Wrote {len(written)} page(s) for {len(markers)} markers")
+        return written
+
+    def plan_pages(self, markers):
+        """Split markers into pages
+
+        Returns:
+            list: dicts with keys path, label, group, markers
+        """
+        stem, ext = os.path.splitext(self.output_path)
+        markers = list(markers)
+
+        if not self.split_by_type:
+            chunks = self._chunks(markers)
+            pages = []
+            for i, chunk in enumerate(chunks, 1):
+                path = self.output_path if i == 1 else f"{stem}_p{i}{ext}"
+                label = f"Page {i}/{len(chunks)}"
+                pages.append({'path': path, 'label': label, 'group': None, 'markers': chunk})
+            return pages
+
+        # Index page plus per-type pages
+        groups = {}
+        for marker in markers:
+            groups.setdefault(marker_report_type(marker), []).append(marker)
+
+        pages = [{'path': self.output_path, 'label': 'Index', 'group': None, 'markers': []}]
+        for group in REPORT_TYPES + ('OTHER',):
+            group_markers = groups.get(group)
+            if not group_markers:
+                continue
+            chunks = self._chunks(group_markers)
+            for i, chunk in enumerate(chunks, 1):
+                suffix = group.lower() if i == 1 else f"{group.lower()}_p{i}"
+                label = group if len(chunks) == 1 else f"{group} {i}/{len(chunks)}"
+                pages.append({'path': f"{stem}_{suffix}{ext}", 'label': label,
+                              'group': group, 'markers': chunk})
+        return pages
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _chunks(self, markers):
+        if not markers:
+            return [[]]
+        return [markers[i:i + self.page_size] for i in range(0, len(markers), self.page_size)]
+
+    def _write_page(self, page, pages, render_section):
+        nav = self._page_nav(page, pages)
+
+        with open(page['path'], 'w', encoding='utf-8') as f:
+            f.write(self._head)
+            f.write(nav)
+            for marker in page['markers']:
+                f.write(render_section(marker))
+            if page['markers']:
+                f.write(nav)
+            f.write(self._tail)
+
+    def _page_nav(self, page, pages):
+        """Navigation bar linking all pages (empty for single-page reports)"""
+        if len(pages) <= 1:
+            return ""
+
+        links = []
+        for other in pages:
+            name = os.path.basename(other['path'])
+            count = f" ({len(other['markers'])})" if other['markers'] else ""
+            if other is page:
+                links.append(f'<span class="page-current">{other["label"]}{count}</span>')
+            else:
+                links.append(f'<a href="{name}">{other["label"]}{count}</a>')
+
+        return f"""
+    <div class="page-nav">
+        {' | '.join(links)}
+    </div>
+"""
+
+    def _log(self, message):
+        if self.logger is not None:
+            self.logger.info(message)
+        else:
+            try:
+                print(message)
+            except Exception:
+                pass
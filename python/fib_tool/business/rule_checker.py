@@ -0,0 +1,399 @@
+"""Rule checks of FIB markers against the design layers
+
+Before a job goes to the FIB lab every marker is checked against the
+layers recorded when it was placed (layer1 / layer2 / target_layer /
+point_layers):
+
+    cut_multi   the cut line touches more than one shape of its layer, so
+                it may open an unintended net
+    cut_miss    the cut line touches nothing on its layer
+    off_metal   a connect endpoint or probe point is not on its layer
+                (a RULE_CHECK_CONFIG['landing_size'] square must be covered)
+    clearance   another shape of the probe's layer is closer than
+                RULE_CHECK_CONFIG['probe_clearance']
+    layer_missing  the marker's layer does not exist in the layout
+
+Shapes that touch or overlap are merged first, so a wire drawn as several
+boxes counts as one shape.
+
+All markers are checked in one pya.TilingProcessor run: marker geometry is
+converted to Regions per design layer and every tile evaluates Region
+selections (interacting / not_inside) against the hierarchical layer
+shapes of the tile plus its border, on RULE_CHECK_CONFIG['threads']
+threads. The tiles only span the markers' extent, not the whole chip.
+
+A tile only judges the marker shapes lying completely inside its frame
+(tile plus border), where all layer shapes they touch are loaded. The
+border is raised to the largest marker shape, so every marker lies inside
+the frame of the tile holding its lower left corner. Shapes are merged
+only where they lie within RULE_CHECK_CONFIG['merge_halo'] of a marker:
+two wires joined only farther away count as two shapes.
+
+    checker = FibRuleChecker()
+    result = checker.check(markers, layout, cell)
+    for violation in result.violations:
+        print(violation.marker_id, violation.message)
+
+Each checked marker gets a ``violations`` list (empty = clean); markers
+without a usable layer get ``violations = None``.
+"""
+
+import os
+import re
+import time
+
+from ..config import RULE_CHECK_CONFIG, SYMBOL_SIZES
+from ..core.geometry_utils import get_marker_points
+from ..core.log_utils import get_logger
+from ..core.perf_monitor import get_perf_monitor
+
+logger = get_logger('rule_checker')
+
+# Check name -> message
+CHECKS = {
+    'cut_multi': "Cut touches more than one shape (possible unintended net)",
+    'cut_miss': "Cut does not touch its layer",
+    'off_metal': "Point is not on its layer",
+    'clearance': "Other shapes within the probe clearance",
+    'layer_missing': "Layer not found in the layout",
+}
+
+# "M1:86/0", "86/0", "M1 (86/0)"
+_LAYER_RE = re.compile(r'(\d+)\s*/\s*(\d+)\s*\)?\s*$')
+
+
+def parse_layer_spec(text):
+    """(layer, datatype) of a marker layer string, or None ("N/A", empty)
+
+    Example:
+        >>> parse_layer_spec("M1:86/0")
+        (86, 0)
+    """
+    if not text:
+        return None
+    match = _LAYER_RE.search(str(text))
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+class RuleViolation:
+    """One failed check of a marker"""
+
+    __slots__ = ('marker_id', 'check', 'layer', 'x', 'y')
+
+    def __init__(self, marker_id, check, layer, x, y):
+        self.marker_id = marker_id
+        self.check = check    # Key of CHECKS
+        self.layer = layer    # Layer string as stored on the marker
+        self.x = x            # Location in microns
+        self.y = y
+
+    @property
+    def message(self):
+        return CHECKS.get(self.check, self.check)
+
+    def to_dict(self):
+        return {'marker_id': self.marker_id, 'check': self.check, 'layer': self.layer,
+                'x': self.x, 'y': self.y, 'message': self.message}
+
+    def __repr__(self):
+        return f"RuleViolation({self.marker_id}, {self.check}, {self.layer})"
+
+
+class RuleCheckResult:
+    """Violations of one checker run"""
+
+    def __init__(self):
+        self.violations = []
+        self.checked = 0
+        self.unchecked = []   # Ids of markers without a usable layer
+        self.tiles = 0
+        self.elapsed = 0.0
+
+    def failed_marker_ids(self):
+        return sorted(set(v.marker_id for v in self.violations))
+
+    def summary(self):
+        return (f"{len(self.violations)} violation(s) on {len(self.failed_marker_ids())} of "
+                f"{self.checked} checked marker(s), {len(self.unchecked)} without layer info "
+                f"({self.elapsed:.1f} s)")
+
+
+def _marker_kind(marker):
+    marker_class = marker.__class__.__name__
+    if 'Cut' in marker_class:
+        return 'cut'
+    if 'Connect' in marker_class:
+        return 'connect'
+    if 'Probe' in marker_class:
+        return 'probe'
+    return None
+
+
+class _LayerJob:
+    """Marker geometry checked against one design layer"""
+
+    def __init__(self, index, layer_index, name):
+        import pya
+        self.index = index
+        self.layer_index = layer_index
+        self.name = name
+        self.cuts = pya.Region()       # Cut lines
+        self.landings = pya.Region()   # Squares that must be on the layer
+        self.zones = pya.Region()      # Probe clearance disks
+        # (region name, polygon bbox) -> [(marker, layer string, x, y)]
+        self.owners = {}
+        self.extent = 0   # Largest polygon width / height in DBU
+
+    def add(self, region_name, polygon, marker, layer, x, y):
+        getattr(self, region_name).insert(polygon)
+        box = polygon.bbox()
+        key = (region_name, box.left, box.bottom, box.right, box.top)
+        self.owners.setdefault(key, []).append((marker, layer, x, y))
+        self.extent = max(self.extent, box.width(), box.height())
+
+    def script(self, border, halo):
+        """Expression run on each tile (border, halo in DBU)"""
+        i = self.index
+        present = " + ".join(f"{name}{i}" for name, region in
+                             (('c', self.cuts), ('l', self.landings), ('z', self.zones))
+                             if not region.is_empty())
+        # Merge only the layer shapes near markers: merging a whole tile costs far more
+        lines = [f"m{i}.merged_semantics = false;",
+                 f"var t{i} = m{i}.interacting(({present}).sized({halo})).merged;",
+                 f"var f{i} = _tile.sized({border});"]
+        if not self.cuts.is_empty():
+            # Overlapping cuts stay separate polygons (one per marker)
+            lines.append(f"c{i}.merged_semantics = false;")
+            lines.append(f"var c{i}f = c{i}.inside(f{i});")
+            lines.append(f"_output(cut_multi_{i}, c{i}f.interacting(t{i}, 2), false);")
+            lines.append(f"_output(cut_miss_{i}, c{i}f.not_interacting(t{i}), false);")
+        if not self.landings.is_empty():
+            lines.append(f"l{i}.merged_semantics = false;")
+            lines.append(f"_output(off_metal_{i}, l{i}.inside(f{i}).not_inside(t{i}), false);")
+        if not self.zones.is_empty():
+            lines.append(f"z{i}.merged_semantics = false;")
+            lines.append(f"_output(clearance_{i}, z{i}.inside(f{i}).interacting(t{i}, 2), false);")
+        return " ".join(lines)
+
+
+# Output name prefix -> region the output polygons come from
+_OUTPUTS = {
+    'cut_multi': 'cuts',
+    'cut_miss': 'cuts',
+    'off_metal': 'landings',
+    'clearance': 'zones',
+}
+
+
+class FibRuleChecker:
+    """Checks markers against the design layers with a TilingProcessor
+
+    Args:
+        threads (int): Worker threads (default RULE_CHECK_CONFIG, None = CPUs)
+        tile_size (float): Tile side in microns
+        tile_border (float): Tile overlap in microns (raised to the largest marker)
+        landing_size (float): Side of the square that must be on metal
+        probe_clearance (float): Radius around probes free of other shapes
+
+    Example:
+        >>> result = FibRuleChecker(threads=8).check(markers, layout, cell)
+        >>> print(result.summary())
+    """
+
+    def __init__(self, threads=None, tile_size=None, tile_border=None,
+                 landing_size=None, probe_clearance=None):
+        config = RULE_CHECK_CONFIG
+        self.threads = threads if threads is not None else (config['threads'] or os.cpu_count() or 1)
+        self.tile_size = tile_size or config['tile_size']
+        self.landing_size = landing_size or config['landing_size']
+        self.probe_clearance = probe_clearance or config['probe_clearance']
+        self.merge_halo = config['merge_halo']
+        self.tile_border = tile_border or config['tile_border']
+
+    def check(self, markers, layout, cell):
+        """Run all checks and store each marker's violations on it
+
+        Args:
+            markers: Marker objects
+            layout: pya.Layout with the design layers
+            cell: Top cell to check in (shapes are read hierarchically)
+
+        Returns:
+            RuleCheckResult
+        """
+        t0 = time.perf_counter()
+        result = RuleCheckResult()
+        jobs = {}
+        missing = set()   # Layer specs not in the layout
+        seen = {}   # id(marker) -> set of (check, layer) already reported
+
+        def job_for(layer_text, marker, x, y):
+            spec = parse_layer_spec(layer_text)
+            if spec is None:
+                return None
+            job = jobs.get(spec)
+            if job is None:
+                layer_index = None if spec in missing else layout.find_layer(spec[0], spec[1])
+                if layer_index is None:
+                    missing.add(spec)
+                    add_violation(marker, 'layer_missing', layer_text, x, y)
+                    return None
+                job = jobs[spec] = _LayerJob(len(jobs), layer_index, layer_text)
+            return job
+
+        def add_violation(marker, check, layer_text, x, y):
+            reported = seen.setdefault(id(marker), set())
+            if (check, layer_text) in reported:
+                return
+            reported.add((check, layer_text))
+            violation = RuleViolation(marker.id, check, layer_text, x, y)
+            marker.violations.append(violation)
+            result.violations.append(violation)
+
+        dbu = layout.dbu
+        for marker in markers:
+            marker.violations = []
+            if not self._collect(marker, dbu, job_for):
+                marker.violations = None
+                result.unchecked.append(marker.id)
+            else:
+                result.checked += 1
+
+        # Violations found while collecting (layer_missing) are already stored
+        active = [job for job in jobs.values()
+                  if not (job.cuts.is_empty() and job.landings.is_empty() and job.zones.is_empty())]
+        if active:
+            outputs = self._run_tiles(active, layout, cell, result)
+            for job, check, region in outputs:
+                region_name = _OUTPUTS[check]
+                for polygon in region.each():
+                    box = polygon.bbox()
+                    for marker, layer_text, x, y in job.owners.get(
+                            (region_name, box.left, box.bottom, box.right, box.top), ()):
+                        add_violation(marker, check, layer_text, x, y)
+
+        order = {}
+        for row, marker in enumerate(markers):
+            order[marker.id] = row
+        result.violations.sort(key=lambda v: (order.get(v.marker_id, 0), v.check))
+        result.elapsed = time.perf_counter() - t0
+        get_perf_monitor().record('rule_check', result.elapsed)
+        logger.info("[Rule Check] %s", result.summary())
+        return result
+
+    def _collect(self, marker, dbu, job_for):
+        """Add a marker's check geometry to the layer jobs
+
+        Returns:
+            bool: False if the marker has no usable layer
+        """
+        import pya
+
+        kind = _marker_kind(marker)
+        points = get_marker_points(marker)
+        if kind is None or not points:
+            return False
+        db_points = [pya.Point(int(round(x / dbu)), int(round(y / dbu))) for x, y in points]
+        checked = False
+
+        if kind == 'cut':
+            width_key = 'multipoint' if hasattr(marker, 'points') else 'cut'
+            width = int(round(SYMBOL_SIZES[width_key]['line_width'] / dbu))
+            polygon = pya.Path(db_points, width).polygon()
+            for layer_text in self._unique(self._point_layers(marker)):
+                job = job_for(layer_text, marker, points[0][0], points[0][1])
+                if job is not None:
+                    job.add('cuts', polygon, marker, layer_text, points[0][0], points[0][1])
+                    checked = True
+                elif parse_layer_spec(layer_text) is not None:
+                    checked = True
+            return checked
+
+        half = max(1, int(round(self.landing_size / dbu / 2.0)))
+        layers = self._point_layers(marker)
+        if kind == 'connect':
+            ends = [(0, layers[0] if layers else None), (len(points) - 1, layers[-1] if layers else None)]
+        else:
+            ends = [(0, getattr(marker, 'target_layer', None))]
+
+        for point_index, layer_text in ends:
+            x, y = points[point_index]
+            p = db_points[point_index]
+            job = job_for(layer_text, marker, x, y)
+            if job is None:
+                checked = checked or parse_layer_spec(layer_text) is not None
+                continue
+            checked = True
+            job.add('landings', pya.Polygon(pya.Box(p.x - half, p.y - half, p.x + half, p.y + half)),
+                    marker, layer_text, x, y)
+            if kind == 'probe':
+                r = int(round(self.probe_clearance / dbu))
+                zone = pya.Polygon.ellipse(pya.Box(p.x - r, p.y - r, p.x + r, p.y + r), 32)
+                job.add('zones', zone, marker, layer_text, x, y)
+        return checked
+
+    @staticmethod
+    def _point_layers(marker):
+        """Layer strings of a marker's points (first to last)"""
+        if hasattr(marker, 'points'):
+            return list(getattr(marker, 'point_layers', None) or [])
+        if hasattr(marker, 'x1'):
+            return [getattr(marker, 'layer1', None), getattr(marker, 'layer2', None)]
+        return [getattr(marker, 'target_layer', None)]
+
+    @staticmethod
+    def _unique(layer_texts):
+        """Layer strings with one entry per layer/datatype"""
+        result = []
+        specs = set()
+        for text in layer_texts:
+            spec = parse_layer_spec(text)
+            if spec is not None and spec not in specs:
+                specs.add(spec)
+                result.append(text)
+        return result
+
+    def _run_tiles(self, jobs, layout, cell, result):
+        """Evaluate the checks of all layer jobs in one tiling run
+
+        Returns:
+            list: (job, check, output Region) tuples
+        """
+        import pya
+
+        dbu = layout.dbu
+        # Every marker shape must fit into the border (see module docstring)
+        border = max(int(round(self.tile_border / dbu)), max(job.extent for job in jobs) + 1)
+        processor = pya.TilingProcessor()
+        processor.dbu = dbu
+        processor.threads = self.threads
+        processor.tile_size(self.tile_size, self.tile_size)
+        processor.tile_border(border * dbu, border * dbu)
+
+        frame = pya.Box()
+        outputs = []
+        for job in jobs:
+            i = job.index
+            processor.input(f"m{i}", layout, cell.cell_index(), job.layer_index)
+            for name, region in (('c', job.cuts), ('l', job.landings), ('z', job.zones)):
+                if not region.is_empty():
+                    processor.input(f"{name}{i}", region)
+                    frame += region.bbox()
+            for check, region_name in _OUTPUTS.items():
+                if not getattr(job, region_name).is_empty():
+                    output = pya.Region()
+                    processor.output(f"{check}_{i}", output)
+                    outputs.append((job, check, output))
+            processor.queue(job.script(border, int(round(self.merge_halo / dbu))))
+
+        # Tiles cover the markers only, not the whole chip
+        processor.frame = frame.to_dtype(dbu)
+        columns = max(1, -(-frame.width() * dbu // self.tile_size))
+        rows = max(1, -(-frame.height() * dbu // self.tile_size))
+        result.tiles = int(columns * rows)
+        logger.debug("[Rule Check] %s layer(s), ~%s tile(s), border %.2f um, %s thread(s)",
+                     len(jobs), result.tiles, border * dbu, self.threads)
+        processor.execute("FIB rule check")
+        return outputs
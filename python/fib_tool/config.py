@@ -53,12 +53,18 @@ GEOMETRIC_PARAMS = {
     'layer_tap_radius': 0.5,           # Search radius for layer detection at click position (μm)
 }
 
+# Markers store coordinates as integers in this unit (μm per unit). It divides
+# every usual layout dbu (0.001, 0.0005, 0.00025, 0.0001 ...), so converting to
+# the layout's dbu is exact. Project files record it as 'dbu'.
+CANONICAL_DBU = 0.00001
+
 # UI timeout settings (milliseconds)
 UI_TIMEOUTS = {
     'message_short': 2000,    # Short status messages (2 seconds)
     'message_medium': 3000,   # Medium status messages (3 seconds)
     'message_long': 10000,    # Long status messages (10 seconds)
     'double_click': 500,      # Double-click time threshold (500ms)
+    'filter_debounce': 150,   # Marker list filter applied after this typing pause
 }
 
 # Default marker notes (Chinese)
@@ -103,6 +109,119 @@ SCREENSHOT_CONFIG = {
     }
 }
 
+# Startup behaviour (klayout_package.init_fib_tool / fib_plugin)
+# The panel and layer manager are imported on first use unless enabled here
+STARTUP_CONFIG = {
+    'dock_panel': False,     # True = create and dock the FIB Panel at KLayout startup
+    'check_layers': False,   # True = create FIB layers at startup (otherwise on first mode activation)
+}
+
+# Console logging (see core/log_utils.py)
+# Override at runtime with the FIB_TOOL_LOG environment variable, e.g.
+#   FIB_TOOL_LOG=DEBUG  or  FIB_TOOL_LOG=layer_tap=DEBUG,fib_plugin=INFO
+LOGGING_CONFIG = {
+    'default_level': 'INFO',
+    'levels': {
+        # Click / marker hot paths: silent unless something goes wrong
+        'fib_plugin': 'WARNING',
+        'layer_tap': 'WARNING',
+        'smart_counter': 'WARNING',
+        'fib_panel': 'WARNING',
+    },
+    'format': '%(message)s',
+}
+
+# Performance instrumentation (see core/perf_monitor.py)
+# Override at startup with FIB_TOOL_PERF=0 / FIB_TOOL_PERF=1
+PERF_CONFIG = {
+    'enabled': True,             # Timers cost two perf_counter() calls; False = no-op
+    'max_samples': 1000,         # Recent samples kept per operation for p95
+    'dump_filename': 'fib_perf_stats.json',
+}
+
+# Marker spatial index (see core/spatial_index.py)
+SPATIAL_INDEX_CONFIG = {
+    'cell_size': 10.0,           # Grid pitch in μm (about the size of a typical marker)
+    'max_cells_per_box': 256,    # Boxes spanning more cells are checked by every query instead
+}
+
+# Snap marker points to layout geometry (see snapping.py)
+SNAP_CONFIG = {
+    'enabled': False,         # Initial state of the panel's "Snap" checkbox
+    'radius': 0.5,            # Snap radius in μm
+    'window': 20.0,           # Side of the cached area around a click in μm
+    'cell_size': 1.0,         # Grid pitch of the cached features in μm
+    'max_features': 200000,   # Edge/spine segments cached per window at most
+}
+
+# Marker rule checks against the design layers (see business/rule_checker.py)
+RULE_CHECK_CONFIG = {
+    'threads': None,           # TilingProcessor threads (None = number of CPUs)
+    'tile_size': 200.0,        # Tile side in μm
+    'tile_border': 5.0,        # Tile overlap in μm (raised to the largest marker shape)
+    'landing_size': 0.1,       # Side in μm of the square that must lie on metal at connect ends / probes
+    'probe_clearance': 1.0,    # Radius in μm around a probe that must be free of other shapes
+    'merge_halo': 2.0,         # Shapes joined only farther than this (μm) from a marker count as separate
+}
+
+# Marker-to-marker spacing (see business/conflict_analyzer.py)
+CONFLICT_CONFIG = {
+    'min_spacing': 0.5,      # Markers closer than this (μm, as drawn without width) conflict
+    'check_on_add': True,    # Check each new marker against its neighbours when it is created
+}
+
+# Net lookup for CONNECT endpoints (see business/connectivity.py)
+# Layers as "name:layer/datatype" or "layer/datatype" strings
+CONNECTIVITY_CONFIG = {
+    'enabled': False,      # True = trace each new CONNECT marker when it is created
+    'window': 50.0,        # Side of an extracted window in μm
+    'margin': 5.0,         # Endpoints must be this far (μm) inside a cached window to reuse it
+    'cache_size': 32,      # Extracted windows kept
+    'conductors': [],      # e.g. ['M1:31/0', 'M2:32/0'] (endpoint layers are always added)
+    'vias': [],            # e.g. [('31/0', '51/0', '32/0')] as (lower, via, upper)
+    'labels': {},          # e.g. {'31/0': '31/10'}: text layer naming a conductor's nets
+}
+
+# Bulk marker transform (see business/bulk_transform.py)
+TRANSFORM_CONFIG = {
+    'vectorize_from': 1000,   # Selections this large use the NumPy marker table (if NumPy is installed)
+}
+
+# Marker migration to a new layout revision (see business/marker_migrator.py)
+MIGRATION_CONFIG = {
+    'max_depth': 4,             # Instance levels below the top cell that are indexed
+    'name_property': None,      # Instance property naming instances (e.g. 'name' or 1), None = by order
+    'max_array_members': 1000,  # Larger arrays are one entry (markers move with the whole array)
+    'cell_size': 50.0,          # Grid pitch of the instance box index in μm
+}
+
+# Export log settings (export_log.txt written next to the HTML report)
+EXPORT_LOG_CONFIG = {
+    'filename': 'export_log.txt',
+    'level': 'DEBUG',          # Minimum level written to the log file
+    'console_level': 'INFO',   # Minimum level echoed to the console
+    'quiet': False,            # True = log file only, no console output
+    'buffer_lines': 200,       # Flush buffered lines to disk every N lines
+}
+
+# HTML report layout
+REPORT_CONFIG = {
+    'page_size': 200,         # Max marker sections per HTML page
+    'split_by_type': False,   # True = index page + per-type pages (cut/connect/probe)
+    'lazy_images': True,      # Use loading="lazy" on report images
+}
+
+# Screenshot post-processing (thumbnails / re-encoding, Pillow optional)
+IMAGE_PROCESSING = {
+    'enabled': True,
+    'thumbnail_size': (400, 300),  # Max thumbnail size in pixels (aspect ratio kept)
+    'thumbnail_format': 'png',     # 'png' | 'jpeg' | 'webp' (jpeg/webp need Pillow)
+    'reencode_format': None,       # None = keep full PNGs, or 'png' | 'jpeg' | 'webp'
+    'quality': 85,                 # JPEG/WebP quality
+    'keep_original': False,        # Keep the original PNG after re-encoding to another format
+    'workers': 4,                  # Thread pool size
+}
+
 # Report settings
 REPORT_TEMPLATE = """<!DOCTYPE html>
 <html>
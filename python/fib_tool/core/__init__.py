@@ -1,31 +1,94 @@
 """Core utilities for FIB Tool
 
 This module provides core utility functions and classes for geometry calculations,
-validation, and state management.
+spatial indexing, columnar marker tables, validation, state management, logging, export
+logging, performance instrumentation and batched layout edits.
 """
 
 from .geometry_utils import (
     calculate_distance,
     calculate_direction,
     get_bounding_box,
-    get_marker_center
+    get_marker_points,
+    to_canonical,
+    from_canonical,
+    to_dbu,
+    canonical_to_dbu,
+    check_coordinate_grid,
+    get_marker_db_points,
+    set_marker_db_points,
+    get_marker_center,
+    boxes_in_region,
+    transform_points,
+    get_numpy,
+    point_segment_distance,
+    point_marker_distance,
+    point_box_distance,
+    closest_point_on_segment,
+    segments_intersect,
+    segment_segment_distance,
+    get_marker_segments,
+    marker_marker_distance
 )
 from .validation_utils import (
     validate_marker_id,
     validate_coordinates,
     validate_file_path,
-    validate_conversion
+    validate_conversion,
+    marker_type_name
 )
 from .global_state import FibGlobalState
+from .export_logger import FibExportLogger
+from .marker_index import FibMarkerIndex
+from .marker_numbers import FibMarkerNumberIndex
+from .spatial_index import UniformGridIndex, FibMarkerSpatialIndex
+from .marker_table import FibMarkerTable
+from .log_utils import get_logger, configure_logging, set_log_level
+from .perf_monitor import FibPerfMonitor, get_perf_monitor, perf_timer, timed
+from .edit_session import FibEditSession
 
 __all__ = [
     'calculate_distance',
     'calculate_direction',
     'get_bounding_box',
+    'get_marker_points',
+    'to_canonical',
+    'from_canonical',
+    'to_dbu',
+    'canonical_to_dbu',
+    'check_coordinate_grid',
+    'get_marker_db_points',
+    'set_marker_db_points',
     'get_marker_center',
+    'boxes_in_region',
+    'transform_points',
+    'get_numpy',
+    'point_segment_distance',
+    'point_marker_distance',
+    'point_box_distance',
+    'closest_point_on_segment',
+    'segments_intersect',
+    'segment_segment_distance',
+    'get_marker_segments',
+    'marker_marker_distance',
     'validate_marker_id',
     'validate_coordinates',
     'validate_file_path',
     'validate_conversion',
+    'marker_type_name',
     'FibGlobalState',
+    'FibExportLogger',
+    'FibMarkerIndex',
+    'FibMarkerNumberIndex',
+    'UniformGridIndex',
+    'FibMarkerSpatialIndex',
+    'FibMarkerTable',
+    'get_logger',
+    'configure_logging',
+    'set_log_level',
+    'FibPerfMonitor',
+    'get_perf_monitor',
+    'perf_timer',
+    'timed',
+    'FibEditSession',
 ]
@@ -0,0 +1,131 @@
+"""Batched layout edits for FIB Tool
+
+Creating, deleting, renaming and rearranging markers, loading a project and
+clearing all markers each insert or erase many shapes. FibEditSession groups
+such a batch into one undo step and one layout update:
+
+    with FibEditSession(view, "FIB: delete markers"):
+        for marker in markers:
+            delete_marker_from_gds(marker)
+
+On entry the outermost session opens ``view.transaction(description)`` and
+calls ``layout.start_changes()``; on exit it calls ``layout.end_changes()``
+and ``view.commit()`` - also when the block raises, so the view is never
+left inside an open transaction. Sessions nest: inner sessions (e.g. the
+per-marker draw inside a project load) only count depth, so the whole
+batch stays one undo step.
+
+Without a view (standalone pya/klayout module) only the layout calls are
+made; without a layout the session does nothing.
+"""
+
+import time
+
+from .log_utils import get_logger
+from .perf_monitor import get_perf_monitor
+
+logger = get_logger('edit_session')
+
+
+def _current_view():
+    """Current layout view of the main window, or None"""
+    try:
+        import pya
+        main_window = pya.Application.instance().main_window()
+        return main_window.current_view() if main_window else None
+    except Exception:
+        return None
+
+
+def _active_layout(view):
+    """Layout of the view's active cellview, or None"""
+    try:
+        cellview = view.active_cellview()
+        return cellview.layout() if cellview.is_valid() else None
+    except Exception:
+        return None
+
+
+class FibEditSession:
+    """Context manager grouping layout edits into one undo step and one redraw
+
+    Args:
+        view: pya.LayoutView (None: the main window's current view)
+        description (str): Undo/redo menu text
+        layout: pya.Layout (None: the view's active layout)
+
+    Example:
+        >>> with FibEditSession(view, "FIB: rearrange markers"):
+        ...     for marker in markers:
+        ...         rename(marker)
+    """
+
+    # Nesting depth per view (or per layout when there is no view)
+    _depths = {}
+
+    def __init__(self, view=None, description="FIB edit", layout=None):
+        self.view = view if view is not None else _current_view()
+        self.description = description
+        self.layout = layout if layout is not None else (_active_layout(self.view) if self.view is not None else None)
+        self._key = None
+        self._outer = False
+        self._transaction = False
+        self._changes = False
+        self._t0 = 0.0
+
+    @classmethod
+    def depth(cls, view=None, layout=None):
+        """Number of open sessions on a view (or layout)"""
+        target = view if view is not None else layout
+        return cls._depths.get(id(target), 0) if target is not None else 0
+
+    def __enter__(self):
+        target = self.view if self.view is not None else self.layout
+        self._key = id(target)
+        depth = self._depths.get(self._key, 0)
+        self._depths[self._key] = depth + 1
+        if depth == 0 and target is not None:
+            self._outer = True
+            self._t0 = time.perf_counter()
+            self._begin()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        depth = self._depths.get(self._key, 1) - 1
+        if depth > 0:
+            self._depths[self._key] = depth
+        else:
+            self._depths.pop(self._key, None)
+        if self._outer:
+            self._end()
+            get_perf_monitor().record('edit_session', time.perf_counter() - self._t0)
+        return False
+
+    def _begin(self):
+        if self.view is not None:
+            try:
+                # Do not nest into a transaction KLayout (or a macro) already opened
+                if not self.view.is_transacting():
+                    self.view.transaction(self.description)
+                    self._transaction = True
+            except Exception as e:
+                logger.warning("[Edit Session] Could not open transaction '%s': %s", self.description, e)
+        if self.layout is not None:
+            try:
+                self.layout.start_changes()
+                self._changes = True
+            except Exception as e:
+                logger.warning("[Edit Session] Could not start layout changes: %s", e)
+
+    def _end(self):
+        if self._changes:
+            try:
+                self.layout.end_changes()
+            except Exception as e:
+                logger.warning("[Edit Session] Could not end layout changes: %s", e)
+        if self._transaction:
+            try:
+                self.view.commit()
+            except Exception as e:
+                logger.warning("[Edit Session] Could not commit transaction '%s': %s", self.description, e)
+        logger.debug("[Edit Session] Committed '%s'", self.description)
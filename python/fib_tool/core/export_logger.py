@@ -0,0 +1,196 @@
+"""Export logging for FIB Tool
+
+This module provides a buffered, leveled logger shared by all stages of one
+HTML export (screenshots, report generation). One file handle is opened per
+export instead of reopening export_log.txt for every message.
+"""
+
+import time
+from contextlib import contextmanager
+
+from ..config import EXPORT_LOG_CONFIG
+from .perf_monitor import get_perf_monitor
+
+
+LEVELS = {
+    'DEBUG': 10,
+    'INFO': 20,
+    'WARNING': 30,
+    'ERROR': 40,
+}
+
+
+def _level_value(level):
+    """Convert level name (or number) to its numeric value"""
+    if isinstance(level, int):
+        return level
+    return LEVELS.get(str(level).upper(), LEVELS['INFO'])
+
+
+def _ascii_console(message):
+    """Replace Unicode symbols with ASCII equivalents for Windows GBK consoles"""
+    return message.replace('✓', '[OK]').replace('✗', '[X]').replace('ℹ', '[i]')
+
+
+class FibExportLogger:
+    """Buffered export logger with levels, step timings and a quiet mode
+
+    Lines are collected in memory and written through a single open file
+    handle every `buffer_lines` lines and on close(). Each file line carries
+    the elapsed time since the logger was created and its level.
+
+    Attributes:
+        log_path (str): Log file path or None for console-only logging
+        timings (dict): Accumulated seconds per step name (see step())
+
+    Example:
+        >>> with FibExportLogger('/tmp/export_log.txt', mode='w') as log:
+        ...     with log.step('screenshots'):
+        ...         log.info("[Screenshot] Processing CUT_0...")
+    """
+
+    def __init__(self, log_path=None, mode='a', level=None, console_level=None,
+                 quiet=None, buffer_lines=None):
+        """Open the log file (if any) once for the whole export
+
+        Args:
+            log_path: Log file path, or None to log to console only
+            mode (str): 'w' to start a fresh log, 'a' to append
+            level: Minimum level written to the file (default from config)
+            console_level: Minimum level printed to the console (default from config)
+            quiet (bool): If True, nothing is printed to the console
+            buffer_lines (int): Number of buffered lines before flushing to disk
+        """
+        self.log_path = str(log_path) if log_path else None
+        self.level = _level_value(level or EXPORT_LOG_CONFIG['level'])
+        self.console_level = _level_value(console_level or EXPORT_LOG_CONFIG['console_level'])
+        self.quiet = EXPORT_LOG_CONFIG['quiet'] if quiet is None else quiet
+        self.buffer_lines = buffer_lines or EXPORT_LOG_CONFIG['buffer_lines']
+
+        self.timings = {}
+        self._steps = []  # Stack of active step names
+        self._buffer = []
+        self._file = None
+        self._start = time.perf_counter()
+
+        if self.log_path:
+            try:
+                self._file = open(self.log_path, mode, encoding='utf-8')
+            except OSError as e:
+                self._console(f"[Export Log] Cannot open log file {self.log_path}: {e}")
+
+    # ------------------------------------------------------------------
+    # Logging
+    # ------------------------------------------------------------------
+
+    def log(self, message, level='INFO'):
+        """Log a message at the given level"""
+        value = _level_value(level)
+
+        if not self.quiet and value >= self.console_level:
+            self._console(message)
+
+        if self._file is not None and value >= self.level:
+            elapsed = time.perf_counter() - self._start
+            level_name = level if isinstance(level, str) else 'INFO'
+            self._buffer.append(f"[{elapsed:9.3f}s] [{level_name.upper():<7}] {message}\n")
+            if len(self._buffer) >= self.buffer_lines:
+                self.flush()
+
+    def debug(self, message):
+        self.log(message, 'DEBUG')
+
+    def info(self, message):
+        self.log(message, 'INFO')
+
+    def warning(self, message):
+        self.log(message, 'WARNING')
+
+    def error(self, message):
+        self.log(message, 'ERROR')
+
+    def __call__(self, message):
+        """Allow the logger to be passed where a plain log(message) function is expected"""
+        self.info(message)
+
+    def exception(self, message):
+        """Log an error message followed by the current traceback"""
+        import traceback
+        self.error(message)
+        self.error(traceback.format_exc())
+
+    # ------------------------------------------------------------------
+    # Step timing
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def step(self, name):
+        """Time a named export step; repeated steps accumulate in self.timings
+
+        Each step is also recorded in the performance monitor as 'export.<name>'.
+        """
+        self._steps.append(name)
+        t0 = time.perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - t0
+            self._steps.pop()
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+            get_perf_monitor().record(f"export.{name}", elapsed)
+            self.debug(f"[Timing] {name}: {elapsed:.3f}s")
+
+    def current_step(self):
+        """Name of the innermost active step, or None"""
+        return self._steps[-1] if self._steps else None
+
+    def elapsed(self):
+        """Seconds since this logger was created"""
+        return time.perf_counter() - self._start
+
+    def timing_summary(self):
+        """Return step timings as printable lines"""
+        lines = [f"[Timing] {name}: {seconds:.3f}s" for name, seconds in self.timings.items()]
+        lines.append(f"[Timing] total: {self.elapsed():.3f}s")
+        return lines
+
+    # ------------------------------------------------------------------
+    # File handling
+    # ------------------------------------------------------------------
+
+    def flush(self):
+        """Write buffered lines to the log file"""
+        if self._file is None or not self._buffer:
+            return
+        try:
+            self._file.write(''.join(self._buffer))
+            self._file.flush()
+        except OSError as e:
+            self._console(f"[Export Log] Error writing log file: {e}")
+        self._buffer = []
+
+    def close(self):
+        """Write timing summary, flush and close the log file"""
+        if self.timings:
+            for line in self.timing_summary():
+                self.info(line)
+        self.flush()
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+        return False
+
+    def _console(self, message):
+        try:
+            print(_ascii_console(message))
+        except Exception:
+            pass
@@ -2,10 +2,55 @@
 
 This module provides common geometry calculations for markers including
 distance calculations, direction detection, and bounding box computations.
+
+Markers keep their coordinates as integers in CANONICAL_DBU (config) and
+expose micron floats as properties; to_canonical / from_canonical convert
+between the two and get_marker_db_points gives layout database units.
+
+calculate_distance, get_bounding_box, boxes_in_region and transform_points
+also take whole columns (see core.marker_table): NumPy arrays are processed
+vectorized, other sequences in pure Python. NumPy is optional; it is only
+imported by get_numpy() (core.marker_table builds its arrays with it).
 """
 
 import math
 
+from ..config import CANONICAL_DBU
+
+# Canonical units per micron (100000 for CANONICAL_DBU = 0.00001)
+CANONICAL_SCALE = int(round(1.0 / CANONICAL_DBU))
+
+_dbu_factors = {}  # layout dbu -> canonical units per database unit (0 = not a whole number)
+
+_numpy_module = None  # numpy, or False if not installed (see get_numpy)
+
+
+def get_numpy():
+    """The numpy module, or None if it is not installed
+
+    Imported on the first call so that loading the tool does not pay for it.
+    """
+    global _numpy_module
+    if _numpy_module is None:
+        try:
+            import numpy
+            _numpy_module = numpy
+        except ImportError:
+            _numpy_module = False
+    return _numpy_module or None
+
+
+def _is_column(value):
+    """True for arrays / sequences of coordinates, False for scalars"""
+    return hasattr(value, '__len__')
+
+
+def _vector_backend(*values):
+    """numpy if any value is a NumPy array, None for pure Python"""
+    if any(hasattr(value, 'ndim') for value in values):
+        return get_numpy()
+    return None
+
 
 def calculate_distance(x1, y1, x2, y2):
     """Calculate Euclidean distance between two points
@@ -13,14 +58,24 @@ def calculate_distance(x1, y1, x2, y2):
     Args:
         x1, y1: First point coordinates (in microns)
         x2, y2: Second point coordinates (in microns)
+        Each may also be a column (array or sequence) of coordinates.
 
     Returns:
-        float: Distance in microns
+        float: Distance in microns (array / list of distances for columns)
 
     Example:
         >>> calculate_distance(0, 0, 3, 4)
         5.0
+        >>> calculate_distance([0, 0], [0, 1], [3, 0], [4, 1])
+        [5.0, 0.0]
     """
+    if _is_column(x1) or _is_column(y1) or _is_column(x2) or _is_column(y2):
+        np = _vector_backend(x1, y1, x2, y2)
+        if np is not None:
+            return np.hypot(np.asarray(x2, dtype=float) - x1, np.asarray(y2, dtype=float) - y1)
+        n = max(len(v) for v in (x1, y1, x2, y2) if _is_column(v))
+        x1, y1, x2, y2 = ((v if _is_column(v) else [v] * n) for v in (x1, y1, x2, y2))
+        return [math.hypot(bx - ax, by - ay) for ax, ay, bx, by in zip(x1, y1, x2, y2)]
     dx = x2 - x1
     dy = y2 - y1
     return math.sqrt(dx * dx + dy * dy)
@@ -55,7 +110,7 @@ def get_bounding_box(points):
     """Calculate bounding box for a list of points
 
     Args:
-        points: List of (x, y) tuples in microns
+        points: List of (x, y) tuples in microns, or an (N, 2) array
 
     Returns:
         tuple: (min_x, min_y, max_x, max_y) or None if points is empty
@@ -64,6 +119,11 @@ def get_bounding_box(points):
         >>> get_bounding_box([(0, 0), (10, 5), (3, 8)])
         (0, 0, 10, 8)
     """
+    if hasattr(points, 'ndim'):
+        if not len(points):
+            return None
+        low, high = points.min(axis=0), points.max(axis=0)
+        return (low[0].item(), low[1].item(), high[0].item(), high[1].item())
     if not points:
         return None
 
@@ -73,6 +133,205 @@ def get_bounding_box(points):
     return (min(xs), min(ys), max(xs), max(ys))
 
 
+def boxes_in_region(boxes, region, inside=False):
+    """Indices of the boxes that overlap (or lie inside) a region
+
+    Args:
+        boxes: Sequence of (min_x, min_y, max_x, max_y), or an (N, 4) array
+        region: (min_x, min_y, max_x, max_y) in the same units
+        inside (bool): True = boxes completely inside the region,
+            False = boxes overlapping or touching it
+
+    Returns:
+        Array (for a NumPy `boxes` array) or list of indices into `boxes`, ascending
+
+    Example:
+        >>> boxes_in_region([(0, 0, 1, 1), (5, 5, 6, 6)], (0.5, 0.5, 2, 2))
+        [0]
+    """
+    rx1, ry1, rx2, ry2 = region
+    np = _vector_backend(boxes)
+    if np is not None:
+        if inside:
+            mask = (boxes[:, 0] >= rx1) & (boxes[:, 1] >= ry1) & (boxes[:, 2] <= rx2) & (boxes[:, 3] <= ry2)
+        else:
+            mask = (boxes[:, 2] >= rx1) & (boxes[:, 3] >= ry1) & (boxes[:, 0] <= rx2) & (boxes[:, 1] <= ry2)
+        return np.flatnonzero(mask)
+    if inside:
+        return [i for i, (x1, y1, x2, y2) in enumerate(boxes)
+                if x1 >= rx1 and y1 >= ry1 and x2 <= rx2 and y2 <= ry2]
+    return [i for i, (x1, y1, x2, y2) in enumerate(boxes)
+            if x2 >= rx1 and y2 >= ry1 and x1 <= rx2 and y1 <= ry2]
+
+
+def transform_points(xs, ys, matrix):
+    """Apply an affine transformation to columns of coordinates
+
+    Args:
+        xs, ys: Coordinates (arrays, sequences or scalars)
+        matrix: (m11, m12, m21, m22, dx, dy) with
+            x' = m11 * x + m12 * y + dx and y' = m21 * x + m22 * y + dy
+
+    Returns:
+        tuple: (xs', ys') as float arrays (NumPy input), lists, or scalars
+
+    Example:
+        >>> transform_points([1.0], [0.0], (0, -1, 1, 0, 10, 0))  # rotate 90, shift x
+        ([10.0], [1.0])
+    """
+    m11, m12, m21, m22, dx, dy = matrix
+    if not _is_column(xs):
+        return m11 * xs + m12 * ys + dx, m21 * xs + m22 * ys + dy
+    np = _vector_backend(xs, ys)
+    if np is not None:
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        return m11 * xs + m12 * ys + dx, m21 * xs + m22 * ys + dy
+    return ([m11 * x + m12 * y + dx for x, y in zip(xs, ys)],
+            [m21 * x + m22 * y + dy for x, y in zip(xs, ys)])
+
+
+def get_marker_points(marker):
+    """Get all defining points of a marker
+
+    Args:
+        marker: Probe (x, y), cut/connect (x1, y1, x2, y2) or multipoint (points)
+
+    Returns:
+        list: (x, y) tuples in microns
+
+    Example:
+        >>> class Probe:
+        ...     x, y = 1.0, 2.0
+        >>> get_marker_points(Probe())
+        [(1.0, 2.0)]
+    """
+    if hasattr(marker, 'points'):
+        return list(marker.points)
+    if hasattr(marker, 'x1'):
+        return [(marker.x1, marker.y1), (marker.x2, marker.y2)]
+    return [(marker.x, marker.y)]
+
+
+def to_canonical(value):
+    """Microns -> canonical integer units (rounded to the nearest unit)
+
+    Example:
+        >>> to_canonical(1.2345999)
+        123460
+    """
+    return int(round(value * CANONICAL_SCALE))
+
+
+def from_canonical(value):
+    """Canonical integer units -> microns
+
+    Dividing by the integer scale gives the float nearest to the decimal
+    value, so from_canonical(to_canonical(x)) prints with at most five
+    decimals and round-trips exactly.
+
+    Example:
+        >>> from_canonical(123460)
+        1.2346
+    """
+    return value / CANONICAL_SCALE
+
+
+def to_dbu(value, dbu):
+    """Microns -> layout database units (rounded, not truncated)"""
+    return int(round(value / dbu))
+
+
+def _dbu_factor(dbu):
+    factor = _dbu_factors.get(dbu)
+    if factor is None:
+        ratio = dbu / CANONICAL_DBU
+        factor = int(round(ratio)) if ratio >= 0.5 and abs(ratio - round(ratio)) < 1e-6 else 0
+        _dbu_factors[dbu] = factor
+    return factor
+
+
+def canonical_to_dbu(value, dbu):
+    """Canonical integer units -> layout database units
+
+    Integer arithmetic (halves round up) when the dbu is a whole number of
+    canonical units, which covers the usual layout dbus.
+    """
+    factor = _dbu_factor(dbu)
+    if factor == 1:
+        return value
+    if factor:
+        return (2 * value + factor) // (2 * factor)
+    return int(round(value * CANONICAL_DBU / dbu))
+
+
+def check_coordinate_grid(file_dbu, layout_dbu):
+    """Error message if a project's coordinate grid is coarser than the layout's
+
+    Coordinates saved on a coarser grid have already lost the positions
+    between its points, so loading them onto the finer layout would
+    silently move markers.
+
+    Args:
+        file_dbu (float): Unit of the file's integer coordinates (None = float microns)
+        layout_dbu (float): Database unit of the target layout (None = unknown)
+
+    Returns:
+        str or None: Error message, None if the file can be loaded
+    """
+    if file_dbu is None or layout_dbu is None or file_dbu <= layout_dbu * (1 + 1e-9):
+        return None
+    return (f"Project coordinates are stored on a {file_dbu:g} um grid, "
+            f"coarser than the layout's {layout_dbu:g} um database unit")
+
+
+def get_marker_db_points(marker, dbu=CANONICAL_DBU):
+    """Get all defining points of a marker in layout database units
+
+    Uses the canonical integer fields (ipoints, ix1.., ix) when the marker
+    has them, otherwise rounds the micron coordinates.
+
+    Args:
+        marker: Marker object
+        dbu (float): Layout database unit in microns
+
+    Returns:
+        list: (x, y) integer tuples
+    """
+    if hasattr(marker, 'ipoints'):
+        points = marker.ipoints
+    elif hasattr(marker, 'ix1'):
+        points = [(marker.ix1, marker.iy1), (marker.ix2, marker.iy2)]
+    elif hasattr(marker, 'ix'):
+        points = [(marker.ix, marker.iy)]
+    else:
+        return [(to_dbu(x, dbu), to_dbu(y, dbu)) for x, y in get_marker_points(marker)]
+    if dbu == CANONICAL_DBU:
+        return list(points)
+    factor = _dbu_factor(dbu)
+    if factor:
+        # Inlined canonical_to_dbu (hot path: drawing and erasing markers)
+        half, twice = factor, 2 * factor
+        return [((2 * x + half) // twice, (2 * y + half) // twice) for x, y in points]
+    return [(canonical_to_dbu(x, dbu), canonical_to_dbu(y, dbu)) for x, y in points]
+
+
+def set_marker_db_points(marker, points):
+    """Replace the defining points of a marker (inverse of get_marker_db_points)
+
+    Args:
+        marker: Marker object with canonical fields (ipoints, ix1.., ix)
+        points: (x, y) integer tuples in canonical units, as many as
+            get_marker_db_points(marker) returns
+    """
+    if hasattr(marker, 'ipoints'):
+        marker.ipoints = points
+    elif hasattr(marker, 'ix1'):
+        (marker.ix1, marker.iy1), (marker.ix2, marker.iy2) = points[0], points[-1]
+    else:
+        marker.ix, marker.iy = points[0]
+
+
 def get_marker_center(marker):
     """Get center point of a marker
 
@@ -110,3 +369,175 @@ def get_marker_center(marker):
 
     # Fallback
     return (0.0, 0.0)
+
+
+def point_segment_distance(px, py, x1, y1, x2, y2):
+    """Distance from a point to a line segment
+
+    Args:
+        px, py: Point coordinates (in microns)
+        x1, y1, x2, y2: Segment end points (in microns)
+
+    Returns:
+        float: Distance in microns
+
+    Example:
+        >>> point_segment_distance(5, 3, 0, 0, 10, 0)
+        3.0
+    """
+    dx = x2 - x1
+    dy = y2 - y1
+    length_sq = dx * dx + dy * dy
+    if length_sq > 0.0:
+        t = ((px - x1) * dx + (py - y1) * dy) / length_sq
+        if t > 1.0:
+            t = 1.0
+        elif t < 0.0:
+            t = 0.0
+        x1 += t * dx
+        y1 += t * dy
+    return math.hypot(px - x1, py - y1)
+
+
+def point_marker_distance(x, y, marker):
+    """Distance from a point to a marker's geometry
+
+    Probes are points, cut/connect markers segments and multi-point markers
+    polylines (as drawn, without the marker width).
+
+    Args:
+        x, y: Point coordinates (in microns)
+        marker: Any FIB marker
+
+    Returns:
+        float: Distance in microns (inf for a marker without points)
+
+    Example:
+        >>> class Cut:
+        ...     x1, y1, x2, y2 = 0.0, 0.0, 10.0, 0.0
+        >>> point_marker_distance(5.0, -2.0, Cut())
+        2.0
+    """
+    points = get_marker_points(marker)
+    if not points:
+        return math.inf
+    if len(points) == 1:
+        return math.hypot(x - points[0][0], y - points[0][1])
+    return min(point_segment_distance(x, y, ax, ay, bx, by)
+               for (ax, ay), (bx, by) in zip(points, points[1:]))
+
+
+def point_box_distance(x, y, box):
+    """Distance from a point to a (min_x, min_y, max_x, max_y) box (0 inside)
+
+    Example:
+        >>> point_box_distance(13, 4, (0, 0, 10, 8))
+        3.0
+    """
+    dx = max(box[0] - x, 0.0, x - box[2])
+    dy = max(box[1] - y, 0.0, y - box[3])
+    return math.hypot(dx, dy)
+
+
+def closest_point_on_segment(px, py, x1, y1, x2, y2):
+    """Point of a line segment closest to (px, py)
+
+    Example:
+        >>> closest_point_on_segment(5, 3, 0, 0, 10, 0)
+        (5.0, 0.0)
+    """
+    dx = x2 - x1
+    dy = y2 - y1
+    length_sq = dx * dx + dy * dy
+    if length_sq <= 0.0:
+        return x1, y1
+    t = min(1.0, max(0.0, ((px - x1) * dx + (py - y1) * dy) / length_sq))
+    return x1 + t * dx, y1 + t * dy
+
+
+def _orientation(ax, ay, bx, by, cx, cy):
+    """Sign of the cross product (b - a) x (c - a)"""
+    cross = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    return (cross > 0) - (cross < 0)
+
+
+def segments_intersect(ax1, ay1, ax2, ay2, bx1, by1, bx2, by2):
+    """True if two line segments touch or cross
+
+    Example:
+        >>> segments_intersect(0, 0, 10, 10, 0, 10, 10, 0)
+        True
+    """
+    o1 = _orientation(ax1, ay1, ax2, ay2, bx1, by1)
+    o2 = _orientation(ax1, ay1, ax2, ay2, bx2, by2)
+    o3 = _orientation(bx1, by1, bx2, by2, ax1, ay1)
+    o4 = _orientation(bx1, by1, bx2, by2, ax2, ay2)
+    if o1 != o2 and o3 != o4:
+        return True
+    # Collinear cases: an end point lies on the other segment
+    return ((o1 == 0 and point_segment_distance(bx1, by1, ax1, ay1, ax2, ay2) == 0.0) or
+            (o2 == 0 and point_segment_distance(bx2, by2, ax1, ay1, ax2, ay2) == 0.0) or
+            (o3 == 0 and point_segment_distance(ax1, ay1, bx1, by1, bx2, by2) == 0.0) or
+            (o4 == 0 and point_segment_distance(ax2, ay2, bx1, by1, bx2, by2) == 0.0))
+
+
+def segment_segment_distance(ax1, ay1, ax2, ay2, bx1, by1, bx2, by2):
+    """Distance between two line segments (0 if they touch or cross)
+
+    Degenerate segments (both end points equal) are points.
+
+    Example:
+        >>> segment_segment_distance(0, 0, 10, 0, 5, 2, 5, 8)
+        2.0
+    """
+    if segments_intersect(ax1, ay1, ax2, ay2, bx1, by1, bx2, by2):
+        return 0.0
+    # Otherwise the closest pair involves an end point of one segment
+    return min(point_segment_distance(ax1, ay1, bx1, by1, bx2, by2),
+               point_segment_distance(ax2, ay2, bx1, by1, bx2, by2),
+               point_segment_distance(bx1, by1, ax1, ay1, ax2, ay2),
+               point_segment_distance(bx2, by2, ax1, ay1, ax2, ay2))
+
+
+def get_marker_segments(marker):
+    """Line segments of a marker's geometry (as drawn, without width)
+
+    A probe is one degenerate segment (its point), cut/connect markers one
+    segment and multi-point markers one segment per polyline edge.
+
+    Returns:
+        list: (x1, y1, x2, y2) tuples in microns
+
+    Example:
+        >>> class Probe:
+        ...     x, y = 1.0, 2.0
+        >>> get_marker_segments(Probe())
+        [(1.0, 2.0, 1.0, 2.0)]
+    """
+    points = get_marker_points(marker)
+    if len(points) == 1:
+        x, y = points[0]
+        return [(x, y, x, y)]
+    return [(ax, ay, bx, by) for (ax, ay), (bx, by) in zip(points, points[1:])]
+
+
+def marker_marker_distance(marker_a, marker_b):
+    """Distance between the geometry of two markers (0 if they touch or cross)
+
+    Example:
+        >>> class Cut:
+        ...     x1, y1, x2, y2 = 0.0, 0.0, 10.0, 0.0
+        >>> class Probe:
+        ...     x, y = 4.0, 3.0
+        >>> marker_marker_distance(Cut(), Probe())
+        3.0
+    """
+    best = math.inf
+    for a in get_marker_segments(marker_a):
+        for b in get_marker_segments(marker_b):
+            d = segment_segment_distance(*a, *b)
+            if d < best:
+                best = d
+                if best == 0.0:
+                    return best
+    return best
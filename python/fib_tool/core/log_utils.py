@@ -0,0 +1,131 @@
+"""Package-wide logging for FIB Tool
+
+All modules log through ``get_logger('<module>')``, which returns the
+standard-library logger ``fib_tool.<module>``. Messages use %-style
+arguments so nothing is formatted unless the level is enabled:
+
+    logger = get_logger('layer_tap')
+    logger.debug("[Layer Tap] Searching at (%.3f, %.3f) um", x, y)
+
+Levels come from LOGGING_CONFIG in config.py and can be overridden with the
+FIB_TOOL_LOG environment variable:
+
+    FIB_TOOL_LOG=DEBUG                       everything at DEBUG
+    FIB_TOOL_LOG=layer_tap=DEBUG             one module
+    FIB_TOOL_LOG=INFO,fib_plugin=DEBUG       default + per-module levels
+
+Output goes to the current sys.stdout (KLayout's Macro Development console
+replaces sys.stdout after startup), without extra prefixes - messages carry
+their own "[Module]" tag as the former print statements did.
+"""
+
+import logging
+import os
+import sys
+
+from ..config import LOGGING_CONFIG
+
+
+ROOT_LOGGER_NAME = 'fib_tool'
+ENV_VAR = 'FIB_TOOL_LOG'
+
+_configured = False
+
+
+class _ConsoleHandler(logging.Handler):
+    """Write records to whatever sys.stdout currently is"""
+
+    def emit(self, record):
+        try:
+            stream = sys.stdout
+            if stream is None:
+                return
+            stream.write(self.format(record) + '\n')
+        except Exception:
+            self.handleError(record)
+
+
+def _level(value, default=logging.INFO):
+    if isinstance(value, int):
+        return value
+    level = logging.getLevelName(str(value).strip().upper())
+    return level if isinstance(level, int) else default
+
+
+def parse_level_spec(spec):
+    """Parse "LEVEL,module=LEVEL,..." into (default_level or None, {module: level})
+
+    Example:
+        >>> parse_level_spec("INFO,layer_tap=DEBUG")
+        (20, {'layer_tap': 10})
+    """
+    default = None
+    modules = {}
+    for part in (spec or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '=' in part:
+            module, level = part.split('=', 1)
+            modules[module.strip()] = _level(level)
+        else:
+            default = _level(part)
+    return default, modules
+
+
+def configure_logging(config=None, env=None):
+    """(Re)apply logging levels and the console handler
+
+    Args:
+        config (dict): Overrides LOGGING_CONFIG (default_level, levels, format)
+        env (str): Overrides the FIB_TOOL_LOG environment variable
+    """
+    global _configured
+    config = config or LOGGING_CONFIG
+
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    root.propagate = False
+    # Match by class name: a reloaded log_utils module has a new _ConsoleHandler class
+    console_handlers = [h for h in root.handlers if type(h).__name__ == _ConsoleHandler.__name__]
+    if not console_handlers:
+        console_handlers = [_ConsoleHandler()]
+        root.addHandler(console_handlers[0])
+    for handler in console_handlers:
+        handler.setFormatter(logging.Formatter(config.get('format', '%(message)s')))
+
+    default_level = _level(config.get('default_level', 'INFO'))
+    module_levels = {name: _level(level) for name, level in config.get('levels', {}).items()}
+
+    env_default, env_modules = parse_level_spec(os.environ.get(ENV_VAR, '') if env is None else env)
+    if env_default is not None:
+        # A global level from the environment applies to every module
+        default_level = env_default
+        module_levels = {}
+    module_levels.update(env_modules)
+
+    root.setLevel(default_level)
+    for name in list(logging.Logger.manager.loggerDict):
+        if name.startswith(ROOT_LOGGER_NAME + '.'):
+            logging.getLogger(name).setLevel(logging.NOTSET)
+    for module, level in module_levels.items():
+        logging.getLogger(f"{ROOT_LOGGER_NAME}.{module}").setLevel(level)
+
+    _configured = True
+
+
+def get_logger(module):
+    """Logger for a FIB Tool module, e.g. get_logger('layer_tap')
+
+    Args:
+        module (str): Short module name (also accepts __name__ like 'fib_tool.layer_tap')
+    """
+    if not _configured:
+        configure_logging()
+    short_name = module.rsplit('.', 1)[-1]
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{short_name}")
+
+
+def set_log_level(level, module=None):
+    """Change a level at runtime, e.g. set_log_level('DEBUG', 'layer_tap')"""
+    name = ROOT_LOGGER_NAME if module is None else f"{ROOT_LOGGER_NAME}.{module}"
+    logging.getLogger(name).setLevel(_level(level))
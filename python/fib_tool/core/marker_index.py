@@ -0,0 +1,321 @@
+"""Search index for the marker list filter
+
+FibMarkerIndex keeps prebuilt lookup tables over the markers so a filter
+query is answered from set lookups and bisect ranges instead of scanning
+and formatting every marker:
+
+    type    -> markers of that type (cut, connect, probe, multi)
+    id      -> sorted ids (parallel key list) for prefix ranges
+    layer   -> markers per detected layer name (layer1/layer2/target_layer/
+               point_layers/target_layers)
+    note    -> markers per note word
+    region  -> grid spatial index over bounding boxes (core.spatial_index)
+
+Query syntax (case-insensitive, terms separated by spaces are AND-ed):
+    cut                     bare term: type, id prefix, layer prefix or note word prefix
+    type:probe              marker type
+    id:CUT_1                id prefix
+    layer:M1                layer name prefix
+    note:open               note word prefix
+    region:x1,y1,x2,y2      bounding box touches the region (um)
+
+Markers are keyed by id(marker); the owner (the marker list model) keeps
+the marker objects alive.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+
+from .geometry_utils import get_bounding_box, get_marker_points
+from .spatial_index import FibMarkerSpatialIndex
+
+
+QUERY_FIELDS = ('type', 'id', 'layer', 'note', 'region')
+
+_PREFIX_END = '\U0010ffff'
+_WORD_RE = re.compile(r'\w+')
+
+
+def marker_type_names(marker):
+    """Type names a marker is found under, e.g. ('cut', 'multi')"""
+    class_name = marker.__class__.__name__.lower()
+    names = [name for name in ('cut', 'connect', 'probe') if name in class_name]
+    if 'multipoint' in class_name:
+        names.append('multi')
+    return tuple(names)
+
+
+def marker_layer_names(marker):
+    """Detected layer names of a marker (lower case, without duplicates)"""
+    names = []
+    for attr in ('layer1', 'layer2', 'target_layer'):
+        value = getattr(marker, attr, None)
+        if value:
+            names.append(str(value))
+    for attr in ('point_layers', 'target_layers'):
+        for value in getattr(marker, attr, None) or ():
+            if value:
+                names.append(str(value))
+    return tuple(dict.fromkeys(name.lower() for name in names))
+
+
+def parse_query(text):
+    """Split a filter string into (field, value) terms
+
+    Example:
+        >>> parse_query("cut layer:M1")
+        [('', 'cut'), ('layer', 'm1')]
+    """
+    terms = []
+    for word in (text or '').lower().split():
+        field, sep, value = word.partition(':')
+        if sep and field in QUERY_FIELDS:
+            if value:
+                terms.append((field, value))
+        else:
+            terms.append(('', word))
+    return terms
+
+
+def _parse_region(value):
+    try:
+        x1, y1, x2, y2 = (float(v) for v in value.split(','))
+    except ValueError:
+        return None
+    return (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+
+
+class _Entry:
+    """Indexed values of one marker (kept so removal works after edits)"""
+
+    __slots__ = ('marker', 'id', 'types', 'layers', 'words', 'bbox')
+
+    def __init__(self, marker):
+        self.marker = marker
+        self.id = str(marker.id).lower()
+        self.types = marker_type_names(marker)
+        self.layers = marker_layer_names(marker)
+        self.words = tuple(dict.fromkeys(_WORD_RE.findall(str(getattr(marker, 'notes', '') or '').lower())))
+        self.bbox = get_bounding_box(get_marker_points(marker))
+
+
+class FibMarkerIndex:
+    """Prebuilt indices for filtering markers
+
+    Example:
+        >>> index = FibMarkerIndex()
+        >>> index.rebuild(markers)
+        >>> keys = index.match("type:cut layer:m2")
+        >>> visible = [m for m in markers if id(m) in keys]
+    """
+
+    def __init__(self):
+        self._entries = {}     # key -> _Entry
+        self._by_type = {}     # type name -> set(keys)
+        self._id_values = []   # sorted lower-case ids
+        self._id_keys = []     # keys in _id_values order
+        self._by_layer = {}    # layer name -> set(keys)
+        self._by_word = {}     # note word -> set(keys)
+        self._layer_names = None  # sorted layer names, rebuilt lazily
+        self._words = None        # sorted note words, rebuilt lazily
+        self.spatial = FibMarkerSpatialIndex()  # bounding boxes (region, nearest)
+        self._cache = {}       # (field, value) -> set(keys)
+
+    def __len__(self):
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def rebuild(self, markers):
+        """Index all markers from scratch"""
+        self.__init__()
+        ids = []
+        for marker in markers:
+            key = id(marker)
+            entry = _Entry(marker)
+            self._entries[key] = entry
+            self._link(key, entry)
+            ids.append((entry.id, key))
+            self.spatial.add(marker, entry.bbox)
+        ids.sort()
+        self._id_values = [value for value, _ in ids]
+        self._id_keys = [key for _, key in ids]
+
+    def add(self, marker):
+        key = id(marker)
+        if key in self._entries:
+            self.remove(marker)
+        entry = _Entry(marker)
+        self._entries[key] = entry
+        self._link(key, entry)
+        self._insert_sorted(self._id_values, self._id_keys, entry.id, key)
+        self.spatial.add(marker, entry.bbox)
+        self._cache.clear()
+
+    def remove(self, marker):
+        key = id(marker)
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for name in entry.types:
+            self._discard(self._by_type, name, key)
+        for name in entry.layers:
+            if self._discard(self._by_layer, name, key):
+                self._layer_names = None
+        for word in entry.words:
+            if self._discard(self._by_word, word, key):
+                self._words = None
+        self._remove_sorted(self._id_values, self._id_keys, entry.id, key)
+        self.spatial.remove(marker)
+        self._cache.clear()
+
+    def update(self, marker):
+        """Re-index a marker after its id, notes, layers or geometry changed"""
+        self.remove(marker)
+        self.add(marker)
+
+    def _link(self, key, entry):
+        for name in entry.types:
+            self._by_type.setdefault(name, set()).add(key)
+        for name in entry.layers:
+            if name not in self._by_layer:
+                self._layer_names = None
+            self._by_layer.setdefault(name, set()).add(key)
+        for word in entry.words:
+            if word not in self._by_word:
+                self._words = None
+            self._by_word.setdefault(word, set()).add(key)
+
+    @staticmethod
+    def _discard(table, name, key):
+        """Remove key from table[name]; True if the name disappeared"""
+        keys = table.get(name)
+        if keys is None:
+            return False
+        keys.discard(key)
+        if not keys:
+            del table[name]
+            return True
+        return False
+
+    @staticmethod
+    def _insert_sorted(values, keys, value, key):
+        pos = bisect_right(values, value)
+        values.insert(pos, value)
+        keys.insert(pos, key)
+
+    @staticmethod
+    def _remove_sorted(values, keys, value, key):
+        pos = bisect_left(values, value)
+        while pos < len(values) and values[pos] == value:
+            if keys[pos] == key:
+                del values[pos]
+                del keys[pos]
+                return
+            pos += 1
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def match(self, text):
+        """Keys of markers matching a filter string, or None for an empty filter"""
+        terms = parse_query(text)
+        if not terms:
+            return None
+
+        sets = [self._term_keys(field, value) for field, value in terms]
+        sets.sort(key=len)
+        result = set(sets[0])
+        for keys in sets[1:]:
+            if not result:
+                break
+            result &= keys
+        return result
+
+    def matches(self, marker, text):
+        """Check a single marker against a filter string (no index lookup)"""
+        terms = parse_query(text)
+        if not terms:
+            return True
+        entry = _Entry(marker)
+        return all(self._entry_matches(entry, field, value) for field, value in terms)
+
+    def _term_keys(self, field, value):
+        cache_key = (field, value)
+        keys = self._cache.get(cache_key)
+        if keys is not None:
+            return keys
+
+        if field == 'type':
+            keys = self._by_type.get(value, set())
+        elif field == 'id':
+            keys = self._id_prefix(value)
+        elif field == 'layer':
+            keys = self._prefix_union(self._sorted_layer_names(), self._by_layer, value)
+        elif field == 'note':
+            keys = self._prefix_union(self._sorted_words(), self._by_word, value)
+        elif field == 'region':
+            keys = self._region(value)
+        else:
+            keys = set(self._by_type.get(value, ()))
+            keys |= self._id_prefix(value)
+            keys |= self._prefix_union(self._sorted_layer_names(), self._by_layer, value)
+            keys |= self._prefix_union(self._sorted_words(), self._by_word, value)
+
+        self._cache[cache_key] = keys
+        return keys
+
+    def _id_prefix(self, prefix):
+        lo = bisect_left(self._id_values, prefix)
+        hi = bisect_left(self._id_values, prefix + _PREFIX_END, lo)
+        return set(self._id_keys[lo:hi])
+
+    @staticmethod
+    def _prefix_union(names, table, prefix):
+        lo = bisect_left(names, prefix)
+        hi = bisect_left(names, prefix + _PREFIX_END, lo)
+        if hi - lo == 1:
+            return table[names[lo]]
+        keys = set()
+        for name in names[lo:hi]:
+            keys |= table[name]
+        return keys
+
+    def _sorted_layer_names(self):
+        if self._layer_names is None:
+            self._layer_names = sorted(self._by_layer)
+        return self._layer_names
+
+    def _sorted_words(self):
+        if self._words is None:
+            self._words = sorted(self._by_word)
+        return self._words
+
+    def _region(self, value):
+        region = _parse_region(value)
+        if region is None:
+            return set()
+        return self.spatial.window_keys(*region)
+
+    @staticmethod
+    def _entry_matches(entry, field, value):
+        if field == 'type':
+            return value in entry.types
+        if field == 'id':
+            return entry.id.startswith(value)
+        if field == 'layer':
+            return any(name.startswith(value) for name in entry.layers)
+        if field == 'note':
+            return any(word.startswith(value) for word in entry.words)
+        if field == 'region':
+            region = _parse_region(value)
+            if region is None or entry.bbox is None:
+                return False
+            bx1, by1, bx2, by2 = entry.bbox
+            return bx1 <= region[2] and bx2 >= region[0] and by1 <= region[3] and by2 >= region[1]
+        return (value in entry.types or entry.id.startswith(value)
+                or any(name.startswith(value) for name in entry.layers)
+                or any(word.startswith(value) for word in entry.words))
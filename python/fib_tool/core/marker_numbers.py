@@ -0,0 +1,165 @@
+"""Incremental marker numbering for SmartCounter
+
+FibMarkerNumberIndex tracks which numbers are taken per marker type so the
+smallest free number (CUT_0, CUT_1, ...) is found without scanning all ids.
+A marker id counts for type T when it matches ``^T_(\\d+)`` - the same rule
+SmartCounter always used, so ``CUT_3_M1`` takes number 3 and multi-point
+CUT markers share the CUT numbers.
+
+Per type:
+    counts  number -> how many ids use it (ids like CUT_1 and CUT_1_b share 1)
+    low     every number below `low` is either used or in `freed`
+    freed   min-heap of numbers below `low` that became free; entries that
+            were taken again are dropped lazily when they reach the top
+
+next_number() is O(log n) (amortized O(1) while numbers are only added),
+add/remove/rename are O(log n). A type's table is built on its first query.
+
+Markers are keyed by id(marker); the owner (the marker list model) keeps
+the marker objects alive and reports add/remove/rename/rebuild.
+"""
+
+import heapq
+import re
+
+
+_DIGITS_RE = re.compile(r'\d+')
+
+
+class _TypeNumbers:
+    """Used and free numbers of one marker type"""
+
+    __slots__ = ('prefix', 'counts', 'freed', 'low', '_max')
+
+    def __init__(self, marker_type, marker_ids=()):
+        self.prefix = marker_type.upper() + '_'
+        self.counts = {}
+        self.freed = []
+        self.low = 0
+        self._max = -1
+        for marker_id in marker_ids:
+            number = self.number_of(marker_id)
+            if number is not None:
+                self.add(number)
+
+    def number_of(self, marker_id):
+        """Number of an id for this type, or None"""
+        if not marker_id.startswith(self.prefix):
+            return None
+        match = _DIGITS_RE.match(marker_id, len(self.prefix))
+        return int(match.group()) if match else None
+
+    def add(self, number):
+        self.counts[number] = self.counts.get(number, 0) + 1
+        if self._max is not None and number > self._max:
+            self._max = number
+
+    def remove(self, number):
+        count = self.counts.get(number, 0) - 1
+        if count > 0:
+            self.counts[number] = count
+            return
+        self.counts.pop(number, None)
+        if number < self.low:
+            heapq.heappush(self.freed, number)
+            if len(self.freed) > 2 * len(self.counts) + 64:
+                # Too many stale entries: keep only numbers that are still free
+                self.freed = sorted(set(n for n in self.freed if n not in self.counts))
+        if number == self._max:
+            self._max = None  # Recomputed on demand
+
+    def next_number(self):
+        counts, freed = self.counts, self.freed
+        while freed:
+            if freed[0] not in counts:
+                return freed[0]
+            heapq.heappop(freed)
+        while self.low in counts:
+            self.low += 1
+        return self.low
+
+    def max_number(self):
+        """Largest used number, or -1"""
+        if self._max is None:
+            self._max = max(self.counts) if self.counts else -1
+        return self._max
+
+
+class FibMarkerNumberIndex:
+    """Used/free marker numbers per type, updated on add/remove/rename
+
+    Example:
+        >>> index = FibMarkerNumberIndex()
+        >>> index.rebuild(markers)          # CUT_0, CUT_2, PROBE_0
+        >>> index.next_number('cut')
+        1
+    """
+
+    def __init__(self):
+        self._ids = {}    # id(marker) -> marker id string
+        self._types = {}  # TYPE -> _TypeNumbers (only for queried types)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def rebuild(self, markers):
+        """Index all markers from scratch"""
+        self._ids = {id(marker): str(marker.id) for marker in markers}
+        for marker_type in list(self._types):
+            self._types[marker_type] = _TypeNumbers(marker_type, self._ids.values())
+
+    def add(self, marker):
+        key = id(marker)
+        if key in self._ids:
+            self.remove(marker)
+        marker_id = str(marker.id)
+        self._ids[key] = marker_id
+        self._add_id(marker_id)
+
+    def remove(self, marker):
+        marker_id = self._ids.pop(id(marker), None)
+        if marker_id is not None:
+            self._remove_id(marker_id)
+
+    def update(self, marker):
+        """Re-index a marker after its id changed (rename)"""
+        key = id(marker)
+        old_id = self._ids.get(key)
+        new_id = str(marker.id)
+        if old_id == new_id:
+            return
+        if old_id is not None:
+            self._remove_id(old_id)
+        self._ids[key] = new_id
+        self._add_id(new_id)
+
+    def _add_id(self, marker_id):
+        for numbers in self._types.values():
+            number = numbers.number_of(marker_id)
+            if number is not None:
+                numbers.add(number)
+
+    def _remove_id(self, marker_id):
+        for numbers in self._types.values():
+            number = numbers.number_of(marker_id)
+            if number is not None:
+                numbers.remove(number)
+
+    def _numbers(self, marker_type):
+        key = marker_type.upper()
+        numbers = self._types.get(key)
+        if numbers is None:
+            numbers = self._types[key] = _TypeNumbers(key, self._ids.values())
+        return numbers
+
+    def next_number(self, marker_type):
+        """Smallest number not used by any ``TYPE_<n>...`` id"""
+        return self._numbers(marker_type).next_number()
+
+    def used_numbers(self, marker_type):
+        """Set of numbers used by the given type"""
+        return set(self._numbers(marker_type).counts)
+
+    def max_number(self, marker_type):
+        """Largest used number of the given type, or -1"""
+        return self._numbers(marker_type).max_number()
@@ -0,0 +1,229 @@
+"""Columnar view of the marker list
+
+FibMarkerTable holds the geometry of a marker list column-wise so bulk
+operations work on arrays instead of one marker object at a time:
+
+    kinds       kind code per row (KIND_CODES)
+    x1, y1      first point; x2, y2 last point (probes: same as the first)
+    boxes       (min_x, min_y, max_x, max_y) per row
+    offsets     row i owns points offsets[i]:offsets[i + 1] of xs / ys
+    xs, ys      all points of all markers (cut/connect 2, probe 1, multi-point n)
+
+Columns are canonical integer units (CANONICAL_DBU); the query methods take
+and return microns. With NumPy the columns are int64 arrays and the queries
+are vectorized, without it they are array('q') and the queries use the pure
+Python paths of geometry_utils.
+
+The marker list model builds the table on first use after any change
+(FibMarkerListModel.marker_table), so it always matches the marker objects:
+
+    table = model.marker_table()
+    box = table.bounding_box()
+    cuts_here = table.markers_in_region((0, 0, 100, 100), kinds=('cut',))
+    xs, ys = table.transformed_points((0, -1, 1, 0, 0, 0))
+"""
+
+import math
+from array import array
+
+from .geometry_utils import (
+    CANONICAL_SCALE, boxes_in_region, calculate_distance, get_marker_db_points, get_numpy, transform_points
+)
+
+# Marker class name -> kind code (column `kinds`); unknown classes get -1
+KIND_CODES = {
+    'CutMarker': 0,
+    'ConnectMarker': 1,
+    'ProbeMarker': 2,
+    'MultiPointCutMarker': 3,
+    'MultiPointConnectMarker': 4,
+}
+
+# Kind names accepted by the `kinds` filters -> codes
+KIND_NAMES = {
+    'cut': (0, 3),
+    'connect': (1, 4),
+    'probe': (2,),
+    'multipoint': (3, 4),
+}
+
+# Tolerance (canonical units) for region bounds that are whole units
+_EPSILON = 1e-6
+
+
+class FibMarkerTable:
+    """Marker geometry as columns (NumPy arrays when available)
+
+    Args:
+        markers: Marker objects (row i is markers[i])
+        use_numpy (bool): None = NumPy if installed, False = pure Python
+
+    Example:
+        >>> table = FibMarkerTable(markers)
+        >>> table.bounding_box()
+        (0.0, 0.0, 120.5, 80.0)
+        >>> [m.id for m in table.markers_in_region((0, 0, 10, 10))]
+        ['CUT_1', 'PROBE_3']
+    """
+
+    def __init__(self, markers=(), use_numpy=None):
+        self.markers = list(markers)
+        kinds, offsets = array('b'), array('q', [0])
+        x1, y1, x2, y2 = array('q'), array('q'), array('q'), array('q')
+        xs, ys, boxes = array('q'), array('q'), array('q')
+        for marker in self.markers:
+            points = get_marker_db_points(marker)
+            kinds.append(KIND_CODES.get(marker.__class__.__name__, -1))
+            x1.append(points[0][0])
+            y1.append(points[0][1])
+            x2.append(points[-1][0])
+            y2.append(points[-1][1])
+            px = [x for x, _ in points]
+            py = [y for _, y in points]
+            xs.extend(px)
+            ys.extend(py)
+            boxes.extend((min(px), min(py), max(px), max(py)))
+            offsets.append(len(xs))
+
+        np = get_numpy() if use_numpy is not False else None
+        self.numpy = np is not None
+        if np is not None:
+            self.kinds = np.frombuffer(kinds, dtype=np.int8)
+            self.offsets, self.xs, self.ys = (np.frombuffer(column, dtype=np.int64) for column in (offsets, xs, ys))
+            self.x1, self.y1, self.x2, self.y2 = (np.frombuffer(column, dtype=np.int64) for column in (x1, y1, x2, y2))
+            self.boxes = np.frombuffer(boxes, dtype=np.int64).reshape(-1, 4)
+        else:
+            self.kinds, self.offsets, self.xs, self.ys = kinds, offsets, xs, ys
+            self.x1, self.y1, self.x2, self.y2 = x1, y1, x2, y2
+            self.boxes = [tuple(boxes[i:i + 4]) for i in range(0, len(boxes), 4)]
+
+    def __len__(self):
+        return len(self.markers)
+
+    # ------------------------------------------------------------------
+    # Queries (microns in, microns out)
+    # ------------------------------------------------------------------
+
+    def bounding_box(self, rows=None):
+        """Bounding box of all markers (or of the given rows) in microns, None if empty"""
+        boxes = self.boxes
+        if rows is not None:
+            boxes = boxes[rows] if self.numpy else [boxes[row] for row in rows]
+        if not len(boxes):
+            return None
+        if self.numpy:
+            box = (boxes[:, 0].min(), boxes[:, 1].min(), boxes[:, 2].max(), boxes[:, 3].max())
+        else:
+            box = (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                   max(b[2] for b in boxes), max(b[3] for b in boxes))
+        return tuple(int(value) / CANONICAL_SCALE for value in box)
+
+    def rows_of_kind(self, kinds):
+        """Rows whose marker kind is one of `kinds` ('cut', 'connect', 'probe', 'multipoint')"""
+        codes = set()
+        for kind in kinds:
+            codes.update(KIND_NAMES[kind])
+        if self.numpy:
+            np = get_numpy()
+            return np.flatnonzero(np.isin(self.kinds, list(codes)))
+        return [row for row, code in enumerate(self.kinds) if code in codes]
+
+    def rows_in_region(self, region, inside=False, kinds=None):
+        """Rows whose bounding box overlaps (inside=True: lies in) a micron box"""
+        # Integer box with the same result as comparing in microns
+        x1, y1, x2, y2 = (value * CANONICAL_SCALE for value in region)
+        canonical = (math.ceil(x1 - _EPSILON), math.ceil(y1 - _EPSILON),
+                     math.floor(x2 + _EPSILON), math.floor(y2 + _EPSILON))
+        rows = boxes_in_region(self.boxes, canonical, inside)
+        if kinds is not None:
+            wanted = self.rows_of_kind(kinds)
+            if self.numpy:
+                rows = get_numpy().intersect1d(rows, wanted, assume_unique=True)
+            else:
+                wanted = set(wanted)
+                rows = [row for row in rows if row in wanted]
+        return rows
+
+    def markers_in_region(self, region, inside=False, kinds=None):
+        """Marker objects whose bounding box overlaps (or lies in) a micron box"""
+        markers = self.markers
+        return [markers[row] for row in self.rows_in_region(region, inside, kinds)]
+
+    def lengths(self):
+        """Drawn length of every marker in microns (0 for probes)"""
+        offsets = self.offsets
+        if self.numpy:
+            np = get_numpy()
+            steps = calculate_distance(self.xs[:-1], self.ys[:-1], self.xs[1:], self.ys[1:])
+            # Length of row i = sum of the steps between its own points
+            total = np.concatenate(([0.0], np.cumsum(steps)))
+            return (total[offsets[1:] - 1] - total[offsets[:-1]]) / CANONICAL_SCALE
+        xs, ys = self.xs, self.ys
+        lengths = []
+        for row in range(len(self.markers)):
+            length = 0.0
+            for i in range(offsets[row], offsets[row + 1] - 1):
+                length += math.hypot(xs[i + 1] - xs[i], ys[i + 1] - ys[i])
+            lengths.append(length / CANONICAL_SCALE)
+        return lengths
+
+    def transformed_points(self, matrix, rows=None):
+        """All points (or the points of `rows`) transformed, in microns
+
+        Args:
+            matrix: (m11, m12, m21, m22, dx, dy), dx / dy in microns
+                (see geometry_utils.transform_points)
+            rows: Row indices (None = all rows); the points of row i are
+                offsets[i]:offsets[i + 1] of the full result
+
+        Returns:
+            tuple: (xs, ys) in microns, plus the offsets of the selected rows
+                into them when `rows` is given: (xs, ys, offsets)
+        """
+        xs, ys = self.xs, self.ys
+        offsets = None
+        if rows is not None:
+            xs, ys, offsets = self._gather(rows)
+        scale = float(CANONICAL_SCALE)
+        m11, m12, m21, m22, dx, dy = matrix
+        tx, ty = transform_points(xs, ys, (m11 / scale, m12 / scale, m21 / scale, m22 / scale, dx, dy))
+        return (tx, ty) if offsets is None else (tx, ty, offsets)
+
+    def transformed_db_points(self, matrix, rows=None):
+        """All points (or the points of `rows`) transformed, in canonical units
+
+        Like transformed_points, but rounded to canonical integers so the
+        result can be stored back on the markers (set_marker_db_points).
+
+        Args:
+            matrix: (m11, m12, m21, m22, dx, dy), dx / dy in canonical units
+
+        Returns:
+            tuple: (xs, ys, offsets) as lists; the points of the i-th row
+                (of `rows`, or of the table) are offsets[i]:offsets[i + 1]
+        """
+        xs, ys, offsets = self.xs, self.ys, self.offsets
+        if rows is not None:
+            xs, ys, offsets = self._gather(rows)
+        tx, ty = transform_points(xs, ys, matrix)
+        if self.numpy:
+            np = get_numpy()
+            return np.rint(tx).astype(np.int64).tolist(), np.rint(ty).astype(np.int64).tolist(), offsets.tolist()
+        return [int(round(x)) for x in tx], [int(round(y)) for y in ty], list(offsets)
+
+    def _gather(self, rows):
+        """Points of some rows, concatenated, with their new offsets"""
+        offsets = self.offsets
+        if self.numpy:
+            np = get_numpy()
+            rows = np.asarray(rows, dtype=np.int64)
+            counts = offsets[rows + 1] - offsets[rows]
+            new_offsets = np.concatenate(([0], np.cumsum(counts)))
+            index = np.repeat(offsets[rows] - new_offsets[:-1], counts) + np.arange(new_offsets[-1])
+            return self.xs[index], self.ys[index], new_offsets
+        xs, ys, new_offsets = array('q'), array('q'), array('q', [0])
+        for row in rows:
+            xs.extend(self.xs[offsets[row]:offsets[row + 1]])
+            ys.extend(self.ys[offsets[row]:offsets[row + 1]])
+            new_offsets.append(len(xs))
+        return xs, ys, new_offsets
@@ -0,0 +1,235 @@
+"""Performance instrumentation for FIB Tool
+
+Operations are timed with a context manager or a decorator and aggregated
+per name (count, total, mean, p95, max):
+
+    from .core.perf_monitor import perf_timer, timed
+
+    with perf_timer('marker.delete'):
+        ...
+
+    @timed('layer_tap.lookup')
+    def get_layer_at_point_with_selection(...):
+        ...
+
+When the monitor is disabled (PERF_CONFIG['enabled'] = False or
+FIB_TOOL_PERF=0) perf_timer() returns a shared no-op context manager and
+timed() wrappers call straight through, so instrumented code costs one
+attribute check.
+
+p95 is computed over the most recent PERF_CONFIG['max_samples'] samples of
+an operation; count, mean and max cover the whole session.
+"""
+
+import functools
+import json
+import os
+import platform
+import time
+from collections import deque
+from datetime import datetime
+
+from ..config import PERF_CONFIG
+
+
+ENV_VAR = 'FIB_TOOL_PERF'
+
+_perf_counter = time.perf_counter
+
+
+class _OpStats:
+    """Aggregated timings of one operation"""
+
+    __slots__ = ('count', 'total', 'max', 'samples')
+
+    def __init__(self, max_samples):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=max_samples)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.samples.append(seconds)
+
+    def summary(self):
+        """Stats in milliseconds"""
+        samples = sorted(self.samples)
+        p95 = samples[min(len(samples) - 1, int(0.95 * len(samples)))] if samples else 0.0
+        return {
+            'count': self.count,
+            'total_ms': round(self.total * 1000.0, 3),
+            'mean_ms': round(self.total * 1000.0 / self.count, 3) if self.count else 0.0,
+            'p95_ms': round(p95 * 1000.0, 3),
+            'max_ms': round(self.max * 1000.0, 3),
+        }
+
+
+class _Timer:
+    """Context manager recording one timing into a monitor"""
+
+    __slots__ = ('_monitor', '_name', '_t0')
+
+    def __init__(self, monitor, name):
+        self._monitor = monitor
+        self._name = name
+
+    def __enter__(self):
+        self._t0 = _perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self._monitor.record(self._name, _perf_counter() - self._t0)
+        return False
+
+
+class _NullTimer:
+    """Shared no-op timer used while the monitor is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def _env_enabled(default):
+    value = os.environ.get(ENV_VAR)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() not in ('0', 'false', 'off', 'no')
+
+
+class FibPerfMonitor:
+    """Per-operation timing statistics
+
+    Attributes:
+        enabled (bool): Timers record only while True
+        max_samples (int): Recent samples kept per operation for p95
+
+    Example:
+        >>> monitor = FibPerfMonitor(enabled=True)
+        >>> with monitor.timer('project.save'):
+        ...     save()
+        >>> monitor.stats()['project.save']['count']
+        1
+    """
+
+    def __init__(self, enabled=None, max_samples=None):
+        self.enabled = _env_enabled(PERF_CONFIG['enabled']) if enabled is None else bool(enabled)
+        self.max_samples = max_samples or PERF_CONFIG['max_samples']
+        self._ops = {}
+        self._started = time.time()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def timer(self, name):
+        """Context manager timing the enclosed block as `name`"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def timed(self, name=None):
+        """Decorator timing every call of a function (default name: its __qualname__)"""
+        def decorator(func):
+            op_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                t0 = _perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(op_name, _perf_counter() - t0)
+            return wrapper
+        return decorator
+
+    def record(self, name, seconds):
+        """Add one measured duration (seconds) for an operation"""
+        if not self.enabled:
+            return
+        stats = self._ops.get(name)
+        if stats is None:
+            stats = self._ops[name] = _OpStats(self.max_samples)
+        stats.add(seconds)
+
+    def set_enabled(self, enabled):
+        self.enabled = bool(enabled)
+
+    def reset(self):
+        """Drop all collected timings"""
+        self._ops = {}
+        self._started = time.time()
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def stats(self):
+        """{operation: {count, total_ms, mean_ms, p95_ms, max_ms}} sorted by name"""
+        return {name: self._ops[name].summary() for name in sorted(self._ops)}
+
+    def to_dict(self):
+        """Stats plus session/environment info for bug reports"""
+        try:
+            import pya
+            klayout_version = pya.Application.instance().version()
+        except Exception:
+            klayout_version = None
+
+        return {
+            'generated': datetime.now().isoformat(timespec='seconds'),
+            'session_started': datetime.fromtimestamp(self._started).isoformat(timespec='seconds'),
+            'enabled': self.enabled,
+            'max_samples': self.max_samples,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'klayout': klayout_version,
+            'operations': self.stats(),
+        }
+
+    def dump_json(self, path):
+        """Write to_dict() to a JSON file and return the path"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+    def summary_lines(self):
+        """Stats as printable table lines"""
+        lines = [f"{'Operation':<28}{'Count':>8}{'Mean ms':>10}{'p95 ms':>10}{'Max ms':>10}"]
+        for name, stats in self.stats().items():
+            lines.append(f"{name:<28}{stats['count']:>8}{stats['mean_ms']:>10.2f}"
+                         f"{stats['p95_ms']:>10.2f}{stats['max_ms']:>10.2f}")
+        return lines
+
+
+_monitor = FibPerfMonitor()
+
+
+def get_perf_monitor():
+    """The session-wide monitor used by perf_timer() and timed()"""
+    return _monitor
+
+
+def perf_timer(name):
+    """Time a block with the session-wide monitor"""
+    if not _monitor.enabled:
+        return _NULL_TIMER
+    return _Timer(_monitor, name)
+
+
+def timed(name=None):
+    """Decorator timing a function with the session-wide monitor"""
+    return _monitor.timed(name)
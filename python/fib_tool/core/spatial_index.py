@@ -0,0 +1,322 @@
+"""Spatial index over marker bounding boxes
+
+UniformGridIndex buckets boxes into square grid cells so window and
+nearest-neighbour queries only look at the cells around the query instead
+of every marker. Boxes are (min_x, min_y, max_x, max_y) in microns as
+returned by geometry_utils.get_bounding_box; a box is registered in every
+cell it touches. Boxes spanning more than SPATIAL_INDEX_CONFIG
+['max_cells_per_box'] cells go to a coarser grid (COARSE_FACTOR times the
+pitch, nested as needed) so long multi-point paths neither fill thousands
+of cells nor get checked by every query.
+
+FibMarkerSpatialIndex keys the grid by id(marker) and measures nearest
+distances to the marker geometry (point, segment or polyline):
+
+    index = FibMarkerSpatialIndex()
+    index.rebuild(markers)
+    marker, distance = index.nearest(x, y, max_distance=5.0)
+    nearby = index.window(x - 5.0, y - 5.0, x + 5.0, y + 5.0)
+
+Insert, remove and update are O(cells touched by the box). The owner (the
+marker list model, through FibMarkerIndex) keeps the marker objects alive
+and reports add/move/delete.
+"""
+
+import math
+
+from ..config import SPATIAL_INDEX_CONFIG
+from .geometry_utils import get_bounding_box, get_marker_points, point_box_distance, point_marker_distance
+
+
+COARSE_FACTOR = 16
+
+
+class UniformGridIndex:
+    """Boxes bucketed into square grid cells
+
+    Args:
+        cell_size (float): Grid pitch in microns
+        max_cells_per_box (int): Larger boxes go to a coarser nested grid
+
+    Example:
+        >>> grid = UniformGridIndex(10.0)
+        >>> grid.insert('a', (0, 0, 4, 4))
+        >>> grid.insert('b', (50, 50, 52, 52))
+        >>> sorted(grid.query_window(-1, -1, 5, 5))
+        ['a']
+        >>> grid.nearest(48, 48)
+        ('b', 2.8284271247461903)
+    """
+
+    def __init__(self, cell_size=None, max_cells_per_box=None):
+        self.cell_size = float(cell_size or SPATIAL_INDEX_CONFIG['cell_size'])
+        self.max_cells_per_box = max_cells_per_box or SPATIAL_INDEX_CONFIG['max_cells_per_box']
+        self._boxes = {}     # key -> box
+        self._cells = {}     # (ix, iy) -> set(keys)
+        self._coarse = None  # UniformGridIndex for boxes too large for this grid
+        self._bounds = None  # (ix1, iy1, ix2, iy2) ever occupied (not shrunk on remove)
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def __contains__(self, key):
+        return key in self._boxes
+
+    def box(self, key):
+        return self._boxes.get(key)
+
+    def _cell_range(self, box):
+        size = self.cell_size
+        return (math.floor(box[0] / size), math.floor(box[1] / size),
+                math.floor(box[2] / size), math.floor(box[3] / size))
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def insert(self, key, box):
+        if key in self._boxes:
+            self.remove(key)
+        if box is None:
+            return
+        self._boxes[key] = box
+        ix1, iy1, ix2, iy2 = self._cell_range(box)
+        if (ix2 - ix1 + 1) * (iy2 - iy1 + 1) > self.max_cells_per_box:
+            if self._coarse is None:
+                self._coarse = UniformGridIndex(self.cell_size * COARSE_FACTOR, self.max_cells_per_box)
+            self._coarse.insert(key, box)
+            return
+        cells = self._cells
+        for ix in range(ix1, ix2 + 1):
+            for iy in range(iy1, iy2 + 1):
+                bucket = cells.get((ix, iy))
+                if bucket is None:
+                    cells[(ix, iy)] = {key}
+                else:
+                    bucket.add(key)
+        bounds = self._bounds
+        if bounds is None:
+            self._bounds = (ix1, iy1, ix2, iy2)
+        elif ix1 < bounds[0] or iy1 < bounds[1] or ix2 > bounds[2] or iy2 > bounds[3]:
+            self._bounds = (min(ix1, bounds[0]), min(iy1, bounds[1]), max(ix2, bounds[2]), max(iy2, bounds[3]))
+
+    def remove(self, key):
+        box = self._boxes.pop(key, None)
+        if box is None:
+            return
+        if self._coarse is not None and key in self._coarse:
+            self._coarse.remove(key)
+            return
+        ix1, iy1, ix2, iy2 = self._cell_range(box)
+        cells = self._cells
+        for ix in range(ix1, ix2 + 1):
+            for iy in range(iy1, iy2 + 1):
+                bucket = cells.get((ix, iy))
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del cells[(ix, iy)]
+
+    def update(self, key, box):
+        """Move a key to a new box"""
+        if self._boxes.get(key) == box:
+            return
+        self.remove(key)
+        self.insert(key, box)
+
+    def clear(self):
+        self.__init__(self.cell_size, self.max_cells_per_box)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def query_window(self, x1, y1, x2, y2):
+        """Keys whose box touches the window
+
+        Returns:
+            set: Keys
+        """
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        boxes = self._boxes
+        candidates = set()
+        ix1, iy1, ix2, iy2 = self._cell_range((x1, y1, x2, y2))
+        if (ix2 - ix1 + 1) * (iy2 - iy1 + 1) > len(self._cells):
+            # Window covers more cells than are occupied: walk the occupied ones
+            for (ix, iy), bucket in self._cells.items():
+                if ix1 <= ix <= ix2 and iy1 <= iy <= iy2:
+                    candidates |= bucket
+        else:
+            cells = self._cells
+            for ix in range(ix1, ix2 + 1):
+                for iy in range(iy1, iy2 + 1):
+                    bucket = cells.get((ix, iy))
+                    if bucket:
+                        candidates |= bucket
+        result = set()
+        for key in candidates:
+            bx1, by1, bx2, by2 = boxes[key]
+            if bx1 <= x2 and bx2 >= x1 and by1 <= y2 and by2 >= y1:
+                result.add(key)
+        if self._coarse is not None:
+            result |= self._coarse.query_window(x1, y1, x2, y2)
+        return result
+
+    def nearest(self, x, y, max_distance=None, distance=None):
+        """Key closest to a point
+
+        Cells are visited in rings around the point's cell until no unvisited
+        cell can hold anything closer than the best match.
+
+        Args:
+            x, y: Query point (in microns)
+            max_distance (float): Ignore keys farther away (None = no limit)
+            distance (callable): distance(key, x, y) -> float for the exact
+                test; defaults to the distance to the key's box. Must not be
+                smaller than the box distance.
+
+        Returns:
+            tuple: (key, distance), or (None, None) if nothing is in range
+        """
+        if not self._boxes:
+            return None, None
+        if distance is None:
+            boxes = self._boxes
+            distance = lambda key, px, py: point_box_distance(px, py, boxes[key])
+        best_key = None
+        best = math.inf if max_distance is None else float(max_distance)
+        if self._coarse is not None and len(self._coarse):
+            best_key, d = self._coarse.nearest(x, y, max_distance, distance)
+            if best_key is not None:
+                best = d
+        seen = set()
+
+        def visit(keys):
+            nonlocal best_key, best
+            for key in keys:
+                if key in seen:
+                    continue
+                seen.add(key)
+                # The box distance is a cheap lower bound of the exact distance
+                if point_box_distance(x, y, self._boxes[key]) > best:
+                    continue
+                d = distance(key, x, y)
+                if d <= best:
+                    best_key, best = key, d
+
+        if self._bounds is not None:
+            size = self.cell_size
+            cx, cy = math.floor(x / size), math.floor(y / size)
+            bx1, by1, bx2, by2 = self._bounds
+            # Rings beyond this radius contain no occupied cells
+            max_ring = max(cx - bx1, bx2 - cx, cy - by1, by2 - cy, 0)
+            cells = self._cells
+            for ring in range(max_ring + 1):
+                # After ring r every box closer than r * cell_size has been seen
+                if best < (ring - 1) * size:
+                    break
+                if (2 * ring + 1) ** 2 > 4 * len(cells):
+                    # Rings grew larger than the occupied area: scan the remaining cells
+                    for bucket in list(cells.values()):
+                        visit(bucket)
+                    break
+                if ring == 0:
+                    ring_cells = ((cx, cy),)
+                else:
+                    ring_cells = self._ring(cx, cy, ring)
+                for cell in ring_cells:
+                    bucket = cells.get(cell)
+                    if bucket:
+                        visit(bucket)
+
+        if best_key is None:
+            return None, None
+        return best_key, best
+
+    @staticmethod
+    def _ring(cx, cy, ring):
+        """Cells at Chebyshev distance `ring` from (cx, cy)"""
+        for ix in range(cx - ring, cx + ring + 1):
+            yield (ix, cy - ring)
+            yield (ix, cy + ring)
+        for iy in range(cy - ring + 1, cy + ring):
+            yield (cx - ring, iy)
+            yield (cx + ring, iy)
+
+
+class FibMarkerSpatialIndex:
+    """Grid index over marker bounding boxes with marker-level queries
+
+    Example:
+        >>> index = FibMarkerSpatialIndex()
+        >>> index.rebuild(markers)
+        >>> marker, distance = index.nearest(12.0, 3.5, max_distance=5.0)
+        >>> in_view = index.window(0, 0, 100, 100)
+    """
+
+    def __init__(self, cell_size=None):
+        self.grid = UniformGridIndex(cell_size)
+        self._markers = {}  # id(marker) -> marker
+
+    def __len__(self):
+        return len(self._markers)
+
+    def rebuild(self, markers):
+        """Index all markers from scratch"""
+        self.grid.clear()
+        self._markers = {}
+        for marker in markers:
+            self.add(marker)
+
+    def add(self, marker, bbox=None):
+        """Index a marker (bbox: precomputed bounding box, optional)"""
+        key = id(marker)
+        self._markers[key] = marker
+        self.grid.insert(key, bbox if bbox is not None else get_bounding_box(get_marker_points(marker)))
+
+    def remove(self, marker):
+        key = id(marker)
+        if self._markers.pop(key, None) is not None:
+            self.grid.remove(key)
+
+    def update(self, marker, bbox=None):
+        """Re-index a marker after its geometry changed (move / transform)"""
+        key = id(marker)
+        self._markers[key] = marker
+        self.grid.update(key, bbox if bbox is not None else get_bounding_box(get_marker_points(marker)))
+
+    def window_keys(self, x1, y1, x2, y2):
+        """Keys (id(marker)) of markers whose bounding box touches the window"""
+        return self.grid.query_window(x1, y1, x2, y2)
+
+    def window(self, x1, y1, x2, y2):
+        """Markers whose bounding box touches the window"""
+        markers = self._markers
+        return [markers[key] for key in self.grid.query_window(x1, y1, x2, y2)]
+
+    def within(self, x, y, radius):
+        """Markers whose geometry is within radius of a point, nearest first
+
+        Returns:
+            list: (marker, distance) tuples
+        """
+        markers = self._markers
+        hits = []
+        for key in self.grid.query_window(x - radius, y - radius, x + radius, y + radius):
+            d = point_marker_distance(x, y, markers[key])
+            if d <= radius:
+                hits.append((markers[key], d))
+        hits.sort(key=lambda hit: hit[1])
+        return hits
+
+    def nearest(self, x, y, max_distance=None):
+        """Marker whose geometry (point, segment, polyline) is closest to a point
+
+        Returns:
+            tuple: (marker, distance), or (None, None)
+        """
+        markers = self._markers
+        key, d = self.grid.nearest(x, y, max_distance,
+                                   lambda key, px, py: point_marker_distance(px, py, markers[key]))
+        return (markers[key], d) if key is not None else (None, None)
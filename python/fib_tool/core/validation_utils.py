@@ -129,6 +129,24 @@ def validate_file_path(filepath, must_exist=False, must_be_writable=False):
     return (True, None)
 
 
+def marker_type_name(marker):
+    """Conversion type of a marker: 'cut', 'connect', 'probe', 'multipoint' or 'unknown'
+
+    Uses a ``marker_type`` attribute if the object has one, otherwise the
+    class name (multi-point classes first: MultiPointCutMarker is 'multipoint').
+    """
+    marker_type = getattr(marker, 'marker_type', None)
+    if marker_type:
+        return marker_type.lower()
+    class_name = marker.__class__.__name__.lower()
+    if 'multipoint' in class_name:
+        return 'multipoint'
+    for name in ('cut', 'connect', 'probe'):
+        if name in class_name:
+            return name
+    return 'unknown'
+
+
 def validate_conversion(source_marker, target_type):
     """Check if a marker can be converted to target type
 
@@ -151,8 +169,8 @@ def validate_conversion(source_marker, target_type):
     if not source_marker:
         return (False, "Source marker is None")
 
-    # Get source type
-    source_type = getattr(source_marker, 'marker_type', 'unknown').lower()
+    # Get source type (marker classes have no marker_type attribute)
+    source_type = marker_type_name(source_marker)
 
     # Normalize target type
     target_type = target_type.lower()
@@ -161,8 +179,10 @@ def validate_conversion(source_marker, target_type):
     if source_type == target_type:
         return (False, f"Marker is already type '{target_type}'")
 
-    # Probe markers (single point) can convert to anything
+    # Probe markers (single point) can convert to anything but multipoint (2+ points)
     if source_type == 'probe':
+        if target_type == 'multipoint':
+            return (False, "Multipoint markers need at least 2 points")
         return (True, None)
 
     # Two-point markers (cut, connect) can convert between each other and to multipoint
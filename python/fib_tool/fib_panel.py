@@ -6,6 +6,7 @@ Integrates with fib_plugin.py to provide a comprehensive FIB workflow interface
 
 import sys
 import os
+import time
 
 # Add the current directory to Python path
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -13,25 +14,43 @@ if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
 import pya
-from .markers import CutMarker, ConnectMarker, ProbeMarker
-from .config import LAYERS, GEOMETRIC_PARAMS, UI_TIMEOUTS, DEFAULT_MARKER_NOTES
+from .markers import CutMarker, ConnectMarker, ProbeMarker, coordinate_texts
+from .config import LAYERS, GEOMETRIC_PARAMS, UI_TIMEOUTS, SNAP_CONFIG, CONFLICT_CONFIG, CONNECTIVITY_CONFIG
 from .marker_menu import MarkerContextMenu
 from .smart_counter import SmartCounter
 from .file_dialog_helper import FileDialogHelper
+from .core.log_utils import get_logger
+from .core.perf_monitor import get_perf_monitor, perf_timer
+from .core.edit_session import FibEditSession
 
 # Phase 2 refactoring: Import new modular components
 from .core.global_state import FibGlobalState
 from .ui.dialog_manager import FibDialogManager
+from .ui.marker_list_model import FibMarkerListModel
 from .business.marker_transformer import FibMarkerTransformer
 from .business.file_manager import FibFileManager
 from .business.export_manager import FibExportManager
+from .business.conflict_analyzer import FibConflictAnalyzer
+
+logger = get_logger('fib_panel')
+
 
 class FIBPanel(pya.QDockWidget):
     """Main FIB Panel - Dockable widget for KLayout"""
     
+    # Performance tab columns: (header, stats key)
+    PERF_COLUMNS = [
+        ("Operation", None),
+        ("Count", 'count'),
+        ("Mean ms", 'mean_ms'),
+        ("p95 ms", 'p95_ms'),
+        ("Max ms", 'max_ms'),
+        ("Total ms", 'total_ms'),
+    ]
+    
     def __init__(self, parent=None):
         super().__init__("FIB Panel", parent)
-        self.markers_list = []  # Global marker list
+        self.marker_model = FibMarkerListModel(self)  # Owns the global marker list
         self.active_mode = None
         self.marker_notes_dict = {}  # Centralized notes storage: marker_id -> notes
 
@@ -40,6 +59,8 @@ class FIBPanel(pya.QDockWidget):
         self.transformer = FibMarkerTransformer()
         self.file_manager = FibFileManager()
         self.export_manager = FibExportManager()
+        self.conflict_analyzer = FibConflictAnalyzer()
+        self.connectivity = None  # FibConnectivityService, created on first net trace
 
         # Initialize context menu handler and smart counter
         self.context_menu = MarkerContextMenu(self)
@@ -48,11 +69,20 @@ class FIBPanel(pya.QDockWidget):
         # Setup UI
         try:
             self.setup_ui()
-            print("[FIB Panel] Initialized successfully")
+            logger.info("[FIB Panel] Initialized successfully")
         except Exception as e:
-            print(f"[FIB Panel] Error in setup_ui: {e}")
+            logger.error("[FIB Panel] Error in setup_ui: %s", e)
             import traceback
             traceback.print_exc()
+
+    @property
+    def markers_list(self):
+        """Global marker list (owned by the list model)"""
+        return self.marker_model.markers
+
+    @markers_list.setter
+    def markers_list(self, markers):
+        self.marker_model.set_markers(markers)
     
     def setup_ui(self):
         """Setup the panel UI"""
@@ -80,12 +110,19 @@ class FIBPanel(pya.QDockWidget):
             # Marker list section
             self.create_marker_list_section()
             
+            # Tabs: marker workflow + performance statistics + rule checks
+            self.tabs = pya.QTabWidget()
+            self.tabs.addTab(self.container, "Markers")
+            self.tabs.addTab(self.create_performance_tab(), "Performance")
+            self.tabs.addTab(self.create_checks_tab(), "Checks")
+            self.tabs.currentChanged.connect(self.on_tab_changed)
+            
             # Set the widget
-            self.setWidget(self.container)
+            self.setWidget(self.tabs)
             self.setMinimumWidth(170)  # Reduced from 250 to 170 (about 1/3 smaller)
             
         except Exception as e:
-            print(f"[FIB Panel] Error in setup_ui: {e}")
+            logger.error("[FIB Panel] Error in setup_ui: %s", e)
             # Create minimal fallback UI
             fallback = pya.QWidget()
             fallback_layout = pya.QVBoxLayout(fallback)
@@ -100,20 +137,24 @@ class FIBPanel(pya.QDockWidget):
             group_layout.setSpacing(1)  # Further reduced spacing for height compression
             group_layout.setContentsMargins(2, 1, 2, 1)  # Minimal margins for height compression
             
-            # First row: New, Save, Load
+            # First row: New, Save, Load, Migrate
             btn_layout1 = pya.QHBoxLayout()
             
             btn_new = pya.QPushButton("New")
             btn_save = pya.QPushButton("Save")
             btn_load = pya.QPushButton("Load")
+            btn_migrate = pya.QPushButton("Migrate...")
+            btn_migrate.setToolTip("Open a new layout revision and move the markers with their cell instances")
             
             btn_new.clicked.connect(self.on_new_project)
             btn_save.clicked.connect(self.on_save_project)
             btn_load.clicked.connect(self.on_load_project)
+            btn_migrate.clicked.connect(self.on_migrate_markers)
             
             btn_layout1.addWidget(btn_new)
             btn_layout1.addWidget(btn_save)
             btn_layout1.addWidget(btn_load)
+            btn_layout1.addWidget(btn_migrate)
             
             group_layout.addLayout(btn_layout1)
             
@@ -123,13 +164,18 @@ class FIBPanel(pya.QDockWidget):
             btn_export_html = pya.QPushButton("Export HTML")
             btn_export_html.clicked.connect(self.on_export_html)
 
+            btn_update_html = pya.QPushButton("Update HTML")
+            btn_update_html.setToolTip("Update a previous export: only new/changed markers are re-rendered")
+            btn_update_html.clicked.connect(self.on_update_html)
+
             btn_layout2.addWidget(btn_export_html)
+            btn_layout2.addWidget(btn_update_html)
 
             group_layout.addLayout(btn_layout2)
             self.main_layout.addWidget(group)
             
         except Exception as e:
-            print(f"[FIB Panel] Error creating project section: {e}")
+            logger.error("[FIB Panel] Error creating project section: %s", e)
     
     def create_marker_section(self):
         """Create marker creation section"""
@@ -185,6 +231,13 @@ class FIBPanel(pya.QDockWidget):
             self.btn_probe.setFixedHeight(widget_height)
             self.btn_probe.setContentsMargins(0, 0, 0, 0)  # Remove internal margins
             
+            # Pick button: select markers by clicking them in the layout
+            self.btn_pick = pya.QPushButton("Pick")
+            self.btn_pick.setToolTip(f"Click a marker in the layout to select it (within {GEOMETRIC_PARAMS['search_radius']} um)")
+            self.btn_pick.setFixedWidth(widget_min_width)  # Fixed width for consistency
+            self.btn_pick.setFixedHeight(widget_height)
+            self.btn_pick.setContentsMargins(0, 0, 0, 0)  # Remove internal margins
+            
             # Apply consistent styling to ensure perfect alignment
             button_style = """
                 QPushButton {
@@ -209,6 +262,7 @@ class FIBPanel(pya.QDockWidget):
             self.btn_cut.setStyleSheet(button_style)
             self.btn_connect.setStyleSheet(button_style)
             self.btn_probe.setStyleSheet(button_style)
+            self.btn_pick.setStyleSheet(button_style)
             self.cut_mode_combo.setStyleSheet(combo_style)
             self.connect_mode_combo.setStyleSheet(combo_style)
             
@@ -216,6 +270,7 @@ class FIBPanel(pya.QDockWidget):
             self.btn_cut.clicked.connect(self.on_cut_clicked)
             self.btn_connect.clicked.connect(self.on_connect_clicked)
             self.btn_probe.clicked.connect(self.on_probe_clicked)
+            self.btn_pick.clicked.connect(self.on_pick_clicked)
             
             # Add widgets to grid with explicit alignment flags
             grid_layout.addWidget(self.btn_cut, 0, 0, pya.Qt.AlignTop | pya.Qt.AlignLeft)
@@ -223,6 +278,7 @@ class FIBPanel(pya.QDockWidget):
             grid_layout.addWidget(self.btn_connect, 1, 0, pya.Qt.AlignTop | pya.Qt.AlignLeft)
             grid_layout.addWidget(self.connect_mode_combo, 1, 1, pya.Qt.AlignTop | pya.Qt.AlignLeft)
             grid_layout.addWidget(self.btn_probe, 2, 0, pya.Qt.AlignTop | pya.Qt.AlignLeft)
+            grid_layout.addWidget(self.btn_pick, 2, 1, pya.Qt.AlignTop | pya.Qt.AlignLeft)
             
             # Set uniform row heights to ensure consistent spacing
             grid_layout.setRowMinimumHeight(0, widget_height)
@@ -239,6 +295,18 @@ class FIBPanel(pya.QDockWidget):
             # Add the grid layout to the group
             group_layout.addLayout(grid_layout)
             
+            # Snap marker points to vertices / edges / path centerlines of the detected layer
+            self.snap_checkbox = pya.QCheckBox("Snap to geometry")
+            self.snap_checkbox.setToolTip(f"Move clicks to the nearest vertex, edge or path centerline "
+                                          f"of the detected layer within {SNAP_CONFIG['radius']} um")
+            try:
+                from .snapping import is_snap_enabled
+                self.snap_checkbox.setChecked(is_snap_enabled())
+            except ImportError:
+                self.snap_checkbox.setEnabled(False)
+            self.snap_checkbox.toggled.connect(self.on_snap_toggled)
+            group_layout.addWidget(self.snap_checkbox)
+            
             # Status label with word wrap to prevent panel expansion
             self.status_label = pya.QLabel("Ready")
             self.status_label.setWordWrap(True)  # Enable word wrap
@@ -252,11 +320,12 @@ class FIBPanel(pya.QDockWidget):
             self.mode_buttons = {
                 'cut': self.btn_cut,
                 'connect': self.btn_connect,
-                'probe': self.btn_probe
+                'probe': self.btn_probe,
+                'select': self.btn_pick
             }
             
         except Exception as e:
-            print(f"[FIB Panel] Error creating marker section: {e}")
+            logger.error("[FIB Panel] Error creating marker section: %s", e)
     
     def create_coordinate_jump_section(self):
         """Create coordinate jump section"""
@@ -290,58 +359,64 @@ class FIBPanel(pya.QDockWidget):
             self.main_layout.addWidget(group)
             
         except Exception as e:
-            print(f"[FIB Panel] Error creating coordinate jump section: {e}")
+            logger.error("[FIB Panel] Error creating coordinate jump section: %s", e)
     
     def create_marker_list_section(self):
         """Create marker list section"""
         try:
             group = pya.QGroupBox("Markers")
+            self.marker_group = group
             group_layout = pya.QVBoxLayout(group)
             group_layout.setSpacing(1)
             group_layout.setContentsMargins(2, 1, 2, 1)
             
-            # Simple list widget that can expand with window
-            self.marker_list = pya.QListWidget()
+            # Filter box - indexed search, applied after a short typing pause
+            self.marker_filter_input = pya.QLineEdit()
+            self.marker_filter_input.setPlaceholderText("Filter: cut, M1, id:CUT_1, note:text, region:x1,y1,x2,y2")
+            self.marker_filter_input.setToolTip(
+                "Space-separated terms are combined (AND).\n"
+                "Plain word: type, id prefix, layer or note word\n"
+                "type:cut|connect|probe|multi   id:<prefix>   layer:<name>\n"
+                "note:<word>   region:x1,y1,x2,y2 (um)")
+            self.marker_filter_input.setFixedHeight(24)
+            self.marker_filter_input.textChanged.connect(self.on_marker_filter_changed)
+            group_layout.addWidget(self.marker_filter_input)
+            
+            self._filter_timer = pya.QTimer(self)
+            self._filter_timer.setSingleShot(True)
+            self._filter_timer.setInterval(UI_TIMEOUTS['filter_debounce'])
+            self._filter_timer.timeout.connect(self.apply_marker_filter)
+            
+            # Model/view list - rows are rendered on demand from the marker model
+            self.marker_list = pya.QListView()
+            self.marker_list.setModel(self.marker_model)
             
             # Enable multi-selection with Ctrl/Cmd and Shift keys
             self.marker_list.setSelectionMode(pya.QAbstractItemView.ExtendedSelection)
             
+            # All rows have the same height: lets the view skip per-row size queries
+            self.marker_list.setUniformItemSizes(True)
+            try:
+                self.marker_list.setLayoutMode(pya.QListView.Batched)
+                self.marker_list.setBatchSize(500)
+            except Exception as layout_error:
+                logger.debug("[FIB Panel] Batched list layout not available: %s", layout_error)
+            
             self.marker_list.setContextMenuPolicy(pya.Qt.CustomContextMenu)
             self.marker_list.customContextMenuRequested.connect(self.on_marker_context_menu)
-            self.marker_list.itemDoubleClicked.connect(self.on_marker_double_clicked)
+            self.marker_list.doubleClicked.connect(self.on_marker_double_clicked)
             # Remove maximum height constraint to allow expansion
 
-            # Try to enable drag-drop reordering (may not work in all KLayout versions)
+            # Drag-drop reordering - the model moves the dropped rows (move_rows)
             try:
                 self.marker_list.setDragEnabled(True)
                 self.marker_list.setAcceptDrops(True)
                 self.marker_list.setDropIndicatorShown(True)
                 self.marker_list.setDragDropMode(pya.QAbstractItemView.InternalMove)
                 self.marker_list.setDefaultDropAction(pya.Qt.MoveAction)
-                print("[FIB Panel] Drag-drop enabled (may not work in all KLayout versions)")
+                self.marker_model.rowsMoved.connect(self.on_markers_reordered)
             except Exception as drag_error:
-                print(f"[FIB Panel] Drag-drop not available: {drag_error}")
-
-            # Connect reorder signal (with fallback for different Qt versions)
-            try:
-                # Try to get model - it might be a method or a property
-                list_model = None
-                if callable(self.marker_list.model):
-                    list_model = self.marker_list.model()
-                else:
-                    list_model = self.marker_list.model
-                
-                # Try to connect rowsMoved signal
-                if list_model and hasattr(list_model, 'rowsMoved'):
-                    list_model.rowsMoved.connect(self.on_markers_reordered)
-                    print("[FIB Panel] Connected to rowsMoved signal")
-                else:
-                    raise AttributeError("rowsMoved not available")
-                    
-            except (AttributeError, TypeError) as e:
-                # Fallback: use selection change detection
-                print(f"[FIB Panel] rowsMoved signal not available ({e}), using fallback")
-                self.marker_list.itemSelectionChanged.connect(self._check_reorder_needed)
+                logger.warning("[FIB Panel] Drag-drop not available: %s", drag_error)
             
             # Add list with stretch factor so it expands
             group_layout.addWidget(self.marker_list, 1)  # Stretch factor = 1
@@ -359,8 +434,14 @@ class FIBPanel(pya.QDockWidget):
             btn_move_down.setFixedHeight(24)
             btn_move_down.clicked.connect(self.on_move_marker_down)
             
+            btn_transform = pya.QPushButton("Transform...")
+            btn_transform.setFixedHeight(24)
+            btn_transform.setToolTip("Shift, rotate, mirror or scale the selected markers (all if none is selected)")
+            btn_transform.clicked.connect(self.on_transform_markers)
+            
             reorder_layout.addWidget(btn_move_up)
             reorder_layout.addWidget(btn_move_down)
+            reorder_layout.addWidget(btn_transform)
             
             group_layout.addLayout(reorder_layout)
             
@@ -374,10 +455,238 @@ class FIBPanel(pya.QDockWidget):
             self.main_layout.addWidget(group, 1)  # Stretch factor = 1
             
         except Exception as e:
-            print(f"[FIB Panel] Error creating marker list section: {e}")
+            logger.error("[FIB Panel] Error creating marker list section: %s", e)
             # Create minimal fallback
             self.marker_list = None
     
+    def create_performance_tab(self):
+        """Create the Performance tab (per-operation timing statistics)"""
+        widget = pya.QWidget()
+        try:
+            layout = pya.QVBoxLayout(widget)
+            layout.setSpacing(1)
+            layout.setContentsMargins(2, 2, 2, 2)
+            
+            self.perf_enabled_check = pya.QCheckBox("Collect timings")
+            self.perf_enabled_check.setChecked(get_perf_monitor().enabled)
+            self.perf_enabled_check.toggled.connect(self.on_perf_enabled_toggled)
+            layout.addWidget(self.perf_enabled_check)
+            
+            self.perf_tree = pya.QTreeWidget()
+            self.perf_tree.setColumnCount(len(self.PERF_COLUMNS))
+            self.perf_tree.setHeaderLabels([title for title, _ in self.PERF_COLUMNS])
+            self.perf_tree.setRootIsDecorated(False)
+            self.perf_tree.setSortingEnabled(True)
+            layout.addWidget(self.perf_tree, 1)
+            
+            btn_layout = pya.QHBoxLayout()
+            btn_refresh = pya.QPushButton("Refresh")
+            btn_refresh.clicked.connect(self.refresh_performance_tab)
+            btn_reset = pya.QPushButton("Reset")
+            btn_reset.clicked.connect(self.on_perf_reset)
+            btn_dump = pya.QPushButton("Save JSON...")
+            btn_dump.setToolTip("Save the timing statistics for a bug report")
+            btn_dump.clicked.connect(self.on_perf_dump)
+            btn_layout.addWidget(btn_refresh)
+            btn_layout.addWidget(btn_reset)
+            btn_layout.addWidget(btn_dump)
+            layout.addLayout(btn_layout)
+            
+        except Exception as e:
+            logger.error("[FIB Panel] Error creating performance tab: %s", e)
+            self.perf_tree = None
+        return widget
+    
+    def on_tab_changed(self, index):
+        """Refresh the statistics when the Performance tab is shown"""
+        if index == 1:
+            self.refresh_performance_tab()
+    
+    def refresh_performance_tab(self):
+        """Fill the Performance tab from the session-wide monitor"""
+        if getattr(self, 'perf_tree', None) is None:
+            return
+        try:
+            self.perf_tree.setSortingEnabled(False)
+            self.perf_tree.clear()
+            for name, stats in get_perf_monitor().stats().items():
+                item = pya.QTreeWidgetItem(self.perf_tree)
+                item.setText(0, name)
+                for column, (_, key) in enumerate(self.PERF_COLUMNS[1:], 1):
+                    # Numeric display data so the columns sort by value
+                    item.setData(column, pya.Qt.DisplayRole, round(stats[key], 2))
+                    item.setTextAlignment(column, pya.Qt.AlignRight)
+            self.perf_tree.setSortingEnabled(True)
+            for column in range(len(self.PERF_COLUMNS)):
+                self.perf_tree.resizeColumnToContents(column)
+        except Exception as e:
+            logger.error("[FIB Panel] Error refreshing performance tab: %s", e)
+    
+    def on_perf_enabled_toggled(self, checked):
+        get_perf_monitor().set_enabled(checked)
+    
+    def on_perf_reset(self):
+        get_perf_monitor().reset()
+        self.refresh_performance_tab()
+    
+    def on_perf_dump(self):
+        """Save the timing statistics as JSON (for bug reports)"""
+        try:
+            from .config import PERF_CONFIG
+            default_path = os.path.join(os.path.expanduser("~"), PERF_CONFIG['dump_filename'])
+            filename = pya.QFileDialog.getSaveFileName(
+                self, "Save Performance Statistics", default_path,
+                "JSON Files (*.json);;All Files (*)")
+            if isinstance(filename, tuple):
+                filename = filename[0]
+            if not filename:
+                return
+            get_perf_monitor().dump_json(filename)
+            logger.info("[FIB Panel] Performance statistics saved to %s", filename)
+            FibDialogManager.info(f"Performance statistics saved to {os.path.basename(filename)}", "FIB Panel")
+        except Exception as e:
+            logger.error("[FIB Panel] Error saving performance statistics: %s", e)
+            FibDialogManager.warning(f"Error saving performance statistics: {e}", "FIB Panel")
+    
+    # Rule checks tab: (header, violation attribute)
+    CHECK_COLUMNS = [
+        ("Marker", 'marker_id'),
+        ("Problem", 'message'),
+        ("Layer", 'layer'),
+        ("Location", None),
+    ]
+
+    def create_checks_tab(self):
+        """Create the Checks tab (marker rule checks against the design layers)"""
+        widget = pya.QWidget()
+        try:
+            layout = pya.QVBoxLayout(widget)
+            layout.setSpacing(1)
+            layout.setContentsMargins(2, 2, 2, 2)
+
+            btn_layout = pya.QHBoxLayout()
+            btn_run = pya.QPushButton("Run Checks")
+            btn_run.setToolTip("Check cuts, connect endpoints and probes against the layers they were placed on")
+            btn_run.clicked.connect(self.on_run_checks)
+            btn_conflicts = pya.QPushButton("Find Conflicts")
+            btn_conflicts.setToolTip(f"List markers closer than {CONFLICT_CONFIG['min_spacing']} um to each other")
+            btn_conflicts.clicked.connect(self.on_find_conflicts)
+            btn_nets = pya.QPushButton("Trace Nets")
+            btn_nets.setToolTip("Look up the nets at both ends of each CONNECT marker")
+            btn_nets.clicked.connect(self.on_trace_nets)
+            btn_layout.addWidget(btn_run)
+            btn_layout.addWidget(btn_conflicts)
+            btn_layout.addWidget(btn_nets)
+            layout.addLayout(btn_layout)
+
+            self.checks_summary_label = pya.QLabel("Not run")
+            self.checks_summary_label.setWordWrap(True)
+            layout.addWidget(self.checks_summary_label)
+
+            self.checks_tree = pya.QTreeWidget()
+            self.checks_tree.setColumnCount(len(self.CHECK_COLUMNS))
+            self.checks_tree.setHeaderLabels([title for title, _ in self.CHECK_COLUMNS])
+            self.checks_tree.setRootIsDecorated(False)
+            self.checks_tree.itemDoubleClicked.connect(self.on_violation_double_clicked)
+            layout.addWidget(self.checks_tree, 1)
+
+        except Exception as e:
+            logger.error("[FIB Panel] Error creating checks tab: %s", e)
+            self.checks_tree = None
+        return widget
+
+    def on_run_checks(self):
+        """Run the rule checker over all markers and list the violations"""
+        try:
+            if not self.markers_list:
+                FibDialogManager.warning("No markers to check. Create some markers first.", "FIB Panel")
+                return
+
+            cellview = self._active_cellview()
+            if cellview is None:
+                FibDialogManager.warning("No active layout", "FIB Panel")
+                return
+
+            from .business.rule_checker import FibRuleChecker
+            result = FibRuleChecker().check(self.markers_list, cellview.layout(), cellview.cell)
+            self.show_check_result(result)
+        except Exception as e:
+            logger.error("[FIB Panel] Error running rule checks: %s", e)
+            FibDialogManager.warning(f"Error running rule checks: {e}", "FIB Panel")
+
+    def on_find_conflicts(self):
+        """List marker pairs closer than the minimum spacing"""
+        try:
+            if not self.markers_list:
+                FibDialogManager.warning("No markers to check. Create some markers first.", "FIB Panel")
+                return
+            conflicts = self.conflict_analyzer.analyze(self.markers_list)
+            self.show_check_items(conflicts, f"{len(conflicts)} marker pair(s) closer than "
+                                             f"{self.conflict_analyzer.min_spacing} um")
+        except Exception as e:
+            logger.error("[FIB Panel] Error finding conflicts: %s", e)
+            FibDialogManager.warning(f"Error finding conflicts: {e}", "FIB Panel")
+
+    def on_trace_nets(self):
+        """Look up the endpoint nets of all CONNECT markers"""
+        try:
+            cellview = self._active_cellview()
+            if cellview is None:
+                FibDialogManager.warning("No active layout", "FIB Panel")
+                return
+            service = self._connectivity_service()
+            service.invalidate()  # The layout may have been edited since the last trace
+            traces = service.trace_markers(self.markers_list, cellview.layout(), cellview.cell)
+            if not traces:
+                FibDialogManager.warning("No CONNECT markers to trace.", "FIB Panel")
+                return
+            open_count = sum(1 for trace in traces if trace.connected is False)
+            self.show_check_items(traces, f"{len(traces)} CONNECT marker(s) traced, {open_count} "
+                                          f"between different nets ({service.extractions} window(s) extracted)")
+        except Exception as e:
+            logger.error("[FIB Panel] Error tracing nets: %s", e)
+            FibDialogManager.warning(f"Error tracing nets: {e}", "FIB Panel")
+
+    def _connectivity_service(self):
+        if self.connectivity is None:
+            from .business.connectivity import FibConnectivityService
+            self.connectivity = FibConnectivityService()
+        return self.connectivity
+
+    @staticmethod
+    def _active_cellview():
+        main_window = pya.Application.instance().main_window()
+        current_view = main_window.current_view()
+        if not current_view or not current_view.active_cellview().is_valid():
+            return None
+        return current_view.active_cellview()
+
+    def show_check_result(self, result):
+        """Fill the Checks tab from a RuleCheckResult"""
+        self.show_check_items(result.violations, result.summary())
+
+    def show_check_items(self, items, summary):
+        """Fill the Checks tab (RuleViolation, MarkerConflict, NetTrace or UnmappedMarker items)"""
+        if getattr(self, 'checks_tree', None) is None:
+            return
+        self.checks_summary_label.setText(summary)
+        self.checks_tree.clear()
+        for entry in items:
+            item = pya.QTreeWidgetItem(self.checks_tree)
+            for column, (_, attr) in enumerate(self.CHECK_COLUMNS):
+                if attr is None:
+                    item.setText(column, f"({entry.x:.3f}, {entry.y:.3f})")
+                else:
+                    item.setText(column, str(getattr(entry, attr, None) or '-'))
+        for column in range(len(self.CHECK_COLUMNS)):
+            self.checks_tree.resizeColumnToContents(column)
+
+    def on_violation_double_clicked(self, item, column):
+        """Select and zoom to the marker of a violation"""
+        marker = self.marker_model.find_marker(item.text(0))
+        if marker is not None and self.select_marker(marker):
+            self.context_menu.handle_double_click(self.marker_model.row_of(marker.id))
+
     # Event handlers
     def on_new_project(self):
         """Handle New project with save prompt"""
@@ -400,12 +709,12 @@ class FIBPanel(pya.QDockWidget):
             )
 
             if result == FibDialogManager.RESULT_CANCEL:
-                print("[FIB Panel] New project cancelled by user")
+                logger.debug("[FIB Panel] New project cancelled by user")
                 return
 
             if result == FibDialogManager.RESULT_YES:
                 # User wants to save first
-                print("[FIB Panel] User chose to save before clearing")
+                logger.debug("[FIB Panel] User chose to save before clearing")
 
                 # Trigger save dialog
                 try:
@@ -420,12 +729,12 @@ class FIBPanel(pya.QDockWidget):
                             # Save failed, ask if user wants to continue anyway
                             if not FibDialogManager.confirm("Save Failed", f"Failed to save markers.\n\n"
                                 f"Do you still want to clear the project?"):
-                                print("[FIB Panel] New project cancelled after save failure")
+                                logger.debug("[FIB Panel] New project cancelled after save failure")
                                 return
                         else:
                             import os
                             basename = os.path.basename(filename)
-                            print(f"[FIB Panel] Markers saved to {basename} before clearing")
+                            logger.info("[FIB Panel] Markers saved to %s before clearing", basename)
 
                             # Show brief success message
                             try:
@@ -436,26 +745,26 @@ class FIBPanel(pya.QDockWidget):
                         # User cancelled save dialog, ask if want to continue
                         if not FibDialogManager.confirm("Save Cancelled", f"Save cancelled.\n\n"
                             f"Do you still want to clear the project without saving?"):
-                            print("[FIB Panel] New project cancelled after save cancellation")
+                            logger.debug("[FIB Panel] New project cancelled after save cancellation")
                             return
 
                 except Exception as save_error:
-                    print(f"[FIB Panel] Error during save: {save_error}")
+                    logger.error("[FIB Panel] Error during save: %s", save_error)
 
                     # Ask if user wants to continue despite error
                     if not FibDialogManager.confirm("Save Error", f"Error during save: {save_error}\n\n"
                         f"Do you still want to clear the project?"):
-                        print("[FIB Panel] New project cancelled after save error")
+                        logger.error("[FIB Panel] New project cancelled after save error")
                         return
 
             # Clear project (both "No" and "Yes after save" paths reach here)
             self._clear_project_internal()
 
             FibDialogManager.info("New project created", "FIB Panel")
-            print(f"[FIB Panel] New project created, cleared {marker_count} markers")
+            logger.info("[FIB Panel] New project created, cleared %s markers", marker_count)
 
         except Exception as e:
-            print(f"[FIB Panel] Error in on_new_project: {e}")
+            logger.error("[FIB Panel] Error in on_new_project: %s", e)
             import traceback
             traceback.print_exc()
             FibDialogManager.warning(f"Error creating new project: {e}", "FIB Panel")
@@ -463,18 +772,16 @@ class FIBPanel(pya.QDockWidget):
     def _clear_project_internal(self):
         """Internal method to clear all project data (called after confirmation)"""
         try:
-            # Clear markers from GDS layout
-            self.clear_markers_from_gds()
-
-            # Clear coordinate texts
-            self.clear_coordinate_texts()
+            # Clear markers and coordinate texts from GDS layout (one undo step)
+            with FibEditSession(description="FIB: clear project"):
+                self.clear_markers_from_gds()
+                self.clear_coordinate_texts()
 
             # Reset marker counters
             self.reset_marker_counters()
 
             # Clear panel data
-            self.markers_list.clear()
-            self._safe_call(self.marker_list, 'clear')
+            self.marker_model.clear()
 
             # Clear notes dictionary
             if hasattr(self, 'marker_notes_dict'):
@@ -491,10 +798,10 @@ class FIBPanel(pya.QDockWidget):
                     btn.setStyleSheet("")
             self.status_label.setText("Ready")
 
-            print("[FIB Panel] Project cleared successfully")
+            logger.info("[FIB Panel] Project cleared successfully")
 
         except Exception as e:
-            print(f"[FIB Panel] Error in _clear_project_internal: {e}")
+            logger.error("[FIB Panel] Error in _clear_project_internal: %s", e)
             import traceback
             traceback.print_exc()
     
@@ -525,11 +832,11 @@ class FIBPanel(pya.QDockWidget):
                         basename = os.path.basename(saved_filename)
                         FibDialogManager.info(f"Project auto-saved as {basename} with {len(self.markers_list)} markers", "FIB Panel")
                 except Exception as fallback_error:
-                    print(f"[FIB Panel] Fallback save error: {fallback_error}")
+                    logger.error("[FIB Panel] Fallback save error: %s", fallback_error)
                     FibDialogManager.warning("Save failed. Check console for details.", "FIB Panel")
                     
         except Exception as e:
-            print(f"[FIB Panel] Error in save project: {e}")
+            logger.error("[FIB Panel] Error in save project: %s", e)
             FibDialogManager.warning(f"Error saving project: {e}", "FIB Panel")
     
     def on_load_project(self):
@@ -539,6 +846,10 @@ class FIBPanel(pya.QDockWidget):
             filename = FileDialogHelper.get_load_filename(self)
             
             if filename:
+                is_valid, error = self.file_manager.validate_json_file(filename, self._current_layout_dbu())
+                if not is_valid:
+                    FibDialogManager.warning(f"Cannot load project: {error}", "FIB Panel")
+                    return
                 success = self.load_markers_from_json(filename)
                 if success:
                     basename = os.path.basename(filename)
@@ -546,12 +857,53 @@ class FIBPanel(pya.QDockWidget):
                 else:
                     FibDialogManager.warning("Failed to load project", "FIB Panel")
             else:
-                print("[FIB Panel] Load cancelled by user")
+                logger.debug("[FIB Panel] Load cancelled by user")
                 
         except Exception as e:
-            print(f"[FIB Panel] Error in load project: {e}")
+            logger.error("[FIB Panel] Error in load project: %s", e)
             FibDialogManager.warning(f"Error loading project: {e}", "FIB Panel")
 
+    def on_migrate_markers(self):
+        """Map all markers onto a new layout revision through their containing instances"""
+        try:
+            markers = list(self.markers_list)
+            if not markers:
+                FibDialogManager.warning("No markers to migrate. Create or load some markers first.", "FIB Panel")
+                return
+            old_cellview = self._active_cellview()
+            if old_cellview is None:
+                FibDialogManager.warning("Open the layout the markers were placed on first.", "FIB Panel")
+                return
+            filepath = FibDialogManager.ask_open_filepath(
+                "Layout files (*.gds *.gds2 *.gds.gz *.oas *.oasis);;All files (*)", self)
+            if not filepath:
+                return
+
+            from .business.marker_migrator import FibMarkerMigrator
+            from .business.bulk_transform import FibBulkTransformer
+            old_layout, old_cell = old_cellview.layout(), old_cellview.cell
+            main_window = pya.Application.instance().main_window()
+            main_window.load_layout(filepath, 1)  # New view, the old revision stays open
+            new_view = main_window.current_view()
+            new_cellview = new_view.active_cellview()
+            new_layout, new_cell = new_cellview.layout(), new_cellview.cell
+
+            result = FibMarkerMigrator().migrate(markers, old_layout, old_cell, new_layout, new_cell)
+            with perf_timer('marker.migrate_draw'), FibEditSession(new_view, "FIB: migrate markers", new_layout):
+                FibBulkTransformer().draw_gds(markers, new_cell)
+            new_view.add_missing_layers()
+            self.marker_model.refresh_all()
+
+            summary = result.summary()
+            self.show_check_items(result.unmapped, summary)
+            self.status_label.setText(summary)
+            if result.unmapped:
+                FibDialogManager.warning(f"{summary}\n\nMarkers that could not be mapped keep their old "
+                                         f"coordinates and are listed in the Checks tab.", "Migrate Markers")
+        except Exception as e:
+            logger.error("[FIB Panel] Error migrating markers: %s", e)
+            FibDialogManager.warning(f"Error migrating markers: {e}", "FIB Panel")
+
     def get_gds_filename(self, view):
         """Get GDS filename from current cellview (basename without extension)"""
         import os
@@ -655,7 +1007,7 @@ class FIBPanel(pya.QDockWidget):
 
             if not parent_dir:
                 try:
-                    print("[FIB Panel] Export HTML cancelled by user")
+                    logger.debug("[FIB Panel] Export HTML cancelled by user")
                 except:
                     pass
                 return
@@ -671,7 +1023,7 @@ class FIBPanel(pya.QDockWidget):
             try:
                 os.makedirs(export_dir, exist_ok=False)
                 try:
-                    print(f"[FIB Panel] Created export directory: {export_dir}")
+                    logger.debug("[FIB Panel] Created export directory: %s", export_dir)
                 except:
                     pass
             except FileExistsError:
@@ -682,7 +1034,7 @@ class FIBPanel(pya.QDockWidget):
                 try:
                     os.makedirs(export_dir, exist_ok=True)
                     try:
-                        print(f"[FIB Panel] Created export directory (retry): {export_dir}")
+                        logger.debug("[FIB Panel] Created export directory (retry): %s", export_dir)
                     except:
                         pass
                 except Exception as e:
@@ -712,7 +1064,7 @@ class FIBPanel(pya.QDockWidget):
                 if os.path.exists(html_file):
                     self._ask_to_open_html(html_file)
                 else:
-                    print(f"[FIB Panel] Warning: HTML file not found at {html_file}")
+                    logger.warning("[FIB Panel] Warning: HTML file not found at %s", html_file)
             else:
                 FibDialogManager.warning(
                     f"Failed to export HTML.\n\n"
@@ -733,110 +1085,107 @@ class FIBPanel(pya.QDockWidget):
                 error_msg = f"Error exporting HTML: {e}"
 
             try:
-                print(f"[FIB Panel] {error_msg}")
+                logger.debug("[FIB Panel] %s", error_msg)
             except:
                 pass
             FibDialogManager.warning(error_msg, "FIB Panel")
 
-    def export_markers(self, output_dir, view):
+    def export_markers(self, output_dir, view, update=False):
         """Export markers to HTML report with screenshots
 
         Args:
             output_dir: Directory to save all output files (HTML, screenshots)
             view: Current KLayout view
+            update (bool): Update a previous export in output_dir incrementally
 
         Returns:
             bool: True if successful, False otherwise
         """
-        # Setup logging to file (works without Macro Development Console)
+        # One buffered log for the whole export (screenshots + report)
         from pathlib import Path
-        log_file = None
-        try:
-            log_file = Path(output_dir) / 'export_log.txt'
-            # Clear old log
-            if log_file.exists():
-                log_file.unlink()
-        except:
-            pass
+        from .core.export_logger import FibExportLogger
+        from .config import EXPORT_LOG_CONFIG
 
-        def log(message):
-            """Log to both console and file"""
-            # Replace Unicode symbols with ASCII equivalents for Windows GBK compatibility
-            ascii_message = message.replace('✓', '[OK]').replace('✗', '[X]').replace('ℹ', '[i]')
-            try:
-                print(ascii_message)
-            except:
-                pass
-            if log_file:
-                try:
-                    with open(log_file, 'a', encoding='utf-8') as f:
-                        f.write(message + '\n')
-                except:
-                    pass
+        log = FibExportLogger(Path(output_dir) / EXPORT_LOG_CONFIG['filename'], mode='w')
 
-        log("=" * 80)
-        log("[FIB Panel] export_markers() CALLED")
-        log("=" * 80)
-        log(f"[FIB Panel] Output directory: {output_dir}")
-        log(f"[FIB Panel] Number of markers: {len(self.markers_list)}")
-        log(f"[FIB Panel] View: {view}")
+        log.debug("=" * 80)
+        log.debug("[FIB Panel] export_markers() CALLED")
+        log.debug("=" * 80)
+        log.info(f"[FIB Panel] Output directory: {output_dir}")
+        log.info(f"[FIB Panel] Number of markers: {len(self.markers_list)} (update={update})")
+        log.debug(f"[FIB Panel] View: {view}")
 
         try:
-            log("[FIB Panel] Importing screenshot_export module...")
-            import os
-            from .screenshot_export import (
-                export_markers_with_screenshots,
-                generate_html_report_with_screenshots
-            )
-            log("[FIB Panel] Import successful")
+            from .screenshot_export import export_report
 
-            log(f"[FIB Panel] Starting HTML export with screenshots...")
+            log.info(f"[FIB Panel] Starting HTML export with screenshots...")
 
-            # Generate screenshots for all markers
-            log(f"[FIB Panel] Calling export_markers_with_screenshots with {len(self.markers_list)} markers...")
-            try:
-                screenshots_dict = export_markers_with_screenshots(
-                    self.markers_list,
-                    view,
-                    output_dir
-                )
-                log(f"[FIB Panel] Screenshots generated: {len(screenshots_dict)} markers")
-            except Exception as screenshot_error:
-                log(f"[FIB Panel] ERROR in export_markers_with_screenshots: {screenshot_error}")
-                import traceback
-                log(traceback.format_exc())
+            report_path = export_report(self.markers_list, view, output_dir, logger=log, update=update)
+            if not report_path:
+                log.error(f"[FIB Panel] Failed to generate HTML report")
                 return False
 
-            # Define output filename
-            html_filename = os.path.join(output_dir, "fib_markers_report.html")
+            log.info(f"[FIB Panel] HTML report saved to: {report_path}")
+            return True
 
-            # Generate HTML report with screenshots
-            log(f"[FIB Panel] Calling generate_html_report_with_screenshots...")
-            try:
-                success = generate_html_report_with_screenshots(
-                    self.markers_list,
-                    screenshots_dict,
-                    html_filename
-                )
+        except Exception as e:
+            log.exception(f"[FIB Panel] Error in export_markers: {e}")
+            return False
 
-                if not success:
-                    log(f"[FIB Panel] Failed to generate HTML report (returned False)")
-                    return False
+        finally:
+            log.close()
 
-                log(f"[FIB Panel] HTML report saved to: {html_filename}")
-                return True
+    def on_update_html(self):
+        """Handle Update HTML - refresh a previous export directory in place"""
+        try:
+            from .business.report_manifest import FibReportManifest
 
-            except Exception as html_error:
-                log(f"[FIB Panel] ERROR in generate_html_report_with_screenshots: {html_error}")
-                import traceback
-                log(traceback.format_exc())
-                return False
+            if not self.markers_list:
+                FibDialogManager.warning("No markers to export. Create some markers first.", "FIB Panel")
+                return
+
+            main_window = pya.Application.instance().main_window()
+            current_view = main_window.current_view()
+            if not current_view:
+                FibDialogManager.warning("No active view", "FIB Panel")
+                return
+
+            export_dir = pya.QFileDialog().getExistingDirectory(
+                self, "Select Previous Export Directory", os.path.expanduser("~")
+            )
+            if isinstance(export_dir, tuple):
+                export_dir = export_dir[0] if export_dir[0] else None
+            if not export_dir:
+                return
+
+            if not os.path.exists(FibReportManifest.path(export_dir)):
+                FibDialogManager.warning(
+                    f"No report manifest found in:\n{export_dir}\n\n"
+                    f"Select a directory created by Export HTML.",
+                    "FIB Panel"
+                )
+                return
+
+            if self.export_markers(export_dir, current_view, update=True):
+                FibDialogManager.info(
+                    f"HTML report updated:\n{export_dir}\n\n"
+                    f"{len(self.markers_list)} markers included\n\n"
+                    f"Log file: {export_dir}/export_log.txt",
+                    "FIB Panel"
+                )
+                html_file = os.path.join(export_dir, "fib_markers_report.html")
+                if os.path.exists(html_file):
+                    self._ask_to_open_html(html_file)
+            else:
+                FibDialogManager.warning(
+                    f"Failed to update HTML.\n\n"
+                    f"Please check the log file for details:\n{export_dir}/export_log.txt",
+                    "FIB Panel"
+                )
 
         except Exception as e:
-            log(f"[FIB Panel] Error in export_markers: {e}")
-            import traceback
-            log(traceback.format_exc())
-            return False
+            logger.error("[FIB Panel] Error updating HTML: %s", e)
+            FibDialogManager.warning(f"Error updating HTML: {e}", "FIB Panel")
 
     
     def on_cut_clicked(self):
@@ -853,7 +1202,7 @@ class FIBPanel(pya.QDockWidget):
             self.activate_toolbar_plugin(mode)
             self.activate_mode(mode)
         except Exception as e:
-            print(f"[FIB Panel] Error in on_cut_clicked: {e}")
+            logger.error("[FIB Panel] Error in on_cut_clicked: %s", e)
             # Fallback to regular cut mode
             self.activate_toolbar_plugin('cut')
             self.activate_mode('cut')
@@ -872,7 +1221,7 @@ class FIBPanel(pya.QDockWidget):
             self.activate_toolbar_plugin(mode)
             self.activate_mode(mode)
         except Exception as e:
-            print(f"[FIB Panel] Error in on_connect_clicked: {e}")
+            logger.error("[FIB Panel] Error in on_connect_clicked: %s", e)
             # Fallback to regular connect mode
             self.activate_toolbar_plugin('connect')
             self.activate_mode('connect')
@@ -882,10 +1231,20 @@ class FIBPanel(pya.QDockWidget):
         self.activate_toolbar_plugin('probe')
         self.activate_mode('probe')
 
+    def on_pick_clicked(self):
+        """Handle Pick button - select markers by clicking them in the layout"""
+        self.activate_toolbar_plugin('select')
+        self.activate_mode('select')
+
+    def on_snap_toggled(self, checked):
+        """Handle Snap checkbox"""
+        from .snapping import set_snap_enabled
+        set_snap_enabled(checked)
+
     def on_cut_mode_changed(self, index):
         """Handle Cut mode dropdown change - auto-switch to Cut mode"""
         try:
-            print(f"[FIB Panel] Cut dropdown changed to index {index}")
+            logger.debug("[FIB Panel] Cut dropdown changed to index %s", index)
 
             # Determine new mode
             current_text = self.cut_mode_combo.currentText
@@ -903,17 +1262,17 @@ class FIBPanel(pya.QDockWidget):
             self.activate_toolbar_plugin(new_mode)
             self.activate_mode(new_mode)
 
-            print(f"[FIB Panel] Auto-switched to {new_mode}")
+            logger.debug("[FIB Panel] Auto-switched to %s", new_mode)
 
         except Exception as e:
-            print(f"[FIB Panel] Error in on_cut_mode_changed: {e}")
+            logger.error("[FIB Panel] Error in on_cut_mode_changed: %s", e)
             import traceback
             traceback.print_exc()
 
     def on_connect_mode_changed(self, index):
         """Handle Connect mode dropdown change - auto-switch to Connect mode"""
         try:
-            print(f"[FIB Panel] Connect dropdown changed to index {index}")
+            logger.debug("[FIB Panel] Connect dropdown changed to index %s", index)
 
             # Determine new mode
             current_text = self.connect_mode_combo.currentText
@@ -931,86 +1290,86 @@ class FIBPanel(pya.QDockWidget):
             self.activate_toolbar_plugin(new_mode)
             self.activate_mode(new_mode)
 
-            print(f"[FIB Panel] Auto-switched to {new_mode}")
+            logger.debug("[FIB Panel] Auto-switched to %s", new_mode)
 
         except Exception as e:
-            print(f"[FIB Panel] Error in on_connect_mode_changed: {e}")
+            logger.error("[FIB Panel] Error in on_connect_mode_changed: %s", e)
             import traceback
             traceback.print_exc()
 
     def activate_toolbar_plugin(self, mode):
         """Activate the corresponding plugin mode"""
-        print("=" * 80)
-        print(f"[FIB Panel] DEBUG: activate_toolbar_plugin called with mode='{mode}'")
-        print("=" * 80)
+        logger.debug('=' * 80)
+        logger.debug("[FIB Panel] DEBUG: activate_toolbar_plugin called with mode='%s'", mode)
+        logger.debug('=' * 80)
         
         try:
             # PRIORITY 1: Import directly from fib_plugin module (most reliable for SALT packages)
-            print(f"[FIB Panel] Step 1: Attempting to import fib_plugin module...")
+            logger.debug("[FIB Panel] Step 1: Attempting to import fib_plugin module...")
             try:
                 from . import fib_plugin
-                print(f"[FIB Panel] [OK] fib_plugin module imported successfully")
-                print(f"[FIB Panel] fib_plugin module location: {fib_plugin.__file__ if hasattr(fib_plugin, '__file__') else 'unknown'}")
+                logger.info("[FIB Panel] [OK] fib_plugin module imported successfully")
+                logger.debug("[FIB Panel] fib_plugin module location: %s", fib_plugin.__file__ if hasattr(fib_plugin, '__file__') else 'unknown')
                 
                 # Check if activate_fib_mode exists
                 has_function = hasattr(fib_plugin, 'activate_fib_mode')
-                print(f"[FIB Panel] Has activate_fib_mode: {has_function}")
+                logger.debug("[FIB Panel] Has activate_fib_mode: %s", has_function)
                 
                 if has_function:
-                    print(f"[FIB Panel] Step 2: Calling fib_plugin.activate_fib_mode('{mode}')...")
+                    logger.debug("[FIB Panel] Step 2: Calling fib_plugin.activate_fib_mode('%s')...", mode)
                     
                     # Get the function
                     activate_func = getattr(fib_plugin, 'activate_fib_mode')
-                    print(f"[FIB Panel] Function object: {activate_func}")
-                    print(f"[FIB Panel] Function type: {type(activate_func)}")
+                    logger.debug("[FIB Panel] Function object: %s", activate_func)
+                    logger.debug("[FIB Panel] Function type: %s", type(activate_func))
                     
                     # Call it
                     result = activate_func(mode)
                     
-                    print(f"[FIB Panel] Step 3: Function returned: {result} (type: {type(result)})")
+                    logger.debug("[FIB Panel] Step 3: Function returned: %s (type: %s)", result, type(result))
                     
                     if result:
-                        print(f"[FIB Panel] [OK] SUCCESS: {mode} mode activated")
-                        print("=" * 80)
+                        logger.debug("[FIB Panel] [OK] SUCCESS: %s mode activated", mode)
+                        logger.debug('=' * 80)
                         return True
                     else:
-                        print(f"[FIB Panel] [X] FAILED: activate_fib_mode returned False")
+                        logger.error("[FIB Panel] [X] FAILED: activate_fib_mode returned False")
                 else:
-                    print(f"[FIB Panel] [X] FAILED: fib_plugin has no activate_fib_mode attribute")
-                    print(f"[FIB Panel] Available attributes in fib_plugin:")
+                    logger.error("[FIB Panel] [X] FAILED: fib_plugin has no activate_fib_mode attribute")
+                    logger.debug("[FIB Panel] Available attributes in fib_plugin:")
                     attrs = [attr for attr in dir(fib_plugin) if not attr.startswith('_')]
                     for i, attr in enumerate(attrs[:20]):  # Show first 20
-                        print(f"[FIB Panel]   {i+1}. {attr}")
+                        logger.debug("[FIB Panel]   %s. %s", i + 1, attr)
                     if len(attrs) > 20:
-                        print(f"[FIB Panel]   ... and {len(attrs)-20} more")
+                        logger.debug("[FIB Panel]   ... and %s more", len(attrs) - 20)
                 
             except ImportError as import_error:
-                print(f"[FIB Panel] [X] ImportError: {import_error}")
+                logger.error("[FIB Panel] [X] ImportError: %s", import_error)
                 import traceback
                 traceback.print_exc()
             except Exception as direct_error:
-                print(f"[FIB Panel] [X] Exception during import/call: {direct_error}")
+                logger.error("[FIB Panel] [X] Exception during import/call: %s", direct_error)
                 import traceback
                 traceback.print_exc()
             
             # PRIORITY 2: Try __main__ namespace (fallback for exec() loading)
-            print(f"[FIB Panel] Step 4: Checking __main__ namespace...")
+            logger.debug("[FIB Panel] Step 4: Checking __main__ namespace...")
             if 'activate_fib_mode' in sys.modules['__main__'].__dict__:
-                print(f"[FIB Panel] [OK] Found activate_fib_mode in __main__")
+                logger.debug("[FIB Panel] [OK] Found activate_fib_mode in __main__")
                 activate_fib_mode = sys.modules['__main__'].__dict__['activate_fib_mode']
-                print(f"[FIB Panel] Calling __main__.activate_fib_mode('{mode}')...")
+                logger.debug("[FIB Panel] Calling __main__.activate_fib_mode('%s')...", mode)
                 result = activate_fib_mode(mode)
-                print(f"[FIB Panel] __main__ result: {result}")
+                logger.debug("[FIB Panel] __main__ result: %s", result)
                 if result:
-                    print(f"[FIB Panel] [OK] SUCCESS via __main__")
-                    print("=" * 80)
+                    logger.debug("[FIB Panel] [OK] SUCCESS via __main__")
+                    logger.debug('=' * 80)
                     return True
             else:
-                print(f"[FIB Panel] [X] activate_fib_mode not found in __main__")
+                logger.error("[FIB Panel] [X] activate_fib_mode not found in __main__")
             
             # If everything failed, show error
-            print(f"[FIB Panel] [X] ALL METHODS FAILED")
-            print("=" * 80)
+            logger.error("[FIB Panel] [X] ALL METHODS FAILED")
+            logger.debug('=' * 80)
             
             FibDialogManager.warning(f"无法激活 {mode.upper()} 模式。\n\n"
                 f"Failed to activate {mode.upper()} mode.\n\n"
@@ -1025,10 +1384,10 @@ class FIBPanel(pya.QDockWidget):
             return False
                 
         except Exception as e:
-            print(f"[FIB Panel] [X] FATAL ERROR: {e}")
+            logger.error("[FIB Panel] [X] FATAL ERROR: %s", e)
             import traceback
             traceback.print_exc()
-            print("=" * 80)
+            logger.debug('=' * 80)
             
             FibDialogManager.warning(f"激活模式时出错 / Error activating mode:\n\n{str(e)}", "FIB Panel Error")
             return False
@@ -1056,7 +1415,7 @@ class FIBPanel(pya.QDockWidget):
             
             # Set appropriate status message (keep it short to prevent panel expansion)
             # Shorten display names for compact layout
-            display_name = 'CON' if base_mode == 'connect' else base_mode.upper()
+            display_name = {'connect': 'CON', 'select': 'PICK'}.get(base_mode, base_mode.upper())
             if mode.endswith('_multi'):
                 self.status_label.setText(f"{display_name}: L-add, R-end")
             else:
@@ -1065,7 +1424,7 @@ class FIBPanel(pya.QDockWidget):
             # Clear any pending points when switching modes
             self.clear_pending_points()
         
-        print(f"[FIB Panel] Mode: {self.active_mode}")
+        logger.debug("[FIB Panel] Mode: %s", self.active_mode)
     
     def clear_pending_points(self):
         """Clear pending points from all plugin instances"""
@@ -1078,17 +1437,45 @@ class FIBPanel(pya.QDockWidget):
                         plugin.temp_points = []
                         plugin.last_click_time = 0
                         plugin.last_click_pos = None
-                        print(f"[FIB Panel] Cleared temp_points and double-click state for {plugin_mode} plugin")
+                        logger.info("[FIB Panel] Cleared temp_points and double-click state for %s plugin", plugin_mode)
         except Exception as e:
-            print(f"[FIB Panel] Error clearing pending points: {e}")
+            logger.error("[FIB Panel] Error clearing pending points: %s", e)
     
     def on_marker_context_menu(self, position):
         """Handle right-click on marker list"""
         self.context_menu.show_context_menu(position)
     
-    def on_marker_double_clicked(self, item):
+    def on_marker_filter_changed(self, text=None):
+        """Restart the debounce timer on every keystroke"""
+        self._filter_timer.start()
+    
+    def apply_marker_filter(self):
+        """Apply the filter box text to the marker list"""
+        try:
+            filter_text = self.marker_filter_input.text
+            if callable(filter_text):
+                filter_text = filter_text()
+            
+            start = time.perf_counter()
+            visible = self.marker_model.set_filter(filter_text)
+            elapsed = time.perf_counter() - start
+            elapsed_ms = elapsed * 1000.0
+            get_perf_monitor().record('marker.filter', elapsed)
+            
+            total = len(self.markers_list)
+            if self.marker_model.is_filtered():
+                self.marker_group.setTitle(f"Markers ({visible}/{total})")
+            else:
+                self.marker_group.setTitle("Markers")
+            logger.debug("[FIB Panel] Filter '%s': %s/%s markers (%.1f ms)", filter_text, visible, total, elapsed_ms)
+            
+        except Exception as e:
+            logger.error("[FIB Panel] Error applying marker filter: %s", e)
+    
+    def on_marker_double_clicked(self, index):
         """Handle double-click on marker"""
-        self.context_menu.handle_double_click(item)
+        if index.isValid():
+            self.context_menu.handle_double_click(index.row())
     
 
     def on_coordinate_jump(self):
@@ -1149,7 +1536,7 @@ class FIBPanel(pya.QDockWidget):
             
             current_view.zoom_box(zoom_box)
             
-            print(f"[FIB Panel] Jumped to coordinates: ({x:.3f}, {y:.3f})")
+            logger.debug("[FIB Panel] Jumped to coordinates: (%.3f, %.3f)", x, y)
             
             # Show brief message
             try:
@@ -1158,33 +1545,90 @@ class FIBPanel(pya.QDockWidget):
                 pass
                 
         except Exception as e:
-            print(f"[FIB Panel] Error in coordinate jump: {e}")
+            logger.error("[FIB Panel] Error in coordinate jump: %s", e)
             import traceback
             traceback.print_exc()
             FibDialogManager.warning(f"Error: {e}", "Coordinate Jump")
     
+    def on_transform_markers(self):
+        """Shift / rotate / mirror / scale the selected markers (all if none is selected)"""
+        try:
+            model = self.marker_model
+            rows = [model.source_row(row) for row in self.selected_marker_rows()]
+            rows = [row for row in rows if row >= 0] or list(range(len(model.markers)))
+            if not rows:
+                FibDialogManager.warning("No markers to transform. Create some markers first.", "FIB Panel")
+                return
+            cellview = self._active_cellview()
+            if cellview is None:
+                FibDialogManager.warning("No active layout", "FIB Panel")
+                return
+            trans = FibDialogManager.ask_transform(len(rows), self)
+            if trans is None:
+                return
+
+            from .business.bulk_transform import FibBulkTransformer
+            markers = [model.markers[row] for row in rows]
+            erased = FibBulkTransformer().apply(markers, trans, cellview.cell, table=model.marker_table(), rows=rows)
+            model.refresh_all()  # New positions: search / spatial index and marker table
+            self.status_label.setText(f"Transformed {len(markers)} marker(s)")
+            if erased == 0:
+                logger.warning("[FIB Panel] No drawn shapes found for the transformed markers")
+        except Exception as e:
+            logger.error("[FIB Panel] Error transforming markers: %s", e)
+            FibDialogManager.warning(f"Error transforming markers: {e}", "FIB Panel")
+
+    def on_convert_markers(self, target_type):
+        """Convert the selected markers to another type (one undo step)
+
+        Args:
+            target_type (str): See FibMarkerTransformer.convert_batch
+        """
+        try:
+            model = self.marker_model
+            rows = [model.source_row(row) for row in self.selected_marker_rows()]
+            markers = [model.markers[row] for row in rows if row >= 0]
+            if not markers:
+                FibDialogManager.warning("No markers selected.", "FIB Panel")
+                return
+            cellview = self._active_cellview()
+            cell = cellview.cell if cellview is not None else None
+            converted, failures = self.transformer.convert_batch(markers, target_type, cell, model=model)
+            for _, marker in converted:
+                if marker.id in self.marker_notes_dict:
+                    self.marker_notes_dict[marker.id] = marker.notes
+
+            message = f"Converted {len(converted)} marker(s) to {target_type.replace('_', ' ')}"
+            self.status_label.setText(message)
+            if failures:
+                details = "\n".join(f"  • {marker_id}: {reason}" for marker_id, reason in failures[:20])
+                if len(failures) > 20:
+                    details += f"\n  ... and {len(failures) - 20} more"
+                FibDialogManager.warning(f"{message}, {len(failures)} not converted:\n\n{details}", "Convert Markers")
+        except Exception as e:
+            logger.error("[FIB Panel] Error converting markers: %s", e)
+            FibDialogManager.warning(f"Error converting markers: {e}", "FIB Panel")
+
     def on_clear_all(self):
         """Clear all markers"""
         if self.markers_list:
             if FibDialogManager.confirm("Clear All", f"Delete all {len(self.markers_list)} markers from layout and reset counters?"):
-                # Clear markers from GDS layout
-                self.clear_markers_from_gds()
-                
-                # Clear coordinate texts
-                self.clear_coordinate_texts()
+                # Clear markers and coordinate texts from GDS layout (one undo step)
+                with FibEditSession(description="FIB: clear all markers"):
+                    self.clear_markers_from_gds()
+                    self.clear_coordinate_texts()
                 
                 # Reset marker counters
                 self.reset_marker_counters()
                 
                 # Clear panel data
-                self.markers_list.clear()
-                self._safe_call(self.marker_list, 'clear')
+                self.marker_model.clear()
                 
                 # Reset smart counters
                 if hasattr(self, 'smart_counter'):
                     self.smart_counter.reset_counters()
                 
-                print("[FIB Panel] Cleared all markers from layout and reset counters")
+                logger.info("[FIB Panel] Cleared all markers from layout and reset counters")
     
     def clear_markers_from_gds(self):
         """Clear all FIB markers from the GDS layout"""
@@ -1194,7 +1638,7 @@ class FIBPanel(pya.QDockWidget):
             current_view = main_window.current_view()
             
             if not current_view or not current_view.active_cellview().is_valid():
-                print("[FIB Panel] No active layout found")
+                logger.debug("[FIB Panel] No active layout found")
                 return
             
             cellview = current_view.active_cellview()
@@ -1209,14 +1653,14 @@ class FIBPanel(pya.QDockWidget):
                 try:
                     fib_layer = layout.layer(layer_num, 0)
                     cell.shapes(fib_layer).clear()
-                    print(f"[FIB Panel] Cleared layer {layer_num} ({layer_name})")
+                    logger.info("[FIB Panel] Cleared layer %s (%s)", layer_num, layer_name)
                 except Exception as layer_error:
-                    print(f"[FIB Panel] Error clearing layer {layer_num}: {layer_error}")
+                    logger.error("[FIB Panel] Error clearing layer %s: %s", layer_num, layer_error)
             
-            print("[FIB Panel] All FIB markers cleared from GDS")
+            logger.info("[FIB Panel] All FIB markers cleared from GDS")
             
         except Exception as e:
-            print(f"[FIB Panel] Error clearing markers from GDS: {e}")
+            logger.error("[FIB Panel] Error clearing markers from GDS: %s", e)
     
     def clear_coordinate_texts(self):
         """Clear all coordinate text labels"""
@@ -1225,7 +1669,7 @@ class FIBPanel(pya.QDockWidget):
             if 'clear_coordinate_texts' in sys.modules['__main__'].__dict__:
                 clear_func = sys.modules['__main__'].__dict__['clear_coordinate_texts']
                 clear_func()
-                print("[FIB Panel] Coordinate texts cleared via global function")
+                logger.info("[FIB Panel] Coordinate texts cleared via global function")
             else:
                 # Fallback: clear coordinate layer directly
                 main_window = pya.Application.instance().main_window()
@@ -1239,10 +1683,10 @@ class FIBPanel(pya.QDockWidget):
                     from .config import LAYERS
                     coord_layer = layout.layer(LAYERS['coordinates'], 0)
                     cell.shapes(coord_layer).clear()
-                    print("[FIB Panel] Coordinate texts cleared directly")
+                    logger.info("[FIB Panel] Coordinate texts cleared directly")
                     
         except Exception as e:
-            print(f"[FIB Panel] Error clearing coordinate texts: {e}")
+            logger.error("[FIB Panel] Error clearing coordinate texts: %s", e)
     
     def _ask_to_open_html(self, html_filename):
         """Ask user if they want to open the HTML file in browser"""
@@ -1251,7 +1695,7 @@ class FIBPanel(pya.QDockWidget):
                 self._open_html_in_browser(html_filename)
                 
         except Exception as e:
-            print(f"[FIB Panel] Error asking to open HTML: {e}")
+            logger.error("[FIB Panel] Error asking to open HTML: %s", e)
     
     def _open_file_explorer(self, directory):
         """Open file explorer/finder at the specified directory"""
@@ -1261,7 +1705,7 @@ class FIBPanel(pya.QDockWidget):
             import os
             
             if not os.path.exists(directory):
-                print(f"[FIB Panel] Directory does not exist: {directory}")
+                logger.debug("[FIB Panel] Directory does not exist: %s", directory)
                 return
             
             system = platform.system().lower()
@@ -1269,12 +1713,12 @@ class FIBPanel(pya.QDockWidget):
             if system == "windows":
                 # Windows: Open Explorer
                 subprocess.Popen(['explorer', directory])
-                print(f"[FIB Panel] Opened Explorer at: {directory}")
+                logger.debug("[FIB Panel] Opened Explorer at: %s", directory)
                 
             elif system == "darwin":  # macOS
                 # macOS: Open Finder
                 subprocess.Popen(['open', directory])
-                print(f"[FIB Panel] Opened Finder at: {directory}")
+                logger.debug("[FIB Panel] Opened Finder at: %s", directory)
                 
             else:  # Linux
                 # Linux: Try common file managers
@@ -1282,15 +1726,15 @@ class FIBPanel(pya.QDockWidget):
                 for fm in file_managers:
                     try:
                         subprocess.Popen([fm, directory])
-                        print(f"[FIB Panel] Opened {fm} at: {directory}")
+                        logger.debug("[FIB Panel] Opened %s at: %s", fm, directory)
                         return
                     except FileNotFoundError:
                         continue
                 
-                print(f"[FIB Panel] No file manager found for Linux")
+                logger.debug("[FIB Panel] No file manager found for Linux")
                 
         except Exception as e:
-            print(f"[FIB Panel] Error opening file explorer: {e}")
+            logger.error("[FIB Panel] Error opening file explorer: %s", e)
     
     def _open_html_in_browser(self, html_filename):
         """Open HTML file in browser with priority: Edge > Chrome > IE"""
@@ -1317,12 +1761,12 @@ class FIBPanel(pya.QDockWidget):
                 
                 for browser_path in browsers:
                     if os.path.exists(browser_path):
-                        print(f"[FIB Panel] Opening HTML with: {os.path.basename(browser_path)}")
+                        logger.debug("[FIB Panel] Opening HTML with: %s", os.path.basename(browser_path))
                         subprocess.Popen([browser_path, html_filename])
                         return
                 
                 # Fallback: Use default browser
-                print("[FIB Panel] Using default browser")
+                logger.debug("[FIB Panel] Using default browser")
                 os.startfile(html_filename)
                 
             elif system == "darwin":  # macOS
@@ -1336,13 +1780,13 @@ class FIBPanel(pya.QDockWidget):
                 for browser in browsers:
                     try:
                         subprocess.run(["open", "-a", browser, html_filename], check=True)
-                        print(f"[FIB Panel] Opened HTML with: {browser}")
+                        logger.debug("[FIB Panel] Opened HTML with: %s", browser)
                         return
                     except subprocess.CalledProcessError:
                         continue
                 
                 # Fallback: Use default browser
-                print("[FIB Panel] Using default browser")
+                logger.debug("[FIB Panel] Using default browser")
                 subprocess.run(["open", html_filename])
                 
             else:  # Linux
@@ -1357,77 +1801,70 @@ class FIBPanel(pya.QDockWidget):
                 for browser in browsers:
                     try:
                         subprocess.Popen([browser, html_filename])
-                        print(f"[FIB Panel] Opened HTML with: {browser}")
+                        logger.debug("[FIB Panel] Opened HTML with: %s", browser)
                         return
                     except FileNotFoundError:
                         continue
                 
                 # Fallback: Use xdg-open
-                print("[FIB Panel] Using default browser")
+                logger.debug("[FIB Panel] Using default browser")
                 subprocess.Popen(["xdg-open", html_filename])
                 
         except Exception as e:
-            print(f"[FIB Panel] Error opening HTML in browser: {e}")
+            logger.error("[FIB Panel] Error opening HTML in browser: %s", e)
             # Final fallback: Show message with file path
             FibDialogManager.info(f"Could not open browser automatically.\n\nPlease open this file manually:\n{html_filename}", "FIB Panel")
     
     def _recreate_coordinate_texts(self, marker, cell, layout):
         """Recreate coordinate text labels for a loaded marker"""
         try:
-            dbu = layout.dbu
             coord_layer_num = LAYERS['coordinates']
             coord_layer = layout.layer(coord_layer_num, 0)
             
-            # Get coordinates based on marker type
-            coordinates = []
-            
-            if hasattr(marker, 'points'):
-                # Multi-point marker
-                coordinates = marker.points
-            elif hasattr(marker, 'x1'):
-                # Two-point marker (cut, connect)
-                coordinates = [(marker.x1, marker.y1), (marker.x2, marker.y2)]
-            elif hasattr(marker, 'x'):
-                # Single-point marker (probe)
-                coordinates = [(marker.x, marker.y)]
-            
-            # Create coordinate texts
-            for x, y in coordinates:
-                coord_text = f"{marker.id}:({x:.3f},{y:.3f})"
-                text_x = int(x / dbu)
-                text_y = int(y / dbu)
-                
-                text_obj = pya.Text(coord_text, pya.Trans(pya.Point(text_x, text_y)))
+            # One text per marker point (all points of multi-point markers)
+            texts = coordinate_texts(marker, layout.dbu)
+            for text_obj in texts:
                 cell.shapes(coord_layer).insert(text_obj)
             
-            print(f"[FIB Panel] Recreated {len(coordinates)} coordinate texts for {marker.id}")
+            logger.debug("[FIB Panel] Recreated %s coordinate texts for %s", len(texts), marker.id)
             
         except Exception as e:
-            print(f"[FIB Panel] Error recreating coordinate texts: {e}")
+            logger.error("[FIB Panel] Error recreating coordinate texts: %s", e)
     
     def reset_marker_counters(self):
         """Reset marker counters to start from 0"""
         try:
             # Phase 2 refactoring: Use FibGlobalState instead of sys.modules
             self.state.reset_counters()
-            print("[FIB Panel] Marker counters reset via FibGlobalState")
+            logger.debug("[FIB Panel] Marker counters reset via FibGlobalState")
         except Exception as e:
-            print(f"[FIB Panel] Error resetting marker counters: {e}")
+            logger.error("[FIB Panel] Error resetting marker counters: %s", e)
     
+    def _current_layout_dbu(self):
+        """Database unit of the active layout, or None without one"""
+        try:
+            cellview = self._active_cellview()
+            return cellview.layout().dbu if cellview is not None else None
+        except Exception as e:
+            logger.debug("[FIB Panel] No layout dbu: %s", e)
+            return None
+
     def save_markers_to_json(self, filename):
         """Save markers to JSON file (Phase 2 refactoring: delegated to FibFileManager)"""
         return self.file_manager.save_markers_to_json(
             self.markers_list,
             filename,
             marker_notes_dict=self.marker_notes_dict,
-            marker_counters=self.state.marker_counters
+            marker_counters=self.state.marker_counters,
+            layout_dbu=self._current_layout_dbu()
         )
     
     def load_markers_from_json(self, filename):
         """Load markers from JSON file (Phase 2 refactoring: using FibFileManager)"""
         try:
             # Phase 2 refactoring: Use FibFileManager to load data
-            markers_data, notes_dict, counters = self.file_manager.load_markers_from_json(filename)
+            markers_data, notes_dict, counters = self.file_manager.load_markers_from_json(
+                filename, layout_dbu=self._current_layout_dbu())
 
             if markers_data is None:
                 return False
@@ -1437,122 +1874,61 @@ class FIBPanel(pya.QDockWidget):
 
             # Load centralized notes dictionary
             self.marker_notes_dict = notes_dict
-            print(f"[FIB Panel] Loaded notes dict: {self.marker_notes_dict}")
+            logger.info("[FIB Panel] Loaded notes dict: %s", self.marker_notes_dict)
 
             # Load marker counters into FibGlobalState
             self.state.marker_counters.update(counters)
-            print(f"[FIB Panel] Loaded marker counters: {self.state.marker_counters}")
+            logger.info("[FIB Panel] Loaded marker counters: %s", self.state.marker_counters)
             
             # Get current view and cell for drawing
             main_window = pya.Application.instance().main_window()
             current_view = main_window.current_view()
             
             if not current_view or not current_view.active_cellview().is_valid():
-                print("[FIB Panel] No active layout found for loading markers")
+                logger.debug("[FIB Panel] No active layout found for loading markers")
                 return False
             
             cellview = current_view.active_cellview()
             cell = cellview.cell
             layout = cellview.layout()
             
-            # Import marker classes and drawing function
-            from .markers import CutMarker, ConnectMarker, ProbeMarker
-            
-            # Try to import multi-point markers
-            try:
-                from .multipoint_markers import MultiPointCutMarker, MultiPointConnectMarker
-                multipoint_available = True
-            except ImportError:
-                multipoint_available = False
-                print("[FIB Panel] Multi-point markers not available for loading")
-            
             # Load markers (using data from FibFileManager)
-            loaded_count = 0
-            for marker_data in markers_data:
-                try:
-                    marker_type = marker_data['type']
-                    marker_id = marker_data['id']
-                    
-                    # Create marker object
-                    if marker_type == 'multipoint_cut' and multipoint_available:
-                        points = marker_data.get('points', [])
-                        marker = MultiPointCutMarker(marker_id, points, LAYERS['cut'])
-                    elif marker_type == 'multipoint_connect' and multipoint_available:
-                        points = marker_data.get('points', [])
-                        marker = MultiPointConnectMarker(marker_id, points, LAYERS['connect'])
-                    elif marker_type == 'cut':
-                        marker = CutMarker(marker_id, marker_data['x1'], marker_data['y1'], 
-                                         marker_data['x2'], marker_data['y2'], 6)
-                    elif marker_type == 'connect':
-                        marker = ConnectMarker(marker_id, marker_data['x1'], marker_data['y1'], 
-                                             marker_data['x2'], marker_data['y2'], 6)
-                    elif marker_type == 'probe':
-                        marker = ProbeMarker(marker_id, marker_data['x'], marker_data['y'], 6)
-                    else:
-                        print(f"[FIB Panel] Unknown marker type: {marker_type}")
-                        continue
-                    
-                    # Set additional properties
-                    # Try to get notes from dict first, then from marker_data
-                    if marker_id in self.marker_notes_dict:
-                        marker.notes = self.marker_notes_dict[marker_id]
-                        print(f"[FIB Panel] Restored notes from dict for {marker_id}: '{marker.notes}'")
-                    else:
-                        loaded_notes = marker_data.get('notes', '')
-                        # If no notes in file, set default based on marker type
-                        if not loaded_notes:
-                            if marker_type == 'cut' or marker_type == 'multipoint_cut':
-                                loaded_notes = DEFAULT_MARKER_NOTES['cut']
-                            elif marker_type == 'connect' or marker_type == 'multipoint_connect':
-                                loaded_notes = DEFAULT_MARKER_NOTES['connect']
-                            elif marker_type == 'probe':
-                                loaded_notes = DEFAULT_MARKER_NOTES['probe']
-                        marker.notes = loaded_notes
-                    
-                    marker.screenshots = marker_data.get('screenshots', [])
-                    marker.target_layers = marker_data.get('target_layers', [])
-                    
-                    # Restore layer information
-                    if marker_type == 'multipoint_cut' or marker_type == 'multipoint_connect':
-                        # Multi-point markers
-                        marker.point_layers = marker_data.get('point_layers', [])
-                        print(f"[FIB Panel] Restored point_layers for {marker_id}: {marker.point_layers}")
-                    elif marker_type == 'cut' or marker_type == 'connect':
-                        # Two-point markers
-                        marker.layer1 = marker_data.get('layer1', None)
-                        marker.layer2 = marker_data.get('layer2', None)
-                        print(f"[FIB Panel] Restored layer info for {marker_id}: layer1={marker.layer1}, layer2={marker.layer2}")
-                    elif marker_type == 'probe':
-                        # Probe markers
-                        marker.target_layer = marker_data.get('target_layer', None)
-                        print(f"[FIB Panel] Restored target_layer for {marker_id}: {marker.target_layer}")
-                    
-                    # Draw marker to GDS
-                    from .config import LAYERS
-                    if marker_type.startswith('multipoint_'):
-                        base_type = marker_type.replace('multipoint_', '')
-                        fib_layer = layout.layer(LAYERS[base_type], 0)
-                    else:
-                        fib_layer = layout.layer(LAYERS[marker_type], 0)
+            with perf_timer('project.load_draw'), FibEditSession(current_view, "FIB: load project", layout):
+                loaded_markers = []
+                for marker_data in markers_data:
+                    try:
+                        marker = self.file_manager.marker_from_dict(marker_data, self.marker_notes_dict)
+                        if marker is None:
+                            continue
+                        marker_type = marker_data['type']
+
+                        # Draw marker to GDS
+                        from .config import LAYERS
+                        if marker_type.startswith('multipoint_'):
+                            base_type = marker_type.replace('multipoint_', '')
+                            fib_layer = layout.layer(LAYERS[base_type], 0)
+                        else:
+                            fib_layer = layout.layer(LAYERS[marker_type], 0)
                     
-                    marker.to_gds(cell, fib_layer)
+                        marker.to_gds(cell, fib_layer)
                     
-                    # Recreate coordinate texts for this marker
-                    self._recreate_coordinate_texts(marker, cell, layout)
+                        # Recreate coordinate texts for this marker
+                        self._recreate_coordinate_texts(marker, cell, layout)
                     
-                    # Add to panel
-                    self.add_marker(marker)
-                    loaded_count += 1
+                        loaded_markers.append(marker)
                     
-                except Exception as marker_error:
-                    print(f"[FIB Panel] Error loading marker {marker_data.get('id', 'unknown')}: {marker_error}")
-                    continue
+                    except Exception as marker_error:
+                        logger.error("[FIB Panel] Error loading marker %s: %s", marker_data.get('id', 'unknown'), marker_error)
+                        continue
+            
+                # Add to panel (single rowsInserted for the whole project)
+                self.marker_model.append_markers(loaded_markers)
             
-            print(f"[FIB Panel] Loaded {loaded_count} markers from {filename}")
+            logger.info("[FIB Panel] Loaded %s markers from %s", len(loaded_markers), filename)
             return True
             
         except Exception as e:
-            print(f"[FIB Panel] Error loading from JSON: {e}")
+            logger.error("[FIB Panel] Error loading from JSON: %s", e)
             return False
     
     
@@ -1561,329 +1937,82 @@ class FIBPanel(pya.QDockWidget):
         """Add a marker to the panel (called by plugin)"""
         try:
             # Check if panel is still valid
-            if not hasattr(self, 'markers_list'):
-                print("[FIB Panel] Panel not properly initialized, skipping marker add")
+            if not hasattr(self, 'marker_model'):
+                logger.debug("[FIB Panel] Panel not properly initialized, skipping marker add")
                 return
             
-            # Always add to markers list
-            self.markers_list.append(marker)
-            
-            # Try to add to UI if available
-            if hasattr(self, 'marker_list') and self.marker_list is not None:
-                try:
-                    # Check if the widget is still valid
-                    _ = self.marker_list.count  # This will throw if widget is destroyed
-                    
-                    # Add to list widget
-                    marker_class_name = marker.__class__.__name__
-                    
-                    # Handle multi-point markers
-                    if 'MultiPoint' in marker_class_name:
-                        if 'Cut' in marker_class_name:
-                            marker_type = "CUT (MULTI)"
-                        elif 'Connect' in marker_class_name:
-                            marker_type = "CONNECT (MULTI)"
-                        else:
-                            marker_type = "MULTI"
-                        
-                        # Show complete point coordinates for multi-point markers with layer info
-                        if hasattr(marker, 'points') and len(marker.points) > 0:
-                            if len(marker.points) <= 3:
-                                # For 3 or fewer points, show all coordinates with layer info in panel
-                                point_strs = []
-                                for i, p in enumerate(marker.points):
-                                    layer_info = ""
-                                    if hasattr(marker, 'point_layers') and i < len(marker.point_layers) and marker.point_layers[i]:
-                                        layer_info = f" [{marker.point_layers[i]}]"
-                                    point_strs.append(f"({p[0]:.3f},{p[1]:.3f}){layer_info}")
-                                coords = f"{len(marker.points)} pts: " + " -> ".join(point_strs)
-                            else:
-                                # For more than 3 points, show first 2, ..., last 1 with layer info (shorter for panel)
-                                first_points = []
-                                for i in range(2):
-                                    p = marker.points[i]
-                                    layer_info = ""
-                                    if hasattr(marker, 'point_layers') and i < len(marker.point_layers) and marker.point_layers[i]:
-                                        layer_info = f" [{marker.point_layers[i]}]"
-                                    first_points.append(f"({p[0]:.3f},{p[1]:.3f}){layer_info}")
-                                
-                                # Last point
-                                last_p = marker.points[-1]
-                                last_layer_info = ""
-                                if hasattr(marker, 'point_layers') and len(marker.point_layers) > 0 and marker.point_layers[-1]:
-                                    last_layer_info = f" [{marker.point_layers[-1]}]"
-                                last_point = f"({last_p[0]:.3f},{last_p[1]:.3f}){last_layer_info}"
-                                
-                                coords = f"{len(marker.points)} pts: " + " -> ".join(first_points) + " -> ... -> " + last_point
-                        else:
-                            coords = "No points"
-                    else:
-                        # Regular markers
-                        marker_type = marker_class_name.replace('Marker', '').upper()
-                        
-                        if hasattr(marker, 'x1'):  # CUT or CONNECT
-                            # Get layer info for display
-                            layer1_str = getattr(marker, 'layer1', None) or 'N/A'
-                            layer2_str = getattr(marker, 'layer2', None) or 'N/A'
-                            coords = f"({marker.x1:.3f},{marker.y1:.3f}) {layer1_str} to ({marker.x2:.3f},{marker.y2:.3f}) {layer2_str}"
-                        else:  # PROBE
-                            # Get layer info for display
-                            target_layer_str = getattr(marker, 'target_layer', None) or 'N/A'
-                            coords = f"({marker.x:.3f},{marker.y:.3f}) {target_layer_str}"
-                    
-                    item_text = f"{marker.id} - {marker_type} - {coords}"
-                    self._safe_call(self.marker_list, 'addItem', item_text)
-                    print(f"[FIB Panel] Added marker: {marker.id}")
-                    
-                except Exception as ui_error:
-                    print(f"[FIB Panel] UI error adding marker {marker.id}: {ui_error}")
-                    print(f"[FIB Panel] Marker {marker.id} added to data but not UI")
-            else:
-                print(f"[FIB Panel] marker_list not available, marker {marker.id} added to data only")
+            # The list view (if any) picks up the new row from the model
+            self.marker_model.append_marker(marker)
+            logger.debug("[FIB Panel] Added marker: %s", marker.id)
+
+            if CONFLICT_CONFIG['check_on_add']:
+                conflicts = self.conflict_analyzer.check_marker(marker, self.marker_model.spatial_index)
+                if conflicts:
+                    logger.warning("[FIB Panel] %s: %s", marker.id, conflicts[0].message)
+                    self.status_label.setText(f"{marker.id}: {conflicts[0].message}")
+
+            if CONNECTIVITY_CONFIG['enabled'] and 'Connect' in marker.__class__.__name__:
+                cellview = self._active_cellview()
+                if cellview is not None:
+                    trace = self._connectivity_service().trace_marker(marker, cellview.layout(), cellview.cell)
+                    if trace is not None and trace.connected:
+                        self.status_label.setText(f"{marker.id}: {trace.message}")
                 
         except Exception as e:
-            print(f"[FIB Panel] Error adding marker {getattr(marker, 'id', 'unknown')}: {e}")
+            logger.error("[FIB Panel] Error adding marker %s: %s", getattr(marker, 'id', 'unknown'), e)
             import traceback
             traceback.print_exc()
 
-    def on_markers_reordered(self, parent, start, end, destination, row):
-        """Handle marker list drag-drop reordering"""
-        try:
-            print(f"[FIB Panel] Markers reordered: {start}-{end} to {row}")
-
-            # Get count - handle both method and property safely
-            try:
-                # Try as method first
-                list_count = self.marker_list.count()
-            except TypeError:
-                # It's a property, not a method
-                list_count = self.marker_list.count
-
-            # Rebuild markers_list from current UI order
-            new_markers_list = []
-            for i in range(list_count):
-                item = self._safe_call(self.marker_list, 'item', i)
-                marker_id = self._extract_marker_id_from_item(item)
-                marker = self._find_marker_by_id_in_list(marker_id)
-                if marker:
-                    new_markers_list.append(marker)
-
-            self.markers_list = new_markers_list
-            print(f"[FIB Panel] List reordered: {[m.id for m in self.markers_list]}")
-
-            try:
-                pya.MainWindow.instance().message("Markers reordered", 2000)
-            except:
-                pass
-
-        except Exception as e:
-            print(f"[FIB Panel] Error in reorder: {e}")
-
-    def _extract_marker_id_from_item(self, item):
-        """Extract marker ID from list item text"""
-        try:
-            # Try to get text from item
-            if hasattr(item, 'text'):
-                text_attr = item.text
-                if callable(text_attr):
-                    text = text_attr()
-                else:
-                    text = text_attr
-            else:
-                print(f"[FIB Panel] ERROR: item has no 'text' attribute")
-                return "Unknown"
-            
-            # Ensure text is a string
-            if callable(text):
-                text = text()
-            text = str(text)
-            
-            print(f"[FIB Panel] Extracting ID from text: '{text}'")
-            
-            # Format: "MARKER_ID - TYPE - (coords)"
-            parts = text.split(' - ')
-            if parts:
-                marker_id = parts[0].strip()
-                print(f"[FIB Panel] Extracted marker_id: '{marker_id}'")
-                return marker_id
-            else:
-                print(f"[FIB Panel] ERROR: Could not split text")
-                return "Unknown"
-                
-        except Exception as e:
-            print(f"[FIB Panel] ERROR in _extract_marker_id_from_item: {e}")
-            import traceback
-            traceback.print_exc()
-            return "Unknown"
-
-    def _find_marker_by_id_in_list(self, marker_id):
-        """Find marker in markers_list by ID"""
-        for marker in self.markers_list:
-            if marker.id == marker_id:
-                return marker
-        return None
-
-    def _check_reorder_needed(self):
-        """Fallback: detect if markers were reordered"""
-        try:
-            # Get count - handle both method and property safely
-            try:
-                list_count = self.marker_list.count()
-            except TypeError:
-                list_count = self.marker_list.count
-            
-            ui_order = [self._extract_marker_id_from_item(
-                self._safe_call(self.marker_list, 'item', i)
-            ) for i in range(list_count)]
-
-            data_order = [m.id for m in self.markers_list]
-
-            if ui_order != data_order:
-                self._sync_markers_to_ui_order()
-        except Exception as e:
-            print(f"[FIB Panel] Reorder detection error: {e}")
-
-    def _rebuild_marker_list_ui(self):
-        """Rebuild the UI list from markers_list
+    def select_marker(self, marker):
+        """Select one marker in the list (clears a filter that hides it)
         
-        This is more reliable than takeItem/insertItem in KLayout's Qt bindings.
+        Returns:
+            bool: True if the marker is in the list and was selected
         """
+        row = self.marker_model.row_of(marker.id)
+        if row < 0 and self.marker_model.is_filtered():
+            self.marker_filter_input.setText("")
+            self._filter_timer.stop()
+            self.apply_marker_filter()
+            row = self.marker_model.row_of(marker.id)
+        if row < 0:
+            return False
+        self.select_marker_rows([row], current=row)
+        return True
+
+    def selected_marker_rows(self):
+        """Sorted rows of the selected markers"""
+        if getattr(self, 'marker_list', None) is None:
+            return []
         try:
-            print(f"[FIB Panel] Rebuilding UI list from {len(self.markers_list)} markers")
-            
-            # Clear the UI list - handle both method and property
-            try:
-                self.marker_list.clear()
-            except TypeError:
-                # If clear is not callable, manually remove all items
-                try:
-                    list_count = self.marker_list.count()
-                except TypeError:
-                    list_count = self.marker_list.count
-                for i in range(list_count - 1, -1, -1):
-                    self.marker_list.takeItem(i)
-            
-            # Re-add all markers in the current order
-            for marker in self.markers_list:
-                marker_class_name = marker.__class__.__name__
-                
-                # Handle multi-point markers
-                if 'MultiPoint' in marker_class_name:
-                    if 'Cut' in marker_class_name:
-                        marker_type = "CUT (MULTI)"
-                    elif 'Connect' in marker_class_name:
-                        marker_type = "CONNECT (MULTI)"
-                    else:
-                        marker_type = "MULTI"
-                    
-                    # Show point coordinates for multi-point markers
-                    if hasattr(marker, 'points') and len(marker.points) > 0:
-                        if len(marker.points) <= 3:
-                            point_strs = [f"({p[0]:.3f},{p[1]:.3f})" for p in marker.points]
-                            coords = " -> ".join(point_strs)
-                        else:
-                            first = marker.points[0]
-                            last = marker.points[-1]
-                            coords = f"({first[0]:.3f},{first[1]:.3f}) -> ... -> ({last[0]:.3f},{last[1]:.3f}) [{len(marker.points)} pts]"
-                    else:
-                        coords = "(no points)"
-                else:
-                    # Regular markers
-                    marker_type = marker_class_name.replace('Marker', '').upper()
-                    
-                    if hasattr(marker, 'x1'):  # CUT or CONNECT
-                        # Get layer info for display
-                        layer1_str = getattr(marker, 'layer1', None) or 'N/A'
-                        layer2_str = getattr(marker, 'layer2', None) or 'N/A'
-                        coords = f"({marker.x1:.3f},{marker.y1:.3f}) {layer1_str} to ({marker.x2:.3f},{marker.y2:.3f}) {layer2_str}"
-                    else:  # PROBE
-                        # Get layer info for display
-                        target_layer_str = getattr(marker, 'target_layer', None) or 'N/A'
-                        coords = f"({marker.x:.3f},{marker.y:.3f}) {target_layer_str}"
-                
-                item_text = f"{marker.id} - {marker_type} - {coords}"
-                try:
-                    self.marker_list.addItem(item_text)
-                except Exception as add_error:
-                    print(f"[FIB Panel] Error adding item: {add_error}")
-                print(f"[FIB Panel] Added to UI: {item_text}")
-            
-            # Get count safely - handle both method and property
-            try:
-                list_count = self.marker_list.count()
-            except TypeError:
-                list_count = self.marker_list.count
-            
-            print(f"[FIB Panel] UI list rebuilt with {list_count} items")
-            
+            selection = self.marker_list.selectionModel()
+            return sorted(index.row() for index in selection.selectedRows())
         except Exception as e:
-            print(f"[FIB Panel] Error rebuilding UI list: {e}")
-            import traceback
-            traceback.print_exc()
-    
-    def _sync_markers_to_ui_order(self):
-        """Sync markers_list to match UI order"""
+            logger.error("[FIB Panel] Error reading selection: %s", e)
+            return []
+
+    def selected_markers(self):
+        """Selected marker objects in list order"""
+        markers = (self.marker_model.marker_at(row) for row in self.selected_marker_rows())
+        return [marker for marker in markers if marker is not None]
+
+    def select_marker_rows(self, rows, current=None):
+        """Select the given rows (and optionally make one of them current)"""
+        if getattr(self, 'marker_list', None) is None:
+            return
         try:
-            # Get count - handle both method and property safely
-            try:
-                list_count = self.marker_list.count()
-            except TypeError:
-                list_count = self.marker_list.count
-            
-            print(f"[FIB Panel] Syncing {list_count} items from UI to markers_list")
-            print(f"[FIB Panel] Current markers_list has {len(self.markers_list)} markers")
-            
-            new_list = []
-            for i in range(list_count):
-                # Access item directly without _safe_call
-                # In KLayout's Qt bindings, item() should be a method
-                try:
-                    item = self.marker_list.item(i)
-                except TypeError as te:
-                    # If item is a property, try accessing it differently
-                    print(f"[FIB Panel] ERROR: item({i}) not callable: {te}")
-                    # Don't continue - this would lose the marker!
-                    # Instead, keep the original order for this item
-                    if i < len(self.markers_list):
-                        new_list.append(self.markers_list[i])
-                        print(f"[FIB Panel] Kept original marker at index {i}: {self.markers_list[i].id}")
-                    continue
-                
-                if item is None:
-                    print(f"[FIB Panel] ERROR: item at index {i} is None")
-                    # Don't continue - this would lose the marker!
-                    if i < len(self.markers_list):
-                        new_list.append(self.markers_list[i])
-                        print(f"[FIB Panel] Kept original marker at index {i}: {self.markers_list[i].id}")
-                    continue
-                    
-                marker_id = self._extract_marker_id_from_item(item)
-                print(f"[FIB Panel] Item {i}: extracted marker_id = '{marker_id}'")
-                
-                marker = self._find_marker_by_id_in_list(marker_id)
-                if marker:
-                    new_list.append(marker)
-                    print(f"[FIB Panel] Item {i}: found and added marker '{marker.id}'")
-                else:
-                    print(f"[FIB Panel] ERROR: Item {i}: marker '{marker_id}' not found in markers_list!")
-                    # This is a serious error - marker ID doesn't match any marker
-
-            print(f"[FIB Panel] Sync complete: {len(new_list)} markers in new_list")
-            print(f"[FIB Panel] New order: {[m.id for m in new_list]}")
-            
-            # Only update if we didn't lose any markers
-            if len(new_list) == len(self.markers_list):
-                self.markers_list = new_list
-                print(f"[FIB Panel] markers_list updated successfully")
-            else:
-                print(f"[FIB Panel] ERROR: Sync would lose markers! Keeping original order.")
-                print(f"[FIB Panel] Original: {len(self.markers_list)}, New: {len(new_list)}")
-                
+            selection = self.marker_list.selectionModel()
+            selection.clearSelection()
+            for row in rows:
+                index = self.marker_model.index(row, 0, pya.QModelIndex())
+                selection.select(index, pya.QItemSelectionModel.Select)
+            if current is not None:
+                index = self.marker_model.index(current, 0, pya.QModelIndex())
+                selection.setCurrentIndex(index, pya.QItemSelectionModel.NoUpdate)
+                self.marker_list.scrollTo(index)
         except Exception as e:
-            print(f"[FIB Panel] Sync error: {e}")
-            import traceback
-            traceback.print_exc()
-    
+            logger.error("[FIB Panel] Error setting selection: %s", e)
+
     def _safe_call(self, obj, method_name, *args):
         """Safely call a method that might be a property in some Qt versions
         
@@ -1899,138 +2028,81 @@ class FIBPanel(pya.QDockWidget):
             else:
                 # It's a property, return its value (should have no args)
                 if len(args) > 0:
-                    print(f"[FIB Panel] Warning: {method_name} is a property but args were provided: {args}")
+                    logger.warning("[FIB Panel] Warning: %s is a property but args were provided: %s", method_name, args)
                 return attr
                 
         except Exception as e:
-            print(f"[FIB Panel] Error in _safe_call({method_name}, {args}): {e}")
+            logger.error("[FIB Panel] Error in _safe_call(%s, %s): %s", method_name, args, e)
             import traceback
             traceback.print_exc()
             raise
     
+    def on_markers_reordered(self, parent, start, end, destination, row):
+        """Status message after a drag-drop move (the model already reordered markers_list)"""
+        logger.debug("[FIB Panel] Markers reordered: %s-%s to %s", start, end, row)
+        try:
+            pya.MainWindow.instance().message("Markers reordered", UI_TIMEOUTS['message_short'])
+        except Exception:
+            pass
+
     def on_move_marker_up(self):
         """Move selected marker(s) up in the list"""
         try:
-            # Get all selected rows
-            selected_items = self.marker_list.selectedItems()
-            if not selected_items:
-                print(f"[FIB Panel] No markers selected")
+            selected_rows = self.selected_marker_rows()
+            if not selected_rows:
+                logger.debug("[FIB Panel] No markers selected")
                 return
             
-            # Get row indices for selected items
-            selected_rows = []
-            for item in selected_items:
-                try:
-                    row = self.marker_list.row(item)
-                    selected_rows.append(row)
-                except:
-                    pass
-            
-            # Sort rows in ascending order
-            selected_rows.sort()
-            
-            print(f"[FIB Panel] Move up: selected rows = {selected_rows}")
+            logger.debug("[FIB Panel] Move up: selected rows = %s", selected_rows)
             
             # Check if any selected row is already at top
-            if not selected_rows or selected_rows[0] <= 0:
-                print(f"[FIB Panel] Cannot move up: first selected item already at top")
+            if selected_rows[0] <= 0:
+                logger.warning("[FIB Panel] Cannot move up: first selected item already at top")
                 return
             
-            # Move each selected marker up by swapping with the one above
-            # Process from top to bottom to avoid conflicts
+            # Swap each selected marker with the one above (top to bottom);
+            # only the swapped rows are repainted
             for row in selected_rows:
-                if row > 0:
-                    self.markers_list[row], self.markers_list[row - 1] = \
-                        self.markers_list[row - 1], self.markers_list[row]
-            
-            print(f"[FIB Panel] New order: {[m.id for m in self.markers_list]}")
-            
-            # Rebuild the UI list
-            self._rebuild_marker_list_ui()
+                self.marker_model.swap_rows(row, row - 1)
             
             # Restore selection at new positions
-            for row in selected_rows:
-                if row > 0:
-                    try:
-                        item = self.marker_list.item(row - 1)
-                        if item:
-                            try:
-                                item.setSelected(True)
-                            except Exception as select_error:
-                                print(f"[FIB Panel] Error setting selection: {select_error}")
-                    except:
-                        pass
+            self.select_marker_rows([row - 1 for row in selected_rows], current=selected_rows[0] - 1)
             
-            print(f"[FIB Panel] Moved {len(selected_rows)} marker(s) up")
+            logger.debug("[FIB Panel] Moved %s marker(s) up", len(selected_rows))
             
         except Exception as e:
-            print(f"[FIB Panel] Error moving markers up: {e}")
+            logger.error("[FIB Panel] Error moving markers up: %s", e)
             import traceback
             traceback.print_exc()
     
     def on_move_marker_down(self):
         """Move selected marker(s) down in the list"""
         try:
-            # Get all selected rows
-            selected_items = self.marker_list.selectedItems()
-            if not selected_items:
-                print(f"[FIB Panel] No markers selected")
+            selected_rows = self.selected_marker_rows()
+            if not selected_rows:
+                logger.debug("[FIB Panel] No markers selected")
                 return
             
-            # Get row indices for selected items
-            selected_rows = []
-            for item in selected_items:
-                try:
-                    row = self.marker_list.row(item)
-                    selected_rows.append(row)
-                except:
-                    pass
-            
-            # Sort rows in descending order (process from bottom to top)
-            selected_rows.sort(reverse=True)
-            
-            # Get list count
-            try:
-                list_count = self.marker_list.count()
-            except TypeError:
-                list_count = self.marker_list.count
-            
-            print(f"[FIB Panel] Move down: selected rows = {selected_rows}, list_count = {list_count}")
+            # Visible rows only: a filter hides part of markers_list
+            list_count = self.marker_model.rowCount()
+            logger.debug("[FIB Panel] Move down: selected rows = %s, list_count = %s", selected_rows, list_count)
             
             # Check if any selected row is already at bottom
-            if not selected_rows or selected_rows[0] >= list_count - 1:
-                print(f"[FIB Panel] Cannot move down: last selected item already at bottom")
+            if selected_rows[-1] >= list_count - 1:
+                logger.warning("[FIB Panel] Cannot move down: last selected item already at bottom")
                 return
             
-            # Move each selected marker down by swapping with the one below
-            # Process from bottom to top to avoid conflicts
-            for row in selected_rows:
-                if row < len(self.markers_list) - 1:
-                    self.markers_list[row], self.markers_list[row + 1] = \
-                        self.markers_list[row + 1], self.markers_list[row]
-            
-            print(f"[FIB Panel] New order: {[m.id for m in self.markers_list]}")
-            
-            # Rebuild the UI list
-            self._rebuild_marker_list_ui()
+            # Swap each selected marker with the one below (bottom to top)
+            for row in reversed(selected_rows):
+                self.marker_model.swap_rows(row, row + 1)
             
             # Restore selection at new positions
-            for row in selected_rows:
-                if row < list_count - 1:
-                    try:
-                        item = self.marker_list.item(row + 1)
-                        if item:
-                            try:
-                                item.setSelected(True)
-                            except Exception as select_error:
-                                print(f"[FIB Panel] Error setting selection: {select_error}")
-                    except:
-                        pass
+            self.select_marker_rows([row + 1 for row in selected_rows], current=selected_rows[-1] + 1)
             
-            print(f"[FIB Panel] Moved {len(selected_rows)} marker(s) down")
+            logger.debug("[FIB Panel] Moved %s marker(s) down", len(selected_rows))
             
         except Exception as e:
-            print(f"[FIB Panel] Error moving markers down: {e}")
+            logger.error("[FIB Panel] Error moving markers down: %s", e)
             import traceback
             traceback.print_exc()
 
@@ -2055,11 +2127,11 @@ def create_fib_panel():
         main_window.addDockWidget(pya.Qt.RightDockWidgetArea, fib_panel_instance)
         fib_panel_instance.show()
         
-        print("[FIB Panel] Created and docked successfully")
+        logger.info("[FIB Panel] Created and docked successfully")
         return fib_panel_instance
         
     except Exception as e:
-        print(f"[FIB Panel] Error creating panel: {e}")
+        logger.error("[FIB Panel] Error creating panel: %s", e)
         import traceback
         traceback.print_exc()
         return None
@@ -2072,7 +2144,7 @@ def get_fib_panel():
     if fib_panel_instance and is_panel_valid(fib_panel_instance):
         return fib_panel_instance
     else:
-        print("[FIB Panel] Panel invalid, returning None")
+        logger.debug("[FIB Panel] Panel invalid, returning None")
         return None
 
 def is_panel_valid(panel):
@@ -15,6 +15,7 @@ This plugin can be loaded in two ways:
 Version: 1.0.0
 """
 
+import logging
 import sys
 import os
 
@@ -25,17 +26,32 @@ if script_dir not in sys.path:
 
 import pya
 from .markers import CutMarker, ConnectMarker, ProbeMarker
-from .config import LAYERS, GEOMETRIC_PARAMS, UI_TIMEOUTS, DEFAULT_MARKER_NOTES
-from .layer_manager import ensure_fib_layers, get_layer_info_summary, verify_layers_exist
+from .config import LAYERS, GEOMETRIC_PARAMS, UI_TIMEOUTS, DEFAULT_MARKER_NOTES, STARTUP_CONFIG
+from .core.log_utils import get_logger
+from .core.perf_monitor import timed
+from .core.geometry_utils import (
+    get_marker_points, get_marker_db_points, to_canonical, from_canonical, to_dbu, canonical_to_dbu
+)
+from .core.edit_session import FibEditSession
+
+logger = get_logger('fib_plugin')
 
 # Import layer tap functionality
 try:
     from .layer_tap import get_layer_at_point_with_selection, format_layer_for_display
     LAYER_TAP_AVAILABLE = True
-    print("[FIB Plugin] Layer tap functionality available")
+    logger.debug("[FIB Plugin] Layer tap functionality available")
 except ImportError as e:
     LAYER_TAP_AVAILABLE = False
-    print(f"[FIB Plugin] Layer tap not available: {e}")
+    logger.warning("[FIB Plugin] Layer tap not available: %s", e)
+
+# Import snap-to-geometry functionality
+try:
+    from .snapping import snap_point, is_snap_enabled, get_snap_cache
+    SNAP_AVAILABLE = True
+except ImportError as e:
+    SNAP_AVAILABLE = False
+    logger.warning("[FIB Plugin] Snapping not available: %s", e)
 
 # Global flag to prevent double initialization
 # This is important when the plugin is loaded both via SALT and exec()
@@ -66,7 +82,7 @@ def get_or_create_layer(layout, layer_num, datatype=0, layer_name=None):
     
     new_layer_info = pya.LayerInfo(layer_num, datatype, layer_name)
     layer_index = layout.insert_layer(new_layer_info)
-    print(f"[FIB] Created layer {layer_num}/{datatype} ({layer_name}) with index {layer_index}")
+    logger.debug("[FIB] Created layer %s/%s (%s) with index %s", layer_num, datatype, layer_name, layer_index)
     
     return layer_index
 
@@ -91,19 +107,50 @@ current_plugins = {
 active_plugin = None
 current_mode = None
 
-# Panel availability flag (import delayed to avoid circular dependency)
+# Panel availability flag (import delayed: fib_panel is loaded on first use)
 PANEL_AVAILABLE = True
 
-def get_fib_panel():
-    """Get FIB panel instance (lazy import to avoid circular dependency)"""
+def get_fib_panel(create=False):
+    """Get FIB panel instance (lazy import to avoid circular dependency and startup cost)
+
+    Args:
+        create (bool): Create and dock the panel if it does not exist yet
+    """
     try:
-        from .fib_panel import get_fib_panel as _get_fib_panel
-        return _get_fib_panel()
+        from .fib_panel import get_fib_panel as _get_fib_panel, create_fib_panel
+        panel = _get_fib_panel()
+        if panel is None and create:
+            panel = create_fib_panel()
+        return panel
     except ImportError:
         global PANEL_AVAILABLE
         PANEL_AVAILABLE = False
         return None
 
+
+def ensure_fib_layers_on_first_use():
+    """Create the FIB layers in the current layout if they are missing
+
+    layer_manager is imported only when a layer actually has to be created.
+
+    Returns:
+        bool: True if all FIB layers exist afterwards
+    """
+    try:
+        view = pya.Application.instance().main_window().current_view()
+        if not view or not view.active_cellview().is_valid():
+            return False
+        layout = view.active_cellview().layout()
+        present = {(info.layer, info.datatype) for info in layout.layer_infos()}
+        if all((layer_num, 0) in present for key, layer_num in LAYERS.items() if key != 'coordinates'):
+            return True
+
+        from .layer_manager import ensure_fib_layers
+        return ensure_fib_layers()
+    except Exception as e:
+        logger.error("[FIB Plugin] Layer check error: %s", e)
+        return False
+
 # Import multi-point marker classes
 try:
     from .multipoint_markers import (
@@ -111,10 +158,10 @@ try:
         create_multipoint_cut_marker, create_multipoint_connect_marker
     )
     MULTIPOINT_AVAILABLE = True
-    print("[FIB Plugin] Multi-point markers available")
+    logger.debug("[FIB Plugin] Multi-point markers available")
 except ImportError:
     MULTIPOINT_AVAILABLE = False
-    print("[FIB Plugin] Multi-point markers not available")
+    logger.warning("[FIB Plugin] Multi-point markers not available")
 
 # Marker creation functions
 def _get_next_marker_number(marker_type):
@@ -123,15 +170,16 @@ def _get_next_marker_number(marker_type):
 
     try:
         if PANEL_AVAILABLE:
-            panel = get_fib_panel()
+            panel = get_fib_panel(create=True)
             if panel and hasattr(panel, 'smart_counter'):
                 return panel.smart_counter.get_next_number(marker_type)
         return marker_counter[marker_type]
     except (AttributeError, KeyError, TypeError) as e:
-        print(f"[FIB] Smart counter error: {e}, using fallback")
+        logger.error("[FIB] Smart counter error: %s, using fallback", e)
         return marker_counter[marker_type]
 
 
+@timed('marker.create')
 def _create_marker_internal(marker_type, marker_class, *args, **kwargs):
     """Internal unified marker creation function
 
@@ -152,7 +200,6 @@ def _create_marker_internal(marker_type, marker_class, *args, **kwargs):
     # Create marker
     marker = marker_class(marker_id, *args, **kwargs)
     marker.notes = DEFAULT_MARKER_NOTES[marker_type]
-    marker.screenshots = []
 
     # Notify panel
     if PANEL_AVAILABLE:
@@ -161,7 +208,7 @@ def _create_marker_internal(marker_type, marker_class, *args, **kwargs):
             if panel:
                 panel.add_marker(marker)
         except Exception as e:
-            print(f"[FIB Plugin] Error notifying panel for {marker_type.upper()} marker: {e}")
+            logger.error("[FIB Plugin] Error notifying panel for %s marker: %s", marker_type.upper(), e)
 
     return marker
 
@@ -175,9 +222,9 @@ def create_cut_marker(x1, y1, x2, y2, layer1=None, layer2=None):
         layer1: Layer info string for point 1 (e.g., "M1" or "1/0")
         layer2: Layer info string for point 2 (e.g., "M2" or "2/0")
     """
-    print(f"[DEBUG] create_cut_marker called with: x1={x1}, y1={y1}, x2={x2}, y2={y2}, layer1={layer1}, layer2={layer2}")
+    logger.debug("[DEBUG] create_cut_marker called with: x1=%s, y1=%s, x2=%s, y2=%s, layer1=%s, layer2=%s", x1, y1, x2, y2, layer1, layer2)
     marker = _create_marker_internal('cut', CutMarker, x1, y1, x2, y2, 6, layer1=layer1, layer2=layer2)
-    print(f"[DEBUG] Created marker: {marker.id} from ({x1}, {y1}) [{layer1 or 'N/A'}] to ({x2}, {y2}) [{layer2 or 'N/A'}]")
+    logger.debug("[DEBUG] Created marker: %s from (%s, %s) [%s] to (%s, %s) [%s]", marker.id, x1, y1, layer1 or 'N/A', x2, y2, layer2 or 'N/A')
     return marker
 
 def create_connect_marker(x1, y1, x2, y2, layer1=None, layer2=None):
@@ -190,7 +237,7 @@ def create_connect_marker(x1, y1, x2, y2, layer1=None, layer2=None):
         layer2: Layer info string for point 2 (e.g., "M2" or "2/0")
     """
     marker = _create_marker_internal('connect', ConnectMarker, x1, y1, x2, y2, 6, layer1=layer1, layer2=layer2)
-    print(f"[DEBUG] Created marker: {marker.id} from ({x1}, {y1}) [{layer1 or 'N/A'}] to ({x2}, {y2}) [{layer2 or 'N/A'}]")
+    logger.debug("[DEBUG] Created marker: %s from (%s, %s) [%s] to (%s, %s) [%s]", marker.id, x1, y1, layer1 or 'N/A', x2, y2, layer2 or 'N/A')
     return marker
 
 def create_probe_marker(x, y, target_layer=None):
@@ -201,12 +248,19 @@ def create_probe_marker(x, y, target_layer=None):
         target_layer: Layer info string at probe point (e.g., "M1" or "1/0")
     """
     marker = _create_marker_internal('probe', ProbeMarker, x, y, 6, target_layer=target_layer)
-    print(f"[DEBUG] Created marker: {marker.id} at ({x}, {y}) [{target_layer or 'N/A'}]")
+    logger.debug("[DEBUG] Created marker: %s at (%s, %s) [%s]", marker.id, x, y, target_layer or 'N/A')
     return marker
 
 # Drawing function
-def draw_marker(marker, cell, layout):
-    """Draw marker to GDS and show message"""
+@timed('marker.draw')
+def draw_marker(marker, cell, layout, text_shapes=None):
+    """Draw marker to GDS and show message
+
+    Args:
+        text_shapes (list): Coordinate text shapes inserted for the marker's
+            points (one per point, from FIBToolPlugin._draw_new_marker).
+            They are relabelled directly; without them the texts are searched.
+    """
     # Get FIB layer based on marker type
     marker_class_name = marker.__class__.__name__.lower()
     
@@ -231,46 +285,86 @@ def draw_marker(marker, cell, layout):
     marker.to_gds(cell, fib_layer)
     
     # Update coordinate texts to include marker ID
-    update_coordinate_texts_with_marker_id(marker, cell, layout)
+    if not label_coordinate_texts(marker, text_shapes, layout):
+        update_coordinate_texts_with_marker_id(marker, cell, layout)
     
-    # Show message
+    # Show message (with the nearest conflict found when the panel added the marker)
     try:
-        if hasattr(marker, 'points') and len(marker.points) > 2:
+        conflicts = getattr(marker, 'conflicts', None)
+        if conflicts:
+            pya.MainWindow.instance().message(f"Created {marker.id} - {conflicts[0].message}", UI_TIMEOUTS['message_long'])
+        elif hasattr(marker, 'points') and len(marker.points) > 2:
             pya.MainWindow.instance().message(f"Created {marker.id} ({len(marker.points)} points)", UI_TIMEOUTS['message_short'])
         else:
             pya.MainWindow.instance().message(f"Created {marker.id}", UI_TIMEOUTS['message_short'])
     except Exception as msg_error:
-        print(f"[FIB] Message error: {msg_error}")
-        print(f"[FIB] Created {marker.id}")
-    print(f"[FIB] Created {marker.id}")
+        logger.error("[FIB] Message error: %s", msg_error)
+        logger.debug("[FIB] Created %s", marker.id)
+    logger.debug("[FIB] Created %s", marker.id)
     return True
 
+@timed('coord_text.label')
+def label_coordinate_texts(marker, text_shapes, layout):
+    """Prefix the marker ID to the coordinate texts inserted for its points
+
+    Rewrites the text shapes in place (no search). Nothing is changed unless
+    every handle is still valid: shape references are only stable in
+    editable layouts, and a text may have been deleted meanwhile.
+
+    Args:
+        marker: The finished marker
+        text_shapes (list): pya.Shape per marker point (None entries allowed)
+        layout: pya.Layout the shapes belong to
+
+    Returns:
+        bool: True if all texts were relabelled, False if the caller has to
+              fall back to update_coordinate_texts_with_marker_id()
+    """
+    if not text_shapes or len(text_shapes) != len(get_marker_points(marker)):
+        return False
+    try:
+        if not layout.is_editable():
+            return False
+        for shape in text_shapes:
+            if shape is None or not shape.is_valid() or not shape.is_text():
+                return False
+        
+        for shape in text_shapes:
+            text_string = shape.text_string
+            if ":" not in text_string:  # Simple coordinate text without ID
+                shape.text_string = f"{marker.id}:{text_string}"
+        logger.debug("[FIB] Labelled %s coordinate texts with marker ID %s", len(text_shapes), marker.id)
+        return True
+        
+    except Exception as e:
+        logger.warning("[FIB] Coordinate text handles not usable (%s), searching instead", e)
+        return False
+
+@timed('coord_text.update')
 def update_coordinate_texts_with_marker_id(marker, cell, layout):
-    """Update coordinate texts to include marker ID"""
+    """Update coordinate texts to include marker ID (search by position)
+
+    Fallback for label_coordinate_texts() when no valid text handles exist.
+    """
     try:
         # Get or create coordinate layer
         coord_layer_num = LAYERS['coordinates']
         coord_layer = get_or_create_layer(layout, coord_layer_num, 0, 'FIB_COORDINATES')
         dbu = layout.dbu
         
-        # Get marker coordinates
-        if hasattr(marker, 'points'):  # Multi-point markers
-            coordinates = marker.points
-        elif hasattr(marker, 'x1'):  # CUT or CONNECT markers
-            coordinates = [(marker.x1, marker.y1), (marker.x2, marker.y2)]
-        else:  # PROBE marker
-            coordinates = [(marker.x, marker.y)]
+        # Marker coordinates in canonical units (coordinate texts print the same values)
+        coordinates = get_marker_db_points(marker)
         
         updated_count = 0
         
         # Update coordinate texts near these positions
-        for coord_x, coord_y in coordinates:
+        for coord_ix, coord_iy in coordinates:
             # Convert to database units for search
-            search_x = int(coord_x / dbu)
-            search_y = int(coord_y / dbu)
+            search_x = canonical_to_dbu(coord_ix, dbu)
+            search_y = canonical_to_dbu(coord_iy, dbu)
             
             # Create search region - larger radius to ensure we find the text
-            search_radius = int(GEOMETRIC_PARAMS['search_radius'] / dbu)
+            search_radius = to_dbu(GEOMETRIC_PARAMS['search_radius'], dbu)
             search_box = pya.Box(
                 search_x - search_radius, search_y - search_radius,
                 search_x + search_radius, search_y + search_radius
@@ -286,9 +380,6 @@ def update_coordinate_texts_with_marker_id(marker, cell, layout):
                     text_string = text_obj.string
                     
                     # Check if this is a coordinate text for this position
-                    expected_coord = f"({coord_x:.2f},{coord_y:.2f})"
-                    
-                    # More flexible matching - check if coordinates are close enough
                     # Extract coordinates from text using regex
                     import re
                     coord_pattern = r'\(([0-9.-]+),([0-9.-]+)\)'
@@ -299,8 +390,8 @@ def update_coordinate_texts_with_marker_id(marker, cell, layout):
                         try:
                             text_x = float(match.group(1))
                             text_y = float(match.group(2))
-                            # Check if coordinates are close
-                            if abs(text_x - coord_x) < GEOMETRIC_PARAMS['coordinate_precision'] and abs(text_y - coord_y) < GEOMETRIC_PARAMS['coordinate_precision']:
+                            # Texts print 3 decimals = canonical units, so compare exactly
+                            if to_canonical(text_x) == coord_ix and to_canonical(text_y) == coord_iy:
                                 is_matching_coord = True
                         except ValueError:
                             pass
@@ -319,7 +410,7 @@ def update_coordinate_texts_with_marker_id(marker, cell, layout):
                         new_text_obj = pya.Text(new_text_string, text_obj.trans)
                         shapes_to_add.append(new_text_obj)
                         
-                        print(f"[FIB] Updated coordinate text: '{text_string}' -> '{new_text_string}'")
+                        logger.debug("[FIB] Updated coordinate text: '%s' -> '%s'", text_string, new_text_string)
                         updated_count += 1
             
             # Apply changes
@@ -329,10 +420,10 @@ def update_coordinate_texts_with_marker_id(marker, cell, layout):
             for text_obj in shapes_to_add:
                 cell.shapes(coord_layer).insert(text_obj)
         
-        print(f"[FIB] Updated {updated_count} coordinate texts with marker ID {marker.id}")
+        logger.debug("[FIB] Updated %s coordinate texts with marker ID %s", updated_count, marker.id)
                 
     except Exception as e:
-        print(f"[FIB] Error updating coordinate texts: {e}")
+        logger.error("[FIB] Error updating coordinate texts: %s", e)
         import traceback
         traceback.print_exc()
 
@@ -343,20 +434,20 @@ class FIBToolPlugin(pya.Plugin):
     def __init__(self, manager):
         super(FIBToolPlugin, self).__init__()
         self.manager = manager
-        self.mode = None  # 'cut', 'connect', 'probe', 'cut_multi', 'connect_multi'
+        self.mode = None  # 'cut', 'connect', 'probe', 'cut_multi', 'connect_multi', 'select'
         self.temp_points = []
         self.is_multipoint_mode = False
         self.last_click_time = 0
         self.last_click_pos = None
         self.double_click_threshold = UI_TIMEOUTS['double_click']
         self.double_click_distance = GEOMETRIC_PARAMS['double_click_distance']
-        print(f"[FIB Plugin] Initialized")
+        logger.debug("[FIB Plugin] Initialized")
     
     def activated(self):
         """Called when plugin is activated"""
         global current_mode, active_plugin
         
-        print(f"[FIB Plugin] Activated, mode: {self.mode}")
+        logger.debug("[FIB Plugin] Activated, mode: %s", self.mode)
         
         # Set global state
         current_mode = self.mode
@@ -365,6 +456,15 @@ class FIBToolPlugin(pya.Plugin):
         # Determine if this is a multi-point mode
         self.is_multipoint_mode = self.mode.endswith('_multi')
         
+        # First use: the panel and layer manager are not loaded at startup
+        ensure_fib_layers_on_first_use()
+        
+        # The layout may have been edited since the last snap
+        if SNAP_AVAILABLE:
+            get_snap_cache().invalidate()
+        if PANEL_AVAILABLE:
+            get_fib_panel(create=True)
+        
         try:
             if self.mode == 'cut':
                 pya.MainWindow.instance().message("CUT mode: Click twice (position + direction)", UI_TIMEOUTS['message_long'])
@@ -376,14 +476,16 @@ class FIBToolPlugin(pya.Plugin):
                 pya.MainWindow.instance().message("CONNECT multi-point mode: Left-click to add points, right-click to finish", UI_TIMEOUTS['message_long'])
             elif self.mode == 'probe':
                 pya.MainWindow.instance().message("PROBE mode: Click once", UI_TIMEOUTS['message_long'])
+            elif self.mode == 'select':
+                pya.MainWindow.instance().message("PICK mode: Click on a marker to select it in the FIB Panel", UI_TIMEOUTS['message_long'])
         except Exception as msg_error:
-            print(f"[FIB Plugin] Message error in activated(): {msg_error}")
+            logger.error("[FIB Plugin] Message error in activated(): %s", msg_error)
     
     def deactivated(self):
         """Called when plugin is deactivated"""
         global current_mode, active_plugin
         
-        print(f"[FIB Plugin] Deactivated, mode: {self.mode}")
+        logger.debug("[FIB Plugin] Deactivated, mode: %s", self.mode)
         
         # Clear global state only if this plugin was active
         if active_plugin == self:
@@ -395,6 +497,7 @@ class FIBToolPlugin(pya.Plugin):
         self.last_click_time = 0
         self.last_click_pos = None
     
+    @timed('plugin.mouse_click')
     def mouse_click_event(self, p, buttons, prio):
         """Handle mouse click events"""
         global current_mode, active_plugin
@@ -421,7 +524,7 @@ class FIBToolPlugin(pya.Plugin):
                 return False
             effective_mode = self.mode
         
-        print(f"[FIB Plugin] Mouse click: plugin_mode={self.mode}, global_mode={current_mode}, effective_mode={effective_mode}, prio={prio}")
+        logger.debug("[FIB Plugin] Mouse click: plugin_mode=%s, global_mode=%s, effective_mode=%s, prio=%s", self.mode, current_mode, effective_mode, prio)
         
         # Use effective mode for this event
         working_mode = effective_mode
@@ -439,7 +542,9 @@ class FIBToolPlugin(pya.Plugin):
         x = p.x
         y = p.y
         
-
+        # Pick mode selects an existing marker - no points, texts or layer tap
+        if working_mode == 'select':
+            return self._pick_marker(x, y)
         
         # Detect layer at click position using layer tap functionality
         detected_layer = None
@@ -450,15 +555,22 @@ class FIBToolPlugin(pya.Plugin):
                 detected_layer = get_layer_at_point_with_selection(x, y, position_label=point_label)
                 if detected_layer:
                     layer_str = format_layer_for_display(detected_layer)
-                    print(f"[DEBUG] Position ({x:.3f}, {y:.3f}) - Detected layer: {layer_str}")
+                    logger.debug("[DEBUG] Position (%.3f, %.3f) - Detected layer: %s", x, y, layer_str)
                 else:
-                    print(f"[DEBUG] Position ({x:.3f}, {y:.3f}) - No layer detected (N/A)")
+                    logger.debug("[DEBUG] Position (%.3f, %.3f) - No layer detected (N/A)", x, y)
             except Exception as tap_error:
-                print(f"[DEBUG] Layer tap error: {tap_error}")
+                logger.error("[DEBUG] Layer tap error: %s", tap_error)
                 import traceback
                 traceback.print_exc()
         else:
-            print(f"[DEBUG] Position ({x:.3f}, {y:.3f}) - Layer tap not available")
+            logger.debug("[DEBUG] Position (%.3f, %.3f) - Layer tap not available", x, y)
+        
+        # Snap to the nearest vertex / edge / path centerline of the detected layer
+        if SNAP_AVAILABLE and is_snap_enabled() and detected_layer is not None:
+            snapped = snap_point(x, y, detected_layer)
+            if snapped is not None:
+                logger.debug("[DEBUG] Snapped (%.3f, %.3f) to %s at (%.3f, %.3f)", x, y, snapped.kind, snapped.x, snapped.y)
+                x, y = snapped.x, snapped.y
         
         # Store the point with layer information
         point_info = {
@@ -467,15 +579,13 @@ class FIBToolPlugin(pya.Plugin):
             'layer': format_layer_for_display(detected_layer) if LAYER_TAP_AVAILABLE else None
         }
         self.temp_points.append(point_info)
-        print(f"[DEBUG] Stored points: {len(self.temp_points)} total")
-        
-        # Add coordinate text at click position (will be updated with marker ID later)
-        self._add_coordinate_text(view, x, y)
+        logger.debug("[DEBUG] Stored points: %s total", len(self.temp_points))
         
-        # Handle different modes
+        # Coordinate texts are inserted together with the marker, so a marker
+        # is one undo step and abandoned points leave nothing in the layout
         if working_mode == 'cut':
             if len(self.temp_points) == 2:
-                print(f"[DEBUG] Creating CUT marker with points: {self.temp_points}")
+                logger.debug("[DEBUG] Creating CUT marker with points: %s", self.temp_points)
                 # Get layer info for each point
                 layer1 = self.temp_points[0].get('layer')
                 layer2 = self.temp_points[1].get('layer')
@@ -484,15 +594,13 @@ class FIBToolPlugin(pya.Plugin):
                     self.temp_points[1]['x'], self.temp_points[1]['y'],
                     layer1=layer1, layer2=layer2
                 )
-                draw_marker(marker, cell, layout)
+                self._draw_new_marker(marker, view, cell, layout)
                 self.temp_points = []
+            else:
+                self._show_point_message("CUT", x, y, "click the second point")
         elif working_mode == 'cut_multi':
             # Multi-point cut mode - collect points until right-click
-            if len(self.temp_points) >= 2:
-                try:
-                    pya.MainWindow.instance().message(f"Cut path: {len(self.temp_points)} points. Right-click to finish.", UI_TIMEOUTS['message_medium'])
-                except Exception:
-                    pass  # Message display is non-critical
+            self._show_point_message(f"Cut path ({len(self.temp_points)} points)", x, y, "right-click to finish")
         elif working_mode == 'connect':
             if len(self.temp_points) == 2:
                 # Get layer info for each point
@@ -503,15 +611,13 @@ class FIBToolPlugin(pya.Plugin):
                     self.temp_points[1]['x'], self.temp_points[1]['y'],
                     layer1=layer1, layer2=layer2
                 )
-                draw_marker(marker, cell, layout)
+                self._draw_new_marker(marker, view, cell, layout)
                 self.temp_points = []
+            else:
+                self._show_point_message("CONNECT", x, y, "click the end point")
         elif working_mode == 'connect_multi':
             # Multi-point connect mode - collect points until right-click
-            if len(self.temp_points) >= 2:
-                try:
-                    pya.MainWindow.instance().message(f"Connect path: {len(self.temp_points)} points. Right-click to finish.", UI_TIMEOUTS['message_medium'])
-                except Exception:
-                    pass  # Message display is non-critical
+            self._show_point_message(f"Connect path ({len(self.temp_points)} points)", x, y, "right-click to finish")
         elif working_mode == 'probe':
             if len(self.temp_points) == 1:
                 # Get layer info for probe point
@@ -520,8 +626,8 @@ class FIBToolPlugin(pya.Plugin):
                     self.temp_points[0]['x'], self.temp_points[0]['y'],
                     target_layer=target_layer
                 )
-                draw_marker(marker, cell, layout)
-                self.temp_points = []
+                self._draw_new_marker(marker, view, cell, layout)
+            self.temp_points = []
         return True
     
     def _handle_right_click_finish(self, p, buttons, prio):
@@ -540,11 +646,11 @@ class FIBToolPlugin(pya.Plugin):
                 return False
             effective_mode = self.mode
         
-        print(f"[DEBUG] Right-click detected in mode: {effective_mode}")
+        logger.debug("[DEBUG] Right-click detected in mode: %s", effective_mode)
         
         # Only handle right-click in multi-point modes
         if not effective_mode.endswith('_multi'):
-            print(f"[DEBUG] Not in multi-point mode, ignoring right-click")
+            logger.debug("[DEBUG] Not in multi-point mode, ignoring right-click")
             return False
         
         # Get current view and cell
@@ -558,36 +664,37 @@ class FIBToolPlugin(pya.Plugin):
         
         # Check if we have enough points
         if len(self.temp_points) < 2:
-            print(f"[DEBUG] Not enough points: {len(self.temp_points)} < 2")
+            logger.debug("[DEBUG] Not enough points: %s < 2", len(self.temp_points))
             try:
                 pya.MainWindow.instance().message("Need at least 2 points. Continue clicking with left button.", UI_TIMEOUTS['message_medium'])
             except Exception:
                 pass  # Message display is non-critical
             return True
         
-        print(f"[DEBUG] Right-click: Finishing {effective_mode} with {len(self.temp_points)} points")
-        print(f"[DEBUG] MULTIPOINT_AVAILABLE = {MULTIPOINT_AVAILABLE}")
+        logger.debug("[DEBUG] Right-click: Finishing %s with %s points", effective_mode, len(self.temp_points))
+        logger.debug("[DEBUG] MULTIPOINT_AVAILABLE = %s", MULTIPOINT_AVAILABLE)
         
         # Create multi-point marker
         if effective_mode == 'cut_multi':
             if MULTIPOINT_AVAILABLE:
-                print(f"[DEBUG] Creating multi-point CUT marker...")
-                self._create_multipoint_cut_marker(cell, layout)
+                logger.debug("[DEBUG] Creating multi-point CUT marker...")
+                self._create_multipoint_cut_marker(view, cell, layout)
             else:
-                print(f"[DEBUG] ERROR: MULTIPOINT_AVAILABLE is False!")
+                logger.error("[DEBUG] ERROR: MULTIPOINT_AVAILABLE is False!")
         elif effective_mode == 'connect_multi':
             if MULTIPOINT_AVAILABLE:
-                print(f"[DEBUG] Creating multi-point CONNECT marker...")
-                self._create_multipoint_connect_marker(cell, layout)
+                logger.debug("[DEBUG] Creating multi-point CONNECT marker...")
+                self._create_multipoint_connect_marker(view, cell, layout)
             else:
-                print(f"[DEBUG] ERROR: MULTIPOINT_AVAILABLE is False!")
+                logger.error("[DEBUG] ERROR: MULTIPOINT_AVAILABLE is False!")
         
         return True
     
-    def _create_multipoint_cut_marker(self, cell, layout):
+    @timed('marker.create_multipoint')
+    def _create_multipoint_cut_marker(self, view, cell, layout):
         """Create a multi-point cut marker"""
         try:
-            print(f"[DEBUG] _create_multipoint_cut_marker called with {len(self.temp_points)} points")
+            logger.debug("[DEBUG] _create_multipoint_cut_marker called with %s points", len(self.temp_points))
             
             # Use smart counter to get next available number
             if PANEL_AVAILABLE:
@@ -601,7 +708,7 @@ class FIBToolPlugin(pya.Plugin):
             
             # Create marker ID
             marker_id = f"CUT_{next_number}"
-            print(f"[DEBUG] Marker ID: {marker_id}")
+            logger.debug("[DEBUG] Marker ID: %s", marker_id)
             
             # Update global counter
             marker_counter['cut'] = max(marker_counter['cut'], next_number + 1)
@@ -610,28 +717,29 @@ class FIBToolPlugin(pya.Plugin):
             points = [(point['x'], point['y']) for point in self.temp_points]
             point_layers = [point.get('layer', 'N/A') for point in self.temp_points]
             
-            print(f"[DEBUG] Points to create marker: {points}")
-            print(f"[DEBUG] Point layers: {point_layers}")
+            logger.debug("[DEBUG] Points to create marker: %s", points)
+            logger.debug("[DEBUG] Point layers: %s", point_layers)
             
             # Create multi-point marker with layer info
             marker = create_multipoint_cut_marker(marker_id, points, point_layers)
-            print(f"[DEBUG] Marker object created: {marker}")
+            logger.debug("[DEBUG] Marker object created: %s", marker)
             
             # Draw marker
-            draw_marker(marker, cell, layout)
-            print(f"[DEBUG] Marker drawn to GDS")
+            self._draw_new_marker(marker, view, cell, layout)
+            logger.debug("[DEBUG] Marker drawn to GDS")
             
             # Clear temp points
             self.temp_points = []
             
-            print(f"[DEBUG] [OK] Successfully created multi-point cut marker {marker_id} with {len(points)} points")
+            logger.info("[DEBUG] [OK] Successfully created multi-point cut marker %s with %s points", marker_id, len(points))
             
         except Exception as e:
-            print(f"[DEBUG] [X] Error creating multi-point cut marker: {e}")
+            logger.error("[DEBUG] [X] Error creating multi-point cut marker: %s", e)
             import traceback
             traceback.print_exc()
     
-    def _create_multipoint_connect_marker(self, cell, layout):
+    @timed('marker.create_multipoint')
+    def _create_multipoint_connect_marker(self, view, cell, layout):
         """Create a multi-point connect marker"""
         try:
             # Use smart counter to get next available number
@@ -658,15 +766,15 @@ class FIBToolPlugin(pya.Plugin):
             marker = create_multipoint_connect_marker(marker_id, points, point_layers)
             
             # Draw marker
-            draw_marker(marker, cell, layout)
+            self._draw_new_marker(marker, view, cell, layout)
             
             # Clear temp points
             self.temp_points = []
             
-            print(f"[DEBUG] Created multi-point connect marker {marker_id} with {len(points)} points")
+            logger.debug("[DEBUG] Created multi-point connect marker %s with %s points", marker_id, len(points))
             
         except Exception as e:
-            print(f"[DEBUG] Error creating multi-point connect marker: {e}")
+            logger.error("[DEBUG] Error creating multi-point connect marker: %s", e)
             import traceback
             traceback.print_exc()
     
@@ -676,7 +784,7 @@ class FIBToolPlugin(pya.Plugin):
             # Get the current cellview
             cellview = view.active_cellview()
             if not cellview.is_valid():
-                print("[DEBUG] Invalid cellview")
+                logger.debug("[DEBUG] Invalid cellview")
                 return []
             
             layout = cellview.layout()
@@ -684,7 +792,7 @@ class FIBToolPlugin(pya.Plugin):
             
             # point.x and point.y are already in database units
             db_point = pya.Point(int(point.x), int(point.y))
-            print(f"[DEBUG] Searching for layers at DB point: ({db_point.x}, {db_point.y})")
+            logger.debug("[DEBUG] Searching for layers at DB point: (%s, %s)", db_point.x, db_point.y)
             
             # Try using KLayout's built-in selection functionality
             found_layers = []
@@ -700,7 +808,7 @@ class FIBToolPlugin(pya.Plugin):
                 
                 # Get all layer infos and check each one
                 layer_infos = layout.layer_infos()
-                print(f"[DEBUG] Checking {len(layer_infos)} layers")
+                logger.debug("[DEBUG] Checking %s layers", len(layer_infos))
                 
                 for layer_info in layer_infos:
                     layer_index = layout.layer(layer_info)
@@ -711,7 +819,8 @@ class FIBToolPlugin(pya.Plugin):
                     if shapes.size() == 0:
                         continue
                     
-                    print(f"[DEBUG] Layer {layer_info.layer}/{layer_info.datatype}: {shapes.size()} shapes")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("[DEBUG] Layer %s/%s: %s shapes", layer_info.layer, layer_info.datatype, shapes.size())
                     
                     # Convert shapes to region and check intersection
                     layer_region = pya.Region(shapes)
@@ -720,10 +829,10 @@ class FIBToolPlugin(pya.Plugin):
                         if not intersection.is_empty():
                             layer_name = f"{layer_info.layer}/{layer_info.datatype}"
                             found_layers.append(layer_name)
-                            print(f"[DEBUG] Found intersection on layer {layer_name}")
+                            logger.debug("[DEBUG] Found intersection on layer %s", layer_name)
                 
             except Exception as method1_error:
-                print(f"[DEBUG] Method 1 failed: {method1_error}")
+                logger.error("[DEBUG] Method 1 failed: %s", method1_error)
                 
                 # Method 2: Simple shape iteration
                 layer_infos = layout.layer_infos()
@@ -744,18 +853,18 @@ class FIBToolPlugin(pya.Plugin):
                                 layer_name = f"{layer_info.layer}/{layer_info.datatype}"
                                 if layer_name not in found_layers:
                                     found_layers.append(layer_name)
-                                    print(f"[DEBUG] Found shape on layer {layer_name} (bbox method)")
+                                    logger.debug("[DEBUG] Found shape on layer %s (bbox method)", layer_name)
                                 break
                     
                     except Exception as shape_error:
-                        print(f"[DEBUG] Error checking shapes on layer {layer_info}: {shape_error}")
+                        logger.error("[DEBUG] Error checking shapes on layer %s: %s", layer_info, shape_error)
                         continue
             
-            print(f"[DEBUG] Final layers found: {found_layers}")
+            logger.debug("[DEBUG] Final layers found: %s", found_layers)
             return found_layers
             
         except Exception as e:
-            print(f"[DEBUG] Error in _get_layers_at_position: {e}")
+            logger.error("[DEBUG] Error in _get_layers_at_position: %s", e)
             import traceback
             traceback.print_exc()
             return []
@@ -767,36 +876,81 @@ class FIBToolPlugin(pya.Plugin):
             bbox = shape.bbox()
             return bbox.contains(point)
         except Exception as e:
-            print(f"[DEBUG] Error in _shape_contains_point: {e}")
+            logger.error("[DEBUG] Error in _shape_contains_point: %s", e)
             return False
     
+    @timed('marker.pick')
+    def _pick_marker(self, x, y):
+        """Select the marker nearest to a click (within search_radius) in the panel
+        
+        Candidates come from the marker list model's spatial index; the
+        distance is measured to the marker's point, segment or polyline.
+        """
+        panel = get_fib_panel(create=True) if PANEL_AVAILABLE else None
+        if not panel or not hasattr(panel, 'marker_model'):
+            logger.warning("[FIB Plugin] Pick mode needs the FIB Panel")
+            return True
+        
+        radius = GEOMETRIC_PARAMS['search_radius']
+        marker, distance = panel.marker_model.spatial_index.nearest(x, y, max_distance=radius)
+        try:
+            if marker is None:
+                pya.MainWindow.instance().message(f"No marker within {radius} um", UI_TIMEOUTS['message_short'])
+            elif panel.select_marker(marker):
+                pya.MainWindow.instance().message(f"Selected {marker.id} ({distance:.3f} um)", UI_TIMEOUTS['message_short'])
+        except Exception as e:
+            logger.error("[FIB Plugin] Error selecting picked marker: %s", e)
+        
+        logger.debug("[FIB Plugin] Pick at (%.3f, %.3f): %s", x, y, marker.id if marker else None)
+        return True
+    
+    def _draw_new_marker(self, marker, view, cell, layout):
+        """Insert the coordinate texts of the collected points and draw the marker
+
+        Both go into one FibEditSession, so the new marker is a single undo step.
+        """
+        with FibEditSession(view, f"FIB: create {marker.TAG} marker", layout):
+            text_shapes = [self._add_coordinate_text(view, point['x'], point['y']) for point in self.temp_points]
+            draw_marker(marker, cell, layout, text_shapes=text_shapes)
+    
+    def _show_point_message(self, prefix, x, y, hint):
+        """Status bar feedback for a point that does not complete a marker yet"""
+        try:
+            pya.MainWindow.instance().message(f"{prefix}: point at ({x:.3f}, {y:.3f}), {hint}", UI_TIMEOUTS['message_medium'])
+        except Exception:
+            pass  # Message display is non-critical
+    
+    @timed('coord_text.add')
     def _add_coordinate_text(self, view, x, y, marker_id=None):
-        """Add coordinate text at the click position"""
+        """Add coordinate text at the click position
+        
+        Returns:
+            pya.Shape: The inserted text shape, or None on error
+        """
         try:
             # Get current cellview
             cellview = view.active_cellview()
             if not cellview.is_valid():
-                return
+                return None
             
             cell = cellview.cell
             layout = cellview.layout()
             dbu = layout.dbu
             
-            # x, y are in the correct units (likely microns), create display text
-            # Use 3 decimal places for 0.001 precision
+            # x, y are in microns; show them as the marker will store them
+            # (canonical units; labels show 3 decimal places)
+            ix, iy = to_canonical(x), to_canonical(y)
+            x, y = from_canonical(ix), from_canonical(iy)
             if marker_id:
                 coord_text = f"{marker_id}:({x:.3f},{y:.3f})"
             else:
                 coord_text = f"({x:.3f},{y:.3f})"
             
-            # For text placement, we need to convert to database units
-            # If x, y are already in microns, divide by dbu
-            # If x, y are in database units, use directly
-            # Based on the coordinate values, they seem to be in microns, so divide by dbu
-            text_x = int(x / dbu)
-            text_y = int(y / dbu)
+            # For text placement, convert to database units
+            text_x = canonical_to_dbu(ix, dbu)
+            text_y = canonical_to_dbu(iy, dbu)
             
-            print(f"[DEBUG] Text placement: x={x:.2f}um / dbu={dbu} = {text_x} DB units")
+            logger.debug("[DEBUG] Text placement: x=%.2fum / dbu=%s = %s DB units", x, dbu, text_x)
             
             # Create text object at the click position
             text_obj = pya.Text(coord_text, pya.Trans(pya.Point(text_x, text_y)))
@@ -806,12 +960,14 @@ class FIBToolPlugin(pya.Plugin):
             coord_layer = get_or_create_layer(layout, coord_layer_num, 0, 'FIB_COORDINATES')
             
             # Insert text into the layout
-            cell.shapes(coord_layer).insert(text_obj)
+            text_shape = cell.shapes(coord_layer).insert(text_obj)
             
-            print(f"[DEBUG] Added coordinate text '{coord_text}' at DB position ({text_x}, {text_y})")
+            logger.debug("[DEBUG] Added coordinate text '%s' at DB position (%s, %s)", coord_text, text_x, text_y)
+            return text_shape
             
         except Exception as e:
-            print(f"[DEBUG] Error adding coordinate text: {e}")
+            logger.error("[DEBUG] Error adding coordinate text: %s", e)
+            return None
 
 # Plugin Factories for each mode
 class FIBCutPluginFactory(pya.PluginFactory):
@@ -859,6 +1015,21 @@ class FIBProbePluginFactory(pya.PluginFactory):
         current_plugins['probe'] = plugin
         return plugin
 
+class FIBSelectPluginFactory(pya.PluginFactory):
+    """Factory for PICK mode plugin (select markers by clicking the layout)"""
+    
+    def __init__(self):
+        super(FIBSelectPluginFactory, self).__init__()
+        self.register(-996, "fib_select", "FIB Pick")
+    
+    def create_plugin(self, manager, root, view):
+        global current_plugins
+        plugin = FIBToolPlugin(manager)
+        plugin.mode = 'select'
+        # Store plugin instance for panel access
+        current_plugins['select'] = plugin
+        return plugin
+
 # Create and register all plugin factories
 # This will add buttons to the toolbar automatically
 # Protected against double initialization
@@ -866,18 +1037,20 @@ class FIBProbePluginFactory(pya.PluginFactory):
 if not _FIB_PLUGIN_FACTORIES_CREATED:
     print("=== FIB Tool Initialization ===")
     
-    # Check and create FIB layers if needed
-    print("\n=== Layer Check ===")
-    try:
-        layer_check_result = ensure_fib_layers()
-        if layer_check_result:
-            print("[OK] FIB layers verified/created successfully")
-            print(get_layer_info_summary())
-        else:
-            print("[!] Layer check completed with warnings (check console for details)")
-    except Exception as layer_error:
-        print(f"[!] Layer check error: {layer_error}")
-        print("  Plugin will continue, but layers may need manual creation")
+    # Check and create FIB layers if needed (otherwise deferred to the first mode activation)
+    if STARTUP_CONFIG['check_layers']:
+        print("\n=== Layer Check ===")
+        try:
+            from .layer_manager import ensure_fib_layers, get_layer_info_summary
+            layer_check_result = ensure_fib_layers()
+            if layer_check_result:
+                print("[OK] FIB layers verified/created successfully")
+                print(get_layer_info_summary())
+            else:
+                print("[!] Layer check completed with warnings (check console for details)")
+        except Exception as layer_error:
+            print(f"[!] Layer check error: {layer_error}")
+            print("  Plugin will continue, but layers may need manual creation")
     
     print("\n=== Plugin Registration ===")
     try:
@@ -885,14 +1058,16 @@ if not _FIB_PLUGIN_FACTORIES_CREATED:
         cut_factory = FIBCutPluginFactory()
         connect_factory = FIBConnectPluginFactory()
         probe_factory = FIBProbePluginFactory()
+        select_factory = FIBSelectPluginFactory()
         
         # Store as class attributes to prevent garbage collection
         FIBCutPluginFactory.instance = cut_factory
         FIBConnectPluginFactory.instance = connect_factory
         FIBProbePluginFactory.instance = probe_factory
+        FIBSelectPluginFactory.instance = select_factory
         
         print("[OK] Plugin factories created successfully")
-        print("[OK] Three buttons added to toolbar: FIB Cut, FIB Connect, FIB Probe")
+        print("[OK] Four buttons added to toolbar: FIB Cut, FIB Connect, FIB Probe, FIB Pick")
         print("[OK] Each button activates a different FIB marker mode")
         
         # Mark as created
@@ -916,6 +1091,7 @@ print("2. Click one of the FIB Tool buttons in the toolbar:")
 print("   - FIB Cut: Create CUT markers")
 print("   - FIB Connect: Create CONNECT markers")
 print("   - FIB Probe: Create PROBE markers")
+print("   - FIB Pick: Select the marker under the cursor in the FIB Panel")
 print("3. Click on the layout to create markers:")
 print("   - CUT: Click twice (start + end points)")
 print("   - CONNECT: Click twice (start + end)")
@@ -943,13 +1119,14 @@ print()
 print("FIB Tool loaded successfully! Use toolbar buttons or FIB Panel to get started.")
 
 # Utility function to clear coordinate texts
+@timed('coord_text.clear')
 def clear_coordinate_texts():
     """Clear all coordinate text labels from the layout"""
     try:
         # Get current view and cell
         view = pya.Application.instance().main_window().current_view()
         if not view or not view.active_cellview().is_valid():
-            print("[DEBUG] No active layout found")
+            logger.debug("[DEBUG] No active layout found")
             return
         
         cellview = view.active_cellview()
@@ -960,11 +1137,11 @@ def clear_coordinate_texts():
         coord_layer = get_or_create_layer(layout, LAYERS['coordinates'], 0, 'FIB_COORDINATES')
         cell.shapes(coord_layer).clear()
         
-        print("[DEBUG] Cleared all coordinate texts")
+        logger.info("[DEBUG] Cleared all coordinate texts")
         pya.Application.instance().main_window().message("Coordinate texts cleared", UI_TIMEOUTS['message_short'])
         
     except Exception as e:
-        print(f"[DEBUG] Error clearing coordinate texts: {e}")
+        logger.error("[DEBUG] Error clearing coordinate texts: %s", e)
 
 # Add functions and variables to global namespace
 sys.modules['__main__'].clear_coordinate_texts = clear_coordinate_texts
@@ -976,65 +1153,69 @@ def activate_fib_mode(mode):
     """Activate FIB plugin mode from panel"""
     global active_plugin, current_mode
     
-    print("=" * 80)
-    print(f"[FIB Plugin] activate_fib_mode() called with mode='{mode}'")
-    print("=" * 80)
+    logger.debug('=' * 80)
+    logger.debug("[FIB Plugin] activate_fib_mode() called with mode='%s'", mode)
+    logger.debug('=' * 80)
     
     try:
-        print(f"[FIB Plugin] Step 1: Getting main window and view...")
+        logger.debug("[FIB Plugin] Step 1: Getting main window and view...")
         
         # Get the main window and current view
         main_window = pya.Application.instance().main_window()
         current_view = main_window.current_view()
         
-        print(f"[FIB Plugin] main_window: {main_window}")
-        print(f"[FIB Plugin] current_view: {current_view}")
+        logger.debug("[FIB Plugin] main_window: %s", main_window)
+        logger.debug("[FIB Plugin] current_view: %s", current_view)
         
         if not current_view:
-            print(f"[FIB Plugin] [X] No active layout view found")
+            logger.error("[FIB Plugin] [X] No active layout view found")
             pya.MessageBox.warning("FIB Tool", "No active layout view found", pya.MessageBox.Ok)
             return False
         
-        print(f"[FIB Plugin] [OK] Active view found")
+        logger.debug("[FIB Plugin] [OK] Active view found")
         
-        print(f"[FIB Plugin] Step 2: Clearing temp points from all plugins...")
+        logger.debug("[FIB Plugin] Step 2: Clearing temp points from all plugins...")
         # Clear temp_points and double-click state from all plugins when switching modes
         for plugin_mode, plugin in current_plugins.items():
             if plugin and hasattr(plugin, 'temp_points'):
                 plugin.temp_points = []
                 plugin.last_click_time = 0
                 plugin.last_click_pos = None
-                print(f"[FIB Plugin]   Cleared {plugin_mode} plugin state")
+                logger.info("[FIB Plugin]   Cleared %s plugin state", plugin_mode)
+        
+        # The layout may have been edited since the last snap
+        if SNAP_AVAILABLE:
+            get_snap_cache().invalidate()
         
-        print(f"[FIB Plugin] Step 3: Setting global mode to '{mode}'")
+        logger.debug("[FIB Plugin] Step 3: Setting global mode to '%s'", mode)
         # Set global mode
         current_mode = mode
         
         # Get base mode for plugin lookup (remove _multi suffix)
         base_mode = mode.replace('_multi', '')
-        print(f"[FIB Plugin] Base mode: '{base_mode}'")
+        logger.debug("[FIB Plugin] Base mode: '%s'", base_mode)
         
-        print(f"[FIB Plugin] Step 4: Getting or creating plugin for '{base_mode}'...")
-        print(f"[FIB Plugin] current_plugins keys: {list(current_plugins.keys())}")
-        print(f"[FIB Plugin] current_plugins['{base_mode}']: {current_plugins.get(base_mode, 'NOT FOUND')}")
+        logger.debug("[FIB Plugin] Step 4: Getting or creating plugin for '%s'...", base_mode)
+        logger.debug("[FIB Plugin] current_plugins keys: %s", list(current_plugins.keys()))
+        logger.debug("[FIB Plugin] current_plugins['%s']: %s", base_mode, current_plugins.get(base_mode, 'NOT FOUND'))
         
         # Get or create the plugin for this base mode
         if base_mode in current_plugins and current_plugins[base_mode]:
             plugin = current_plugins[base_mode]
-            print(f"[FIB Plugin] [OK] Using existing plugin: {plugin}")
+            logger.debug("[FIB Plugin] [OK] Using existing plugin: %s", plugin)
         else:
             # Create a new plugin instance if needed
-            print(f"[FIB Plugin] Creating new plugin instance...")
+            logger.debug("[FIB Plugin] Creating new plugin instance...")
             plugin = FIBToolPlugin(None)
             plugin.mode = base_mode
             current_plugins[base_mode] = plugin
-            print(f"[FIB Plugin] [OK] Created new plugin: {plugin}")
+            logger.debug("[FIB Plugin] [OK] Created new plugin: %s", plugin)
         
         # Set as active plugin
         active_plugin = plugin
-        print(f"[FIB Plugin] [OK] Set active_plugin to: {active_plugin}")
+        logger.debug("[FIB Plugin] [OK] Set active_plugin to: %s", active_plugin)
         
-        print(f"[FIB Plugin] Step 5: Showing activation message...")
+        logger.debug("[FIB Plugin] Step 5: Showing activation message...")
         # Show activation message
         try:
             if mode == 'cut':
@@ -1047,19 +1228,21 @@ def activate_fib_mode(mode):
                 pya.MainWindow.instance().message("CONNECT multi-point mode: Left-click to add points, right-click to finish", UI_TIMEOUTS['message_long'])
             elif mode == 'probe':
                 pya.MainWindow.instance().message("PROBE mode: Click once", UI_TIMEOUTS['message_long'])
-            print(f"[FIB Plugin] [OK] Message displayed")
+            elif mode == 'select':
+                pya.MainWindow.instance().message("PICK mode: Click on a marker to select it in the FIB Panel", UI_TIMEOUTS['message_long'])
+            logger.debug("[FIB Plugin] [OK] Message displayed")
         except Exception as msg_error:
-            print(f"[FIB Plugin] [!] Message error: {msg_error}")
+            logger.error("[FIB Plugin] [!] Message error: %s", msg_error)
         
-        print(f"[FIB Plugin] [OK] SUCCESS: {mode} mode activated")
-        print("=" * 80)
+        logger.debug("[FIB Plugin] [OK] SUCCESS: %s mode activated", mode)
+        logger.debug('=' * 80)
         return True
         
     except Exception as e:
-        print(f"[FIB Plugin] [X] ERROR: {e}")
+        logger.error("[FIB Plugin] [X] ERROR: %s", e)
         import traceback
         traceback.print_exc()
-        print("=" * 80)
+        logger.debug('=' * 80)
         return False
 
 # Add to global namespace
@@ -1070,18 +1253,21 @@ print("clear_coordinate_texts() - Clear all coordinate text labels (Layer 339)")
 
 # Create FIB Panel (delayed import to avoid circular dependency)
 print("\n=== FIB Panel Integration ===")
-try:
-    # Import here after activate_fib_mode is defined
-    from .fib_panel import create_fib_panel
-    panel = create_fib_panel()
-    if panel:
-        print("[OK] FIB Panel created and docked successfully")
-        print("[OK] Panel includes: Project management, marker tree view, right-click menus")
-        print("[OK] Panel buttons are connected to plugin system")
-    else:
-        print("[X] Failed to create FIB Panel")
-except Exception as e:
-    print(f"[X] FIB Panel error: {e}")
-    import traceback
-    traceback.print_exc()
-    print("[OK] Plugin system still works without panel")
+if STARTUP_CONFIG['dock_panel']:
+    try:
+        # Import here after activate_fib_mode is defined
+        from .fib_panel import create_fib_panel
+        panel = create_fib_panel()
+        if panel:
+            print("[OK] FIB Panel created and docked successfully")
+            print("[OK] Panel includes: Project management, marker tree view, right-click menus")
+            print("[OK] Panel buttons are connected to plugin system")
+        else:
+            print("[X] Failed to create FIB Panel")
+    except Exception as e:
+        print(f"[X] FIB Panel error: {e}")
+        import traceback
+        traceback.print_exc()
+        print("[OK] Plugin system still works without panel")
+else:
+    print("[OK] FIB Panel opens on first use (FIB toolbar mode or Tools > FIB Tool, Ctrl+Shift+F)")
@@ -8,6 +8,7 @@ It initializes the FIB Tool plugin system.
 
 import sys
 import os
+import time
 
 # Add the current directory to Python path
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -21,10 +22,10 @@ def init_fib_tool():
     """
     Initialize FIB Tool plugin system.
     
-    This function:
-    1. Checks and creates required layers (337, 338, 339)
-    2. Registers plugin factories for toolbar buttons
-    3. Creates and docks the FIB Panel
+    This function registers the plugin factories (toolbar buttons) with
+    minimal imports. The FIB Panel, layer manager and export modules are
+    loaded on first use (see STARTUP_CONFIG in config.py to create layers
+    and dock the panel at startup instead).
     
     Can be called multiple times safely (will only initialize once).
     """
@@ -34,6 +35,7 @@ def init_fib_tool():
         print("[FIB Tool] Already initialized, skipping...")
         return
     
+    start = time.perf_counter()
     try:
         print("\n" + "=" * 60)
         print("FIB TOOL - SALT Package Initialization")
@@ -57,14 +59,14 @@ def init_fib_tool():
             print(f"[FIB Tool] Layout check warning: {check_error}")
 
         # Import and execute the main plugin
-        # This will register plugin factories and create the panel
+        # This will register plugin factories (the panel is created on first use)
         from . import fib_plugin
 
         # Mark as initialized
         _FIB_TOOL_INITIALIZED = True
 
         print("=" * 60)
-        print("[OK] FIB Tool initialized successfully")
+        print(f"[OK] FIB Tool initialized successfully ({(time.perf_counter() - start) * 1000.0:.0f} ms)")
         print("=" * 60)
         print()
 
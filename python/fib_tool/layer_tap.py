@@ -13,6 +13,10 @@ Strategy:
 
 import pya
 from .config import LAYERS, GEOMETRIC_PARAMS
+from .core.log_utils import get_logger
+from .core.perf_monitor import timed
+
+logger = get_logger('layer_tap')
 
 # Default search radius for layer detection (in microns)
 # Set to 0.5 for precise detection in 0.5μm × 0.5μm area
@@ -105,7 +109,7 @@ def get_layer_name_from_panel(view, layer_num, datatype):
         return None
         
     except Exception as e:
-        print(f"[Layer Tap] Error getting layer name from panel: {e}")
+        logger.error("[Layer Tap] Error getting layer name from panel: %s", e)
         return None
 
 
@@ -150,19 +154,20 @@ def get_visible_layers():
                                 datatype = int(parts[1])
                                 visible.add((layer_num, datatype))
                         except Exception as parse_error:
-                            print(f"[Layer Tap] Error parsing layer source '{source}': {parse_error}")
+                            logger.error("[Layer Tap] Error parsing layer source '%s': %s", source, parse_error)
                             continue
         
-        print(f"[Layer Tap] Visible layers in panel: {len(visible)} layers - {visible}")
+        logger.debug("[Layer Tap] Visible layers in panel: %s layers - %s", len(visible), visible)
         return visible
         
     except Exception as e:
-        print(f"[Layer Tap] Error getting visible layers: {e}")
+        logger.error("[Layer Tap] Error getting visible layers: %s", e)
         import traceback
         traceback.print_exc()
         return set()
 
 
+@timed('layer_tap.scan')
 def get_layers_at_point(x, y, search_radius=None):
     """
     Get all visible layers that have shapes at the given coordinate.
@@ -186,7 +191,7 @@ def get_layers_at_point(x, y, search_radius=None):
         current_view = main_window.current_view()
         
         if not current_view or not current_view.active_cellview().is_valid():
-            print("[Layer Tap] No active layout view")
+            logger.debug("[Layer Tap] No active layout view")
             return []
         
         cellview = current_view.active_cellview()
@@ -198,9 +203,9 @@ def get_layers_at_point(x, y, search_radius=None):
         visible_layers = get_visible_layers()
         
         # Convert to database units
-        db_x = int(x / dbu)
-        db_y = int(y / dbu)
-        db_radius = int(search_radius / dbu)
+        db_x = int(round(x / dbu))
+        db_y = int(round(y / dbu))
+        db_radius = int(round(search_radius / dbu))
         
         # Ensure minimum search radius of 1 database unit
         if db_radius < 1:
@@ -214,8 +219,8 @@ def get_layers_at_point(x, y, search_radius=None):
             db_y + db_radius
         )
         
-        print(f"[Layer Tap] Searching at ({x:.3f}, {y:.3f}) um, radius={search_radius} um")
-        print(f"[Layer Tap] DB units: point=({db_x}, {db_y}), radius={db_radius}, box={search_box}")
+        logger.debug("[Layer Tap] Searching at (%.3f, %.3f) um, radius=%s um", x, y, search_radius)
+        logger.debug("[Layer Tap] DB units: point=(%s, %s), radius=%s, box=%s", db_x, db_y, db_radius, search_box)
         
         found_layers = []
         
@@ -247,23 +252,23 @@ def get_layers_at_point(x, y, search_radius=None):
             if has_shape:
                 # Get layer name if available
                 layer_name = layer_info.name if layer_info.name else None
-                print(f"[Layer Tap] Layer {layer_info.layer}/{layer_info.datatype}: name='{layer_info.name}', type={type(layer_info.name)}")
+                logger.debug("[Layer Tap] Layer %s/%s: name='%s', type=%s", layer_info.layer, layer_info.datatype, layer_info.name, type(layer_info.name))
                 
                 # Try to get layer name from Layer Panel if not available in layout
                 if not layer_name:
                     layer_name = get_layer_name_from_panel(current_view, layer_info.layer, layer_info.datatype)
                     if layer_name:
-                        print(f"[Layer Tap] Got name from panel: '{layer_name}'")
+                        logger.debug("[Layer Tap] Got name from panel: '%s'", layer_name)
                 
                 found_layer = LayerInfo(layer_info.layer, layer_info.datatype, layer_name)
                 found_layers.append(found_layer)
-                print(f"[Layer Tap] Found layer: {found_layer}")
+                logger.debug("[Layer Tap] Found layer: %s", found_layer)
         
-        print(f"[Layer Tap] Total visible layers found: {len(found_layers)}")
+        logger.debug("[Layer Tap] Total visible layers found: %s", len(found_layers))
         return found_layers
         
     except Exception as e:
-        print(f"[Layer Tap] Error: {e}")
+        logger.error("[Layer Tap] Error: %s", e)
         import traceback
         traceback.print_exc()
         return []
@@ -286,43 +291,43 @@ def get_selected_layer_from_panel():
         view = main_window.current_view()
         
         if view is None:
-            print("[Layer Tap] No current view")
+            logger.debug("[Layer Tap] No current view")
             return None
         
         # Get the currently selected layer iterator from Layer Panel
         layer_iter = view.current_layer
         
-        print(f"[Layer Tap] current_layer: {layer_iter}, type: {type(layer_iter)}")
+        logger.debug("[Layer Tap] current_layer: %s, type: %s", layer_iter, type(layer_iter))
         
         # Check if a layer is selected
         if layer_iter.is_null():
-            print("[Layer Tap] No layer selected in Layer Panel (is_null)")
+            logger.debug("[Layer Tap] No layer selected in Layer Panel (is_null)")
             return None
         
         # Get the actual layer properties node
         node = layer_iter.current()
         
-        print(f"[Layer Tap] layer node: {node}, type: {type(node)}")
+        logger.debug("[Layer Tap] layer node: %s, type: %s", node, type(node))
         
         # Check if the layer is visible
         if hasattr(node, 'visible') and not node.visible:
-            print(f"[Layer Tap] Selected layer is hidden (not visible), ignoring")
+            logger.debug("[Layer Tap] Selected layer is hidden (not visible), ignoring")
             return None
         
         # Check if the layer is valid
         if hasattr(node, 'valid') and not node.valid:
-            print(f"[Layer Tap] Selected layer is not valid, ignoring")
+            logger.debug("[Layer Tap] Selected layer is not valid, ignoring")
             return None
         
         # Extract layer information from the node's source
         if hasattr(node, 'source'):
             source = node.source
-            print(f"[Layer Tap] source: {source}, type: {type(source)}")
+            logger.debug("[Layer Tap] source: %s, type: %s", source, type(source))
             
             # Check if source is a string (layer/datatype@mask format) or an object
             if isinstance(source, str):
                 # Parse string format like "86/0@1" or "86/0" or "FIB_CUT 337/0"
-                print(f"[Layer Tap] source is string, parsing: {source}")
+                logger.debug("[Layer Tap] source is string, parsing: %s", source)
                 try:
                     # Remove mask part if present (e.g., "86/0@1" -> "86/0")
                     if '@' in source:
@@ -338,17 +343,17 @@ def get_selected_layer_from_panel():
                         layer_num = int(parts[0])
                         datatype = int(parts[1])
                     else:
-                        print(f"[Layer Tap] Cannot parse source string: {source}")
+                        logger.error("[Layer Tap] Cannot parse source string: %s", source)
                         return None
                 except Exception as parse_error:
-                    print(f"[Layer Tap] Error parsing source string '{source}': {parse_error}")
+                    logger.error("[Layer Tap] Error parsing source string '%s': %s", source, parse_error)
                     return None
             elif hasattr(source, 'layer') and hasattr(source, 'datatype'):
                 # source is a LayerInfo object
                 layer_num = source.layer
                 datatype = source.datatype
             else:
-                print(f"[Layer Tap] Unknown source type: {type(source)}")
+                logger.debug("[Layer Tap] Unknown source type: %s", type(source))
                 return None
             
             layer_name = node.name if hasattr(node, 'name') and node.name else None
@@ -359,27 +364,28 @@ def get_selected_layer_from_panel():
                 if better_name:
                     layer_name = better_name
             
-            print(f"[Layer Tap] Layer Panel selection: layer={layer_num}, datatype={datatype}, name={layer_name}, visible=True")
+            logger.debug("[Layer Tap] Layer Panel selection: layer=%s, datatype=%s, name=%s, visible=True", layer_num, datatype, layer_name)
             
             # Skip FIB layers
             if layer_num in FIB_LAYERS:
-                print(f"[Layer Tap] Skipping FIB layer {layer_num}")
+                logger.debug("[Layer Tap] Skipping FIB layer %s", layer_num)
                 return None
             
             layer_info = LayerInfo(layer_num, datatype, layer_name)
-            print(f"[Layer Tap] Successfully got Layer Panel selection: {layer_info}")
+            logger.info("[Layer Tap] Successfully got Layer Panel selection: %s", layer_info)
             return layer_info
         else:
-            print("[Layer Tap] Node has no source attribute")
+            logger.debug("[Layer Tap] Node has no source attribute")
             return None
         
     except Exception as e:
-        print(f"[Layer Tap] Error getting selected layer from panel: {e}")
+        logger.error("[Layer Tap] Error getting selected layer from panel: %s", e)
         import traceback
         traceback.print_exc()
         return None
 
 
+@timed('layer_tap.lookup')
 def get_layer_at_point_with_selection(x, y, search_radius=None, position_label=""):
     """
     Get layer at point with smart selection strategy.
@@ -404,24 +410,24 @@ def get_layer_at_point_with_selection(x, y, search_radius=None, position_label="
     
     # Case 1: No layers found at position - try Layer Panel as fallback
     if not layers:
-        print(f"[Layer Tap] No layers found at ({x:.3f}, {y:.3f})")
-        print(f"[Layer Tap] Trying Layer Panel selection as fallback...")
+        logger.debug("[Layer Tap] No layers found at (%.3f, %.3f)", x, y)
+        logger.debug("[Layer Tap] Trying Layer Panel selection as fallback...")
         selected_layer = get_selected_layer_from_panel()
         if selected_layer:
-            print(f"[Layer Tap] Using Layer Panel selection: {selected_layer}")
+            logger.debug("[Layer Tap] Using Layer Panel selection: %s", selected_layer)
             return selected_layer
-        print(f"[Layer Tap] No Layer Panel selection either, returning None")
+        logger.debug("[Layer Tap] No Layer Panel selection either, returning None")
         return None
     
     # Case 2: Single layer found - use it directly
     if len(layers) == 1:
-        print(f"[Layer Tap] Single layer at ({x:.3f}, {y:.3f}): {layers[0]}")
+        logger.debug("[Layer Tap] Single layer at (%.3f, %.3f): %s", x, y, layers[0])
         return layers[0]
     
     # Case 3: Multiple layers found - use Layer Panel selection
-    print(f"[Layer Tap] Multiple layers ({len(layers)}) at ({x:.3f}, {y:.3f})")
+    logger.debug("[Layer Tap] Multiple layers (%s) at (%.3f, %.3f)", len(layers), x, y)
     layer_names = [l.to_string() for l in layers]
-    print(f"[Layer Tap] Overlapping layers: {layer_names}")
+    logger.debug("[Layer Tap] Overlapping layers: %s", layer_names)
     
     # Try to get the selected layer from Layer Panel
     selected_layer = get_selected_layer_from_panel()
@@ -430,16 +436,16 @@ def get_layer_at_point_with_selection(x, y, search_radius=None, position_label="
         # Check if the selected layer is among the found layers
         for layer in layers:
             if layer.layer == selected_layer.layer and layer.datatype == selected_layer.datatype:
-                print(f"[Layer Tap] Using Layer Panel selection (matched): {selected_layer}")
+                logger.debug("[Layer Tap] Using Layer Panel selection (matched): %s", selected_layer)
                 return selected_layer
         
         # Selected layer is not at this position, but still use it
         # (user explicitly selected it, so respect their choice)
-        print(f"[Layer Tap] Layer Panel selection {selected_layer} not at position, but using it anyway")
+        logger.debug("[Layer Tap] Layer Panel selection %s not at position, but using it anyway", selected_layer)
         return selected_layer
     
     # No layer selected in panel - use the first found layer as fallback
-    print(f"[Layer Tap] No Layer Panel selection, using first found: {layers[0]}")
+    logger.debug("[Layer Tap] No Layer Panel selection, using first found: %s", layers[0])
     return layers[0]
 
 
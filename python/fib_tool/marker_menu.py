@@ -8,27 +8,29 @@ import sys
 import os
 import pya
 from .config import GEOMETRIC_PARAMS, UI_TIMEOUTS, DEFAULT_MARKER_NOTES
+from .core.geometry_utils import get_bounding_box, get_marker_points, get_marker_db_points, to_dbu
+from .core.perf_monitor import perf_timer, timed
+from .core.edit_session import FibEditSession
 
 class MarkerContextMenu:
     """Context menu handler for FIB markers"""
     
     def __init__(self, panel):
         self.panel = panel
-        self.current_item = None
+        self.current_marker_id = None
     
     def show_context_menu(self, position):
         """Show context menu at the given position"""
         try:
-            # Get the item at the position
-            item = self.panel.marker_list.itemAt(position)
-            if not item:
+            # Get the row at the position
+            index = self.panel.marker_list.indexAt(position)
+            if not index.isValid():
                 return
             
-            self.current_item = item
+            self.current_marker_id = self.panel.marker_model.marker_id_at(index.row())
             
-            # Get all selected items to determine menu options
-            selected_items = self.panel.marker_list.selectedItems()
-            selected_count = len(selected_items)
+            # Get all selected rows to determine menu options
+            selected_count = len(self.panel.selected_marker_rows())
             
             # Create menu
             menu = pya.QMenu()
@@ -38,6 +40,7 @@ class MarkerContextMenu:
                 action_notes = menu.addAction("Add Notes")
                 action_fit = menu.addAction("Zoom to Fit")
                 action_copy = menu.addAction("Copy Coordinates")
+                action_nearby = menu.addAction("Select Nearby Markers")
                 action_rename = menu.addAction("Rename Marker")
                 action_rearrange = menu.addAction("Rearrange New Order")
                 
@@ -52,6 +55,7 @@ class MarkerContextMenu:
                 action_notes = None
                 action_fit = None
                 action_copy = None
+                action_nearby = None
                 action_rename = None
                 action_rearrange = None
                 action_move_up = None
@@ -64,6 +68,18 @@ class MarkerContextMenu:
             # Add separator
             menu.addSeparator()
             
+            # Transform action (available for both single and multi-selection)
+            action_transform = menu.addAction("Transform Marker..." if selected_count == 1
+                                              else f"Transform {selected_count} Markers...")
+            
+            # Type conversion of the whole selection
+            convert_menu = menu.addMenu("Convert To")
+            convert_actions = []
+            for title, target_type in (("Cut", 'cut'), ("Connect", 'connect'), ("Probe", 'probe'),
+                                       ("Multi-Point Cut", 'multipoint_cut'),
+                                       ("Multi-Point Connect", 'multipoint_connect')):
+                convert_actions.append((convert_menu.addAction(title), target_type))
+            
             # Delete action (available for both single and multi-selection)
             if selected_count == 1:
                 action_delete = menu.addAction("Delete Marker")
@@ -80,6 +96,8 @@ class MarkerContextMenu:
                     self.zoom_to_marker()
                 elif selected_action == action_copy:
                     self.copy_coordinates()
+                elif selected_action == action_nearby:
+                    self.select_nearby_markers()
                 elif selected_action == action_notes:
                     self.add_notes()
                 elif selected_action == action_rename:
@@ -91,50 +109,25 @@ class MarkerContextMenu:
                 elif selected_action == action_move_down:
                     self.move_marker_down()
             
-            # Delete action works for both single and multi-selection
+            # Delete, transform and convert work for both single and multi-selection
             if selected_action == action_delete:
                 self.delete_marker()
+            elif selected_action == action_transform:
+                self.panel.on_transform_markers()
+            else:
+                for action, target_type in convert_actions:
+                    if selected_action == action:
+                        self.panel.on_convert_markers(target_type)
+                        break
                 
         except Exception as e:
             print(f"[Marker Menu] Error in context menu: {e}")
             import traceback
             traceback.print_exc()
     
-    def get_item_text(self, item):
-        """Safely get text from QListWidgetItem"""
-        try:
-            # Try different ways to get the text
-            if hasattr(item, 'text') and callable(item.text):
-                return item.text()
-            elif hasattr(item, 'text'):
-                return str(item.text)
-            elif hasattr(item, 'data'):
-                return str(item.data(0))  # Qt.DisplayRole = 0
-            else:
-                return str(item)
-        except Exception as e:
-            print(f"[Marker Menu] Error getting item text: {e}")
-            return "Unknown"
-    
-    def get_marker_id_from_item(self, item):
-        """Extract marker ID from list item"""
-        try:
-            text = self.get_item_text(item)
-            # Format is: "MARKER_ID - TYPE - (coordinates)"
-            parts = text.split(' - ')
-            if len(parts) >= 1:
-                return parts[0].strip()
-            return text.strip()
-        except Exception as e:
-            print(f"[Marker Menu] Error extracting marker ID: {e}")
-            return "Unknown"
-    
     def find_marker_by_id(self, marker_id):
         """Find marker object by ID"""
-        for marker in self.panel.markers_list:
-            if marker.id == marker_id:
-                return marker
-        return None
+        return self.panel.marker_model.find_marker(marker_id)
     
     def zoom_to_marker(self, detail_zoom=False):
         """Zoom view to fit the selected marker
@@ -142,11 +135,11 @@ class MarkerContextMenu:
         Args:
             detail_zoom (bool): If True, use minimal padding for maximum detail (double-click)
         """
-        if not self.current_item:
+        if not self.current_marker_id:
             return
         
         try:
-            marker_id = self.get_marker_id_from_item(self.current_item)
+            marker_id = self.current_marker_id
             marker = self.find_marker_by_id(marker_id)
             
             if not marker:
@@ -213,11 +206,11 @@ class MarkerContextMenu:
     
     def copy_coordinates(self):
         """Copy marker coordinates to clipboard"""
-        if not self.current_item:
+        if not self.current_marker_id:
             return
         
         try:
-            marker_id = self.get_marker_id_from_item(self.current_item)
+            marker_id = self.current_marker_id
             marker = self.find_marker_by_id(marker_id)
             
             if not marker:
@@ -243,13 +236,43 @@ class MarkerContextMenu:
         except Exception as e:
             print(f"[Marker Menu] Error copying coordinates: {e}")
     
+    def select_nearby_markers(self):
+        """Select all markers within search_radius of the selected marker's bounding box"""
+        if not self.current_marker_id:
+            return
+        
+        try:
+            marker = self.find_marker_by_id(self.current_marker_id)
+            bbox = get_bounding_box(get_marker_points(marker)) if marker else None
+            if bbox is None:
+                return
+            
+            model = self.panel.marker_model
+            radius = GEOMETRIC_PARAMS['search_radius']
+            nearby = model.spatial_index.window(bbox[0] - radius, bbox[1] - radius,
+                                                bbox[2] + radius, bbox[3] + radius)
+            
+            # Markers hidden by the list filter cannot be selected
+            rows = sorted(row for row in (model.row_of(m.id) for m in nearby) if row >= 0)
+            self.panel.select_marker_rows(rows, current=model.row_of(marker.id))
+            
+            message = f"Selected {len(rows)} markers within {radius} um of {marker.id}"
+            print(f"[Marker Menu] {message}")
+            try:
+                pya.MainWindow.instance().message(message, UI_TIMEOUTS['message_short'])
+            except:
+                pass
+            
+        except Exception as e:
+            print(f"[Marker Menu] Error selecting nearby markers: {e}")
+    
     def add_notes(self):
         """Add or edit notes for the selected marker"""
-        if not self.current_item:
+        if not self.current_marker_id:
             return
         
         try:
-            marker_id = self.get_marker_id_from_item(self.current_item)
+            marker_id = self.current_marker_id
             marker = self.find_marker_by_id(marker_id)
             
             if not marker:
@@ -293,6 +316,7 @@ class MarkerContextMenu:
             if ok:
                 # Update marker notes in both places for redundancy
                 marker.notes = new_notes
+                self.panel.marker_model.marker_changed(marker)
                 
                 # Also store in centralized dictionary
                 if hasattr(self.panel, 'marker_notes_dict'):
@@ -336,11 +360,11 @@ class MarkerContextMenu:
     
     def rename_marker(self):
         """Rename the selected marker"""
-        if not self.current_item:
+        if not self.current_marker_id:
             return
         
         try:
-            marker_id = self.get_marker_id_from_item(self.current_item)
+            marker_id = self.current_marker_id
             
             # Get new name from user
             try:
@@ -396,14 +420,16 @@ class MarkerContextMenu:
                 # Update marker object
                 marker = self.find_marker_by_id(marker_id)
                 if marker:
-                    old_id = marker.id
-                    marker.id = new_name
+                    with perf_timer('marker.rename'), FibEditSession(description=f"FIB: rename {marker_id}"):
+                        old_id = marker.id
+                        marker.id = new_name
                     
-                    # Update coordinate text in GDS layout
-                    self.update_coordinate_text_in_gds(marker, old_id, new_name)
+                        # Update coordinate text in GDS layout
+                        self.update_coordinate_text_in_gds(marker, old_id, new_name)
                     
-                    # Refresh the entire marker list to avoid Qt text setting issues
-                    self.refresh_marker_list()
+                        # Repaint only the renamed row
+                        self.panel.marker_model.marker_changed(marker)
+                        self.current_marker_id = new_name
                     
                     # Reset smart counters after rename
                     if hasattr(self.panel, 'smart_counter'):
@@ -475,52 +501,53 @@ class MarkerContextMenu:
             # Phase 1: Rename ALL markers to temporary names (TEMP_TYPE_index)
             # Phase 2: Rename ALL from temporary to final names (TYPE_index)
             # Phase 3: Clean up any remaining TEMP_ prefixes (safety net)
-            rename_count = 0
-            all_temp_ids = []  # Track all temp IDs for cleanup
+            with perf_timer('marker.rearrange'), FibEditSession(description="FIB: rearrange markers"):
+                rename_count = 0
+                all_temp_ids = []  # Track all temp IDs for cleanup
             
-            for marker_type, markers in marker_groups.items():
-                if not markers:
-                    continue
+                for marker_type, markers in marker_groups.items():
+                    if not markers:
+                        continue
                 
-                print(f"[Marker Menu] Rearranging {len(markers)} {marker_type} markers")
+                    print(f"[Marker Menu] Rearranging {len(markers)} {marker_type} markers")
                 
-                # Phase 1: Rename ALL to temporary names (even if final name is same)
-                temp_mappings = []  # Store (marker, old_id, temp_id, final_id)
+                    # Phase 1: Rename ALL to temporary names (even if final name is same)
+                    temp_mappings = []  # Store (marker, old_id, temp_id, final_id)
                 
-                for index, marker in enumerate(markers):
-                    old_id = marker.id
-                    temp_id = f"TEMP_{marker_type}_{index}"
-                    final_id = f"{marker_type}_{index}"
+                    for index, marker in enumerate(markers):
+                        old_id = marker.id
+                        temp_id = f"TEMP_{marker_type}_{index}"
+                        final_id = f"{marker_type}_{index}"
                     
-                    # Always rename to temp first to avoid any conflicts
-                    marker.id = temp_id
-                    all_temp_ids.append(temp_id)
-                    self.update_coordinate_text_in_gds(marker, old_id, temp_id)
+                        # Always rename to temp first to avoid any conflicts
+                        marker.id = temp_id
+                        all_temp_ids.append(temp_id)
+                        self.update_coordinate_text_in_gds(marker, old_id, temp_id)
                     
-                    temp_mappings.append((marker, old_id, temp_id, final_id))
-                    print(f"[Marker Menu] Phase 1: {old_id} -> {temp_id}")
+                        temp_mappings.append((marker, old_id, temp_id, final_id))
+                        print(f"[Marker Menu] Phase 1: {old_id} -> {temp_id}")
                 
-                # Phase 2: Rename ALL from temporary to final names
-                for marker, old_id, temp_id, final_id in temp_mappings:
-                    print(f"[Marker Menu] Phase 2 START: Processing {temp_id} -> {final_id} (original: {old_id})")
-                    print(f"[Marker Menu] Phase 2: Current marker.id = '{marker.id}'")
+                    # Phase 2: Rename ALL from temporary to final names
+                    for marker, old_id, temp_id, final_id in temp_mappings:
+                        print(f"[Marker Menu] Phase 2 START: Processing {temp_id} -> {final_id} (original: {old_id})")
+                        print(f"[Marker Menu] Phase 2: Current marker.id = '{marker.id}'")
                     
-                    marker.id = final_id
-                    result = self.update_coordinate_text_in_gds(marker, temp_id, final_id)
+                        marker.id = final_id
+                        result = self.update_coordinate_text_in_gds(marker, temp_id, final_id)
                     
-                    print(f"[Marker Menu] Phase 2 END: marker.id now = '{marker.id}', GDS update result = {result}")
+                        print(f"[Marker Menu] Phase 2 END: marker.id now = '{marker.id}', GDS update result = {result}")
                     
-                    # Only count as rename if the final ID is different from original
-                    if old_id != final_id:
-                        rename_count += 1
+                        # Only count as rename if the final ID is different from original
+                        if old_id != final_id:
+                            rename_count += 1
             
-            # Phase 3: Safety cleanup - remove any remaining TEMP_ prefixes in GDS
-            # This handles edge cases where string replacement might have failed
-            print("[Marker Menu] Phase 3: Cleaning up any remaining TEMP_ prefixes")
-            self.cleanup_temp_markers_in_gds(all_temp_ids)
+                # Phase 3: Safety cleanup - remove any remaining TEMP_ prefixes in GDS
+                # This handles edge cases where string replacement might have failed
+                print("[Marker Menu] Phase 3: Cleaning up any remaining TEMP_ prefixes")
+                self.cleanup_temp_markers_in_gds(all_temp_ids)
             
-            # Refresh the marker list display
-            self.refresh_marker_list()
+                # Re-format all rows (ids changed) without resetting the model
+                self.panel.marker_model.refresh_all()
             
             # Reset smart counters after rearrange
             if hasattr(self.panel, 'smart_counter'):
@@ -579,16 +606,11 @@ class MarkerContextMenu:
     
     def move_marker_up(self):
         """Move the selected marker up in the list"""
-        if not self.current_item:
+        if not self.current_marker_id:
             return
         
         try:
-            # Get row of current item
-            try:
-                current_row = self.panel.marker_list.row(self.current_item)
-            except TypeError:
-                print(f"[Marker Menu] row() not callable")
-                return
+            current_row = self.panel.marker_model.row_of(self.current_marker_id)
             
             if current_row <= 0:
                 # Already at top
@@ -597,11 +619,8 @@ class MarkerContextMenu:
             
             # Use the panel's move method instead of duplicating logic
             if hasattr(self.panel, 'on_move_marker_up'):
-                # Set the current row first
-                try:
-                    self.panel.marker_list.setCurrentRow(current_row)
-                except:
-                    pass
+                # Select the current row first
+                self.panel.select_marker_rows([current_row], current=current_row)
                 # Call the panel's move method
                 self.panel.on_move_marker_up()
             else:
@@ -614,22 +633,12 @@ class MarkerContextMenu:
     
     def move_marker_down(self):
         """Move the selected marker down in the list"""
-        if not self.current_item:
+        if not self.current_marker_id:
             return
         
         try:
-            # Get row of current item
-            try:
-                current_row = self.panel.marker_list.row(self.current_item)
-            except TypeError:
-                print(f"[Marker Menu] row() not callable")
-                return
-            
-            # Get count
-            try:
-                list_count = self.panel.marker_list.count()
-            except TypeError:
-                list_count = self.panel.marker_list.count
+            current_row = self.panel.marker_model.row_of(self.current_marker_id)
+            list_count = self.panel.marker_model.rowCount()  # Visible rows (filter applied)
             
             if current_row < 0 or current_row >= list_count - 1:
                 # Already at bottom
@@ -638,11 +647,8 @@ class MarkerContextMenu:
             
             # Use the panel's move method instead of duplicating logic
             if hasattr(self.panel, 'on_move_marker_down'):
-                # Set the current row first
-                try:
-                    self.panel.marker_list.setCurrentRow(current_row)
-                except:
-                    pass
+                # Select the current row first
+                self.panel.select_marker_rows([current_row], current=current_row)
                 # Call the panel's move method
                 self.panel.on_move_marker_down()
             else:
@@ -656,26 +662,15 @@ class MarkerContextMenu:
     def delete_marker(self):
         """Delete the selected marker(s) from both panel and GDS layout"""
         try:
-            # Get all selected items
-            selected_items = self.panel.marker_list.selectedItems()
+            # Get all selected markers (ids come from the model, not item text)
+            selected_markers = self.panel.selected_markers()
             
-            if not selected_items:
+            if not selected_markers:
                 print(f"[Marker Menu] No markers selected for deletion")
                 return
             
-            # Extract marker IDs from selected items
-            markers_to_delete = []
-            marker_ids = []
-            
-            for item in selected_items:
-                marker_id = self.get_marker_id_from_item(item)
-                marker_obj = self.find_marker_by_id(marker_id)
-                
-                if marker_obj:
-                    markers_to_delete.append((item, marker_id, marker_obj))
-                    marker_ids.append(marker_id)
-                else:
-                    print(f"[Marker Menu] Marker {marker_id} not found in markers list")
+            markers_to_delete = [(marker.id, marker) for marker in selected_markers]
+            marker_ids = [marker.id for marker in selected_markers]
             
             if not markers_to_delete:
                 print(f"[Marker Menu] No valid markers found for deletion")
@@ -693,35 +688,31 @@ class MarkerContextMenu:
             result = pya.MessageBox.question(title, message, pya.MessageBox.Yes | pya.MessageBox.No)
             
             if result == pya.MessageBox.Yes:
-                deleted_count = 0
-                failed_count = 0
+                with perf_timer('marker.delete'), FibEditSession(description=f"FIB: delete {len(marker_ids)} marker(s)"):
+                    deleted_count = 0
+                    failed_count = 0
+                    deleted_ids = []
                 
-                # Delete each marker
-                for item, marker_id, marker_obj in markers_to_delete:
-                    try:
-                        # Delete from GDS layout first
-                        success = self.delete_marker_from_gds(marker_obj)
+                    # Delete each marker
+                    for marker_id, marker_obj in markers_to_delete:
+                        try:
+                            # Delete from GDS layout first
+                            success = self.delete_marker_from_gds(marker_obj)
                         
-                        if success:
-                            # Remove from list widget
-                            try:
-                                row = self.panel.marker_list.row(item)
-                                self.panel.marker_list.takeItem(row)
-                            except Exception as remove_error:
-                                print(f"[Marker Menu] Error removing {marker_id} from list: {remove_error}")
-                            
-                            # Remove from markers list
-                            self.panel.markers_list = [m for m in self.panel.markers_list if m.id != marker_id]
+                            if success:
+                                deleted_ids.append(marker_id)
+                                deleted_count += 1
+                                print(f"[Marker Menu] Successfully deleted marker: {marker_id}")
+                            else:
+                                failed_count += 1
+                                print(f"[Marker Menu] Failed to delete {marker_id} from GDS layout")
                             
-                            deleted_count += 1
-                            print(f"[Marker Menu] Successfully deleted marker: {marker_id}")
-                        else:
+                        except Exception as delete_error:
                             failed_count += 1
-                            print(f"[Marker Menu] Failed to delete {marker_id} from GDS layout")
-                            
-                    except Exception as delete_error:
-                        failed_count += 1
-                        print(f"[Marker Menu] Error deleting {marker_id}: {delete_error}")
+                            print(f"[Marker Menu] Error deleting {marker_id}: {delete_error}")
+                
+                    # Remove from the list model (one notification per contiguous block)
+                    self.panel.marker_model.remove_marker_ids(deleted_ids)
                 
                 # Reset smart counters after deletion
                 if hasattr(self.panel, 'smart_counter'):
@@ -751,6 +742,7 @@ class MarkerContextMenu:
             import traceback
             traceback.print_exc()
     
+    @timed('marker.delete_gds')
     def delete_marker_from_gds(self, marker):
         """Delete marker geometry and coordinate texts from GDS layout"""
         try:
@@ -839,20 +831,9 @@ class MarkerContextMenu:
             
             print(f"[Marker Menu] Deleting {marker_type} geometry from layer {layer_num}")
             
-            # Get marker coordinates for geometry matching
-            # Check for multi-point markers first (they have 'points' attribute)
-            if hasattr(marker, 'points') and len(marker.points) > 0:
-                # Multi-point marker: search around ALL points
-                marker_coords = marker.points
-                print(f"[Marker Menu] Multi-point marker with {len(marker_coords)} points")
-            elif hasattr(marker, 'x1'):  # Regular CUT or CONNECT markers
-                marker_coords = [(marker.x1, marker.y1), (marker.x2, marker.y2)]
-            else:  # PROBE marker
-                marker_coords = [(marker.x, marker.y)]
-            
-            # Convert to database units
+            # Marker coordinates in database units (all points of multi-point markers)
             dbu = layout.dbu
-            db_coords = [(int(x / dbu), int(y / dbu)) for x, y in marker_coords]
+            db_coords = get_marker_db_points(marker, dbu)
             
             # Find and delete geometry near marker coordinates
             deleted_count = 0
@@ -860,7 +841,7 @@ class MarkerContextMenu:
             shapes_to_remove = []
             
             # Create search regions around marker coordinates
-            search_radius = int(GEOMETRIC_PARAMS['search_radius'] / dbu)
+            search_radius = to_dbu(GEOMETRIC_PARAMS['search_radius'], dbu)
             
             for db_x, db_y in db_coords:
                 search_box = pya.Box(
@@ -891,57 +872,12 @@ class MarkerContextMenu:
             traceback.print_exc()
             return 0
     
-    def handle_double_click(self, item):
+    def handle_double_click(self, row):
         """Handle double-click on marker (zoom to maximum detail)"""
-        self.current_item = item
+        self.current_marker_id = self.panel.marker_model.marker_id_at(row)
         self.zoom_to_marker(detail_zoom=True)  # Use detail zoom for double-click
     
-    def refresh_marker_list(self):
-        """Refresh the marker list display"""
-        try:
-            # Clear the current list
-            self.panel.marker_list.clear()
-            
-            # Re-add all markers
-            for marker in self.panel.markers_list:
-                marker_class_name = marker.__class__.__name__
-                marker_type = marker_class_name.replace('Marker', '').upper()
-                
-                # Handle multi-point markers
-                if 'MultiPoint' in marker_class_name:
-                    if 'Cut' in marker_class_name:
-                        marker_type = "CUT (MULTI)"
-                    elif 'Connect' in marker_class_name:
-                        marker_type = "CONNECT (MULTI)"
-                    
-                    if hasattr(marker, 'points') and len(marker.points) > 0:
-                        if len(marker.points) <= 3:
-                            point_strs = [f"({p[0]:.3f},{p[1]:.3f})" for p in marker.points]
-                            coords = " -> ".join(point_strs)
-                        else:
-                            first = marker.points[0]
-                            last = marker.points[-1]
-                            coords = f"({first[0]:.3f},{first[1]:.3f}) -> ... -> ({last[0]:.3f},{last[1]:.3f}) [{len(marker.points)} pts]"
-                    else:
-                        coords = "(no points)"
-                elif hasattr(marker, 'x1'):  # CUT or CONNECT
-                    # Get layer info for display
-                    layer1_str = getattr(marker, 'layer1', None) or 'N/A'
-                    layer2_str = getattr(marker, 'layer2', None) or 'N/A'
-                    coords = f"({marker.x1:.3f},{marker.y1:.3f}) {layer1_str} to ({marker.x2:.3f},{marker.y2:.3f}) {layer2_str}"
-                else:  # PROBE
-                    # Get layer info for display
-                    target_layer_str = getattr(marker, 'target_layer', None) or 'N/A'
-                    coords = f"({marker.x:.3f},{marker.y:.3f}) {target_layer_str}"
-                
-                item_text = f"{marker.id} - {marker_type} - {coords}"
-                self.panel.marker_list.addItem(item_text)
-            
-            print(f"[Marker Menu] Refreshed marker list with {len(self.panel.markers_list)} items")
-            
-        except Exception as e:
-            print(f"[Marker Menu] Error refreshing marker list: {e}")
-    
+    @timed('coord_text.rename')
     def update_coordinate_text_in_gds(self, marker, old_id, new_id):
         """Update coordinate text in GDS layout using exact matching with boundaries
         
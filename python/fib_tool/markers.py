@@ -1,40 +1,188 @@
 """
 FIB Marker Classes
 
-Simple dataclasses. No abstract base classes, no over-engineering.
+Simple value classes. No abstract base classes, no over-engineering.
 Each marker knows how to draw itself and serialize to XML.
+
+Coordinates are stored as integers in CANONICAL_DBU (ix1, iy1, ... / ix, iy)
+so drawing, searching and comparing markers needs no float tolerance; the
+micron attributes (x1, y1, ... / x, y) are properties over them and round
+on assignment. XML elements carry both: micron attributes (x1=...) that
+older releases read, and the exact integers (ix1=...).
+
+Markers use __slots__ (no per-instance __dict__), so every attribute the
+tool sets on a marker is declared here: the class's own fields plus
+OPTIONAL_FIELDS. Assigning any other attribute raises AttributeError.
 """
 
-from dataclasses import dataclass, field
-from typing import Tuple, Optional
+from typing import Optional
 import pya
 from .config import LAYERS, SYMBOL_SIZES
+from .core.geometry_utils import (
+    CANONICAL_SCALE, to_canonical, from_canonical, to_dbu, canonical_to_dbu, get_marker_db_points
+)
+from .core.perf_monitor import timed
+
+
+# Attributes every marker class has besides its geometry and layer fields
+OPTIONAL_FIELDS = ('notes', 'screenshots', 'target_layers', 'violations', 'conflicts', 'nets', 'connected')
+
+
+def init_optional_fields(marker):
+    """Set the OPTIONAL_FIELDS of a new marker to their defaults
+
+    Shared immutable defaults keep unused fields free of per-marker objects;
+    screenshots / target_layers are replaced, never appended to.
+    """
+    marker.notes = ''          # Set to DEFAULT_MARKER_NOTES when created from the UI
+    marker.screenshots = ()    # Screenshot records saved with the project
+    marker.target_layers = ()
+    marker.violations = None   # Rule checker result (None = not checked)
+    marker.conflicts = None    # Conflict analyzer result (None = not analyzed)
+    marker.nets = None         # Endpoint net names (None = not traced)
+    marker.connected = None    # Endpoints already on one net (None = unknown)
+
+
+def coordinate_texts(marker, dbu):
+    """Coordinate labels "ID:(x,y)" of a marker, one pya.Text per point
+
+    Args:
+        dbu (float): Database unit of the target layout
+
+    Returns:
+        list: pya.Text objects for LAYERS['coordinates']
+    """
+    texts = []
+    for ix, iy in get_marker_db_points(marker):
+        label = f"{marker.id}:({from_canonical(ix):.3f},{from_canonical(iy):.3f})"
+        position = pya.Point(canonical_to_dbu(ix, dbu), canonical_to_dbu(iy, dbu))
+        texts.append(pya.Text(label, pya.Trans(position)))
+    return texts
+
+
+def _coordinate(name):
+    """Micron property over the canonical integer attribute `name`"""
+    def getter(self):
+        return getattr(self, name) / CANONICAL_SCALE
+
+    def setter(self, value):
+        setattr(self, name, to_canonical(value))
+
+    return property(getter, setter, doc=f"{name[1:]} in microns (canonical {name})")
+
+
+def _xml_coordinate(elem, name, dbu):
+    """Canonical value of an XML coordinate attribute
+
+    Reads the integer attribute 'i<name>' when present (version 1.2),
+    otherwise `name`.
+
+    Args:
+        dbu (float): Unit of the file's integer coordinates (None = no
+            integers, `name` holds microns as in version 1.0 files)
+    """
+    value = elem.get('i' + name)
+    if value is not None:
+        return to_canonical(int(value) * dbu)
+    value = elem.get(name)
+    if dbu is None:
+        return to_canonical(float(value))
+    return to_canonical(int(value) * dbu)  # Version 1.1: integers under the plain names
+
+
+class _TwoPointMarker:
+    """Shared storage of CutMarker / ConnectMarker (not a public base class)"""
+
+    __slots__ = ('id', 'ix1', 'iy1', 'ix2', 'iy2', 'layer', 'layer1', 'layer2') + OPTIONAL_FIELDS
+
+    x1 = _coordinate('ix1')
+    y1 = _coordinate('iy1')
+    x2 = _coordinate('ix2')
+    y2 = _coordinate('iy2')
+
+    def __init__(self, id: str, x1: float, y1: float, x2: float, y2: float, layer: int,
+                 layer1: Optional[str] = None, layer2: Optional[str] = None):
+        self.id = id
+        self.ix1 = to_canonical(x1)  # First click point
+        self.iy1 = to_canonical(y1)
+        self.ix2 = to_canonical(x2)  # Second click point
+        self.iy2 = to_canonical(y2)
+        self.layer = layer
+        # Layer info for each point (layer name or "layer/datatype" format)
+        self.layer1 = layer1  # Layer at point 1
+        self.layer2 = layer2  # Layer at point 2
+        init_optional_fields(self)
+
+    @classmethod
+    def from_canonical(cls, id, ix1, iy1, ix2, iy2, layer, layer1=None, layer2=None):
+        """Create from canonical integer coordinates (no float round trip)"""
+        marker = cls(id, 0, 0, 0, 0, layer, layer1, layer2)
+        marker.ix1, marker.iy1, marker.ix2, marker.iy2 = ix1, iy1, ix2, iy2
+        return marker
+
+    def geometry_key(self):
+        """Exact, hashable geometry: (tag, ix1, iy1, ix2, iy2)"""
+        return (self.TAG, self.ix1, self.iy1, self.ix2, self.iy2)
+
+    def _fields(self):
+        return (self.id, self.ix1, self.iy1, self.ix2, self.iy2, self.layer, self.layer1, self.layer2)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None  # Mutable, compared by value
+
+    def __repr__(self):
+        return (f"{self.__class__.__name__}(id={self.id!r}, x1={self.x1!r}, y1={self.y1!r}, "
+                f"x2={self.x2!r}, y2={self.y2!r}, layer={self.layer!r}, "
+                f"layer1={self.layer1!r}, layer2={self.layer2!r})")
+
+    def _xml_attributes(self):
+        layer1_attr = f' layer1="{self.layer1}"' if self.layer1 else ''
+        layer2_attr = f' layer2="{self.layer2}"' if self.layer2 else ''
+        return (f'id="{self.id}" x1="{self.x1!r}" y1="{self.y1!r}" '
+                f'x2="{self.x2!r}" y2="{self.y2!r}" '
+                f'ix1="{self.ix1}" iy1="{self.iy1}" ix2="{self.ix2}" iy2="{self.iy2}" '
+                f'layer="{self.layer}"', layer1_attr + layer2_attr)
 
+    @classmethod
+    def from_xml(cls, elem, dbu=None):
+        """Deserialize from XML element
 
-@dataclass
-class CutMarker:
+        Args:
+            dbu (float): Unit of the file's integer coordinates (None = microns, version 1.0)
+        """
+        return cls.from_canonical(
+            elem.get('id'),
+            _xml_coordinate(elem, 'x1', dbu),
+            _xml_coordinate(elem, 'y1', dbu),
+            _xml_coordinate(elem, 'x2', dbu),
+            _xml_coordinate(elem, 'y2', dbu),
+            int(elem.get('layer')),
+            elem.get('layer1'),
+            elem.get('layer2')
+        )
+
+
+class CutMarker(_TwoPointMarker):
     """Cut operation marker - Line connecting two mouse click points"""
-    id: str
-    x1: float  # First click point
-    y1: float
-    x2: float  # Second click point
-    y2: float
-    layer: int
-    # Layer info for each point (layer name or "layer/datatype" format)
-    layer1: Optional[str] = None  # Layer at point 1
-    layer2: Optional[str] = None  # Layer at point 2
-    
+    __slots__ = ()
+    TAG = 'cut'
+
+    @timed('marker.to_gds')
     def to_gds(self, cell, fib_layer):
         """Draw line connecting the two click points with fixed width"""
         dbu = cell.layout().dbu
         fixed_width = SYMBOL_SIZES['cut']['line_width']
-        width = int(fixed_width / dbu)  # Convert to database units
+        width = to_dbu(fixed_width, dbu)  # Convert to database units
         
         # Convert coordinates to database units
-        p1_x = int(self.x1 / dbu)
-        p1_y = int(self.y1 / dbu)
-        p2_x = int(self.x2 / dbu)
-        p2_y = int(self.y2 / dbu)
+        p1_x = canonical_to_dbu(self.ix1, dbu)
+        p1_y = canonical_to_dbu(self.iy1, dbu)
+        p2_x = canonical_to_dbu(self.ix2, dbu)
+        p2_y = canonical_to_dbu(self.iy2, dbu)
         
         # Draw line connecting the two points
         pts = [pya.Point(p1_x, p1_y), pya.Point(p2_x, p2_y)]
@@ -47,58 +195,34 @@ class CutMarker:
         cell.shapes(fib_layer).insert(text)
     
     def to_xml(self) -> str:
-        """Serialize to XML element"""
-        layer1_attr = f' layer1="{self.layer1}"' if self.layer1 else ''
-        layer2_attr = f' layer2="{self.layer2}"' if self.layer2 else ''
-        return (f'<cut id="{self.id}" x1="{self.x1}" y1="{self.y1}" ' 
-                f'x2="{self.x2}" y2="{self.y2}" layer="{self.layer}"{layer1_attr}{layer2_attr}/>')
-    
-    @staticmethod
-    def from_xml(elem) -> 'CutMarker':
-        """Deserialize from XML element"""
-        marker = CutMarker(
-            id=elem.get('id'),
-            x1=float(elem.get('x1')),
-            y1=float(elem.get('y1')),
-            x2=float(elem.get('x2')),
-            y2=float(elem.get('y2')),
-            layer=int(elem.get('layer')),
-            layer1=elem.get('layer1'),
-            layer2=elem.get('layer2')
-        )
-        return marker
+        """Serialize to XML element (microns and canonical integers)"""
+        attributes, layer_attrs = self._xml_attributes()
+        return f'<cut {attributes}{layer_attrs}/>'
 
 
-@dataclass
-class ConnectMarker:
+class ConnectMarker(_TwoPointMarker):
     """Connect operation marker - line with endpoints"""
-    id: str
-    x1: float
-    y1: float
-    x2: float
-    y2: float
-    layer: int
-    # Layer info for each point (layer name or "layer/datatype" format)
-    layer1: Optional[str] = None  # Layer at point 1
-    layer2: Optional[str] = None  # Layer at point 2
-    
+    __slots__ = ()
+    TAG = 'connect'
+
+    @timed('marker.to_gds')
     def to_gds(self, cell, fib_layer):
         """Draw connection line + endpoints + label on GDS using fixed width path"""
         dbu = cell.layout().dbu
         radius = SYMBOL_SIZES['connect']['endpoint_radius']
         fixed_width = SYMBOL_SIZES['connect']['line_width']
-        width = int(fixed_width / dbu)  # Convert to database units
+        width = to_dbu(fixed_width, dbu)  # Convert to database units
         
         # Convert to database units
-        p1 = pya.Point(int(self.x1 / dbu), int(self.y1 / dbu))
-        p2 = pya.Point(int(self.x2 / dbu), int(self.y2 / dbu))
+        p1 = pya.Point(canonical_to_dbu(self.ix1, dbu), canonical_to_dbu(self.iy1, dbu))
+        p2 = pya.Point(canonical_to_dbu(self.ix2, dbu), canonical_to_dbu(self.iy2, dbu))
         
         # Draw connection line with fixed width
         line = pya.Path([p1, p2], width)
         cell.shapes(fib_layer).insert(line)
         
         # Draw endpoint circles
-        r = int(radius / dbu)
+        r = to_dbu(radius, dbu)
         circle1 = pya.Polygon.ellipse(pya.Box(p1.x - r, p1.y - r, p1.x + r, p1.y + r), 32)
         circle2 = pya.Polygon.ellipse(pya.Box(p2.x - r, p2.y - r, p2.x + r, p2.y + r), 32)
         cell.shapes(fib_layer).insert(circle1)
@@ -111,52 +235,68 @@ class ConnectMarker:
         cell.shapes(fib_layer).insert(text)
     
     def to_xml(self) -> str:
-        """Serialize to XML element"""
-        layer1_attr = f' layer1="{self.layer1}"' if self.layer1 else ''
-        layer2_attr = f' layer2="{self.layer2}"' if self.layer2 else ''
+        """Serialize to XML element (microns and canonical integers)"""
+        attributes, layer_attrs = self._xml_attributes()
         # Note: start_x/end_x kept in XML for backward compatibility
-        return (f'<connect id="{self.id}" x1="{self.x1}" y1="{self.y1}" '
-                f'x2="{self.x2}" y2="{self.y2}" layer="{self.layer}" '
-                f'start_x="{self.x1}" start_y="{self.y1}" '
-                f'end_x="{self.x2}" end_y="{self.y2}"{layer1_attr}{layer2_attr}/>')
-    
-    @staticmethod
-    def from_xml(elem) -> 'ConnectMarker':
-        """Deserialize from XML element"""
-        marker = ConnectMarker(
-            id=elem.get('id'),
-            x1=float(elem.get('x1')),
-            y1=float(elem.get('y1')),
-            x2=float(elem.get('x2')),
-            y2=float(elem.get('y2')),
-            layer=int(elem.get('layer')),
-            layer1=elem.get('layer1'),
-            layer2=elem.get('layer2')
-        )
-        return marker
+        return (f'<connect {attributes} '
+                f'start_x="{self.x1!r}" start_y="{self.y1!r}" '
+                f'end_x="{self.x2!r}" end_y="{self.y2!r}"{layer_attrs}/>')
 
 
-@dataclass
 class ProbeMarker:
     """Probe operation marker - circle"""
-    id: str
-    x: float
-    y: float
-    layer: int
-    # Layer info at probe point (layer name or "layer/datatype" format)
-    target_layer: Optional[str] = None  # Layer at probe point
-    
+    __slots__ = ('id', 'ix', 'iy', 'layer', 'target_layer') + OPTIONAL_FIELDS
+    TAG = 'probe'
+
+    x = _coordinate('ix')
+    y = _coordinate('iy')
+
+    def __init__(self, id: str, x: float, y: float, layer: int, target_layer: Optional[str] = None):
+        self.id = id
+        self.ix = to_canonical(x)
+        self.iy = to_canonical(y)
+        self.layer = layer
+        # Layer info at probe point (layer name or "layer/datatype" format)
+        self.target_layer = target_layer  # Layer at probe point
+        init_optional_fields(self)
+
+    @classmethod
+    def from_canonical(cls, id, ix, iy, layer, target_layer=None):
+        """Create from canonical integer coordinates (no float round trip)"""
+        marker = cls(id, 0, 0, layer, target_layer)
+        marker.ix, marker.iy = ix, iy
+        return marker
+
+    def geometry_key(self):
+        """Exact, hashable geometry: ('probe', ix, iy)"""
+        return (self.TAG, self.ix, self.iy)
+
+    def _fields(self):
+        return (self.id, self.ix, self.iy, self.layer, self.target_layer)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None  # Mutable, compared by value
+
+    def __repr__(self):
+        return (f"ProbeMarker(id={self.id!r}, x={self.x!r}, y={self.y!r}, layer={self.layer!r}, "
+                f"target_layer={self.target_layer!r})")
+
+    @timed('marker.to_gds')
     def to_gds(self, cell, fib_layer):
         """Draw circle + label on GDS using KLayout's circle tool"""
         dbu = cell.layout().dbu
         
         # Convert to database units
-        cx = int(self.x / dbu)
-        cy = int(self.y / dbu)
+        cx = canonical_to_dbu(self.ix, dbu)
+        cy = canonical_to_dbu(self.iy, dbu)
         
         # Draw circle instead of arrow
         circle_radius = SYMBOL_SIZES['probe']['circle_radius']
-        r = int(circle_radius / dbu)  # Convert to database units
+        r = to_dbu(circle_radius, dbu)  # Convert to database units
         circle = pya.Polygon.ellipse(pya.Box(cx - r, cy - r, cx + r, cy + r), 32)
         cell.shapes(fib_layer).insert(circle)
 
@@ -165,21 +305,24 @@ class ProbeMarker:
         cell.shapes(fib_layer).insert(text)
     
     def to_xml(self) -> str:
-        """Serialize to XML element"""
+        """Serialize to XML element (microns and canonical integers)"""
         target_layer_attr = f' target_layer="{self.target_layer}"' if self.target_layer else ''
         # Note: start_x/end_x kept in XML for backward compatibility
-        return (f'<probe id="{self.id}" x="{self.x}" y="{self.y}" layer="{self.layer}" '
-                f'start_x="{self.x}" start_y="{self.y}" '
-                f'end_x="{self.x}" end_y="{self.y}"{target_layer_attr}/>')
-    
+        return (f'<probe id="{self.id}" x="{self.x!r}" y="{self.y!r}" ix="{self.ix}" iy="{self.iy}" '
+                f'layer="{self.layer}" start_x="{self.x!r}" start_y="{self.y!r}" '
+                f'end_x="{self.x!r}" end_y="{self.y!r}"{target_layer_attr}/>')
+
     @staticmethod
-    def from_xml(elem) -> 'ProbeMarker':
-        """Deserialize from XML element"""
-        marker = ProbeMarker(
-            id=elem.get('id'),
-            x=float(elem.get('x')),
-            y=float(elem.get('y')),
-            layer=int(elem.get('layer')),
-            target_layer=elem.get('target_layer')
+    def from_xml(elem, dbu=None) -> 'ProbeMarker':
+        """Deserialize from XML element
+
+        Args:
+            dbu (float): Unit of the file's integer coordinates (None = microns, version 1.0)
+        """
+        return ProbeMarker.from_canonical(
+            elem.get('id'),
+            _xml_coordinate(elem, 'x', dbu),
+            _xml_coordinate(elem, 'y', dbu),
+            int(elem.get('layer')),
+            elem.get('target_layer')
         )
-        return marker
@@ -3,70 +3,187 @@ Multi-Point FIB Marker Classes
 
 Extended marker classes that support multiple points for complex cutting and connection paths.
 Maintains backward compatibility with existing 2-point markers.
+
+Points are stored flat (x0, y0, x1, y1, ...) in an array('q') of
+CANONICAL_DBU integers. `ipoints` (integer tuples) and `points` (microns)
+are views built on every access - assign to change them. Like the two-point
+markers the classes use __slots__ (see markers.OPTIONAL_FIELDS).
 """
 
-from dataclasses import dataclass, field
-from typing import List, Tuple
+from array import array
+from typing import List, Optional, Tuple
 import pya
 from .config import LAYERS, SYMBOL_SIZES, DEFAULT_MARKER_NOTES
+from .core.geometry_utils import CANONICAL_SCALE, to_canonical, to_dbu, canonical_to_dbu
+from .core.perf_monitor import timed
+from .markers import OPTIONAL_FIELDS, init_optional_fields
 
 
-@dataclass
-class MultiPointCutMarker:
-    """Multi-point cut operation marker - Path connecting multiple points"""
-    id: str
-    points: List[Tuple[float, float]]  # List of (x, y) coordinates
-    layer: int
-    # Layer info for each point (list of layer names or "layer/datatype" format)
-    point_layers: List[str] = field(default_factory=list)  # Layer at each point
-    
-    def __post_init__(self):
-        """Validate that we have at least 2 points"""
-        if len(self.points) < 2:
-            raise ValueError("MultiPointCutMarker requires at least 2 points")
-    
+def _flat_coordinates(ipoints):
+    """array('q') of x0, y0, x1, y1, ... from integer (x, y) pairs"""
+    coordinates = array('q')
+    for x, y in ipoints:
+        coordinates.append(x)
+        coordinates.append(y)
+    return coordinates
+
+
+def _parse_xml_points(elem, dbu):
+    """Canonical points of an XML points="x,y;x,y" attribute
+
+    Reads the integer 'ipoints' attribute when present (version 1.2).
+
+    Args:
+        dbu (float): Unit of the file's integer coordinates (None = no
+            integers, 'points' holds microns as in version 1.0 files)
+    """
+    points = []
+    # Integers (version 1.2 'ipoints', version 1.1 'points') whenever the file has a dbu
+    points_str = elem.get('ipoints') if dbu is not None else None
+    if points_str is None:
+        points_str = elem.get('points', '')
+    if points_str:
+        for point_str in points_str.split(';'):
+            if ',' in point_str:
+                x, y = point_str.split(',')
+                if dbu is None:
+                    points.append((to_canonical(float(x)), to_canonical(float(y))))
+                else:
+                    points.append((to_canonical(int(x) * dbu), to_canonical(int(y) * dbu)))
+    return points
+
+
+class _MultiPointMarker:
+    """Shared storage of the multi-point markers (not a public base class)"""
+
+    __slots__ = ('id', '_coordinates', 'layer', 'point_layers') + OPTIONAL_FIELDS
+
+    def __init__(self, id: str, points: List[Tuple[float, float]], layer: int,
+                 point_layers: Optional[List[str]] = None):
+        self.id = id
+        self.points = points
+        self.layer = layer
+        # Layer info for each point (list of layer names or "layer/datatype" format)
+        self.point_layers = [] if point_layers is None else point_layers  # Layer at each point
+        init_optional_fields(self)
+
+    @classmethod
+    def from_canonical(cls, id, ipoints, layer, point_layers=None):
+        """Create from canonical integer points (no float round trip)"""
+        marker = cls(id, [(0, 0), (0, 0)], layer, point_layers)
+        marker.ipoints = ipoints
+        return marker
+
+    def _set_coordinates(self, coordinates):
+        """Store flat coordinates, validating that we have at least 2 points"""
+        if len(coordinates) < 4:
+            raise ValueError(f"{self.__class__.__name__} requires at least 2 points")
+        self._coordinates = coordinates
+
+    @property
+    def ipoints(self):
+        """Points as (x, y) tuples in canonical integer units"""
+        coordinates = self._coordinates
+        return list(zip(coordinates[0::2], coordinates[1::2]))
+
+    @ipoints.setter
+    def ipoints(self, ipoints):
+        self._set_coordinates(_flat_coordinates(ipoints))
+
+    @property
+    def points(self):
+        """Points as (x, y) tuples in microns"""
+        coordinates = self._coordinates
+        return [(x / CANONICAL_SCALE, y / CANONICAL_SCALE)
+                for x, y in zip(coordinates[0::2], coordinates[1::2])]
+
+    @points.setter
+    def points(self, points):
+        self._set_coordinates(_flat_coordinates((to_canonical(x), to_canonical(y)) for x, y in points))
+
     @property
     def x1(self):
         """First point x coordinate (for compatibility)"""
-        return self.points[0][0] if self.points else 0
-    
+        return self._coordinates[0] / CANONICAL_SCALE
+
     @property
     def y1(self):
         """First point y coordinate (for compatibility)"""
-        return self.points[0][1] if self.points else 0
-    
+        return self._coordinates[1] / CANONICAL_SCALE
+
     @property
     def x2(self):
         """Last point x coordinate (for compatibility)"""
-        return self.points[-1][0] if self.points else 0
-    
+        return self._coordinates[-2] / CANONICAL_SCALE
+
     @property
     def y2(self):
         """Last point y coordinate (for compatibility)"""
-        return self.points[-1][1] if self.points else 0
-    
+        return self._coordinates[-1] / CANONICAL_SCALE
+
+    def geometry_key(self):
+        """Exact, hashable geometry: (tag, ((ix, iy), ...))"""
+        return (self.TAG, tuple(self.ipoints))
+
+    def _db_points(self, dbu):
+        return [pya.Point(canonical_to_dbu(x, dbu), canonical_to_dbu(y, dbu)) for x, y in self.ipoints]
+
+    def _fields(self):
+        return (self.id, self._coordinates, self.layer, self.point_layers)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None  # Mutable, compared by value
+
+    def __repr__(self):
+        return (f"{self.__class__.__name__}(id={self.id!r}, points={self.points!r}, "
+                f"layer={self.layer!r}, point_layers={self.point_layers!r})")
+
+    def to_xml(self) -> str:
+        """Serialize to XML element (microns and canonical integers)"""
+        points_str = ";".join(f"{x!r},{y!r}" for x, y in self.points)
+        ipoints_str = ";".join(f"{x},{y}" for x, y in self.ipoints)
+        return (f'<{self.XML_TAG} id="{self.id}" points="{points_str}" ipoints="{ipoints_str}" '
+                f'layer="{self.layer}"/>')
+
+    @classmethod
+    def from_xml(cls, elem, dbu=None):
+        """Deserialize from XML element
+
+        Args:
+            dbu (float): Unit of the file's integer coordinates (None = microns, version 1.0)
+        """
+        return cls.from_canonical(elem.get('id'), _parse_xml_points(elem, dbu), int(elem.get('layer')))
+
+
+class MultiPointCutMarker(_MultiPointMarker):
+    """Multi-point cut operation marker - Path connecting multiple points"""
+    __slots__ = ()
+    TAG = 'cut'
+    XML_TAG = 'multipoint_cut'
+
+    @timed('marker.to_gds')
     def to_gds(self, cell, fib_layer):
         """Draw multi-point path with fixed width"""
-        if len(self.points) < 2:
+        if len(self._coordinates) < 4:
             return
 
         dbu = cell.layout().dbu
         fixed_width = SYMBOL_SIZES['multipoint']['line_width']
-        width = int(fixed_width / dbu)  # Convert to database units
+        width = to_dbu(fixed_width, dbu)  # Convert to database units
         
         # Convert all points to database units
-        db_points = []
-        for x, y in self.points:
-            db_x = int(x / dbu)
-            db_y = int(y / dbu)
-            db_points.append(pya.Point(db_x, db_y))
+        db_points = self._db_points(dbu)
         
         # Draw path connecting all points
         path = pya.Path(db_points, width)
         cell.shapes(fib_layer).insert(path)
 
         # Draw small circles at each point to show vertices
-        vertex_radius = int(SYMBOL_SIZES['multipoint']['vertex_radius'] / dbu)
+        vertex_radius = to_dbu(SYMBOL_SIZES['multipoint']['vertex_radius'], dbu)
         for point in db_points:
             vertex_circle = pya.Polygon.ellipse(
                 pya.Box(point.x - vertex_radius, point.y - vertex_radius,
@@ -81,88 +198,34 @@ class MultiPointCutMarker:
             text = pya.Text(self.id, pya.Trans(pya.Point(center_x, center_y)))
             cell.shapes(fib_layer).insert(text)
     
-    def to_xml(self) -> str:
-        """Serialize to XML element"""
-        points_str = ";".join(f"{x},{y}" for x, y in self.points)
-        return f'<multipoint_cut id="{self.id}" points="{points_str}" layer="{self.layer}"/>'
-    
-    @staticmethod
-    def from_xml(elem) -> 'MultiPointCutMarker':
-        """Deserialize from XML element"""
-        points_str = elem.get('points', '')
-        points = []
-        if points_str:
-            for point_str in points_str.split(';'):
-                if ',' in point_str:
-                    x, y = point_str.split(',')
-                    points.append((float(x), float(y)))
-        
-        return MultiPointCutMarker(
-            id=elem.get('id'),
-            points=points,
-            layer=int(elem.get('layer'))
-        )
-
-
-@dataclass
-class MultiPointConnectMarker:
+class MultiPointConnectMarker(_MultiPointMarker):
     """Multi-point connect operation marker - Path with endpoints and junctions"""
-    id: str
-    points: List[Tuple[float, float]]  # List of (x, y) coordinates
-    layer: int
-    # Layer info for each point (list of layer names or "layer/datatype" format)
-    point_layers: List[str] = field(default_factory=list)  # Layer at each point
-    
-    def __post_init__(self):
-        """Validate that we have at least 2 points"""
-        if len(self.points) < 2:
-            raise ValueError("MultiPointConnectMarker requires at least 2 points")
-    
-    @property
-    def x1(self):
-        """First point x coordinate (for compatibility)"""
-        return self.points[0][0] if self.points else 0
-    
-    @property
-    def y1(self):
-        """First point y coordinate (for compatibility)"""
-        return self.points[0][1] if self.points else 0
-    
-    @property
-    def x2(self):
-        """Last point x coordinate (for compatibility)"""
-        return self.points[-1][0] if self.points else 0
-    
-    @property
-    def y2(self):
-        """Last point y coordinate (for compatibility)"""
-        return self.points[-1][1] if self.points else 0
-    
+    __slots__ = ()
+    TAG = 'connect'
+    XML_TAG = 'multipoint_connect'
+
+    @timed('marker.to_gds')
     def to_gds(self, cell, fib_layer):
         """Draw multi-point connection path with endpoints and junctions"""
-        if len(self.points) < 2:
+        if len(self._coordinates) < 4:
             return
         
         dbu = cell.layout().dbu
         fixed_width = SYMBOL_SIZES['multipoint']['line_width']
-        width = int(fixed_width / dbu)  # Convert to database units
+        width = to_dbu(fixed_width, dbu)  # Convert to database units
         endpoint_radius = SYMBOL_SIZES['connect']['endpoint_radius']
         junction_radius = SYMBOL_SIZES['multipoint']['junction_radius']
         
         # Convert all points to database units
-        db_points = []
-        for x, y in self.points:
-            db_x = int(x / dbu)
-            db_y = int(y / dbu)
-            db_points.append(pya.Point(db_x, db_y))
+        db_points = self._db_points(dbu)
         
         # Draw path connecting all points
         path = pya.Path(db_points, width)
         cell.shapes(fib_layer).insert(path)
         
         # Draw endpoint circles (first and last points)
-        endpoint_r = int(endpoint_radius / dbu)
-        junction_r = int(junction_radius / dbu)
+        endpoint_r = to_dbu(endpoint_radius, dbu)
+        junction_r = to_dbu(junction_radius, dbu)
         
         for i, point in enumerate(db_points):
             if i == 0 or i == len(db_points) - 1:
@@ -186,29 +249,6 @@ class MultiPointConnectMarker:
             text = pya.Text(self.id, pya.Trans(pya.Point(center_x, center_y)))
             cell.shapes(fib_layer).insert(text)
     
-    def to_xml(self) -> str:
-        """Serialize to XML element"""
-        points_str = ";".join(f"{x},{y}" for x, y in self.points)
-        return f'<multipoint_connect id="{self.id}" points="{points_str}" layer="{self.layer}"/>'
-    
-    @staticmethod
-    def from_xml(elem) -> 'MultiPointConnectMarker':
-        """Deserialize from XML element"""
-        points_str = elem.get('points', '')
-        points = []
-        if points_str:
-            for point_str in points_str.split(';'):
-                if ',' in point_str:
-                    x, y = point_str.split(',')
-                    points.append((float(x), float(y)))
-        
-        return MultiPointConnectMarker(
-            id=elem.get('id'),
-            points=points,
-            layer=int(elem.get('layer'))
-        )
-
-
 # Utility functions for creating markers
 def create_multipoint_cut_marker(marker_id: str, points: List[Tuple[float, float]], 
                                 point_layers: List[str] = None) -> MultiPointCutMarker:
@@ -227,7 +267,6 @@ def create_multipoint_cut_marker(marker_id: str, points: List[Tuple[float, float
     
     marker = MultiPointCutMarker(marker_id, points, LAYERS['cut'], point_layers=point_layers)
     marker.notes = DEFAULT_MARKER_NOTES['cut']
-    marker.screenshots = []
     
     # Notify panel if available
     try:
@@ -259,7 +298,6 @@ def create_multipoint_connect_marker(marker_id: str, points: List[Tuple[float, f
     
     marker = MultiPointConnectMarker(marker_id, points, LAYERS['connect'], point_layers=point_layers)
     marker.notes = DEFAULT_MARKER_NOTES['connect']
-    marker.screenshots = []
     
     # Notify panel if available
     try:
@@ -13,7 +13,12 @@ Each screenshot includes a scale bar in micrometers.
 import os
 import pya
 from pathlib import Path
-from .config import SCREENSHOT_CONFIG
+from .config import SCREENSHOT_CONFIG, REPORT_CONFIG
+from .core.export_logger import FibExportLogger
+from .core.log_utils import get_logger
+from .business.image_processor import FibImageProcessor
+
+logger = get_logger('screenshot_export')
 
 
 # =============================================================================
@@ -44,7 +49,8 @@ EMBEDDED_MINIMAL_HTML = """<!DOCTYPE html>
         .screenshots {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 15px; }}
         .screenshot {{ text-align: center; }}
         .screenshot h4 {{ margin: 10px 0; color: #7f8c8d; }}
-        .screenshot img {{ max-width: 100%; border: 1px solid #ddd; border-radius: 5px; }}
+        .screenshot img {{ max-width: 100%; height: auto; border: 1px solid #ddd; border-radius: 5px; }}
+        .page-nav {{ background: white; padding: 10px; border-radius: 5px; margin-bottom: 20px; text-align: center; }}
         .fallback-notice {{ background: #fff3cd; border: 1px solid #ffc107; padding: 10px; border-radius: 5px; margin-bottom: 20px; color: #856404; }}
     </style>
 </head>
@@ -88,16 +94,18 @@ EMBEDDED_MINIMAL_HTML = """<!DOCTYPE html>
 """
 
 
-def get_marker_bbox(marker):
+def get_marker_bbox(marker, log=None):
     """
     Get bounding box for a marker
     
     Args:
         marker: Marker object (CutMarker, ConnectMarker, ProbeMarker, or MultiPoint)
+        log: FibExportLogger of the export (None = module logger)
     
     Returns:
         pya.DBox: Bounding box in microns
     """
+    log = log or logger
     try:
         # Multi-point markers
         if hasattr(marker, 'points') and marker.points:
@@ -121,17 +129,11 @@ def get_marker_bbox(marker):
             return pya.DBox(marker.x - r, marker.y - r, marker.x + r, marker.y + r)
         
         else:
-            try:
-                print(f"[Screenshot] Warning: Unknown marker type for {marker.id}")
-            except:
-                pass
+            log.warning(f"[Screenshot] Unknown marker type for {marker.id}")
             return pya.DBox(0, 0, 10, 10)
 
     except Exception as e:
-        try:
-            print(f"[Screenshot] Error getting bbox for {marker.id}: {e}")
-        except:
-            pass
+        log.error(f"[Screenshot] Error getting bbox for {marker.id}: {e}")
         return pya.DBox(0, 0, 10, 10)
 
 
@@ -159,14 +161,16 @@ def calculate_scale_bar_length(view_width):
     return nice_values[-1]
 
 
-def create_marker_dimension_rulers(view, marker):
+def create_marker_dimension_rulers(view, marker, log=None):
     """
     Create dimension rulers at marker coordinates showing X and Y lengths
     
     Args:
         view: LayoutView object
         marker: Marker object
+        log: FibExportLogger of the export (None = module logger)
     """
+    log = log or logger
     try:
         # Get marker coordinates
         if hasattr(marker, 'points') and len(marker.points) >= 2:
@@ -179,10 +183,7 @@ def create_marker_dimension_rulers(view, marker):
             x2, y2 = marker.x2, marker.y2
         else:
             # PROBE marker - no dimensions to show
-            try:
-                print(f"[Screenshot] PROBE marker has no dimensions to measure")
-            except:
-                pass
+            log.debug(f"[Screenshot] PROBE marker has no dimensions to measure")
             return
 
         # Calculate deltas
@@ -197,10 +198,7 @@ def create_marker_dimension_rulers(view, marker):
             x_ruler.style = pya.Annotation.StyleRuler  # Ruler with measurement
             # Remove custom format to avoid $ syntax errors
             view.insert_annotation(x_ruler)
-            try:
-                print(f"[Screenshot] Created X ruler: DX = {delta_x:.2f} um")
-            except:
-                pass
+            log.debug(f"[Screenshot] Created X ruler: DX = {delta_x:.2f} um")
 
         # Y direction ruler (vertical)
         if delta_y > 0.01:  # Only show if significant
@@ -210,24 +208,15 @@ def create_marker_dimension_rulers(view, marker):
             y_ruler.style = pya.Annotation.StyleRuler  # Ruler with measurement
             # Remove custom format to avoid $ syntax errors
             view.insert_annotation(y_ruler)
-            try:
-                print(f"[Screenshot] Created Y ruler: DY = {delta_y:.2f} um")
-            except:
-                pass
+            log.debug(f"[Screenshot] Created Y ruler: DY = {delta_y:.2f} um")
 
-        try:
-            print(f"[Screenshot] Marker dimensions: DX={delta_x:.2f} um, DY={delta_y:.2f} um")
-        except:
-            pass
+        log.debug(f"[Screenshot] Marker dimensions: DX={delta_x:.2f} um, DY={delta_y:.2f} um")
 
     except Exception as e:
-        try:
-            print(f"[Screenshot] Error creating dimension rulers: {e}")
-        except:
-            pass
+        log.error(f"[Screenshot] Error creating dimension rulers: {e}")
 
 
-def create_crosshair_annotation(view, marker_center, layout_bbox):
+def create_crosshair_annotation(view, marker_center, layout_bbox, log=None):
     """
     Create crosshair annotation pointing to marker center
     
@@ -239,7 +228,9 @@ def create_crosshair_annotation(view, marker_center, layout_bbox):
         view: LayoutView object
         marker_center: pya.DPoint - center of marker
         layout_bbox: pya.DBox - layout bounding box
+        log: FibExportLogger of the export (None = module logger)
     """
+    log = log or logger
     try:
         # Horizontal line
         h_ruler = pya.Annotation()
@@ -255,27 +246,23 @@ def create_crosshair_annotation(view, marker_center, layout_bbox):
         v_ruler.style = pya.Annotation.StyleLine
         view.insert_annotation(v_ruler)
 
-        try:
-            print(f"[Screenshot] Created crosshair at ({marker_center.x:.2f}, {marker_center.y:.2f})")
-            print(f"[Screenshot] Note: To change crosshair color to white, set ruler color in KLayout preferences")
-        except:
-            pass
+        log.debug(f"[Screenshot] Created crosshair at ({marker_center.x:.2f}, {marker_center.y:.2f})")
+        log.debug(f"[Screenshot] Note: To change crosshair color to white, set ruler color in KLayout preferences")
 
     except Exception as e:
-        try:
-            print(f"[Screenshot] Error creating crosshair: {e}")
-        except:
-            pass
+        log.error(f"[Screenshot] Error creating crosshair: {e}")
 
 
-def create_scale_bar(view, view_bbox):
+def create_scale_bar(view, view_bbox, log=None):
     """
     Create scale bar annotation in lower left corner
     
     Args:
         view: LayoutView object
         view_bbox: pya.DBox - current view bounding box
+        log: FibExportLogger of the export (None = module logger)
     """
+    log = log or logger
     try:
         # Calculate appropriate scale bar length
         scale_length = calculate_scale_bar_length(view_bbox.width())
@@ -294,16 +281,10 @@ def create_scale_bar(view, view_bbox):
         scale_bar.style = pya.Annotation.StyleRuler  # Ruler style with measurement
         view.insert_annotation(scale_bar)
 
-        try:
-            print(f"[Screenshot] Created scale bar: {scale_length} um")
-        except:
-            pass
+        log.debug(f"[Screenshot] Created scale bar: {scale_length} um")
 
     except Exception as e:
-        try:
-            print(f"[Screenshot] Error creating scale bar: {e}")
-        except:
-            pass
+        log.error(f"[Screenshot] Error creating scale bar: {e}")
 
 
 def select_marker_path(view, marker, log_func=None):
@@ -487,7 +468,18 @@ def select_marker_path(view, marker, log_func=None):
         return True
 
 
-def take_marker_screenshots(marker, view, output_dir):
+def _open_export_logger(logger, log_path, mode='a'):
+    """Reuse the caller's export logger, or open a private one for standalone calls
+
+    Returns:
+        tuple: (logger, owned) - owned loggers must be closed by the caller
+    """
+    if logger is not None:
+        return logger, False
+    return FibExportLogger(log_path, mode=mode), True
+
+
+def take_marker_screenshots(marker, view, output_dir, logger=None):
     """
     Generate 3 screenshots for a single marker
 
@@ -495,36 +487,13 @@ def take_marker_screenshots(marker, view, output_dir):
         marker: Marker object
         view: LayoutView object
         output_dir: Output directory path
+        logger: Optional FibExportLogger shared with the rest of the export
 
     Returns:
         list: List of tuples (description, filename, filepath)
     """
-    from pathlib import Path
-    import os
-
-    # Setup logging to file (works without Macro Development Console)
-    log_file = None
-    try:
-        # output_dir is images subdirectory, go up one level for log
-        base_dir = Path(output_dir).parent
-        log_file = base_dir / 'export_log.txt'
-    except:
-        pass
-
-    def log(message):
-        """Log to both console and file"""
-        # Replace Unicode symbols with ASCII equivalents for Windows GBK compatibility
-        ascii_message = message.replace('✓', '[OK]').replace('✗', '[X]').replace('ℹ', '[i]')
-        try:
-            print(ascii_message)
-        except:
-            pass
-        if log_file:
-            try:
-                with open(log_file, 'a', encoding='utf-8') as f:
-                    f.write(message + '\n')
-            except:
-                pass
+    # output_dir is images subdirectory, log file lives one level up
+    log, owns_logger = _open_export_logger(logger, Path(output_dir).parent / 'export_log.txt')
 
     screenshots = []
 
@@ -532,27 +501,27 @@ def take_marker_screenshots(marker, view, output_dir):
         # Get layout and marker info
         cellview = view.active_cellview()
         if not cellview.is_valid():
-            log(f"[Screenshot] Error: Invalid cellview")
+            log.error(f"[Screenshot] Error: Invalid cellview")
             return screenshots
 
         layout_bbox = cellview.cell.dbbox()
-        marker_bbox = get_marker_bbox(marker)
+        marker_bbox = get_marker_bbox(marker, log)
         marker_center = marker_bbox.center()
 
-        log(f"[Screenshot] Processing {marker.id}...")
-        log(f"[Screenshot]   Marker bbox: {marker_bbox}")
-        log(f"[Screenshot]   Marker center: ({marker_center.x:.2f}, {marker_center.y:.2f})")
+        log.debug(f"[Screenshot] Processing {marker.id}...")
+        log.debug(f"[Screenshot]   Marker bbox: {marker_bbox}")
+        log.debug(f"[Screenshot]   Marker center: ({marker_center.x:.2f}, {marker_center.y:.2f})")
 
         # Store original view state
         original_box = view.box()
 
         # Attempt to select marker path for highlighting in screenshots
         # Note: Path selection is currently disabled due to API compatibility issues
-        selection_success = select_marker_path(view, marker, log_func=log)
+        selection_success = select_marker_path(view, marker, log_func=log.debug)
         if selection_success:
-            log(f"[Screenshot] ✓ Marker path selected for highlighting in {marker.id}")
+            log.debug(f"[Screenshot] ✓ Marker path selected for highlighting in {marker.id}")
         else:
-            log(f"[Screenshot] ℹ Screenshots will be generated without path highlighting for {marker.id}")
+            log.debug(f"[Screenshot] ℹ Screenshots will be generated without path highlighting for {marker.id}")
 
         # === Screenshot 1: Overview (Fit All) with crosshair ===
         try:
@@ -560,18 +529,18 @@ def take_marker_screenshots(marker, view, output_dir):
             view.clear_annotations()
 
             # Create crosshair pointing to marker
-            create_crosshair_annotation(view, marker_center, layout_bbox)
+            create_crosshair_annotation(view, marker_center, layout_bbox, log)
 
             # Create scale bar
             current_box = view.box()
-            create_scale_bar(view, current_box)
+            create_scale_bar(view, current_box, log)
             
             # Save screenshot
             overview_filename = f"{marker.id}_overview.png"
             overview_path = os.path.join(output_dir, overview_filename)
-            log(f"[Screenshot] Attempting to save: {overview_path}")
-            log(f"[Screenshot]   View box: {view.box()}")
-            log(f"[Screenshot]   Cellview: valid={cellview.is_valid()}, cell={cellview.cell.name if cellview.cell else 'None'}")
+            log.debug(f"[Screenshot] Attempting to save: {overview_path}")
+            log.debug(f"[Screenshot]   View box: {view.box()}")
+            log.debug(f"[Screenshot]   Cellview: valid={cellview.is_valid()}, cell={cellview.cell.name if cellview.cell else 'None'}")
             view.save_image(overview_path, 800, 600)
 
             # Verify file was actually created
@@ -582,10 +551,10 @@ def take_marker_screenshots(marker, view, output_dir):
                 raise RuntimeError(f"Screenshot file is empty (0 bytes): {overview_path}")
 
             screenshots.append(('Overview', overview_filename, overview_path))
-            log(f"[Screenshot]   ✓ Overview saved: {overview_filename} ({file_size} bytes)")
+            log.debug(f"[Screenshot]   ✓ Overview saved: {overview_filename} ({file_size} bytes)")
             
         except Exception as e:
-            log(f"[Screenshot]   ✗ Overview failed: {e}")
+            log.error(f"[Screenshot]   ✗ Overview failed: {e}")
             raise
 
         # === Screenshot 2: Zoom 2x (medium zoom) ===
@@ -605,17 +574,17 @@ def take_marker_screenshots(marker, view, output_dir):
             view.zoom_box(zoom2_bbox)
             
             # Create dimension rulers showing marker X and Y lengths
-            create_marker_dimension_rulers(view, marker)
+            create_marker_dimension_rulers(view, marker, log)
             
             # Create scale bar
-            create_scale_bar(view, zoom2_bbox)
+            create_scale_bar(view, zoom2_bbox, log)
             
             # Save screenshot
             zoom2_filename = f"{marker.id}_zoom2x.png"
             zoom2_path = os.path.join(output_dir, zoom2_filename)
-            log(f"[Screenshot] Attempting to save: {zoom2_path}")
-            log(f"[Screenshot]   View box: {view.box()}")
-            log(f"[Screenshot]   Cellview: valid={cellview.is_valid()}, cell={cellview.cell.name if cellview.cell else 'None'}")
+            log.debug(f"[Screenshot] Attempting to save: {zoom2_path}")
+            log.debug(f"[Screenshot]   View box: {view.box()}")
+            log.debug(f"[Screenshot]   Cellview: valid={cellview.is_valid()}, cell={cellview.cell.name if cellview.cell else 'None'}")
             view.save_image(zoom2_path, 800, 600)
 
             # Verify file was actually created
@@ -626,10 +595,10 @@ def take_marker_screenshots(marker, view, output_dir):
                 raise RuntimeError(f"Screenshot file is empty (0 bytes): {zoom2_path}")
 
             screenshots.append(('Zoom 2x', zoom2_filename, zoom2_path))
-            log(f"[Screenshot]   ✓ Zoom 2x saved: {zoom2_filename} ({file_size} bytes)")
+            log.debug(f"[Screenshot]   ✓ Zoom 2x saved: {zoom2_filename} ({file_size} bytes)")
             
         except Exception as e:
-            log(f"[Screenshot]   ✗ Zoom 2x failed: {e}")
+            log.error(f"[Screenshot]   ✗ Zoom 2x failed: {e}")
             raise
 
         # === Screenshot 3: Detail (close-up) ===
@@ -649,17 +618,17 @@ def take_marker_screenshots(marker, view, output_dir):
             view.zoom_box(detail_bbox)
             
             # Create dimension rulers showing marker X and Y lengths
-            create_marker_dimension_rulers(view, marker)
+            create_marker_dimension_rulers(view, marker, log)
             
             # Create scale bar
-            create_scale_bar(view, detail_bbox)
+            create_scale_bar(view, detail_bbox, log)
             
             # Save screenshot
             detail_filename = f"{marker.id}_detail.png"
             detail_path = os.path.join(output_dir, detail_filename)
-            log(f"[Screenshot] Attempting to save: {detail_path}")
-            log(f"[Screenshot]   View box: {view.box()}")
-            log(f"[Screenshot]   Cellview: valid={cellview.is_valid()}, cell={cellview.cell.name if cellview.cell else 'None'}")
+            log.debug(f"[Screenshot] Attempting to save: {detail_path}")
+            log.debug(f"[Screenshot]   View box: {view.box()}")
+            log.debug(f"[Screenshot]   Cellview: valid={cellview.is_valid()}, cell={cellview.cell.name if cellview.cell else 'None'}")
             view.save_image(detail_path, 800, 600)
 
             # Verify file was actually created
@@ -670,10 +639,10 @@ def take_marker_screenshots(marker, view, output_dir):
                 raise RuntimeError(f"Screenshot file is empty (0 bytes): {detail_path}")
 
             screenshots.append(('Detail', detail_filename, detail_path))
-            log(f"[Screenshot]   ✓ Detail saved: {detail_filename} ({file_size} bytes)")
+            log.debug(f"[Screenshot]   ✓ Detail saved: {detail_filename} ({file_size} bytes)")
             
         except Exception as e:
-            log(f"[Screenshot]   ✗ Detail failed: {e}")
+            log.error(f"[Screenshot]   ✗ Detail failed: {e}")
             raise
 
         # Restore original view and clear selection
@@ -681,17 +650,19 @@ def take_marker_screenshots(marker, view, output_dir):
         view.clear_selection()  # Clear marker path selection
         view.zoom_box(original_box)
         
-        log(f"[Screenshot] Completed {marker.id}: {len(screenshots)} screenshots")
+        log.debug(f"[Screenshot] Completed {marker.id}: {len(screenshots)} screenshots")
         
     except Exception as e:
-        log(f"[Screenshot] Error processing {marker.id}: {e}")
-        import traceback
-        log(traceback.format_exc())
-    
+        log.exception(f"[Screenshot] Error processing {marker.id}: {e}")
+
+    finally:
+        if owns_logger:
+            log.close()
+
     return screenshots
 
 
-def export_markers_with_screenshots(markers, view, output_dir):
+def export_markers_with_screenshots(markers, view, output_dir, logger=None):
     """
     Export all markers with screenshots
 
@@ -699,47 +670,28 @@ def export_markers_with_screenshots(markers, view, output_dir):
         markers: List of marker objects
         view: LayoutView object
         output_dir: Output directory path
+        logger: Optional FibExportLogger shared with the rest of the export
 
     Returns:
-        dict: Dictionary mapping marker.id to list of screenshots
+        dict: Dictionary mapping marker.id to list of screenshots. After the
+              image post-processing stage each entry is
+              (description, filename, filepath, meta) with file sizes and
+              the thumbnail name in meta.
     """
-    from pathlib import Path
-    import os
-
-    # Setup logging to file (works without Macro Development Console)
-    log_file = None
-    try:
-        log_file = Path(output_dir) / 'export_log.txt'
-    except:
-        pass
-
-    def log(message):
-        """Log to both console and file"""
-        # Replace Unicode symbols with ASCII equivalents for Windows GBK compatibility
-        ascii_message = message.replace('✓', '[OK]').replace('✗', '[X]').replace('ℹ', '[i]')
-        try:
-            print(ascii_message)
-        except:
-            pass
-        if log_file:
-            try:
-                with open(log_file, 'a', encoding='utf-8') as f:
-                    f.write(message + '\n')
-            except:
-                pass
+    log, owns_logger = _open_export_logger(logger, Path(output_dir) / 'export_log.txt')
 
     all_screenshots = {}
 
     try:
         # ===== VIEW STATE VALIDATION =====
-        log("\n" + "=" * 70)
-        log("[Screenshot Export] View State Validation")
-        log("=" * 70)
+        log.debug("=" * 70)
+        log.debug("[Screenshot Export] View State Validation")
+        log.debug("=" * 70)
 
         # Validate view
         if view is None:
             raise ValueError("View is None - no active KLayout window")
-        log(f"[Screenshot] ✓ View object exists")
+        log.debug(f"[Screenshot] ✓ View object exists")
 
         # Get cellview and validate it
         try:
@@ -749,52 +701,56 @@ def export_markers_with_screenshots(markers, view, output_dir):
 
         if not cellview.is_valid():
             raise ValueError("No active cellview - open a GDS file first")
-        log(f"[Screenshot] ✓ Cellview is valid")
+        log.debug(f"[Screenshot] ✓ Cellview is valid")
 
         if cellview.cell is None:
             raise ValueError("Active cellview has no cell - layout not loaded")
-        log(f"[Screenshot] ✓ Cell is loaded: {cellview.cell.name}")
-
-        log("=" * 70 + "\n")
+        log.debug(f"[Screenshot] ✓ Cell is loaded: {cellview.cell.name}")
         # ===== END VALIDATION =====
 
         # Diagnostic output for debugging
-        log("[Screenshot] ========================================")
-        log(f"[Screenshot] Python module file: {__file__}")
-        log(f"[Screenshot] Module directory: {Path(__file__).parent}")
+        log.debug(f"[Screenshot] Python module file: {__file__}")
         templates_dir = Path(__file__).parent / 'templates'
-        log(f"[Screenshot] Templates directory: {templates_dir}")
-        log(f"[Screenshot] Templates exist: {templates_dir.exists()}")
+        log.debug(f"[Screenshot] Templates directory: {templates_dir} (exists: {templates_dir.exists()})")
         if templates_dir.exists():
             template_files = list(templates_dir.glob('*.html')) + list(templates_dir.glob('*.js'))
-            log(f"[Screenshot] Template files found: {[f.name for f in template_files]}")
-        log(f"[Screenshot] Output directory: {output_dir}")
-        log(f"[Screenshot] Output dir exists: {os.path.exists(output_dir)}")
-        log(f"[Screenshot] Output dir writable: {os.access(output_dir, os.W_OK)}")
-        log("[Screenshot] ========================================")
+            log.debug(f"[Screenshot] Template files found: {[f.name for f in template_files]}")
+        log.debug(f"[Screenshot] Output directory: {output_dir}")
+        log.debug(f"[Screenshot] Output dir exists: {os.path.exists(output_dir)}, "
+                  f"writable: {os.access(output_dir, os.W_OK)}")
 
         # Create images subdirectory
         images_dir = os.path.join(output_dir, 'images')
         os.makedirs(images_dir, exist_ok=True)
 
-        log(f"[Screenshot] Starting export for {len(markers)} markers")
-        log(f"[Screenshot] Images directory: {images_dir}")
+        log.info(f"[Screenshot] Starting export for {len(markers)} markers")
+        log.debug(f"[Screenshot] Images directory: {images_dir}")
+
+        # Thumbnails / re-encoding run in a thread pool while capturing continues
+        processor = FibImageProcessor(images_dir, logger=log)
 
         # Process each marker
-        for i, marker in enumerate(markers, 1):
-            log(f"[Screenshot] [{i}/{len(markers)}] Processing {marker.id}...")
+        with log.step('screenshots'):
+            for i, marker in enumerate(markers, 1):
+                log.info(f"[Screenshot] [{i}/{len(markers)}] Processing {marker.id}...")
 
-            screenshots = take_marker_screenshots(marker, view, images_dir)
-            all_screenshots[marker.id] = screenshots
+                screenshots = take_marker_screenshots(marker, view, images_dir, logger=log)
+                all_screenshots[marker.id] = screenshots
+                processor.submit(screenshots)
 
-        log(f"[Screenshot] Export complete: {len(all_screenshots)} markers processed")
+        with log.step('image_processing'):
+            processor.finish()
+
+        log.info(f"[Screenshot] Export complete: {len(all_screenshots)} markers processed")
 
     except Exception as e:
-        log(f"[Screenshot] Error in export: {e}")
-        import traceback
-        log(traceback.format_exc())
+        log.exception(f"[Screenshot] Error in export: {e}")
         raise  # Re-raise so caller knows export failed
 
+    finally:
+        if owns_logger:
+            log.close()
+
     return all_screenshots
 
 
@@ -898,6 +854,26 @@ def _get_marker_dimensions(marker):
         return "Single point marker", "-"
 
 
+def _screenshot_meta(shot):
+    """Post-processing info of a screenshot tuple (empty dict if not processed)"""
+    return shot[3] if len(shot) > 3 else {}
+
+
+def _screenshot_sources(shot):
+    """Return (thumbnail src, full image src) for a screenshot tuple"""
+    filename = shot[1]
+    thumbnail = _screenshot_meta(shot).get('thumbnail', filename)
+    return f"images/{thumbnail}", f"images/{filename}"
+
+
+def _image_attrs(shot):
+    """Extra <img> attributes: lazy loading plus intrinsic size to reserve layout space"""
+    if not REPORT_CONFIG.get('lazy_images', True):
+        return ""
+    width, height = _screenshot_meta(shot).get('thumb_size', SCREENSHOT_CONFIG['image_size'])
+    return f' width="{width}" height="{height}" loading="lazy" decoding="async"'
+
+
 def _generate_marker_section_html(marker, screenshots_dict):
     """Generate HTML for a single marker section (helper function)"""
     marker_class = marker.__class__.__name__
@@ -927,6 +903,27 @@ def _generate_marker_section_html(marker, screenshots_dict):
         elif 'Probe' in marker_class:
             notes = "点测"
 
+    # Rule check result (only after the checker ran; None = not checked)
+    violations = getattr(marker, 'violations', None)
+    if violations is None:
+        rule_check_html = ""
+    elif not violations:
+        rule_check_html = "\n            <p><strong>Rule Check:</strong> OK</p>"
+    else:
+        problems = "; ".join(f"{v.message} ({v.layer})" for v in violations)
+        rule_check_html = f'\n            <p><strong>Rule Check:</strong> <span style="color: #e74c3c;">{problems}</span></p>'
+
+    # Endpoint nets (only after a net trace; CONNECT markers)
+    nets = getattr(marker, 'nets', None)
+    if nets is None:
+        nets_html = ""
+    else:
+        start, end = (net or '?' for net in nets)
+        if getattr(marker, 'connected', None):
+            nets_html = f'\n            <p><strong>Nets:</strong> <span style="color: #e74c3c;">{start} (already connected)</span></p>'
+        else:
+            nets_html = f"\n            <p><strong>Nets:</strong> {start} -> {end}</p>"
+
     # Build marker section HTML
     html = f"""
     <div class="marker-section">
@@ -937,7 +934,7 @@ def _generate_marker_section_html(marker, screenshots_dict):
             <p><strong>Coordinates:</strong> {coords} um</p>
             <p><strong>Dimensions:</strong> {dimensions_str}</p>
             <p><strong>Length:</strong> {length_str}</p>
-            <p><strong>Notes:</strong> {notes if notes else '-'}</p>
+            <p><strong>Notes:</strong> {notes if notes else '-'}</p>{rule_check_html}{nets_html}
         </div>
 """
 
@@ -947,11 +944,14 @@ def _generate_marker_section_html(marker, screenshots_dict):
         html += f"""
         <div class="screenshots" data-marker-id="{marker.id}">
 """
-        for desc, filename, filepath in screenshots:
+        for shot in screenshots:
+            desc = shot[0]
+            thumb_src, full_src = _screenshot_sources(shot)
+            img_attrs = _image_attrs(shot)
             html += f"""
             <div class="screenshot">
                 <h4>{desc}</h4>
-                <img src="images/{filename}" alt="{desc}">
+                <a href="{full_src}" target="_blank"><img src="{thumb_src}" data-full="{full_src}" alt="{desc}"{img_attrs}></a>
                 <p>{desc} view of {marker.id}</p>
             </div>
 """
@@ -981,7 +981,86 @@ def _generate_marker_section_html(marker, screenshots_dict):
     return html
 
 
-def generate_html_report_with_screenshots(markers, screenshots_dict, output_path):
+def _write_html_report(markers, screenshots_dict, output_path, log, timestamp=None, sections=None):
+    """Render and write the report pages (helper for the public report functions)
+
+    Args:
+        timestamp: Report timestamp (localStorage key prefix); new one if None
+        sections: Optional dict marker.id -> cached section HTML. Cached
+                  sections are reused; missing ones are rendered and added.
+
+    Returns:
+        list: Paths of the written pages
+    """
+    from datetime import datetime
+    from .business.report_writer import FibReportWriter, marker_report_type
+
+    # Generate unique timestamp for this HTML report
+    if timestamp is None:
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
+    log.debug(f"[Screenshot Export] Report timestamp: {timestamp}")
+
+    # Count markers by type
+    type_counts = {'CUT': 0, 'CONNECT': 0, 'PROBE': 0}
+    for marker in markers:
+        marker_type = marker_report_type(marker)
+        if marker_type in type_counts:
+            type_counts[marker_type] += 1
+
+    # Load templates from files (cleaner, more maintainable)
+    html_template = _load_template_file('report_template.html')
+    js_content = _load_template_file('report_script.js')
+
+    if html_template and js_content:
+        # Use external templates (preferred method)
+        #
+        # NOTE:
+        # The HTML template contains many single braces `{` `}` in CSS
+        # blocks. Using `str.format()` on such a template causes Python to
+        # interpret those as format fields, which leads to KeyError like:
+        #   KeyError: '\\n            font-family'
+        #
+        # To avoid having to escape every CSS brace in the template, the
+        # report writer performs a very small custom placeholder
+        # replacement just for the known fields we actually need.
+        log.debug("[Screenshot] Using external template files")
+    else:
+        # Fallback: Use embedded minimal HTML when external templates not found
+        log.warning("[Screenshot] ⚠️  WARNING: External template files not found")
+        log.warning("[Screenshot] Using embedded fallback template (basic functionality)")
+        log.warning("[Screenshot] For enhanced features, ensure templates/ directory exists")
+        log.warning(f"[Screenshot] Expected location: {Path(__file__).parent / 'templates'}")
+
+        # Embedded template still uses str.format() style {{ }} escapes for CSS
+        html_template = EMBEDDED_MINIMAL_HTML.replace('{{', '{').replace('}}', '}')
+        js_content = ""  # No JavaScript in minimal template
+
+    context = {
+        "timestamp": timestamp,
+        "generation_datetime": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "total_markers": len(markers),
+        "cut_count": type_counts['CUT'],
+        "connect_count": type_counts['CONNECT'],
+        "probe_count": type_counts['PROBE'],
+    }
+
+    if sections is None:
+        sections = {}
+
+    def render_section(marker):
+        html = sections.get(marker.id)
+        if html is None:
+            html = _generate_marker_section_html(marker, screenshots_dict)
+            sections[marker.id] = html
+        return html
+
+    # Stream marker sections to disk page by page (no giant string)
+    with log.step('write_html'):
+        writer = FibReportWriter(output_path, html_template, js_content, context, logger=log)
+        return writer.write(markers, render_section)
+
+
+def generate_html_report_with_screenshots(markers, screenshots_dict, output_path, logger=None):
     """
     Generate HTML report with screenshots using external template files.
 
@@ -994,134 +1073,117 @@ def generate_html_report_with_screenshots(markers, screenshots_dict, output_path
         markers: List of marker objects
         screenshots_dict: Dictionary mapping marker.id to screenshots
         output_path: Output HTML file path
+        logger: Optional FibExportLogger shared with the rest of the export
 
     Returns:
         bool: True if successful, False otherwise
     """
-    from datetime import datetime
-    from pathlib import Path
-    import os
+    # Standalone calls start a fresh log; a shared export logger keeps appending
+    log, owns_logger = _open_export_logger(logger, Path(output_path).parent / 'export_log.txt', mode='w')
 
-    # Setup logging to file (works without Macro Development Console)
-    log_file = None
     try:
-        log_dir = Path(output_path).parent
-        log_file = log_dir / 'export_log.txt'
-        # Clear old log
-        if log_file.exists():
-            log_file.unlink()
-    except:
-        pass
-
-    def log(message):
-        """Log to both console and file"""
-        # Replace Unicode symbols with ASCII equivalents for Windows GBK compatibility
-        ascii_message = message.replace('✓', '[OK]').replace('✗', '[X]').replace('ℹ', '[i]')
-        try:
-            print(ascii_message)
-        except:
-            pass
-        if log_file:
-            try:
-                with open(log_file, 'a', encoding='utf-8') as f:
-                    f.write(message + '\n')
-            except:
-                pass
+        _write_html_report(markers, screenshots_dict, output_path, log)
+        log.info(f"[Screenshot] HTML report saved: {output_path}")
+        return True
 
-    try:
-        # Generate unique timestamp for this HTML report
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
-        log(f"[Screenshot Export] Generated report timestamp: {timestamp}")
+    except Exception as e:
+        log.exception(f"[Screenshot] Error generating HTML: {e}")
+        return False
 
-        # Group markers by type
-        markers_by_type = {'CUT': [], 'CONNECT': [], 'PROBE': []}
+    finally:
+        if owns_logger:
+            log.close()
+
+
+def export_report(markers, view, output_dir, logger=None, update=False,
+                  report_filename="fib_markers_report.html"):
+    """
+    Export screenshots, HTML report and manifest into output_dir
+
+    With update=True an existing export directory is updated in place using
+    its manifest (fib_report_manifest.json): only new/moved markers get new
+    screenshots, only changed sections are re-rendered, files of removed
+    markers are deleted and the report timestamp is kept so custom images
+    and notes saved in the browser stay attached. Without a manifest a full
+    export is done. The layout is assumed unchanged between updates.
+
+    Args:
+        markers: List of marker objects
+        view: LayoutView object
+        output_dir: Export directory
+        logger: Optional FibExportLogger shared with the rest of the export
+        update (bool): Update an existing export instead of a fresh one
+        report_filename (str): Main report file name
+
+    Returns:
+        str: Main report path, or None if failed
+    """
+    from .business.report_manifest import FibReportManifest
+
+    log, owns_logger = _open_export_logger(logger, Path(output_dir) / 'export_log.txt', mode='w')
+
+    try:
+        images_dir = os.path.join(output_dir, 'images')
+        report_path = os.path.join(output_dir, report_filename)
+
+        manifest = FibReportManifest.load(output_dir) if update else None
+        if manifest is None:
+            if update:
+                log.warning(f"[Screenshot] No report manifest in {output_dir} - doing a full export")
+            manifest = FibReportManifest()
+        old_pages = set(manifest.pages)
+
+        diff = manifest.diff(markers)
+        log.info(f"[Screenshot] Report diff: {len(diff['new_screenshots'])} new/moved, "
+                 f"{len(diff['rerender'])} changed, {len(diff['unchanged'])} unchanged, "
+                 f"{len(diff['removed'])} removed")
+
+        # Delete files of removed markers and outdated screenshots of moved ones
+        moved = [marker_id for marker_id in diff['new_screenshots'] if marker_id in manifest.markers]
+        for marker_id in diff['removed'] + moved:
+            for path in manifest.files_for(marker_id, images_dir):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            manifest.remove(marker_id)
+
+        # Screenshots only for new/moved markers
+        shoot_ids = set(diff['new_screenshots'])
+        to_shoot = [marker for marker in markers if marker.id in shoot_ids]
+        screenshots_dict = {}
+        if to_shoot:
+            screenshots_dict = export_markers_with_screenshots(to_shoot, view, output_dir, logger=log)
+
+        for marker_id in diff['rerender'] + diff['unchanged']:
+            screenshots_dict[marker_id] = manifest.screenshots_for(marker_id, images_dir)
+
+        # Reuse cached sections of unchanged markers
+        sections = {marker_id: manifest.section_for(marker_id) for marker_id in diff['unchanged']}
+
+        with log.step('html_report'):
+            pages = _write_html_report(markers, screenshots_dict, report_path, log,
+                                       timestamp=manifest.timestamp, sections=sections)
+
+        # Pages from a previous (longer) report that were not rewritten
+        for stale in old_pages - set(os.path.basename(p) for p in pages):
+            try:
+                os.remove(os.path.join(output_dir, stale))
+            except OSError:
+                pass
 
         for marker in markers:
-            marker_class = marker.__class__.__name__
-            if 'Cut' in marker_class:
-                markers_by_type['CUT'].append(marker)
-            elif 'Connect' in marker_class:
-                markers_by_type['CONNECT'].append(marker)
-            elif 'Probe' in marker_class:
-                markers_by_type['PROBE'].append(marker)
-        
-        # Generate marker sections HTML
-        marker_sections_html = ""
-        for marker in markers:
-            marker_sections_html += _generate_marker_section_html(marker, screenshots_dict)
+            manifest.update_marker(marker, screenshots_dict.get(marker.id, []), sections.get(marker.id))
+        manifest.pages = [os.path.basename(p) for p in pages]
+        manifest.save(output_dir)
 
-        # Load templates from files (cleaner, more maintainable)
-        html_template = _load_template_file('report_template.html')
-        js_content = _load_template_file('report_script.js')
-        
-        if html_template and js_content:
-            # Use external templates (preferred method)
-            #
-            # NOTE:
-            # The HTML template contains many single braces `{` `}` in CSS
-            # blocks. Using `str.format()` on such a template causes Python to
-            # interpret those as format fields, which leads to KeyError like:
-            #   KeyError: '\\n            font-family'
-            #
-            # To avoid having to escape every CSS brace in the template, we
-            # perform a very small custom placeholder replacement just for the
-            # known fields we actually need to substitute.
-            context = {
-                "timestamp": timestamp,
-                "generation_datetime": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                "total_markers": len(markers),
-                "cut_count": len(markers_by_type['CUT']),
-                "connect_count": len(markers_by_type['CONNECT']),
-                "probe_count": len(markers_by_type['PROBE']),
-                "marker_sections": marker_sections_html,
-            }
-
-            html = html_template
-            for key, value in context.items():
-                placeholder = "{" + key + "}"
-                html = html.replace(placeholder, str(value))
-            
-            # Embed JavaScript inline for single-file export
-            html = html.replace('<script src="report_script.js"></script>', 
-                               f'<script>\n{js_content}\n</script>')
-            
-            log("[Screenshot] Using external template files")
-        else:
-            # Fallback: Use embedded minimal HTML when external templates not found
-            log("[Screenshot] ⚠️  WARNING: External template files not found")
-            log("[Screenshot] Using embedded fallback template (basic functionality)")
-            log("[Screenshot] For enhanced features, ensure templates/ directory exists")
-            log(f"[Screenshot] Expected location: {Path(__file__).parent / 'templates'}")
-
-            html_template = EMBEDDED_MINIMAL_HTML
-            js_content = ""  # No JavaScript in minimal template
-
-            context = {
-                "timestamp": timestamp,
-                "generation_datetime": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                "total_markers": len(markers),
-                "cut_count": len(markers_by_type['CUT']),
-                "connect_count": len(markers_by_type['CONNECT']),
-                "probe_count": len(markers_by_type['PROBE']),
-                "marker_sections": marker_sections_html,
-            }
-
-            html = html_template
-            for key, value in context.items():
-                placeholder = "{" + key + "}"
-                html = html.replace(placeholder, str(value))
-
-            log("[Screenshot] Using embedded fallback template")
-
-        # Write HTML file (works for both external and embedded templates)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html)
-
-        log(f"[Screenshot] HTML report saved: {output_path}")
-        return True
+        log.info(f"[Screenshot] HTML report saved: {report_path}")
+        return report_path
 
     except Exception as e:
-        log(f"[Screenshot] Error generating HTML: {e}")
-        import traceback
-        log(traceback.format_exc())
-        return False
+        log.exception(f"[Screenshot] Error exporting report: {e}")
+        return None
+
+    finally:
+        if owns_logger:
+            log.close()
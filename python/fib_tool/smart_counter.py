@@ -2,59 +2,84 @@
 """
 Smart Counter - Intelligent marker numbering system
 Automatically finds the next available number for each marker type
+
+Numbers come from the marker list model's FibMarkerNumberIndex, which is
+updated on add/delete/rename, so finding the next number does not scan the
+marker ids. Panels without a model fall back to scanning markers_list.
 """
 
+import logging
 import re
 
+from .core.log_utils import get_logger
+
+logger = get_logger('smart_counter')
+
 class SmartCounter:
     """Smart counter that finds the next available number for each marker type"""
     
     def __init__(self, panel):
         self.panel = panel
     
+    def _number_index(self):
+        """The model's incremental number index, or None"""
+        model = getattr(self.panel, 'marker_model', None)
+        return getattr(model, 'number_index', None)
+    
     def get_next_number(self, marker_type):
         """Get the next available number for the given marker type"""
         try:
-            # Get all existing markers of this type
-            existing_numbers = self.get_existing_numbers(marker_type)
-            
-            # Find the smallest available number starting from 0
-            next_number = 0
-            while next_number in existing_numbers:
-                next_number += 1
+            index = self._number_index()
+            if index is not None:
+                next_number = index.next_number(marker_type)
+            else:
+                # Find the smallest available number starting from 0
+                existing_numbers = self.get_existing_numbers(marker_type)
+                next_number = 0
+                while next_number in existing_numbers:
+                    next_number += 1
             
-            print(f"[Smart Counter] Next {marker_type.upper()} number: {next_number} (existing: {sorted(existing_numbers)})")
+            logger.debug("[Smart Counter] Next %s number: %s", marker_type.upper(), next_number)
             return next_number
             
         except Exception as e:
-            print(f"[Smart Counter] Error getting next number: {e}")
+            logger.error("[Smart Counter] Error getting next number: %s", e)
             # Fallback to simple counter
             return self.get_fallback_counter(marker_type)
     
     def get_existing_numbers(self, marker_type):
         """Get all existing numbers for the given marker type"""
+        index = self._number_index()
+        if index is not None:
+            return index.used_numbers(marker_type)
+        
         existing_numbers = set()
         
         try:
-            # Check all markers in the panel
+            # Extract number from marker ID using regex
+            # Pattern: TYPE_NUMBER or TYPE_NUMBER_LAYER_INFO
+            pattern = re.compile(f"^{re.escape(marker_type.upper())}_(\\d+)")
             for marker in self.panel.markers_list:
-                marker_id = marker.id
-                
-                # Extract number from marker ID using regex
-                # Pattern: TYPE_NUMBER or TYPE_NUMBER_LAYER_INFO
-                pattern = f"^{marker_type.upper()}_(\d+)"
-                match = re.match(pattern, marker_id)
-                
+                match = pattern.match(marker.id)
                 if match:
-                    number = int(match.group(1))
-                    existing_numbers.add(number)
-                    print(f"[Smart Counter] Found existing {marker_type} number: {number} (ID: {marker_id})")
+                    existing_numbers.add(int(match.group(1)))
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[Smart Counter] Existing %s numbers: %s", marker_type, sorted(existing_numbers))
             
         except Exception as e:
-            print(f"[Smart Counter] Error parsing existing numbers: {e}")
+            logger.error("[Smart Counter] Error parsing existing numbers: %s", e)
         
         return existing_numbers
     
+    def get_max_number(self, marker_type):
+        """Largest existing number for the given marker type, or -1"""
+        index = self._number_index()
+        if index is not None:
+            return index.max_number(marker_type)
+        existing_numbers = self.get_existing_numbers(marker_type)
+        return max(existing_numbers) if existing_numbers else -1
+    
     def get_fallback_counter(self, marker_type):
         """Fallback counter using global marker_counter"""
         try:
@@ -65,7 +90,7 @@ class SmartCounter:
             else:
                 return 0
         except (KeyError, AttributeError) as e:
-            print(f"[Smart Counter] Fallback counter error: {e}")
+            logger.error("[Smart Counter] Fallback counter error: %s", e)
             return 0
     
     def update_global_counter(self, marker_type, number):
@@ -76,25 +101,21 @@ class SmartCounter:
                 global_counter = sys.modules['__main__'].__dict__['marker_counter']
                 # Set counter to be at least number + 1
                 global_counter[marker_type] = max(global_counter.get(marker_type, 0), number + 1)
-                print(f"[Smart Counter] Updated global {marker_type} counter to: {global_counter[marker_type]}")
+                logger.debug("[Smart Counter] Updated global %s counter to: %s", marker_type, global_counter[marker_type])
         except Exception as e:
-            print(f"[Smart Counter] Error updating global counter: {e}")
+            logger.error("[Smart Counter] Error updating global counter: %s", e)
     
     def reset_counters(self):
         """Reset all counters to start from existing markers"""
         try:
             for marker_type in ['cut', 'connect', 'probe']:
-                existing_numbers = self.get_existing_numbers(marker_type)
-                if existing_numbers:
-                    max_number = max(existing_numbers)
-                    self.update_global_counter(marker_type, max_number)
-                else:
-                    self.update_global_counter(marker_type, -1)  # Will become 0
+                # -1 (no markers) will become 0
+                self.update_global_counter(marker_type, self.get_max_number(marker_type))
             
-            print("[Smart Counter] All counters reset based on existing markers")
+            logger.debug("[Smart Counter] All counters reset based on existing markers")
             
         except Exception as e:
-            print(f"[Smart Counter] Error resetting counters: {e}")
+            logger.error("[Smart Counter] Error resetting counters: %s", e)
     
     def get_marker_info(self):
         """Get information about all existing markers"""
@@ -136,6 +157,6 @@ class SmartCounter:
                 info[marker_type].sort(key=lambda x: x['number'])
             
         except Exception as e:
-            print(f"[Smart Counter] Error getting marker info: {e}")
+            logger.error("[Smart Counter] Error getting marker info: %s", e)
         
-        return info
\ No newline at end of file
+        return info
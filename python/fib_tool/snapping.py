@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Snapping - Snap FIB marker points to layout geometry
+
+When snap mode is on, a click is moved to the nearest vertex, polygon edge
+or path centerline of the target layer (the layer found by layer_tap)
+within SNAP_CONFIG['radius'].
+
+Strategy:
+- Shapes are read hierarchically (begin_shapes_rec_touching) for a window
+  of SNAP_CONFIG['window'] around the click, merged into a Region and
+  reduced to edges, vertices and path spines
+- The features go into grid indices (core.spatial_index) that are kept
+  and reused while the following clicks stay inside the window on the
+  same layout, cell and layer - only the first click in an area pays for
+  the shape query, later ones are grid lookups
+- Vertices within the radius win over edges and path spines
+
+The cache is dropped when a FIB mode is activated, so edits made between
+marker sessions are picked up.
+"""
+
+import time
+
+import pya
+from .config import SNAP_CONFIG, LAYERS
+from .core.geometry_utils import closest_point_on_segment, point_segment_distance
+from .core.log_utils import get_logger
+from .core.perf_monitor import get_perf_monitor, timed
+from .core.spatial_index import UniformGridIndex
+
+logger = get_logger('snapping')
+
+# FIB layers are never snap targets
+FIB_LAYERS = [LAYERS['cut'], LAYERS['connect'], LAYERS['probe']]
+
+_snap_enabled = SNAP_CONFIG['enabled']
+
+
+def is_snap_enabled():
+    return _snap_enabled
+
+
+def set_snap_enabled(enabled):
+    """Turn snap mode on or off (panel checkbox)"""
+    global _snap_enabled
+    _snap_enabled = bool(enabled)
+    logger.info("[Snap] Snap to geometry %s", "enabled" if _snap_enabled else "disabled")
+
+
+class SnapResult:
+    """Snapped position"""
+
+    __slots__ = ('x', 'y', 'kind', 'distance')
+
+    def __init__(self, x, y, kind, distance):
+        self.x = x
+        self.y = y
+        self.kind = kind          # 'vertex', 'edge' or 'path'
+        self.distance = distance  # From the click, in microns
+
+    def __repr__(self):
+        return f"SnapResult({self.x:.3f}, {self.y:.3f}, {self.kind}, d={self.distance:.3f})"
+
+
+class FibSnapCache:
+    """Edges, vertices and path spines of one layer around the last clicks
+
+    Example:
+        >>> cache = FibSnapCache()
+        >>> result = cache.snap(cell, layer_index, 12.3, 45.6, radius=0.5)
+        >>> if result:
+        ...     x, y = result.x, result.y
+    """
+
+    def __init__(self, window=None, cell_size=None):
+        self.window = window or SNAP_CONFIG['window']
+        self.cell_size = cell_size or SNAP_CONFIG['cell_size']
+        self.builds = 0
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop the cached features (layout may have changed)"""
+        self._key = None
+        self._box = None        # (x1, y1, x2, y2) in microns covered by the features
+        self._segments = []     # (x1, y1, x2, y2, kind)
+        self._vertices = []     # (x, y)
+        self._segment_grid = None
+        self._vertex_grid = None
+
+    def covers(self, key, x, y, radius):
+        """True if the cached features answer a query at (x, y)"""
+        if key != self._key or self._box is None:
+            return False
+        x1, y1, x2, y2 = self._box
+        return x1 + radius <= x <= x2 - radius and y1 + radius <= y <= y2 - radius
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    @timed('snap.build')
+    def build(self, cell, layer, x, y, radius):
+        """Collect the features of a window centered on (x, y)"""
+        layout = cell.layout()
+        dbu = layout.dbu
+        half = max(self.window, 4.0 * radius) / 2.0
+        box = (x - half, y - half, x + half, y + half)
+        db_box = pya.Box(int(round(box[0] / dbu)), int(round(box[1] / dbu)),
+                         int(round(box[2] / dbu)), int(round(box[3] / dbu)))
+
+        self.invalidate()
+        segments = self._segments
+        vertices = set()
+        max_features = SNAP_CONFIG['max_features']
+
+        # Polygon outlines (merged, so abutting shapes do not add inner edges)
+        region = pya.Region(cell.begin_shapes_rec_touching(layer, db_box))
+        edges = region.edges().interacting(pya.Region(db_box))
+        for edge in edges.each():
+            p1, p2 = edge.p1, edge.p2
+            segments.append((p1.x * dbu, p1.y * dbu, p2.x * dbu, p2.y * dbu, 'edge'))
+            for p in (p1, p2):
+                if db_box.contains(p):
+                    vertices.add((p.x * dbu, p.y * dbu))
+            if len(segments) >= max_features:
+                logger.warning("[Snap] More than %s edges near (%.3f, %.3f), snapping to a subset", max_features, x, y)
+                break
+
+        # Path centerlines
+        iterator = cell.begin_shapes_rec_touching(layer, db_box)
+        iterator.shape_flags = pya.Shapes.SPaths
+        while not iterator.at_end() and len(segments) < max_features:
+            path = iterator.shape().path.transformed(iterator.trans())
+            points = [(p.x * dbu, p.y * dbu) for p in path.each_point()]
+            for (ax, ay), (bx, by) in zip(points, points[1:]):
+                segments.append((ax, ay, bx, by, 'path'))
+            iterator.next()
+
+        segment_grid = UniformGridIndex(self.cell_size)
+        for key, (ax, ay, bx, by, _) in enumerate(segments):
+            segment_grid.insert(key, (min(ax, bx), min(ay, by), max(ax, bx), max(ay, by)))
+        self._vertices = list(vertices)
+        vertex_grid = UniformGridIndex(self.cell_size)
+        for key, (vx, vy) in enumerate(self._vertices):
+            vertex_grid.insert(key, (vx, vy, vx, vy))
+
+        self._segment_grid = segment_grid
+        self._vertex_grid = vertex_grid
+        self._box = box
+        self._key = self.cache_key(cell, layer)
+        self.builds += 1
+        logger.debug("[Snap] Cached %s segments, %s vertices around (%.3f, %.3f)",
+                     len(segments), len(self._vertices), x, y)
+
+    @staticmethod
+    def cache_key(cell, layer):
+        layout = cell.layout()
+        return (id(layout), cell.cell_index(), layer, layout.dbu)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def snap(self, cell, layer, x, y, radius=None):
+        """Nearest vertex (preferred), edge or path centerline within radius
+
+        Returns:
+            SnapResult or None if nothing is within the radius
+        """
+        t0 = time.perf_counter()
+        radius = SNAP_CONFIG['radius'] if radius is None else radius
+        if not self.covers(self.cache_key(cell, layer), x, y, radius):
+            self.build(cell, layer, x, y, radius)
+
+        result = None
+        vertices = self._vertices
+        key, distance = self._vertex_grid.nearest(x, y, radius)
+        if key is not None:
+            result = SnapResult(vertices[key][0], vertices[key][1], 'vertex', distance)
+        else:
+            segments = self._segments
+            key, distance = self._segment_grid.nearest(
+                x, y, radius, lambda k, px, py: point_segment_distance(px, py, *segments[k][:4]))
+            if key is not None:
+                sx, sy = closest_point_on_segment(x, y, *segments[key][:4])
+                result = SnapResult(sx, sy, segments[key][4], distance)
+
+        get_perf_monitor().record('snap.query', time.perf_counter() - t0)
+        return result
+
+
+_cache = FibSnapCache()
+
+
+def get_snap_cache():
+    """The session-wide snap cache"""
+    return _cache
+
+
+def snap_point(x, y, layer_info, radius=None):
+    """Snap a click position to the geometry of a layer in the current view
+
+    Args:
+        x, y: Click position in microns
+        layer_info: layer_tap.LayerInfo (or anything with layer/datatype)
+        radius: Snap radius in microns (default SNAP_CONFIG['radius'])
+
+    Returns:
+        SnapResult or None (no layer, FIB layer, or nothing within radius)
+    """
+    if layer_info is None or layer_info.layer in FIB_LAYERS:
+        return None
+    try:
+        view = pya.Application.instance().main_window().current_view()
+        if not view or not view.active_cellview().is_valid():
+            return None
+        cellview = view.active_cellview()
+        layer = cellview.layout().find_layer(layer_info.layer, layer_info.datatype)
+        if layer is None:
+            return None
+        return _cache.snap(cellview.cell, layer, x, y, radius)
+    except Exception as e:
+        logger.error("[Snap] Error snapping (%.3f, %.3f): %s", x, y, e)
+        return None
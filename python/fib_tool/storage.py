@@ -3,6 +3,13 @@ FIB Data Storage
 
 Simple XML serialization. No fancy ORM, no schema validation.
 Just read and write XML files.
+
+Version 1.2 files store each coordinate twice: in microns under the names
+older releases read (x1, points, ...) and as integers in the unit given by
+the root 'dbu' attribute (CANONICAL_DBU) under ix1, ipoints, ... The root
+'layout_dbu' records the database unit of the layout the markers were drawn
+on. Version 1.1 files hold the integers under the plain names; version 1.0
+files hold float microns only and are rounded to canonical units on load.
 """
 
 import sys
@@ -16,14 +23,19 @@ if script_dir not in sys.path:
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from typing import List, Union
+from .config import CANONICAL_DBU
+from .core.geometry_utils import check_coordinate_grid
 from .markers import CutMarker, ConnectMarker, ProbeMarker
 
+XML_VERSION = '1.2'
+
 
 def save_markers(markers: List[Union[CutMarker, ConnectMarker, ProbeMarker]], 
-                 filename: str, library: str, cell: str) -> bool:
+                 filename: str, library: str, cell: str, layout_dbu: float = None) -> bool:
     """
     Save markers to XML file.
     
+    layout_dbu is recorded as the project's layout database unit (if given).
     Returns True on success, False on failure.
     Early return pattern - no nested ifs.
     """
@@ -32,7 +44,9 @@ def save_markers(markers: List[Union[CutMarker, ConnectMarker, ProbeMarker]],
     
     try:
         # Build XML tree
-        root = ET.Element('fib_project', version='1.0')
+        root = ET.Element('fib_project', version=XML_VERSION, dbu=repr(CANONICAL_DBU))
+        if layout_dbu is not None:
+            root.set('layout_dbu', repr(layout_dbu))
         
         # Metadata
         metadata = ET.SubElement(root, 'metadata')
@@ -59,10 +73,12 @@ def save_markers(markers: List[Union[CutMarker, ConnectMarker, ProbeMarker]],
         return False
 
 
-def load_markers(filename: str) -> tuple:
+def load_markers(filename: str, layout_dbu: float = None) -> tuple:
     """
     Load markers from XML file.
     
+    With layout_dbu, files whose integer grid is coarser than the layout's
+    database unit are refused (see check_coordinate_grid).
     Returns (markers_list, library, cell) tuple.
     Returns ([], '', '') on failure.
     """
@@ -71,6 +87,14 @@ def load_markers(filename: str) -> tuple:
         root = tree.getroot()
         
         # Extract metadata
+        # Coordinate unit: None = float microns (version 1.0)
+        dbu = root.get('dbu')
+        dbu = float(dbu) if dbu is not None and root.get('version', '1.0') != '1.0' else None
+        grid_error = check_coordinate_grid(dbu, layout_dbu)
+        if grid_error:
+            print(f"Error loading markers: {grid_error}")
+            return [], '', ''
+
         metadata = root.find('metadata')
         library = metadata.find('library').text if metadata is not None else ''
         cell = metadata.find('cell').text if metadata is not None else ''
@@ -92,11 +116,11 @@ def load_markers(filename: str) -> tuple:
         for elem in markers_elem:
             factory = marker_types.get(elem.tag)
             if factory:
-                markers.append(factory(elem))
+                markers.append(factory(elem, dbu))
         
         return markers, library, cell
         
-    except (IOError, ET.ParseError) as e:
+    except (IOError, ET.ParseError, TypeError, ValueError) as e:
         print(f"Error loading markers: {e}")
         return [], '', ''
 
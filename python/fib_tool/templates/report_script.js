@@ -233,7 +233,9 @@ function attachLightboxToImages() {
             if (e.target.className === 'remove-btn') {
                 return;
             }
-            openLightbox(this.src);
+            // Report thumbnails link to the full image; show it in the lightbox instead
+            e.preventDefault();
+            openLightbox(this.getAttribute('data-full') || this.src);
         });
     }
 }
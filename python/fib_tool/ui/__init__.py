@@ -5,11 +5,14 @@ dialog management, and UI factory functions.
 """
 
 from .dialog_manager import FibDialogManager
+from .marker_list_model import FibMarkerListModel, format_marker_label
 
 # FIBPanel will be imported after refactoring
 # from .fib_panel import FIBPanel
 
 __all__ = [
     'FibDialogManager',
+    'FibMarkerListModel',
+    'format_marker_label',
     # 'FIBPanel',  # Uncomment after refactoring
 ]
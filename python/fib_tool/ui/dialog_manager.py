@@ -317,3 +317,57 @@ class FibDialogManager:
             )
             return filepath if filepath else ""
         return ""
+
+    @staticmethod
+    def ask_transform(count, parent=None):
+        """Ask for a marker transformation (shift, rotate, mirror, scale)
+
+        Rotation, mirror and scale are applied about the given center, then
+        the shift.
+
+        Args:
+            count (int): Number of markers that will be moved (for the title)
+            parent: Parent widget (optional)
+
+        Returns:
+            pya.DCplxTrans: The transformation, or None if cancelled
+        """
+        if not pya:
+            return None
+        dialog = pya.QDialog(parent)
+        dialog.setWindowTitle(f"Transform {count} Marker(s)")
+        form = pya.QFormLayout(dialog)
+
+        def spin_box(label, value, minimum, maximum, decimals, suffix):
+            box = pya.QDoubleSpinBox(dialog)
+            box.setRange(minimum, maximum)
+            box.setDecimals(decimals)
+            box.setValue(value)
+            box.setSuffix(suffix)
+            form.addRow(label, box)
+            return box
+
+        fields = {}
+        for key, label, value, minimum, maximum, decimals, suffix in (
+                ('dx', "Shift X:", 0.0, -1e6, 1e6, 3, " um"),
+                ('dy', "Shift Y:", 0.0, -1e6, 1e6, 3, " um"),
+                ('angle', "Rotate:", 0.0, -360.0, 360.0, 3, " deg"),
+                ('mag', "Scale:", 1.0, 0.001, 1000.0, 6, ""),
+                ('cx', "Center X:", 0.0, -1e6, 1e6, 3, " um"),
+                ('cy', "Center Y:", 0.0, -1e6, 1e6, 3, " um")):
+            fields[key] = spin_box(label, value, minimum, maximum, decimals, suffix)
+        mirror = pya.QCheckBox("Mirror at x axis (before rotating)", dialog)
+        form.addRow("", mirror)
+
+        buttons = pya.QDialogButtonBox(pya.QDialogButtonBox.Ok | pya.QDialogButtonBox.Cancel, dialog)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        form.addRow(buttons)
+        if not dialog.exec_():
+            return None
+
+        values = {key: box.value for key, box in fields.items()}  # pya exposes Qt getters as attributes
+        center = pya.DVector(values['cx'], values['cy'])
+        about_center = pya.DCplxTrans(values['mag'], values['angle'], mirror.isChecked(),
+                                      center + pya.DVector(values['dx'], values['dy']))
+        return about_center * pya.DCplxTrans(-center)
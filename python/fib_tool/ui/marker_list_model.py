@@ -0,0 +1,604 @@
+"""Marker list model for the FIB panel
+
+FibMarkerListModel is a QAbstractListModel over the panel's marker list.
+Display strings are formatted once per marker and cached; edits emit
+row-level dataChanged instead of clearing and re-adding every item, and the
+marker id is available through MARKER_ID_ROLE so views never parse item text.
+Filtering uses the prebuilt FibMarkerIndex instead of scanning labels; its
+grid index over the marker bounding boxes also answers proximity queries
+(spatial_index). Bulk geometry queries use marker_table(), a columnar view
+(core.marker_table) rebuilt on first use after any change.
+"""
+
+from bisect import bisect_left
+from itertools import compress
+
+import pya
+
+from ..core.marker_index import FibMarkerIndex
+from ..core.marker_numbers import FibMarkerNumberIndex
+
+
+# Qt item data roles (plain ints - KLayout passes the role as int to data())
+DISPLAY_ROLE = 0         # Qt.DisplayRole
+TOOLTIP_ROLE = 3         # Qt.ToolTipRole
+MARKER_ID_ROLE = 0x0101  # Qt.UserRole + 1
+
+# MIME type of dragged rows (source rows as ASCII "3,7,8"); only this model accepts it
+MARKER_ROWS_MIME = 'application/x-fib-marker-rows'
+
+# Appending more markers than this rebuilds the search index instead of updating it
+BULK_INDEX_THRESHOLD = 256
+
+
+def _point_label(point, layer=None):
+    label = f"({point[0]:.3f},{point[1]:.3f})"
+    return f"{label} [{layer}]" if layer else label
+
+
+def format_marker_label(marker):
+    """Display string of a marker: "MARKER_ID - TYPE - coordinates"
+
+    Args:
+        marker: Any FIB marker (cut/connect/probe or multi-point)
+
+    Returns:
+        str: List label
+    """
+    marker_class_name = marker.__class__.__name__
+
+    if 'MultiPoint' in marker_class_name:
+        if 'Cut' in marker_class_name:
+            marker_type = "CUT (MULTI)"
+        elif 'Connect' in marker_class_name:
+            marker_type = "CONNECT (MULTI)"
+        else:
+            marker_type = "MULTI"
+
+        points = getattr(marker, 'points', None) or []
+        point_layers = getattr(marker, 'point_layers', None) or []
+
+        def layer_at(i):
+            return point_layers[i] if -len(point_layers) <= i < len(point_layers) else None
+
+        if not points:
+            coords = "No points"
+        elif len(points) <= 3:
+            coords = " -> ".join(_point_label(p, layer_at(i)) for i, p in enumerate(points))
+            coords = f"{len(points)} pts: {coords}"
+        else:
+            # First 2, ..., last 1 (keeps the row short)
+            first = " -> ".join(_point_label(points[i], layer_at(i)) for i in range(2))
+            coords = f"{len(points)} pts: {first} -> ... -> {_point_label(points[-1], layer_at(-1))}"
+
+    else:
+        marker_type = marker_class_name.replace('Marker', '').upper()
+
+        if hasattr(marker, 'x1'):  # CUT or CONNECT
+            layer1_str = getattr(marker, 'layer1', None) or 'N/A'
+            layer2_str = getattr(marker, 'layer2', None) or 'N/A'
+            coords = f"({marker.x1:.3f},{marker.y1:.3f}) {layer1_str} to ({marker.x2:.3f},{marker.y2:.3f}) {layer2_str}"
+        else:  # PROBE
+            target_layer_str = getattr(marker, 'target_layer', None) or 'N/A'
+            coords = f"({marker.x:.3f},{marker.y:.3f}) {target_layer_str}"
+
+    return f"{marker.id} - {marker_type} - {coords}"
+
+
+class FibMarkerListModel(pya.QAbstractListModel):
+    """List model bound to the panel's marker list
+
+    The model owns the ordered marker list; FIBPanel.markers_list returns
+    ``model.markers``. All structural changes go through the model so views
+    receive fine-grained insert/remove/dataChanged notifications.
+
+    A filter (see core.marker_index for the query syntax) hides rows: view
+    rows then map to a sorted list of source rows. Row arguments of the
+    public methods are always view rows.
+
+    Example:
+        >>> model = FibMarkerListModel(panel)
+        >>> view.setModel(model)
+        >>> model.append_marker(marker)
+        >>> model.marker_changed(marker)   # after rename / notes edit
+        >>> model.set_filter("type:cut m2")
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.markers = []
+        self.search_index = FibMarkerIndex()
+        self.number_index = FibMarkerNumberIndex()  # Free numbers for SmartCounter
+        self.filter_text = ''
+        self._rows = None        # visible source rows (sorted) while filtered
+        self._labels = {}        # id(marker) -> cached display string
+        self._row_by_id = None   # marker.id -> source row, rebuilt lazily
+        self._row_by_key = None  # id(marker) -> source row, rebuilt lazily
+        self._table = None       # FibMarkerTable over self.markers, rebuilt lazily
+
+    # ------------------------------------------------------------------
+    # QAbstractListModel interface
+    # ------------------------------------------------------------------
+
+    def rowCount(self, parent=None):
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self.markers) if self._rows is None else len(self._rows)
+
+    def data(self, index, role=DISPLAY_ROLE):
+        if not index.isValid():
+            return None
+        marker = self.marker_at(index.row())
+        if marker is None:
+            return None
+
+        if role == DISPLAY_ROLE:
+            return self.label(marker)
+        if role == MARKER_ID_ROLE:
+            return marker.id
+        if role == TOOLTIP_ROLE:
+            return getattr(marker, 'notes', None) or None
+        return None
+
+    # ------------------------------------------------------------------
+    # Drag and drop (QListView with InternalMove reorders through move_rows)
+    # ------------------------------------------------------------------
+
+    def flags(self, index):
+        if not index.isValid():
+            # Drops between rows and below the last row
+            return pya.Qt.ItemIsDropEnabled
+        return pya.Qt.ItemIsSelectable | pya.Qt.ItemIsEnabled | pya.Qt.ItemIsDragEnabled
+
+    def supportedDropActions(self):
+        return pya.Qt.MoveAction
+
+    def mimeTypes(self):
+        return [MARKER_ROWS_MIME]
+
+    def mimeData(self, indexes):
+        source_rows = sorted({self.source_row(index.row()) for index in indexes if index.isValid()})
+        mime = pya.QMimeData()
+        mime.setData(MARKER_ROWS_MIME, ",".join(str(row) for row in source_rows if row >= 0).encode('ascii'))
+        # The drag deletes the mime data when it ends
+        mime._unmanage()
+        return mime
+
+    def dropMimeData(self, data, action, row, column, parent):
+        if action != pya.Qt.MoveAction or not data.hasFormat(MARKER_ROWS_MIME):
+            return False
+        text = bytes(data.data(MARKER_ROWS_MIME)).decode('ascii')
+        source_rows = [int(value) for value in text.split(',') if value]
+        if row < 0:
+            # Dropped onto a row: insert before it; onto empty space: append
+            row = parent.row() if parent.isValid() else self.rowCount()
+        view_rows = [view_row for view_row in map(self.view_row, source_rows) if view_row >= 0]
+        # The rows are moved here; removeRows is not implemented, so the
+        # view's "remove the dragged originals" step is a no-op
+        return self.move_rows(view_rows, row) > 0
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def marker_table(self):
+        """Columnar view of all markers (rows are source rows)"""
+        if self._table is None:
+            from ..core.marker_table import FibMarkerTable
+            self._table = FibMarkerTable(self.markers)
+        return self._table
+
+    @property
+    def spatial_index(self):
+        """FibMarkerSpatialIndex over all markers (also those hidden by the filter)"""
+        return self.search_index.spatial
+
+    def label(self, marker):
+        """Cached display string of a marker"""
+        key = id(marker)
+        label = self._labels.get(key)
+        if label is None:
+            label = format_marker_label(marker)
+            self._labels[key] = label
+        return label
+
+    def is_filtered(self):
+        return self._rows is not None
+
+    def source_row(self, row):
+        """Index into self.markers of a view row, or -1"""
+        if self._rows is None:
+            return row if 0 <= row < len(self.markers) else -1
+        return self._rows[row] if 0 <= row < len(self._rows) else -1
+
+    def view_row(self, source_row):
+        """View row of a source row, or -1 if hidden by the filter"""
+        if source_row < 0 or self._rows is None:
+            return source_row
+        pos = bisect_left(self._rows, source_row)
+        if pos < len(self._rows) and self._rows[pos] == source_row:
+            return pos
+        return -1
+
+    def marker_at(self, row):
+        source_row = self.source_row(row)
+        return self.markers[source_row] if source_row >= 0 else None
+
+    def marker_id_at(self, row):
+        marker = self.marker_at(row)
+        return marker.id if marker is not None else None
+
+    def row_of(self, marker_id):
+        """View row of a marker id, or -1"""
+        return self.view_row(self._source_row_of(marker_id))
+
+    def _source_row_of(self, marker_id):
+        if self._row_by_id is None:
+            self._row_by_id = {marker.id: row for row, marker in enumerate(self.markers)}
+        return self._row_by_id.get(marker_id, -1)
+
+    def find_marker(self, marker_id):
+        """Marker by id (also when hidden by the filter)"""
+        source_row = self._source_row_of(marker_id)
+        return self.markers[source_row] if source_row >= 0 else None
+
+    # ------------------------------------------------------------------
+    # Filter
+    # ------------------------------------------------------------------
+
+    def set_filter(self, text):
+        """Show only markers matching a filter string ('' shows all)
+
+        Returns:
+            int: Number of visible rows
+        """
+        self.filter_text = (text or '').strip()
+        keys = self.search_index.match(self.filter_text)
+
+        self.beginResetModel()
+        if keys is None:
+            self._rows = None
+        else:
+            self._rows = self._matching_rows(keys)
+        self.endResetModel()
+        return self.rowCount()
+
+    def _matching_rows(self, keys):
+        """Sorted source rows of the markers whose key is in keys"""
+        if len(keys) * 4 < len(self.markers):
+            # Few matches: look the rows up instead of scanning all markers
+            if self._row_by_key is None:
+                self._row_by_key = {id(marker): row for row, marker in enumerate(self.markers)}
+            return sorted(map(self._row_by_key.__getitem__, keys))
+        # C-level scan, no Python loop per row
+        return list(compress(range(len(self.markers)), map(keys.__contains__, map(id, self.markers))))
+
+    # ------------------------------------------------------------------
+    # Structural changes
+    # ------------------------------------------------------------------
+
+    def set_markers(self, markers):
+        """Replace all markers (model reset)"""
+        self.beginResetModel()
+        self.markers = list(markers)
+        self._labels = {}
+        self._row_by_id = None
+        self._row_by_key = None
+        self._table = None
+        self.search_index.rebuild(self.markers)
+        self.number_index.rebuild(self.markers)
+        if self._rows is not None:
+            keys = self.search_index.match(self.filter_text)
+            self._rows = self._matching_rows(keys)
+        self.endResetModel()
+
+    def clear(self):
+        self.set_markers([])
+
+    def append_marker(self, marker):
+        self.append_markers([marker])
+
+    def append_markers(self, markers):
+        """Append markers with a single rowsInserted notification
+
+        While filtered, only the new markers matching the filter become visible.
+        """
+        markers = list(markers)
+        if not markers:
+            return
+
+        first_source = len(self.markers)
+        if self._rows is None:
+            new_rows = None
+            first, count = first_source, len(markers)
+        else:
+            new_rows = [first_source + offset for offset, marker in enumerate(markers)
+                        if self.search_index.matches(marker, self.filter_text)]
+            first, count = len(self._rows), len(new_rows)
+
+        if count:
+            self.beginInsertRows(pya.QModelIndex(), first, first + count - 1)
+        self.markers.extend(markers)
+        self._table = None
+        if new_rows:
+            self._rows.extend(new_rows)
+        if self._row_by_id is not None:
+            for offset, marker in enumerate(markers):
+                self._row_by_id[marker.id] = first_source + offset
+        if self._row_by_key is not None:
+            for offset, marker in enumerate(markers):
+                self._row_by_key[id(marker)] = first_source + offset
+        if len(markers) > BULK_INDEX_THRESHOLD:
+            # Cheaper than one sorted insert per marker
+            self.search_index.rebuild(self.markers)
+        else:
+            for marker in markers:
+                self.search_index.add(marker)
+        for marker in markers:
+            self.number_index.add(marker)
+        if count:
+            self.endInsertRows()
+
+    def remove_rows(self, rows):
+        """Remove view rows, one rowsRemoved notification per contiguous block
+
+        Returns:
+            list: Removed markers
+        """
+        removed = []
+        rows = sorted(set(r for r in rows if 0 <= r < self.rowCount()), reverse=True)
+
+        # Group descending rows into contiguous [start, end] blocks
+        blocks = []
+        for row in rows:
+            if blocks and blocks[-1][0] == row + 1:
+                blocks[-1][0] = row
+            else:
+                blocks.append([row, row])
+
+        for start, end in blocks:
+            self.beginRemoveRows(pya.QModelIndex(), start, end)
+            if self._rows is None:
+                block = self.markers[start:end + 1]
+                del self.markers[start:end + 1]
+            else:
+                source_rows = self._rows[start:end + 1]
+                block = [self.markers[source_row] for source_row in source_rows]
+                for source_row in reversed(source_rows):
+                    del self.markers[source_row]
+                # Visible source rows behind the block move up by the block size
+                del self._rows[start:end + 1]
+                shift = len(source_rows)
+                for pos in range(start, len(self._rows)):
+                    self._rows[pos] -= shift
+            for marker in block:
+                self._labels.pop(id(marker), None)
+                self.search_index.remove(marker)
+                self.number_index.remove(marker)
+            removed.extend(block)
+            self.endRemoveRows()
+
+        if blocks:
+            self._row_by_id = None
+            self._row_by_key = None
+            self._table = None
+        return removed
+
+    def remove_marker_ids(self, marker_ids):
+        """Remove markers by id. Returns the removed markers
+
+        Markers hidden by the filter are removed as well.
+        """
+        source_rows = sorted(set(r for r in (self._source_row_of(mid) for mid in marker_ids) if r >= 0))
+        hidden = [r for r in source_rows if self.view_row(r) < 0]
+        if not hidden:
+            return self.remove_rows([self.view_row(r) for r in source_rows])
+
+        self.beginResetModel()
+        removed = [self.markers[r] for r in source_rows]
+        for r in reversed(source_rows):
+            del self.markers[r]
+        for marker in removed:
+            self._labels.pop(id(marker), None)
+            self.search_index.remove(marker)
+            self.number_index.remove(marker)
+        self._row_by_id = None
+        self._row_by_key = None
+        self._table = None
+        keys = self.search_index.match(self.filter_text)
+        self._rows = self._matching_rows(keys)
+        self.endResetModel()
+        return removed
+
+    def swap_rows(self, row_a, row_b):
+        """Swap the markers of two view rows; only the two rows are repainted
+
+        Returns:
+            bool: False (nothing changed) if either row is not a visible row
+        """
+        source_a, source_b = self.source_row(row_a), self.source_row(row_b)
+        if source_a < 0 or source_b < 0:
+            return False
+        markers = self.markers
+        markers[source_a], markers[source_b] = markers[source_b], markers[source_a]
+        self._table = None
+        if self._row_by_id is not None:
+            self._row_by_id[markers[source_a].id] = source_a
+            self._row_by_id[markers[source_b].id] = source_b
+        if self._row_by_key is not None:
+            self._row_by_key[id(markers[source_a])] = source_a
+            self._row_by_key[id(markers[source_b])] = source_b
+        self._emit_data_changed(row_a, row_a)
+        self._emit_data_changed(row_b, row_b)
+        return True
+
+    def move_rows(self, rows, destination):
+        """Move view rows before another view row, keeping their order
+
+        Each marker is moved with beginMoveRows/endMoveRows, so views keep
+        their selection and rowsMoved is emitted. While filtered, a marker
+        lands right before the marker shown at `destination` (or after the
+        last visible one).
+
+        Args:
+            rows: View rows to move
+            destination: View row to insert before (rowCount() = at the end)
+
+        Returns:
+            int: Number of markers moved
+        """
+        count = self.rowCount()
+        moving = [self.marker_at(row) for row in sorted(set(rows)) if 0 <= row < count]
+        destination = max(0, min(destination, count))
+        # Marker the block goes in front of (None = end of the list)
+        anchor = self.marker_at(destination) if destination < count else None
+        while anchor is not None and any(anchor is marker for marker in moving):
+            destination += 1
+            anchor = self.marker_at(destination) if destination < count else None
+
+        moved = 0
+        for marker in moving:
+            if self._row_by_key is None:
+                self._row_by_key = {id(item): row for row, item in enumerate(self.markers)}
+            source = self._row_by_key[id(marker)]
+            view_from = self.view_row(source)
+            if anchor is None:
+                view_to = self.rowCount()
+                target = len(self.markers) if self._rows is None else self._rows[-1] + 1
+            else:
+                target = self._row_by_key[id(anchor)]
+                view_to = self.view_row(target)
+            if view_to in (view_from, view_from + 1):
+                continue  # Already in place
+            if not self.beginMoveRows(pya.QModelIndex(), view_from, view_from, pya.QModelIndex(), view_to):
+                continue
+            self._move_source_row(source, target)
+            self.endMoveRows()
+            moved += 1
+        return moved
+
+    def _move_source_row(self, source, target):
+        """Move self.markers[source] in front of self.markers[target] (target may be len)"""
+        marker = self.markers.pop(source)
+        if target > source:
+            target -= 1
+        self.markers.insert(target, marker)
+        if self._rows is not None:
+            low, high = min(source, target), max(source, target)
+            shift = -1 if target > source else 1
+            self._rows = sorted(target if row == source else (row + shift if low <= row <= high else row)
+                                for row in self._rows)
+        self._row_by_id = None
+        self._row_by_key = None
+        self._table = None
+
+    # ------------------------------------------------------------------
+    # Content changes
+    # ------------------------------------------------------------------
+
+    def marker_changed(self, marker):
+        """Re-format and re-index one marker after its id, notes or layers changed
+
+        The row stays visible until the filter changes, even if it no longer matches.
+        """
+        self._labels.pop(id(marker), None)
+        self._row_by_id = None
+        self._table = None
+        self.search_index.update(marker)
+        self.number_index.update(marker)
+        # Identity scan - dataclass __eq__ would compare every field
+        for source_row, candidate in enumerate(self.markers):
+            if candidate is marker:
+                row = self.view_row(source_row)
+                if row >= 0:
+                    self._emit_data_changed(row, row)
+                return
+
+    def replace_markers(self, replacements):
+        """Put new marker objects into the rows of old ones (e.g. after a type conversion)
+
+        Rows keep their position. While filtered, the new markers are checked
+        against the filter: rows that no longer match are hidden and hidden
+        rows that now match are shown. One dataChanged covers the rest.
+
+        Args:
+            replacements: (old marker, new marker) pairs; old markers not in the model are skipped
+
+        Returns:
+            int: Number of replaced markers
+        """
+        if self._row_by_key is None:
+            self._row_by_key = {id(marker): row for row, marker in enumerate(self.markers)}
+        bulk = len(replacements) > BULK_INDEX_THRESHOLD
+        rows = []
+        for old, new in replacements:
+            source_row = self._row_by_key.pop(id(old), None)
+            if source_row is None:
+                continue
+            self.markers[source_row] = new
+            self._row_by_key[id(new)] = source_row
+            self._labels.pop(id(old), None)
+            if not bulk:
+                self.search_index.remove(old)
+                self.search_index.add(new)
+            self.number_index.remove(old)
+            self.number_index.add(new)
+            rows.append(source_row)
+        if not rows:
+            return 0
+        self._row_by_id = None
+        self._table = None
+        if bulk:
+            # Cheaper than one sorted insert per marker
+            self.search_index.rebuild(self.markers)
+        if self._rows is not None:
+            self._refilter_rows(rows)
+        view_rows = [row for row in map(self.view_row, rows) if row >= 0]
+        if view_rows:
+            self._emit_data_changed(min(view_rows), max(view_rows))
+        return len(rows)
+
+    def _refilter_rows(self, source_rows):
+        """Re-apply the filter to some source rows whose markers changed
+
+        Rows are hidden / shown one by one (the selection of other rows is
+        kept); above BULK_INDEX_THRESHOLD changes the model is reset.
+        """
+        hide, show = [], []
+        for source_row in source_rows:
+            visible = self.view_row(source_row) >= 0
+            if self.search_index.matches(self.markers[source_row], self.filter_text) != visible:
+                (hide if visible else show).append(source_row)
+        if len(hide) + len(show) > BULK_INDEX_THRESHOLD:
+            self.beginResetModel()
+            self._rows = self._matching_rows(self.search_index.match(self.filter_text))
+            self.endResetModel()
+            return
+        for row in sorted(map(self.view_row, hide), reverse=True):
+            self.beginRemoveRows(pya.QModelIndex(), row, row)
+            del self._rows[row]
+            self.endRemoveRows()
+        for source_row in sorted(show):
+            row = bisect_left(self._rows, source_row)
+            self.beginInsertRows(pya.QModelIndex(), row, row)
+            self._rows.insert(row, source_row)
+            self.endInsertRows()
+
+    def refresh_all(self):
+        """Re-format all markers (e.g. after renumbering) without a model reset"""
+        self._labels = {}
+        self._row_by_id = None
+        self._table = None
+        self.search_index.rebuild(self.markers)
+        self.number_index.rebuild(self.markers)
+        if self.rowCount():
+            self._emit_data_changed(0, self.rowCount() - 1)
+
+    def _emit_data_changed(self, first, last):
+        top_left = self.index(first, 0, pya.QModelIndex())
+        bottom_right = self.index(last, 0, pya.QModelIndex())
+        # KLayout exposes signals as emit_<signal>; older builds only as signal objects
+        if hasattr(self, 'emit_dataChanged'):
+            self.emit_dataChanged(top_left, bottom_right, [])
+        else:
+            self.dataChanged.emit(top_left, bottom_right)
@@ -0,0 +1,8 @@
+"""Make the fib_tool package importable when pytest runs from the repository root"""
+
+import os
+import sys
+
+PYTHON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'python')
+if PYTHON_DIR not in sys.path:
+    sys.path.insert(0, PYTHON_DIR)
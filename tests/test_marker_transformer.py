@@ -0,0 +1,157 @@
+"""Tests for FibMarkerTransformer.convert_batch
+
+Need KLayout's Python module (pya), as in the standalone klayout package.
+"""
+
+import math
+import time
+
+import pytest
+
+pya = pytest.importorskip('pya')
+
+from fib_tool.business.bulk_transform import FibBulkTransformer
+from fib_tool.business.marker_transformer import FibMarkerTransformer
+from fib_tool.config import DEFAULT_MARKER_NOTES, LAYERS
+from fib_tool.markers import CutMarker, ConnectMarker, ProbeMarker
+from fib_tool.multipoint_markers import MultiPointCutMarker, MultiPointConnectMarker
+
+
+def build_markers(count):
+    """Cuts, connects, probes and 3-point multi-point cuts with notes, screenshots and design layers
+
+    Every second marker keeps its type's default note, the others have a
+    custom note.
+    """
+    markers = []
+    side = math.sqrt(count * 400.0)
+    for n in range(count):
+        x, y = (n * 7.3) % side, (n * 3.1) % side
+        kind = n % 4
+        if kind == 0:
+            marker = CutMarker(f"CUT_{n}", x, y, x + 2.0, y + 1.0, LAYERS['cut'], 'M1:31/0', 'M2:32/0')
+        elif kind == 1:
+            marker = ConnectMarker(f"CONNECT_{n}", x, y, x + 2.0, y, LAYERS['connect'], 'M1:31/0', 'M3:33/0')
+        elif kind == 2:
+            marker = ProbeMarker(f"PROBE_{n}", x, y, LAYERS['probe'], 'M3:33/0')
+        else:
+            marker = MultiPointCutMarker(f"CUT_{n}", [(x, y), (x + 1.0, y + 2.0), (x + 3.0, y)],
+                                         LAYERS['cut'], ['M1:31/0', 'M2:32/0', 'M4:34/0'])
+        marker.notes = DEFAULT_MARKER_NOTES[marker.TAG] if n % 2 else f"note {n}"
+        if n % 3 == 0:
+            marker.screenshots = ({'file': f"{marker.id}_overview.png", 'zoom': 'overview'},)
+        markers.append(marker)
+    return markers
+
+
+def design_layers(marker):
+    if hasattr(marker, 'point_layers'):
+        return list(marker.point_layers)
+    if hasattr(marker, 'layer1'):
+        return [marker.layer1, marker.layer2]
+    return [marker.target_layer]
+
+
+def shape_counts(cell):
+    layout = cell.layout()
+    counts = {}
+    for index in layout.layer_indexes():
+        info = layout.get_info(index)
+        size = cell.shapes(index).size()
+        if size:
+            counts[(info.layer, info.datatype)] = size
+    return counts
+
+
+def expected_notes(old, new):
+    if old.notes == DEFAULT_MARKER_NOTES[old.TAG]:
+        return DEFAULT_MARKER_NOTES[new.TAG]
+    return old.notes
+
+
+@pytest.mark.parametrize('target_type', ['cut', 'connect', 'probe', 'multipoint_cut', 'multipoint_connect'])
+def test_convert_batch_keeps_ids_notes_screenshots_and_layers(target_type):
+    markers = build_markers(40)
+    converted, failures = FibMarkerTransformer.convert_batch(markers, target_type)
+
+    assert len(converted) + len(failures) == len(markers)
+    assert converted
+    for old, new in converted:
+        assert new.id == old.id
+        assert new.notes == expected_notes(old, new)
+        assert new.screenshots == old.screenshots
+        assert new.layer == LAYERS[new.TAG]
+        layers = design_layers(old)
+        if hasattr(new, 'point_layers'):
+            assert len(new.point_layers) == len(new.ipoints)
+            assert new.point_layers[:len(layers)] == layers[:len(new.point_layers)]
+        elif hasattr(new, 'layer1'):
+            assert [new.layer1, new.layer2] == [layers[0], layers[-1]]
+        else:
+            assert new.target_layer == layers[0]
+
+
+def test_convert_batch_reports_markers_it_cannot_convert():
+    markers = build_markers(8)
+    converted, failures = FibMarkerTransformer.convert_batch(markers, 'connect')
+
+    # Connects already are, 3-point cuts have no two-point form
+    rejected = {marker.id for marker in markers if isinstance(marker, (ConnectMarker, MultiPointCutMarker))}
+    assert {marker_id for marker_id, _ in failures} == rejected
+    assert all(reason for _, reason in failures)
+    assert {old.id for old, _ in converted} == {marker.id for marker in markers} - rejected
+
+
+def test_multipoint_conversion_keeps_every_point_and_its_layer():
+    marker = MultiPointCutMarker("CUT_7", [(0.0, 0.0), (1.5, 2.0), (3.0, 0.25), (4.0, 4.0)],
+                                 LAYERS['cut'], ['M1:31/0', 'M2:32/0', 'M3:33/0', 'M1:31/0'])
+    marker.notes = "open here"
+
+    (old, new), = FibMarkerTransformer.convert_batch([marker], 'multipoint_connect')[0]
+
+    assert isinstance(new, MultiPointConnectMarker)
+    assert new.id == "CUT_7"
+    assert list(new.ipoints) == list(old.ipoints)
+    assert new.point_layers == ['M1:31/0', 'M2:32/0', 'M3:33/0', 'M1:31/0']
+    assert new.notes == "open here"
+    assert new.layer == LAYERS['connect']
+
+
+def test_convert_batch_replaces_the_gds_shapes():
+    markers = build_markers(200)
+    layout = pya.Layout()
+    cell = layout.create_cell("TOP")
+    FibBulkTransformer().draw_gds(markers, cell)
+
+    converted, _ = FibMarkerTransformer.convert_batch(markers, 'probe', cell)
+
+    # The cell must hold exactly what drawing the resulting marker set gives
+    replaced = {id(old): new for old, new in converted}
+    expected_layout = pya.Layout()
+    expected_cell = expected_layout.create_cell("TOP")
+    FibBulkTransformer().draw_gds([replaced.get(id(marker), marker) for marker in markers], expected_cell)
+    counts = shape_counts(cell)
+    assert counts == shape_counts(expected_cell)
+    assert (LAYERS['connect'], 0) not in counts
+    assert counts[(LAYERS['probe'], 0)] > 0
+
+
+def test_convert_batch_time_at_10k_markers():
+    markers = build_markers(10000)
+    t0 = time.perf_counter()
+    converted, failures = FibMarkerTransformer.convert_batch(markers, 'connect')
+    data_seconds = time.perf_counter() - t0
+    assert len(converted) == 5000 and len(failures) == 5000
+
+    markers = build_markers(10000)
+    layout = pya.Layout()
+    cell = layout.create_cell("TOP")
+    FibBulkTransformer().draw_gds(markers, cell)
+    t0 = time.perf_counter()
+    FibMarkerTransformer.convert_batch(markers, 'connect', cell)
+    gds_seconds = time.perf_counter() - t0
+
+    # Generous bounds: the data pass takes a few ms per thousand markers and
+    # the shape replacement well under a millisecond per marker
+    assert data_seconds < 2.0
+    assert gds_seconds < 15.0